@@ -16,18 +16,30 @@ import re
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
 import numpy as np
 import pandas as pd
 
+from gmail_assistant.analysis.frame_classifier import FrameClassifier, automation_scores
+from gmail_assistant.core.processing.rule_matcher import CategoryRules
+
 
 class EmailAnalysisEngine:
     """Core email analysis engine implementing the comprehensive methodology"""
 
+    AUTOMATED_INDICATORS: ClassVar[list[str]] = [
+        'noreply', 'no-reply', 'notification', 'alert', 'service',
+        'support', 'help', 'admin', 'system', 'donotreply',
+        'automated', 'robot', 'bot', 'mailer-daemon'
+    ]
+    AUTOMATED_DOMAINS: ClassVar[list[str]] = ['amazonaws.com', 'sendgrid.', 'mailgun.', 'mailchimp.']
+    AUTOMATED_SUBJECT_PATTERN = r'^(Re:|Fwd:|AUTO:|ALERT:|NOTIFICATION:)'
+
     def __init__(self, config: dict[str, Any]):
         self.config = config
         self.classification_rules = self._load_classification_rules()
+        self._compiled_rules = CategoryRules(self.classification_rules)
         self.quality_thresholds = config.get('quality_thresholds', {})
         self.logger = self._setup_logging()
 
@@ -184,41 +196,41 @@ class EmailAnalysisEngine:
             'validity_rate': valid_emails / (valid_emails + invalid_emails) * 100 if (valid_emails + invalid_emails) > 0 else 0
         }
 
-    def classify_emails(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Apply hierarchical email classification"""
+    def classify_emails(self, df: pd.DataFrame, vectorized: bool = True) -> pd.DataFrame:
+        """Apply hierarchical email classification (column-wise unless vectorized=False)"""
         self.logger.info("Starting email classification")
 
-        def categorize_email(row):
-            subject = str(row.get('subject', '')).lower()
-            sender = str(row.get('sender', '')).lower()
-            content = str(row.get('plain_text_content', '')).lower()
-
-            # Combine text for analysis
-            combined_text = f"{subject} {content}"
-
-            # Apply classification rules in priority order
-            for category, rules in sorted(self.classification_rules.items(),
-                                        key=lambda x: x[1]['priority']):
-
-                # Check keywords
-                if any(keyword in combined_text for keyword in rules['keywords']):
-                    return category
-
-                # Check sender patterns
-                for pattern in rules.get('sender_patterns', []):
-                    if re.search(pattern, sender):
-                        return category
-
-            return 'Other'
-
-        # Apply classification
-        df['category'] = df.apply(categorize_email, axis=1)
-
-        # Calculate classification confidence
-        df['classification_confidence'] = df.apply(self._calculate_classification_confidence, axis=1)
-
-        # Detect automation
-        df['is_automated'] = df.apply(self._detect_automation, axis=1)
+        # Recompile in case rules were changed after construction
+        self._compiled_rules = CategoryRules(self.classification_rules)
+
+        if vectorized:
+            result = FrameClassifier(self.classification_rules).classify(df)
+            df['category'] = result.category
+
+            # Base confidence + match bonus, from rule-match counts
+            ratio = result.matches / np.maximum(result.totals, 1)
+            confidence = np.where((result.category == 'Other').to_numpy(), 0.5,
+                                  0.7 + 0.3 * np.minimum(ratio, 1.0))
+            df['classification_confidence'] = [round(value, 3) for value in confidence]
+
+            df['is_automated'] = automation_scores(
+                df, self.AUTOMATED_INDICATORS, self.AUTOMATED_DOMAINS,
+                self.AUTOMATED_SUBJECT_PATTERN
+            ) >= 1.0
+        else:
+            def categorize_email(row):
+                subject = str(row.get('subject', '')).lower()
+                sender = str(row.get('sender', '')).lower()
+                content = str(row.get('plain_text_content', '')).lower()
+
+                # Highest-priority category whose keywords or sender patterns match
+                return self._compiled_rules.categorize(f"{subject} {content}", sender)
+
+            df['category'] = df.apply(categorize_email, axis=1)
+            df['classification_confidence'] = df.apply(
+                self._calculate_classification_confidence, axis=1
+            )
+            df['is_automated'] = df.apply(self._detect_automation, axis=1)
 
         # Calculate content metrics
         df['content_length'] = df['plain_text_content'].str.len().fillna(0)
@@ -238,16 +250,12 @@ class EmailAnalysisEngine:
             return 0.5
 
         combined_text = f"{subject} {content}"
-        rules = self.classification_rules.get(category, {})
 
         # Count matching patterns
-        keyword_matches = sum(1 for keyword in rules.get('keywords', [])
-                            if keyword in combined_text)
-        sender_matches = sum(1 for pattern in rules.get('sender_patterns', [])
-                           if re.search(pattern, sender))
-
-        total_patterns = len(rules.get('keywords', [])) + len(rules.get('sender_patterns', []))
-        match_ratio = (keyword_matches + sender_matches) / max(total_patterns, 1)
+        matches, total_patterns = self._compiled_rules.count_matches(
+            combined_text, sender, category
+        )
+        match_ratio = matches / max(total_patterns, 1)
 
         # Base confidence + match bonus
         confidence = 0.7 + (0.3 * min(match_ratio, 1.0))
@@ -258,22 +266,15 @@ class EmailAnalysisEngine:
         sender = str(row.get('sender', '')).lower()
         subject = str(row.get('subject', ''))
 
-        automated_indicators = [
-            'noreply', 'no-reply', 'notification', 'alert', 'service',
-            'support', 'help', 'admin', 'system', 'donotreply',
-            'automated', 'robot', 'bot', 'mailer-daemon'
-        ]
-
         # Check sender patterns
-        automation_score = sum(1 for indicator in automated_indicators if indicator in sender)
+        automation_score = sum(1 for indicator in self.AUTOMATED_INDICATORS if indicator in sender)
 
         # Check subject patterns
-        if re.match(r'^(Re:|Fwd:|AUTO:|ALERT:|NOTIFICATION:)', subject):
+        if re.match(self.AUTOMATED_SUBJECT_PATTERN, subject):
             automation_score += 0.5
 
         # Check for common automated domains
-        automated_domains = ['amazonaws.com', 'sendgrid.', 'mailgun.', 'mailchimp.']
-        if any(domain in sender for domain in automated_domains):
+        if any(domain in sender for domain in self.AUTOMATED_DOMAINS):
             automation_score += 1
 
         return automation_score >= 1.0
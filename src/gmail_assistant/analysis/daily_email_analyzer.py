@@ -14,11 +14,15 @@ import re
 import warnings
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
 import numpy as np
 import pandas as pd
 
+from gmail_assistant.core.processing.rule_matcher import CategoryRules
+
+from .frame_classifier import FrameClassifier, automation_scores
+
 # Suppress pandas warnings for cleaner output
 warnings.filterwarnings('ignore', category=pd.errors.PerformanceWarning)
 
@@ -141,20 +145,37 @@ class DataQualityAssessment:
 class HierarchicalClassifier:
     """Hierarchical email classification engine with confidence scoring"""
 
+    AUTOMATED_INDICATORS: ClassVar[list[str]] = [
+        'noreply', 'no-reply', 'notification', 'alert', 'service',
+        'support', 'help', 'admin', 'system', 'donotreply',
+        'automated', 'robot', 'bot', 'mailer-daemon'
+    ]
+    AUTOMATED_DOMAINS: ClassVar[list[str]] = ['amazonaws.com', 'sendgrid.', 'mailgun.', 'mailchimp.', 'beehiiv.com']
+    AUTOMATED_SUBJECT_PATTERN = r'^(Re:|Fwd:|AUTO:|ALERT:|NOTIFICATION:)'
+
     def __init__(self, classification_rules: dict[str, dict]):
         self.rules = classification_rules
         self.custom_categories = {}
+        self._compile_rules()
 
     def add_custom_categories(self, custom_categories: dict[str, dict]):
         """Add custom categories to the classification engine"""
         self.custom_categories = custom_categories
+        self._compile_rules()
+
+    def _compile_rules(self):
+        """Compile base and custom rules into single-pass matchers"""
+        all_rules = {**self.rules, **self.custom_categories}
+        self._compiled_rules = CategoryRules(all_rules, lowercase_patterns=True)
+        self._frame_classifier = FrameClassifier(all_rules, lowercase_patterns=True)
 
-    def classify_emails(self, df: pd.DataFrame) -> pd.DataFrame:
+    def classify_emails(self, df: pd.DataFrame, vectorized: bool = True) -> pd.DataFrame:
         """
         Apply hierarchical email classification with confidence scoring
 
         Args:
             df: DataFrame with email data
+            vectorized: Evaluate rules column-wise (same results as row-wise)
 
         Returns:
             DataFrame with added classification columns
@@ -163,9 +184,12 @@ class HierarchicalClassifier:
         df_classified = df.copy()
 
         # Apply classification
-        df_classified['category'] = df_classified.apply(self._categorize_email, axis=1)
-        df_classified['classification_confidence'] = df_classified.apply(self._calculate_confidence, axis=1)
-        df_classified['is_automated'] = df_classified.apply(self._detect_automation, axis=1)
+        if vectorized:
+            self._classify_columns(df_classified)
+        else:
+            df_classified['category'] = df_classified.apply(self._categorize_email, axis=1)
+            df_classified['classification_confidence'] = df_classified.apply(self._calculate_confidence, axis=1)
+            df_classified['is_automated'] = df_classified.apply(self._detect_automation, axis=1)
 
         # Calculate derived metrics
         df_classified['content_length'] = df_classified.get('plain_text_content', pd.Series()).str.len().fillna(0)
@@ -173,6 +197,28 @@ class HierarchicalClassifier:
 
         return df_classified
 
+    def _classify_columns(self, df: pd.DataFrame):
+        """Add category, confidence and automation columns using column-wise masks"""
+        result = self._frame_classifier.classify(df)
+        all_rules = {**self.rules, **self.custom_categories}
+
+        # Same formula as _calculate_confidence, over whole arrays
+        ratio = np.divide(result.matches, result.totals,
+                          out=np.zeros(len(df)), where=result.totals > 0)
+        thresholds = result.category.map(
+            lambda c: all_rules.get(c, {}).get('confidence_threshold', 0.8)
+        ).to_numpy(dtype=float)
+        confidence = np.minimum(0.7 + 0.3 * np.minimum(ratio, 1.0), thresholds)
+        confidence = np.where((result.category == 'Other').to_numpy() | (result.totals == 0),
+                              0.5, confidence)
+
+        df['category'] = result.category
+        df['classification_confidence'] = [round(value, 3) for value in confidence]
+        df['is_automated'] = automation_scores(
+            df, self.AUTOMATED_INDICATORS, self.AUTOMATED_DOMAINS,
+            self.AUTOMATED_SUBJECT_PATTERN
+        ) >= 1.0
+
     def _categorize_email(self, row) -> str:
         """Categorize single email using hierarchical rules"""
         subject = str(row.get('subject', '')).lower()
@@ -182,23 +228,8 @@ class HierarchicalClassifier:
         # Combine text for analysis
         combined_text = f"{subject} {content}"
 
-        # Combine base rules with custom categories
-        all_rules = {**self.rules, **self.custom_categories}
-
-        # Apply classification rules in priority order
-        for category, rules in sorted(all_rules.items(), key=lambda x: x[1].get('priority', 10)):
-            # Check keywords
-            keywords = rules.get('keywords', [])
-            if any(keyword in combined_text for keyword in keywords):
-                return category
-
-            # Check sender patterns
-            sender_patterns = rules.get('sender_patterns', [])
-            for pattern in sender_patterns:
-                if re.search(pattern.lower(), sender):
-                    return category
-
-        return 'Other'
+        # Highest-priority category whose keywords or sender patterns match
+        return self._compiled_rules.categorize(combined_text, sender)
 
     def _calculate_confidence(self, row) -> float:
         """Calculate confidence score for classification"""
@@ -211,21 +242,16 @@ class HierarchicalClassifier:
             return 0.5
 
         combined_text = f"{subject} {content}"
-        all_rules = {**self.rules, **self.custom_categories}
-        rules = all_rules.get(category, {})
+        rules = {**self.rules, **self.custom_categories}.get(category, {})
 
         # Count matching patterns
-        keywords = rules.get('keywords', [])
-        keyword_matches = sum(1 for keyword in keywords if keyword in combined_text)
-
-        sender_patterns = rules.get('sender_patterns', [])
-        sender_matches = sum(1 for pattern in sender_patterns if re.search(pattern.lower(), sender))
-
-        total_patterns = len(keywords) + len(sender_patterns)
+        matches, total_patterns = self._compiled_rules.count_matches(
+            combined_text, sender, category
+        )
         if total_patterns == 0:
             return 0.5
 
-        match_ratio = (keyword_matches + sender_matches) / total_patterns
+        match_ratio = matches / total_patterns
 
         # Base confidence + match bonus, capped at category threshold
         confidence = 0.7 + (0.3 * min(match_ratio, 1.0))
@@ -238,22 +264,15 @@ class HierarchicalClassifier:
         sender = str(row.get('sender', '')).lower()
         subject = str(row.get('subject', ''))
 
-        automated_indicators = [
-            'noreply', 'no-reply', 'notification', 'alert', 'service',
-            'support', 'help', 'admin', 'system', 'donotreply',
-            'automated', 'robot', 'bot', 'mailer-daemon'
-        ]
-
         # Check sender patterns
-        automation_score = sum(1 for indicator in automated_indicators if indicator in sender)
+        automation_score = sum(1 for indicator in self.AUTOMATED_INDICATORS if indicator in sender)
 
         # Check subject patterns
-        if re.match(r'^(Re:|Fwd:|AUTO:|ALERT:|NOTIFICATION:)', subject):
+        if re.match(self.AUTOMATED_SUBJECT_PATTERN, subject):
             automation_score += 0.5
 
         # Check for common automated domains
-        automated_domains = ['amazonaws.com', 'sendgrid.', 'mailgun.', 'mailchimp.', 'beehiiv.com']
-        if any(domain in sender for domain in automated_domains):
+        if any(domain in sender for domain in self.AUTOMATED_DOMAINS):
             automation_score += 1
 
         return automation_score >= 1.0
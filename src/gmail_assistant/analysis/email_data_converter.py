@@ -9,12 +9,20 @@ import email
 import email.parser
 import email.utils
 import logging
+import os
 import re
-from datetime import datetime
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
 import pandas as pd
 
+# Date-organised backup layout: YYYY/MM folders, YYYY-MM-DD_HHMMSS_... files
+YEAR_DIR_PATTERN = re.compile(r'^\d{4}$')
+MONTH_DIR_PATTERN = re.compile(r'^\d{2}$')
+FILENAME_DATE_PATTERN = re.compile(r'^(\d{4})-(\d{2})-(\d{2})_')
+
 
 class EmailDataConverter:
     """Convert email files (EML/Markdown) to Parquet format for analysis"""
@@ -256,7 +264,11 @@ class EmailDataConverter:
             self.logger.warning("No email data to convert")
             return 0
 
-        # Create DataFrame and save as Parquet
+        self._write_parquet(email_data, output_file)
+        return processed_count
+
+    def _write_parquet(self, email_data: list[dict], output_file: Path) -> None:
+        """Write email records to a Parquet file with consistent column types"""
         df = pd.DataFrame(email_data)
 
         # Ensure proper data types
@@ -273,58 +285,124 @@ class EmailDataConverter:
         df.to_parquet(output_file, index=False, compression='snappy')
 
         self.logger.info(f"Saved {len(df)} emails to {output_file}")
-        return processed_count
 
     def convert_latest_emails(self, backup_dir: Path, output_file: Path,
-                            days_back: int = 1) -> int:
+                            days_back: int = 1, workers: int | None = None) -> int:
         """
         Convert emails from last N days to Parquet format
 
+        The backup tree is walked once. YYYY/MM folders and files whose
+        YYYY-MM-DD_ filename prefix fall outside the window (widened by a day
+        to allow for timezone differences) are skipped without being opened;
+        the remaining candidates are parsed in parallel and filtered on
+        their received date.
+
         Args:
             backup_dir: Gmail backup directory
             output_file: Output Parquet file
             days_back: Number of days to look back
+            workers: Worker processes for parsing (defaults to the CPU count)
 
         Returns:
             Number of emails processed
         """
-        from datetime import datetime, timedelta
-
-        target_dates = []
-        for i in range(days_back):
-            date = datetime.now().date() - timedelta(days=i+1)
-            target_dates.append(date.strftime('%Y-%m-%d'))
-
-        self.logger.info(f"Converting emails from dates: {target_dates}")
+        today = datetime.now().date()
+        target_dates = {today - timedelta(days=i + 1) for i in range(days_back)}
 
-        all_email_data = []
+        self.logger.info(f"Converting emails from dates: {sorted(str(d) for d in target_dates)}")
 
-        for date_str in target_dates:
-            # Create temporary file for this date
-            temp_file = output_file.parent / f"temp_{date_str}.parquet"
+        candidates = list(self._iter_candidate_files(backup_dir, target_dates))
+        self.logger.info(f"Found {len(candidates)} candidate files")
 
-            count = self.convert_directory(backup_dir, temp_file, date_filter=date_str)
+        all_email_data = {}
+        for file_path, email_record in self._extract_files(candidates, workers):
+            if email_record is None:
+                continue
 
-            if count > 0 and temp_file.exists():
-                # Read and combine data
-                date_df = pd.read_parquet(temp_file)
-                all_email_data.append(date_df)
+            received = email_record.get('date_received')
+            if received is not None:
+                if received.date() not in target_dates:
+                    continue
+            elif self._filename_date(file_path.name) not in target_dates:
+                # Undated emails are only kept when their filename dates them
+                continue
 
-                # Clean up temp file
-                temp_file.unlink()
+            all_email_data.setdefault(email_record['gmail_id'], email_record)
 
         if not all_email_data:
             self.logger.warning("No emails found for specified dates")
             return 0
 
-        # Combine all data and save
-        combined_df = pd.concat(all_email_data, ignore_index=True)
-        combined_df = combined_df.drop_duplicates(subset=['gmail_id'])
+        self._write_parquet(list(all_email_data.values()), output_file)
+        return len(all_email_data)
+
+    def _iter_candidate_files(self, backup_dir: Path,
+                              target_dates: set[date]) -> Iterator[Path]:
+        """
+        Walk the backup tree once, yielding email files that may fall on
+        one of the target dates.
+
+        Files and YYYY/MM folders outside the target window are pruned by
+        name; anything not named by date is yielded for parsing.
+        """
+        window = {d + timedelta(days=offset) for d in target_dates for offset in (-1, 0, 1)}
+        years = {f"{d.year:04d}" for d in window}
+        months = {(f"{d.year:04d}", f"{d.month:02d}") for d in window}
+
+        for root, dirs, files in os.walk(backup_dir):
+            parent = Path(root).name
+            dirs[:] = [
+                name for name in dirs
+                if not (YEAR_DIR_PATTERN.match(name) and name not in years)
+                and not (YEAR_DIR_PATTERN.match(parent) and MONTH_DIR_PATTERN.match(name)
+                         and (parent, name) not in months)
+            ]
+
+            for name in files:
+                if not name.endswith(('.eml', '.md')):
+                    continue
+                file_date = self._filename_date(name)
+                if file_date is not None and file_date not in window:
+                    continue
+                yield Path(root) / name
+
+    def _filename_date(self, filename: str) -> date | None:
+        """Extract the date from a YYYY-MM-DD_HHMMSS_... filename prefix"""
+        match = FILENAME_DATE_PATTERN.match(filename)
+        if not match:
+            return None
+        try:
+            return date(*map(int, match.groups()))
+        except ValueError:
+            return None
+
+    def _extract_files(self, files: list[Path],
+                       workers: int | None = None) -> Iterator[tuple[Path, dict | None]]:
+        """Extract email records from files, in a process pool when worthwhile"""
+        workers = workers or os.cpu_count() or 1
+
+        if workers <= 1 or len(files) < 2:
+            for file_path in files:
+                yield file_path, _extract_file(self, file_path)
+            return
+
+        chunksize = max(1, len(files) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from zip(
+                files,
+                executor.map(_extract_file, [self] * len(files), files, chunksize=chunksize),
+                strict=True
+            )
+
 
-        combined_df.to_parquet(output_file, index=False, compression='snappy')
+def _extract_file(converter: EmailDataConverter, file_path: Path) -> dict | None:
+    """Extract one EML or Markdown file"""
+    if file_path.suffix == '.eml':
+        return converter.extract_from_eml(file_path)
+    if file_path.suffix == '.md':
+        return converter.extract_from_markdown(file_path)
+    return None
 
-        self.logger.info(f"Combined {len(combined_df)} unique emails to {output_file}")
-        return len(combined_df)
 
 def main():
     """CLI interface for email data conversion"""
@@ -333,6 +411,7 @@ def main():
     parser.add_argument('--output', required=True, help='Output Parquet file path')
     parser.add_argument('--date', help='Filter by specific date (YYYY-MM-DD)')
     parser.add_argument('--days-back', type=int, default=1, help='Number of days to look back')
+    parser.add_argument('--workers', type=int, help='Worker processes for parsing (default: CPU count)')
     parser.add_argument('--verbose', action='store_true', help='Verbose logging')
 
     args = parser.parse_args()
@@ -350,7 +429,8 @@ def main():
         if args.date:
             count = converter.convert_directory(input_dir, output_file, date_filter=args.date)
         else:
-            count = converter.convert_latest_emails(input_dir, output_file, days_back=args.days_back)
+            count = converter.convert_latest_emails(input_dir, output_file, days_back=args.days_back,
+                                                   workers=args.workers)
 
         print(f"✅ Successfully converted {count} emails to {output_file}")
         return 0
@@ -4,7 +4,9 @@ from __future__ import annotations
 from .analyze import analyze_emails
 from .auth import authenticate, check_auth_status, revoke_auth
 from .delete import delete_emails, get_email_count
+from .export import export_parquet
 from .fetch import fetch_emails
+from .watch import watch_mailbox
 
 __all__ = [
     # Analyze operations
@@ -14,8 +16,12 @@ __all__ = [
     "check_auth_status",
     # Delete operations
     "delete_emails",
+    # Export operations
+    "export_parquet",
     # Fetch operations
     "fetch_emails",
     "get_email_count",
     "revoke_auth",
+    # Watch operations
+    "watch_mailbox",
 ]
@@ -0,0 +1,75 @@
+"""Export command implementation."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import click
+
+from gmail_assistant.core.exceptions import ConfigError, GmailAssistantError
+from gmail_assistant.utils.secure_logger import SecureLogger
+
+logger = SecureLogger(__name__)
+
+
+def export_parquet(
+    db_path: Path,
+    output_dir: Path,
+    partition_by: str = "year_month",
+    compression: str = "snappy",
+    jobs: int = 1,
+    incremental: bool = False
+) -> dict[str, Any]:
+    """
+    Export the email database to partitioned Parquet files.
+
+    Args:
+        db_path: Path to the SQLite email database
+        output_dir: Output directory for Parquet files
+        partition_by: Partition column
+        compression: Compression codec (snappy, gzip, zstd, none)
+        jobs: Worker processes exporting partitions in parallel
+        incremental: Only rewrite partitions changed since the last export
+
+    Returns:
+        Dict with export statistics
+
+    Raises:
+        ConfigError: If the database is missing or PyArrow is not installed
+        GmailAssistantError: If the export fails
+    """
+    if not db_path.exists():
+        raise ConfigError(f"Database not found: {db_path}")
+
+    from gmail_assistant.export.parquet_exporter import (
+        PYARROW_AVAILABLE,
+        ParquetExporter,
+        ParquetExportError,
+    )
+
+    if not PYARROW_AVAILABLE:
+        raise ConfigError("PyArrow required for Parquet export. "
+                          "Install with: pip install gmail-assistant[analysis]")
+
+    exporter = ParquetExporter(db_path)
+    try:
+        stats = exporter.export_emails(
+            output_dir,
+            partition_by=partition_by,
+            compression=compression,
+            jobs=jobs,
+            incremental=incremental
+        )
+    except ParquetExportError as e:
+        raise GmailAssistantError(f"Parquet export failed: {e}") from e
+
+    click.echo(
+        f"Exported {stats['total_rows']} emails to {stats['files_created']} files "
+        f"({stats['total_size_bytes'] / 1024 / 1024:.1f} MB)"
+    )
+    if incremental:
+        click.echo(
+            f"Unchanged partitions skipped: {stats['partitions_skipped']}, "
+            f"removed: {stats['partitions_deleted']}"
+        )
+    return stats
@@ -10,6 +10,8 @@ import click
 from gmail_assistant.core.exceptions import AuthError
 from gmail_assistant.core.fetch.checkpoint import CheckpointManager
 from gmail_assistant.core.fetch.gmail_assistant import GmailFetcher
+from gmail_assistant.core.fetch.message_cache import MessageCache
+from gmail_assistant.core.fetch.message_index import MessageIndex
 from gmail_assistant.utils.secure_logger import SecureLogger
 
 logger = SecureLogger(__name__)
@@ -21,11 +23,18 @@ def fetch_emails(
     output_dir: Path,
     output_format: str,
     credentials_path: Path,
-    resume: bool = False
+    resume: bool = False,
+    skip_existing: bool = True,
+    use_cache: bool = True
 ) -> dict[str, Any]:
     """
     Fetch emails from Gmail (C-2 implementation).
 
+    Messages already recorded in the output directory's MessageIndex are
+    not fetched again, which is also what makes resuming safe when the
+    mailbox has changed since the interrupted run. Other messages fetched
+    by earlier runs are served from the shared message cache.
+
     Args:
         query: Gmail search query
         max_emails: Maximum emails to fetch
@@ -33,6 +42,8 @@ def fetch_emails(
         output_format: json, mbox, or eml
         credentials_path: Path to credentials.json
         resume: Resume from last checkpoint
+        skip_existing: Skip messages already in the download index
+        use_cache: Serve repeated messages.get calls from the message cache
 
     Returns:
         Dict with fetch statistics
@@ -43,20 +54,19 @@ def fetch_emails(
         APIError: If Gmail API returns error
     """
     checkpoint_mgr = CheckpointManager()
-    skip_count = 0
 
-    # Check for resumable checkpoint
+    # Check for resumable checkpoint; already downloaded messages are
+    # skipped through the message index rather than by position
     if resume:
         checkpoint = checkpoint_mgr.get_latest_checkpoint(query=query, resumable_only=True)
         if checkpoint:
             click.echo(f"Resuming from checkpoint: {checkpoint.sync_id}")
-            resume_info = checkpoint_mgr.get_resume_info(checkpoint)
-            skip_count = resume_info['skip_count']
         else:
             click.echo("No checkpoint found, starting fresh")
 
     # Initialize fetcher
-    fetcher = GmailFetcher(str(credentials_path))
+    message_cache = MessageCache() if use_cache else None
+    fetcher = GmailFetcher(str(credentials_path), message_cache=message_cache)
     if not fetcher.authenticate():
         raise AuthError("Gmail authentication failed")
 
@@ -72,6 +82,7 @@ def fetch_emails(
     else:
         checkpoint = checkpoint_mgr.get_latest_checkpoint(query=query, resumable_only=True)
 
+    index = None
     try:
         # Search for messages
         click.echo(f"Searching for emails with query: {query or '(all)'}")
@@ -86,6 +97,10 @@ def fetch_emails(
         checkpoint.total_messages = len(message_ids)
 
         output_dir.mkdir(parents=True, exist_ok=True)
+        index = MessageIndex.for_output_dir(output_dir) if skip_existing else None
+        known = index.known_ids(message_ids) if index is not None else set()
+        if known:
+            click.echo(f"Skipping {len(known)} already downloaded emails")
 
         # Fetch with progress tracking
         fetched = 0
@@ -95,14 +110,15 @@ def fetch_emails(
             label="Fetching emails"
         ) as bar:
             for i, msg_id in bar:
-                # Skip already processed messages when resuming
-                if i < skip_count:
+                if msg_id in known:
                     continue
 
                 try:
                     email_data = fetcher.get_message_details(msg_id)
                     if email_data:
-                        _save_email(email_data, output_dir, output_format, i)
+                        path, content = _save_email(email_data, output_dir, output_format, i)
+                        if index is not None:
+                            index.record(msg_id, path, content)
                         fetched += 1
 
                     # Update checkpoint every 50 emails
@@ -116,18 +132,33 @@ def fetch_emails(
                     logger.warning(f"Failed to fetch email {msg_id}: {e}")
                     continue
 
+        if index is not None:
+            index.close()
         checkpoint_mgr.mark_completed(checkpoint)
         checkpoint_mgr.cleanup_old_checkpoints()
 
-        return {'fetched': fetched, 'total': len(message_ids)}
+        result = {'fetched': fetched, 'skipped': len(known), 'total': len(message_ids)}
+        if message_cache is not None:
+            result['cache'] = message_cache.get_stats()
+        return result
 
     except Exception:
+        if index is not None:
+            index.close()
         checkpoint_mgr.mark_interrupted(checkpoint)
         raise
+    finally:
+        if message_cache is not None:
+            message_cache.close()
+
 
+def _save_email(email_data: dict[str, Any], output_dir: Path, output_format: str,
+                index: int) -> tuple[Path, str]:
+    """Save email in the specified format.
 
-def _save_email(email_data: dict[str, Any], output_dir: Path, output_format: str, index: int) -> None:
-    """Save email in the specified format."""
+    Returns:
+        Tuple of (file written, content written)
+    """
     # Generate safe filename
     subject = email_data.get('subject', 'no_subject')[:50]
     import re
@@ -137,8 +168,10 @@ def _save_email(email_data: dict[str, Any], output_dir: Path, output_format: str
     if output_format == 'json':
         filename = f"{index:05d}_{safe_subject}_{msg_id}.json"
         filepath = output_dir / filename
+        content = json.dumps(email_data, indent=2, default=str)
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(email_data, f, indent=2, default=str)
+            f.write(content)
+        return filepath, content
 
     elif output_format == 'eml':
         filename = f"{index:05d}_{safe_subject}_{msg_id}.eml"
@@ -146,6 +179,7 @@ def _save_email(email_data: dict[str, Any], output_dir: Path, output_format: str
         raw_content = email_data.get('raw_content', '')
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(raw_content)
+        return filepath, raw_content
 
     elif output_format == 'mbox':
         # Append to single mbox file
@@ -156,6 +190,9 @@ def _save_email(email_data: dict[str, Any], output_dir: Path, output_format: str
             f.write(f"From {email_data.get('sender', 'unknown')}\n")
             f.write(raw_content)
             f.write("\n\n")
+        return mbox_path, raw_content
+
+    raise ValueError(f"Unsupported output format: {output_format}")
 
 
 __all__ = ['fetch_emails']
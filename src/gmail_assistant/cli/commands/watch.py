@@ -0,0 +1,113 @@
+"""Watch command implementation."""
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+import click
+
+from gmail_assistant.core.exceptions import AuthError
+from gmail_assistant.core.fetch.gmail_assistant import GmailFetcher
+from gmail_assistant.core.fetch.history_sync import HistorySyncClient, SyncStateManager
+from gmail_assistant.core.fetch.message_cache import MessageCache
+from gmail_assistant.core.fetch.message_index import MessageIndex
+from gmail_assistant.core.fetch.service_pool import GmailServicePool
+from gmail_assistant.core.fetch.watch import (
+    BackupWatchHandler,
+    DatabaseWatchHandler,
+    MailboxWatcher,
+    WatchConfig,
+    WatchHandler,
+)
+
+
+def watch_mailbox(
+    credentials_path: Path,
+    output_dir: Path | None = None,
+    db_path: Path | None = None,
+    output_format: str = 'both',
+    classify: bool = True,
+    config: WatchConfig | None = None,
+    max_polls: int | None = None
+) -> dict[str, Any]:
+    """
+    Apply mailbox changes as they arrive until interrupted.
+
+    Authenticates once and keeps the Gmail services, the database
+    connection and the message cache open for the whole run. The sync
+    position is stored in the database (or in the backup directory when no
+    database is given), so a restarted watch continues where it stopped.
+
+    Args:
+        credentials_path: Path to credentials.json
+        output_dir: Backup directory for new messages
+        db_path: SQLite email database to keep current
+        output_format: Backup format ('eml', 'markdown', 'both')
+        classify: Classify new emails in the database
+        config: Polling and sync settings
+        max_polls: Stop after this many polls (None to run until Ctrl+C)
+
+    Returns:
+        Dict with watch statistics
+
+    Raises:
+        AuthError: If authentication fails
+    """
+    if output_dir is None and db_path is None:
+        raise click.UsageError("Give --output-dir and/or --db to watch into")
+
+    message_cache = MessageCache()
+    fetcher = GmailFetcher(str(credentials_path), message_cache=message_cache)
+    if not fetcher.authenticate():
+        raise AuthError("Gmail authentication failed")
+    click.echo("Authenticated successfully")
+
+    pool = GmailServicePool(fetcher.auth.credential_manager)
+    handlers: list[WatchHandler] = []
+    try:
+        if db_path is not None:
+            from gmail_assistant.core.processing.classifier import EmailClassifier
+            from gmail_assistant.core.processing.database import EmailDatabaseImporter
+
+            importer = EmailDatabaseImporter(str(db_path))
+            importer.connect_database()
+            handlers.append(DatabaseWatchHandler(
+                importer, EmailClassifier(str(db_path)) if classify else None
+            ))
+            state_conn = importer.conn
+        else:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            state_conn = sqlite3.connect(output_dir / 'watch_state.db')
+
+        if output_dir is not None:
+            handlers.append(BackupWatchHandler(
+                fetcher, output_dir, format_type=output_format,
+                index=MessageIndex.for_output_dir(output_dir)
+            ))
+
+        watcher = MailboxWatcher(
+            HistorySyncClient(fetcher.service, message_cache=message_cache),
+            SyncStateManager(state_conn),
+            handlers=handlers,
+            config=config,
+            service_factory=pool.get_service
+        )
+        click.echo("Watching for changes (Ctrl+C to stop)")
+        try:
+            stats = watcher.run(max_polls=max_polls)
+        except KeyboardInterrupt:
+            # run() has already closed the handlers
+            stats = watcher.stats
+
+        if db_path is None:
+            state_conn.close()
+        result = stats.to_dict()
+        result['cache'] = message_cache.get_stats()
+        return result
+    finally:
+        pool.close()
+        message_cache.close()
+
+
+__all__ = ['watch_mailbox']
@@ -27,9 +27,11 @@ from gmail_assistant import __version__
 from gmail_assistant.cli.commands.analyze import analyze_emails
 from gmail_assistant.cli.commands.auth import authenticate, check_auth_status, revoke_auth
 from gmail_assistant.cli.commands.delete import delete_emails, get_email_count
+from gmail_assistant.cli.commands.export import export_parquet
 
 # C-2: Import command implementations
 from gmail_assistant.cli.commands.fetch import fetch_emails
+from gmail_assistant.cli.commands.watch import watch_mailbox
 from gmail_assistant.core.config import AppConfig
 from gmail_assistant.core.exceptions import (
     AuthError,
@@ -37,6 +39,9 @@ from gmail_assistant.core.exceptions import (
     GmailAssistantError,
     NetworkError,
 )
+from gmail_assistant.core.fetch.message_cache import MessageCache
+from gmail_assistant.core.fetch.message_index import MessageIndex
+from gmail_assistant.core.fetch.watch import WatchConfig
 
 F = TypeVar("F", bound=Callable[..., None])
 
@@ -47,13 +52,17 @@ def _fetch_async(
     output_dir: Path,
     output_format: str,
     credentials_path: Path,
-    concurrency: int
+    concurrency: int,
+    skip_existing: bool = True,
+    use_cache: bool = True
 ) -> dict[str, Any]:
     """
     Async fetch implementation (M-5).
 
     Uses AsyncGmailFetcher for concurrent email fetching.
     Falls back to sync if async dependencies unavailable.
+    Messages already in the output directory's MessageIndex are not fetched;
+    others fetched before are served from the message cache.
     """
     try:
         from gmail_assistant.core.fetch.async_fetcher import AsyncGmailFetcher
@@ -66,41 +75,61 @@ def _fetch_async(
             output_dir=output_dir,
             output_format=output_format,
             credentials_path=credentials_path,
-            resume=False
+            resume=False,
+            skip_existing=skip_existing,
+            use_cache=use_cache
         )
 
     async def _run_async():
         async with AsyncGmailFetcher(
             str(credentials_path),
-            max_concurrent=concurrency
+            max_concurrent=concurrency,
+            max_workers=concurrency,
+            message_cache=message_cache
         ) as fetcher:
-            # Fetch email IDs
             click.echo(f"Using async mode with concurrency={concurrency}")
-            email_ids = await fetcher.fetch_email_ids_async(query, max_emails)
-
-            if not email_ids:
-                return {'fetched': 0, 'total': 0}
-
-            click.echo(f"Found {len(email_ids)} emails, fetching...")
             output_dir.mkdir(parents=True, exist_ok=True)
 
-            # Fetch emails concurrently
-            emails = await fetcher.fetch_emails_async(email_ids)
-
-            # Save emails
+            # IDs are paged while earlier messages download; each message is
+            # written as soon as it arrives
+            index = MessageIndex.for_output_dir(output_dir) if skip_existing else None
             fetched = 0
-            for i, email_data in enumerate(emails):
-                if email_data:
-                    _save_email_async(email_data, output_dir, output_format, i)
+            try:
+                async for email_data in fetcher.stream_emails_async(
+                    query, max_emails, id_filter=index.filter_new if index is not None else None
+                ):
+                    path, content = _save_email_async(
+                        email_data, output_dir, output_format, fetched
+                    )
+                    if index is not None and email_data.get('id'):
+                        index.record(email_data['id'], path, content)
                     fetched += 1
+            finally:
+                if index is not None:
+                    index.close()
+
+            stats = fetcher.last_stream_stats
+            result = {'fetched': fetched, 'skipped': stats['skipped'],
+                      'total': stats['listed']}
+            if message_cache is not None:
+                result['cache'] = message_cache.get_stats()
+            return result
+
+    message_cache = MessageCache() if use_cache else None
+    try:
+        return asyncio.run(_run_async())
+    finally:
+        if message_cache is not None:
+            message_cache.close()
 
-            return {'fetched': fetched, 'total': len(email_ids)}
-
-    return asyncio.run(_run_async())
 
+def _save_email_async(email_data: dict[str, Any], output_dir: Path, output_format: str,
+                      index: int) -> tuple[Path, str]:
+    """Save email from async fetch.
 
-def _save_email_async(email_data: dict[str, Any], output_dir: Path, output_format: str, index: int) -> None:
-    """Save email from async fetch."""
+    Returns:
+        Tuple of (file written, content written)
+    """
     import json
     import re
 
@@ -111,21 +140,27 @@ def _save_email_async(email_data: dict[str, Any], output_dir: Path, output_forma
     if output_format == 'json':
         filename = f"{index:05d}_{safe_subject}_{msg_id}.json"
         filepath = output_dir / filename
+        content = json.dumps(email_data, indent=2, default=str)
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(email_data, f, indent=2, default=str)
+            f.write(content)
+        return filepath, content
     elif output_format == 'eml':
         filename = f"{index:05d}_{safe_subject}_{msg_id}.eml"
         filepath = output_dir / filename
-        raw_content = email_data.get('raw_content', email_data.get('raw', ''))
+        raw_content = str(email_data.get('raw_content', email_data.get('raw', '')))
         with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(str(raw_content))
+            f.write(raw_content)
+        return filepath, raw_content
     elif output_format == 'mbox':
         mbox_path = output_dir / "emails.mbox"
-        raw_content = email_data.get('raw_content', email_data.get('raw', ''))
+        raw_content = str(email_data.get('raw_content', email_data.get('raw', '')))
         with open(mbox_path, 'a', encoding='utf-8') as f:
             f.write(f"From {email_data.get('sender', 'unknown')}\n")
-            f.write(str(raw_content))
+            f.write(raw_content)
             f.write("\n\n")
+        return mbox_path, raw_content
+
+    raise ValueError(f"Unsupported output format: {output_format}")
 
 
 def handle_errors(func: F) -> F:
@@ -180,8 +215,11 @@ def main(ctx: click.Context, config: Path | None, allow_repo_credentials: bool)
 @click.option("--output-dir", "-o", type=click.Path(path_type=Path), help="Output directory.")
 @click.option("--format", "output_format", type=click.Choice(["json", "mbox", "eml"]), default="json")
 @click.option("--resume", is_flag=True, help="Resume from last checkpoint.")
+@click.option("--redownload", is_flag=True,
+              help="Ignore the download index and fetch already downloaded emails again.")
 @click.option("--async", "use_async", is_flag=True, help="Use async fetcher for better performance (M-5).")
 @click.option("--concurrency", type=int, default=10, help="Max concurrent operations for async mode.")
+@click.option("--no-cache", is_flag=True, help="Always request messages from Gmail, bypassing the message cache.")
 @click.pass_context
 @handle_errors
 def fetch(
@@ -191,8 +229,10 @@ def fetch(
     output_dir: Path | None,
     output_format: str,
     resume: bool,
+    redownload: bool,
     use_async: bool,
     concurrency: int,
+    no_cache: bool,
 ) -> None:
     """Fetch emails from Gmail."""
     cfg = AppConfig.load(
@@ -217,7 +257,9 @@ def fetch(
             output_dir=Path(effective_output),
             output_format=output_format,
             credentials_path=cfg.credentials_path,
-            concurrency=concurrency
+            concurrency=concurrency,
+            skip_existing=not redownload,
+            use_cache=not no_cache
         )
     else:
         # C-2: Call sync fetch implementation
@@ -227,9 +269,15 @@ def fetch(
             output_dir=Path(effective_output),
             output_format=output_format,
             credentials_path=cfg.credentials_path,
-            resume=resume
+            resume=resume,
+            skip_existing=not redownload,
+            use_cache=not no_cache
         )
     click.echo(f"\nFetched {result['fetched']}/{result['total']} emails")
+    if result.get('cache'):
+        cache_stats = result['cache']
+        click.echo(f"Message cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                   f"({cache_stats['hit_rate']:.0%} hit rate)")
 
 
 @main.command()
@@ -312,6 +360,86 @@ def analyze(
     )
 
 
+@main.command()
+@click.option("--db", "db_path", required=True, type=click.Path(exists=True, path_type=Path),
+              help="SQLite email database to export.")
+@click.option("--output-dir", "-o", required=True, type=click.Path(path_type=Path),
+              help="Output directory for Parquet files.")
+@click.option("--compression", type=click.Choice(["snappy", "gzip", "zstd", "none"]), default="snappy")
+@click.option("--jobs", "-j", type=click.IntRange(min=1), default=1,
+              help="Worker processes exporting partitions in parallel.")
+@click.option("--incremental", is_flag=True,
+              help="Only rewrite partitions changed since the last export.")
+@handle_errors
+def export(
+    db_path: Path,
+    output_dir: Path,
+    compression: str,
+    jobs: int,
+    incremental: bool,
+) -> None:
+    """Export the email database to Parquet."""
+    click.echo(f"Exporting {db_path} to {output_dir} (jobs: {jobs})")
+
+    export_parquet(
+        db_path=db_path,
+        output_dir=output_dir,
+        compression=compression,
+        jobs=jobs,
+        incremental=incremental
+    )
+
+
+@main.command()
+@click.option("--output-dir", "-o", type=click.Path(path_type=Path),
+              help="Backup directory for new emails (default: config output_dir).")
+@click.option("--db", "db_path", type=click.Path(path_type=Path),
+              help="SQLite email database to keep current.")
+@click.option("--format", "output_format", type=click.Choice(["eml", "markdown", "both"]),
+              default="both")
+@click.option("--label", help="Only apply changes for this label (e.g. INBOX).")
+@click.option("--min-interval", type=click.FloatRange(min=1), default=5.0,
+              help="Seconds between polls while mail is arriving.")
+@click.option("--max-interval", type=click.FloatRange(min=1), default=300.0,
+              help="Seconds between polls when idle.")
+@click.option("--no-classify", is_flag=True, help="Do not classify new emails in the database.")
+@click.option("--no-backup", is_flag=True, help="Only update the database, write no files.")
+@click.pass_context
+@handle_errors
+def watch(
+    ctx: click.Context,
+    output_dir: Path | None,
+    db_path: Path | None,
+    output_format: str,
+    label: str | None,
+    min_interval: float,
+    max_interval: float,
+    no_classify: bool,
+    no_backup: bool,
+) -> None:
+    """Keep the backup and database current as mail arrives."""
+    cfg = AppConfig.load(
+        ctx.obj["config_path"],
+        allow_repo_credentials=ctx.obj["allow_repo_credentials"],
+    )
+    effective_output = None if no_backup else Path(output_dir or cfg.output_dir)
+
+    click.echo(f"Watch: backup {effective_output or '(none)'}, database {db_path or '(none)'}")
+    click.echo(f"Polling every {min_interval:g}-{max_interval:g}s")
+
+    stats = watch_mailbox(
+        credentials_path=cfg.credentials_path,
+        output_dir=effective_output,
+        db_path=db_path,
+        output_format=output_format,
+        classify=not no_classify,
+        config=WatchConfig(min_interval=min_interval, max_interval=max_interval,
+                           label_filter=label)
+    )
+    click.echo(f"\nStopped after {stats['polls']} polls: {stats['added']} added, "
+               f"{stats['deleted']} deleted, {stats['label_changes']} label changes")
+
+
 @main.command()
 @click.option("--status", is_flag=True, help="Check authentication status only.")
 @click.option("--revoke", is_flag=True, help="Revoke stored credentials.")
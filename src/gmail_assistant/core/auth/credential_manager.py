@@ -167,6 +167,17 @@ class SecureCredentialManager:
             return None
         return self.service
 
+    def get_credentials(self) -> Credentials | None:
+        """
+        Get the OAuth credentials backing the Gmail service.
+
+        Returns:
+            Credentials object if authenticated, None otherwise
+        """
+        if not self._credentials and not self.authenticate():
+            return None
+        return self._credentials
+
     def reset_credentials(self) -> bool:
         """
         Clear stored credentials and force re-authentication.
@@ -113,6 +113,8 @@ DEFAULT_RATE_LIMIT: float = 10.0  # requests per second
 DEFAULT_REQUESTS_PER_SECOND: float = 10.0  # alias
 CONSERVATIVE_REQUESTS_PER_SECOND: float = 8.0
 MAX_RATE_LIMIT: float = 100.0
+GMAIL_QUOTA_UNITS_PER_SECOND: float = 250.0  # per-user quota enforced by Gmail
+DEFAULT_QUOTA_COST: int = 5  # messages.get / messages.list
 BATCH_SIZE: int = 100
 MAX_EMAILS_LIMIT: int = 100000
 MAX_EMAILS_DEFAULT: int = 1000
@@ -341,20 +341,15 @@ def create_default_container() -> ServiceContainer:
     from ..utils.cache_manager import CacheManager
     from ..utils.error_handler import ErrorHandler
     from ..utils.input_validator import InputValidator
-    from ..utils.rate_limiter import GmailRateLimiter
-    from .constants import (
-        CONSERVATIVE_REQUESTS_PER_SECOND,
-    )
+    from ..utils.rate_limiter import GmailRateLimiter, get_gmail_rate_limiter
     from .processing.database import EmailDatabaseImporter
 
     container = ServiceContainer()
 
     # Register core utilities
     container.register(CacheManager, CacheManager())
-    container.register_factory(
-        GmailRateLimiter,
-        lambda: GmailRateLimiter(requests_per_second=CONSERVATIVE_REQUESTS_PER_SECOND)
-    )
+    # Gmail quota is per user, so every consumer shares one token bucket
+    container.register_factory(GmailRateLimiter, get_gmail_rate_limiter)
     container.register_type(InputValidator, InputValidator, ServiceLifetime.TRANSIENT)
     container.register(ErrorHandler, ErrorHandler())
 
@@ -0,0 +1,497 @@
+"""
+Native asyncio transport for the Gmail REST API.
+
+googleapiclient is blocking, so AsyncGmailFetcher used to run every call in
+a thread pool: concurrency was capped by the number of threads and each
+request paid a thread hand-off on top of httplib2. This transport talks to
+the Gmail REST endpoints directly over one aiohttp ``ClientSession``, whose
+connector pools keep-alive connections, so a single event loop can keep
+hundreds of requests in flight.
+
+The OAuth access token comes from the same credentials as the rest of the
+package (``SecureCredentialManager``). Expired tokens are refreshed once on
+behalf of every coroutine, a 401 forces one refresh and retry, and 429, 5xx
+and quota 403 responses are retried with exponential backoff honouring
+Retry-After.
+
+Usage:
+    async with AsyncGmailTransport(credential_manager) as transport:
+        page = await transport.list_messages('is:unread', max_results=500)
+        message = await transport.get_message(page['messages'][0]['id'])
+"""
+
+import asyncio
+import json
+import logging
+import random
+import uuid
+from typing import Any, ClassVar
+
+try:
+    import aiohttp
+    from google.auth.transport.requests import Request
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+from gmail_assistant.core.exceptions import APIError, AuthError, NetworkError, RateLimitError
+from gmail_assistant.utils.rate_limiter import GmailRateLimiter
+
+logger = logging.getLogger(__name__)
+
+GMAIL_API_ROOT = 'https://gmail.googleapis.com'
+API_PATH = '/gmail/v1/users/me'
+BATCH_PATH = '/batch/gmail/v1'
+
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+_RATE_LIMIT_PHRASES = ('quota exceeded', 'rate limit', 'too many requests')
+
+
+def _error_message(body: bytes) -> str:
+    """Extract the error message from a Gmail JSON error body."""
+    try:
+        return json.loads(body)['error']['message']
+    except (ValueError, KeyError, TypeError):
+        return body.decode('utf-8', errors='replace')[:200]
+
+
+def _is_rate_limited(status: int, message: str) -> bool:
+    """Check whether a response asks us to slow down (429 or quota 403)."""
+    if status == 429:
+        return True
+    return status == 403 and any(p in message.lower() for p in _RATE_LIMIT_PHRASES)
+
+
+def _retry_after(headers: Any) -> float | None:
+    """Server-requested delay from a Retry-After header, if any."""
+    try:
+        value = headers.get('Retry-After')
+        return float(value) if value else None
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _http_error(status: int, message: str, retry_after: float | None = None) -> APIError:
+    """Map a failed response onto the package's exception hierarchy."""
+    text = f"Gmail API error {status}: {message}"
+    if _is_rate_limited(status, message):
+        return RateLimitError(text, retry_after=int(retry_after) if retry_after else None)
+    if status == 401:
+        return AuthError(text)
+    return APIError(text)
+
+
+def _encode_batch(boundary: str, paths: list[str]) -> bytes:
+    """Encode GET sub-requests as a multipart/mixed batch body."""
+    parts = []
+    for i, path in enumerate(paths):
+        parts.append(
+            f"--{boundary}\r\n"
+            "Content-Type: application/http\r\n"
+            f"Content-ID: <item{i}>\r\n"
+            "\r\n"
+            f"GET {path}\r\n"
+            "\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n")
+    return ''.join(parts).encode('utf-8')
+
+
+def _decode_batch(content_type: str, body: bytes) -> dict[int, tuple[int, Any, Any]]:
+    """
+    Decode a multipart/mixed batch response.
+
+    Returns:
+        Mapping of sub-request index to (status, headers, body bytes)
+    """
+    boundary = None
+    for param in content_type.split(';')[1:]:
+        key, _, value = param.strip().partition('=')
+        if key.lower() == 'boundary':
+            boundary = value.strip('"')
+    if not boundary:
+        raise APIError(f"Batch response is not multipart: {content_type}")
+
+    results = {}
+    for part in body.split(b'--' + boundary.encode()):
+        part = part.strip(b'\r\n')
+        if not part or part == b'--':
+            continue
+        outer, _, inner = part.partition(b'\r\n\r\n')
+        index = None
+        for line in outer.split(b'\r\n'):
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.strip().lower() == 'content-id':
+                # <response-item12> -> 12
+                index = int(value.strip().strip('<>').rsplit('item', 1)[-1])
+        if index is None:
+            continue
+
+        head, _, payload = inner.partition(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        status = int(lines[0].split()[1])
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().title()] = value.strip()
+        results[index] = (status, headers, payload)
+    return results
+
+
+class AsyncGmailTransport:
+    """
+    Gmail REST client on a pooled aiohttp session.
+
+    Features:
+    - One ClientSession with keep-alive connection pooling
+    - Single-flight token refresh shared by all coroutines
+    - Retries with backoff for 429, 5xx and quota errors
+    - Shared quota token bucket via GmailRateLimiter
+    - Multipart batch gets with per-item retry
+    """
+
+    QUOTA_COSTS: ClassVar[dict[str, int]] = {
+        'list': 5,
+        'get': 5,
+        'history': 2,
+        'profile': 1,
+    }
+
+    def __init__(
+        self,
+        credential_manager: Any,
+        rate_limiter: GmailRateLimiter | None = None,
+        base_url: str = GMAIL_API_ROOT,
+        max_connections: int = 100,
+        timeout: float = 60.0,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0
+    ):
+        """
+        Initialize transport.
+
+        Args:
+            credential_manager: SecureCredentialManager providing credentials
+            rate_limiter: Optional quota limiter awaited before each request
+            base_url: API root; overridden by tests to point at a local server
+            max_connections: Connection pool size (bounds requests in flight)
+            timeout: Total timeout per request in seconds
+            max_retries: Retries per request after its first failure
+            base_delay: First retry delay in seconds; doubles per attempt
+            max_delay: Maximum retry delay in seconds
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError(
+                "aiohttp required for the async transport. "
+                "Install with: pip install gmail-assistant[async]"
+            )
+
+        self.credential_manager = credential_manager
+        self.rate_limiter = rate_limiter
+        self.base_url = base_url.rstrip('/')
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._session: aiohttp.ClientSession | None = None
+        self._credentials: Any = None
+        self._refresh_lock = asyncio.Lock()
+        self._stats = {
+            'requests': 0,
+            'batch_requests': 0,
+            'retries': 0,
+            'throttled': 0,
+            'token_refreshes': 0,
+            'errors': 0,
+        }
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
+
+    def _get_session(self) -> 'aiohttp.ClientSession':
+        """Create the pooled session on first use (inside the running loop)."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections,
+                keepalive_timeout=30
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'Accept-Encoding': 'gzip'}
+            )
+        return self._session
+
+    async def _get_token(self) -> str:
+        """Get a valid access token, refreshing it if it has expired."""
+        if self._credentials is None:
+            self._credentials = await asyncio.to_thread(self.credential_manager.get_credentials)
+            if self._credentials is None:
+                raise AuthError("Gmail credentials not available")
+        if not self._credentials.valid:
+            await self._refresh_token(self._credentials.token)
+        return self._credentials.token
+
+    async def _refresh_token(self, stale_token: str | None) -> None:
+        """
+        Refresh the access token once on behalf of every waiting coroutine.
+
+        Args:
+            stale_token: Token that was rejected or found expired; if another
+                coroutine already replaced it, no refresh is made
+        """
+        async with self._refresh_lock:
+            credentials = self._credentials
+            if credentials.token != stale_token and credentials.valid:
+                return
+            try:
+                await asyncio.to_thread(credentials.refresh, Request())
+            except Exception as e:
+                raise AuthError(f"Failed to refresh Gmail credentials: {e}") from e
+            self._stats['token_refreshes'] += 1
+            logger.info("Refreshed Gmail credentials for async transport")
+
+    def _backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """Exponential backoff with jitter, honouring Retry-After."""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        delay += random.uniform(0, delay * 0.1)
+        return max(delay, retry_after) if retry_after else delay
+
+    def _on_throttled(self, retry_after: float | None) -> None:
+        """Back off the shared token bucket after a rate-limit response."""
+        self._stats['throttled'] += 1
+        bucket = getattr(self.rate_limiter, 'bucket', None)
+        if bucket is not None:
+            bucket.on_rate_limited(retry_after)
+
+    async def _send(self, method: str, path: str, quota_cost: int,
+                    **kwargs) -> tuple[int, Any, bytes]:
+        """
+        Send one request, retrying transient failures.
+
+        Returns:
+            Tuple of (status, headers, body) of the final response
+        """
+        attempt = 0
+        refreshed = False
+        url = self.base_url + path
+        extra_headers = kwargs.pop('headers', {})
+
+        while True:
+            if self.rate_limiter:
+                await self.rate_limiter.wait_if_needed_async(quota_cost)
+            token = await self._get_token()
+            headers = {**extra_headers, 'Authorization': f"Bearer {token}"}
+
+            self._stats['requests'] += 1
+            try:
+                async with self._get_session().request(
+                    method, url, headers=headers, **kwargs
+                ) as response:
+                    status = response.status
+                    response_headers = response.headers
+                    body = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt >= self.max_retries:
+                    self._stats['errors'] += 1
+                    raise NetworkError(f"Gmail request failed: {e}") from e
+                attempt += 1
+                self._stats['retries'] += 1
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            if status == 401 and not refreshed:
+                refreshed = True
+                await self._refresh_token(token)
+                continue
+
+            if status < 400:
+                return status, response_headers, body
+
+            message = _error_message(body)
+            retry_after = _retry_after(response_headers)
+            rate_limited = _is_rate_limited(status, message)
+            if rate_limited:
+                self._on_throttled(retry_after)
+            if (status in RETRYABLE_STATUS or rate_limited) and attempt < self.max_retries:
+                attempt += 1
+                self._stats['retries'] += 1
+                await asyncio.sleep(self._backoff(attempt, retry_after))
+                continue
+
+            self._stats['errors'] += 1
+            raise _http_error(status, message, retry_after)
+
+    async def request(self, method: str, path: str, params: list[tuple[str, Any]] | None = None,
+                      quota_cost: int = 5) -> dict[str, Any]:
+        """
+        Call a Gmail endpoint and decode its JSON response.
+
+        Args:
+            method: HTTP method
+            path: Path below ``users/me``, e.g. ``/messages``
+            params: Query parameters (repeated keys allowed)
+            quota_cost: Quota units the call consumes
+
+        Returns:
+            Decoded JSON response (empty dict for empty bodies)
+
+        Raises:
+            AuthError: If credentials are missing or rejected
+            RateLimitError: If still rate limited after retries
+            NetworkError: If the connection keeps failing
+            APIError: For any other error response
+        """
+        params = [(k, v) for k, v in (params or []) if v is not None]
+        _, _, body = await self._send(method, API_PATH + path, quota_cost, params=params)
+        return json.loads(body) if body else {}
+
+    async def list_messages(self, query: str | None = None, page_token: str | None = None,
+                            max_results: int = 500, fields: str | None = None,
+                            label_ids: list[str] | None = None) -> dict[str, Any]:
+        """
+        List one page of message IDs (``messages.list``).
+
+        Returns:
+            Response with ``messages`` and ``nextPageToken``
+        """
+        params = [('q', query), ('pageToken', page_token), ('maxResults', max_results),
+                  ('fields', fields)]
+        params.extend(('labelIds', label) for label in label_ids or [])
+        return await self.request('GET', '/messages', params, self.QUOTA_COSTS['list'])
+
+    async def get_message(self, message_id: str, format: str = 'full',
+                          metadata_headers: list[str] | None = None) -> dict[str, Any]:
+        """
+        Get one message (``messages.get``).
+
+        Returns:
+            Message resource
+        """
+        params = [('format', format)]
+        params.extend(('metadataHeaders', header) for header in metadata_headers or [])
+        return await self.request('GET', f"/messages/{message_id}", params,
+                                  self.QUOTA_COSTS['get'])
+
+    async def list_history(self, start_history_id: int | str, page_token: str | None = None,
+                           history_types: list[str] | None = None, label_id: str | None = None,
+                           max_results: int = 500) -> dict[str, Any]:
+        """
+        List one page of mailbox changes (``history.list``).
+
+        Returns:
+            Response with ``history``, ``historyId`` and ``nextPageToken``
+        """
+        params = [('startHistoryId', str(start_history_id)), ('pageToken', page_token),
+                  ('labelId', label_id), ('maxResults', max_results)]
+        params.extend(('historyTypes', t) for t in history_types or [])
+        return await self.request('GET', '/history', params, self.QUOTA_COSTS['history'])
+
+    async def get_profile(self) -> dict[str, Any]:
+        """Get the mailbox profile (``users.getProfile``)."""
+        return await self.request('GET', '/profile', quota_cost=self.QUOTA_COSTS['profile'])
+
+    async def batch_get_messages(
+        self,
+        message_ids: list[str],
+        format: str = 'full',
+        metadata_headers: list[str] | None = None
+    ) -> tuple[dict[str, dict[str, Any]], dict[str, Exception]]:
+        """
+        Get up to 100 messages in one multipart batch request.
+
+        Sub-requests that are rate limited or fail with a server error are
+        re-sent in a follow-up batch after backoff.
+
+        Args:
+            message_ids: Message IDs (at most 100)
+            format: Message format
+            metadata_headers: Headers to include when format='metadata'
+
+        Returns:
+            Tuple of (messages by ID, errors by ID for permanent failures)
+        """
+        if len(message_ids) > 100:
+            raise ValueError("A Gmail batch request holds at most 100 sub-requests")
+
+        query = f"format={format}" + ''.join(
+            f"&metadataHeaders={header}" for header in metadata_headers or []
+        )
+        messages: dict[str, dict[str, Any]] = {}
+        errors: dict[str, Exception] = {}
+        pending = list(message_ids)
+        attempt = 0
+
+        while pending:
+            boundary = f"batch_{uuid.uuid4().hex}"
+            body = _encode_batch(
+                boundary, [f"{API_PATH}/messages/{msg_id}?{query}" for msg_id in pending]
+            )
+            self._stats['batch_requests'] += 1
+            _, headers, response = await self._send(
+                'POST', BATCH_PATH, len(pending) * self.QUOTA_COSTS['get'],
+                data=body,
+                headers={'Content-Type': f"multipart/mixed; boundary={boundary}"}
+            )
+            parts = _decode_batch(headers.get('Content-Type', ''), response)
+
+            retry, retry_after, throttled = [], None, False
+            for i, msg_id in enumerate(pending):
+                if i not in parts:
+                    errors[msg_id] = APIError(f"No response for message {msg_id}")
+                    continue
+                status, part_headers, payload = parts[i]
+                if status < 400:
+                    messages[msg_id] = json.loads(payload)
+                    continue
+                message = _error_message(payload)
+                if status in RETRYABLE_STATUS or _is_rate_limited(status, message):
+                    retry.append(msg_id)
+                    if _is_rate_limited(status, message):
+                        throttled = True
+                        retry_after = _retry_after(part_headers) or retry_after
+                    if attempt >= self.max_retries:
+                        errors[msg_id] = _http_error(status, message)
+                else:
+                    errors[msg_id] = _http_error(status, message)
+
+            if not retry or attempt >= self.max_retries:
+                break
+            if throttled:
+                self._on_throttled(retry_after)
+            attempt += 1
+            self._stats['retries'] += len(retry)
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+            pending = retry
+
+        self._stats['errors'] += len(errors)
+        return messages, errors
+
+    async def close(self) -> None:
+        """Close the session and its pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get transport statistics.
+
+        Returns:
+            Dictionary with request, retry, throttle and refresh counters
+        """
+        stats = dict(self._stats)
+        stats['max_connections'] = self.max_connections
+        return stats
+
+
+__all__ = ['AIOHTTP_AVAILABLE', 'AsyncGmailTransport']
@@ -1,20 +1,30 @@
 """
 Asynchronous Gmail fetcher for concurrent operations.
 Implements async/await patterns for improved performance.
+
+When aiohttp is installed, API calls go through AsyncGmailTransport on the
+event loop; otherwise blocking googleapiclient calls run in a thread pool.
 """
 
 import asyncio
 import functools
 import logging
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Callable
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 # Local imports
 from gmail_assistant.core.auth.credential_manager import SecureCredentialManager
 from gmail_assistant.utils.memory_manager import MemoryTracker
-from gmail_assistant.utils.rate_limiter import GmailRateLimiter
+from gmail_assistant.utils.rate_limiter import GmailRateLimiter, get_gmail_rate_limiter
+
+from .aio_transport import AIOHTTP_AVAILABLE, AsyncGmailTransport
+from .id_enumeration import LIST_FIELDS, PAGE_SIZE, ShardedIdEnumerator, needs_sharding
+from .service_pool import GmailServicePool
+
+if TYPE_CHECKING:
+    from .message_cache import MessageCache
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +32,13 @@ logger = logging.getLogger(__name__)
 class AsyncGmailFetcher:
     """Asynchronous Gmail fetcher with concurrent operations."""
 
+    MEMORY_CHECK_INTERVAL = 100  # Streamed emails between memory checks
+
     def __init__(self, credentials_file: str = 'credentials.json',
-                 max_concurrent: int = 10, max_workers: int = 4):
+                 max_concurrent: int = 10, max_workers: int = 4,
+                 rate_limiter: GmailRateLimiter | None = None,
+                 message_cache: 'MessageCache | None' = None,
+                 native_transport: bool | None = None):
         """
         Initialize async Gmail fetcher.
 
@@ -31,15 +46,32 @@ class AsyncGmailFetcher:
             credentials_file: Path to OAuth credentials
             max_concurrent: Maximum concurrent operations
             max_workers: Maximum thread pool workers
+            rate_limiter: Quota limiter; defaults to the process-wide shared bucket
+            message_cache: Optional cache consulted before messages.get
+            native_transport: Call the REST API over aiohttp instead of
+                googleapiclient in threads; defaults to whether aiohttp is
+                installed
         """
         self.credential_manager = SecureCredentialManager(credentials_file)
-        self.rate_limiter = GmailRateLimiter(requests_per_second=8.0)
+        # Per-thread services: googleapiclient/httplib2 objects are not thread-safe
+        self.service_pool = GmailServicePool(self.credential_manager)
+        self.rate_limiter = rate_limiter or get_gmail_rate_limiter()
         self.memory_tracker = MemoryTracker()
         self.max_concurrent = max_concurrent
         self.max_workers = max_workers
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
         self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.message_cache = message_cache
         self.logger = logging.getLogger(__name__)
+        self.last_stream_stats: dict[str, int] = {}
+
+        if native_transport is None:
+            native_transport = AIOHTTP_AVAILABLE
+        self.transport = AsyncGmailTransport(
+            self.credential_manager,
+            rate_limiter=self.rate_limiter,
+            max_connections=max_concurrent
+        ) if native_transport else None
 
     @property
     def service(self):
@@ -52,7 +84,10 @@ class AsyncGmailFetcher:
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
+        if self.transport is not None:
+            await self.transport.close()
         self.executor.shutdown(wait=True)
+        self.service_pool.close()
 
     def _sync_api_call(self, func, *args, **kwargs):
         """
@@ -68,6 +103,52 @@ class AsyncGmailFetcher:
         """
         return self.rate_limiter.rate_limited_call(func, *args, **kwargs)
 
+    def _sync_service_call(self, func, *args, **kwargs):
+        """
+        Execute API call with the calling worker thread's pooled service.
+
+        Args:
+            func: Function taking the Gmail service as first argument
+            args: Additional positional arguments
+            kwargs: Keyword arguments
+
+        Returns:
+            Function result
+        """
+        service = self.service_pool.get_service()
+        if service is None:
+            raise RuntimeError("Gmail service not available")
+        return self._sync_api_call(func, service, *args, **kwargs)
+
+    async def _async_service_call(self, func, *args, **kwargs):
+        """
+        Execute API call asynchronously on a pooled per-thread service.
+
+        Args:
+            func: Function taking the Gmail service as first argument
+            args: Additional positional arguments
+            kwargs: Keyword arguments
+
+        Returns:
+            Function result
+        """
+        return await self._async_api_call(self._sync_service_call, func, *args, **kwargs)
+
+    async def _native_call(self, coro_func, *args, **kwargs):
+        """
+        Await a transport call under the concurrency semaphore.
+
+        Args:
+            coro_func: AsyncGmailTransport coroutine method
+            args: Positional arguments
+            kwargs: Keyword arguments
+
+        Returns:
+            Decoded API response
+        """
+        async with self.semaphore:
+            return await coro_func(*args, **kwargs)
+
     async def _async_api_call(self, func, *args, **kwargs):
         """
         Execute API call asynchronously with semaphore control.
@@ -99,51 +180,97 @@ class AsyncGmailFetcher:
         Returns:
             List of email IDs
         """
-        service = self.service
-        if not service:
+        email_ids = []
+        async for page in self.iter_email_id_pages_async(query, max_results):
+            email_ids.extend(page)
+
+        self.logger.info(f"Fetched {len(email_ids)} email IDs asynchronously")
+        return email_ids
+
+    async def _list_page_async(self, query: str, page_token: str | None,
+                               page_size: int) -> dict[str, Any]:
+        """Fetch one ``messages.list`` page of IDs."""
+        if self.transport is not None:
+            return await self._native_call(
+                self.transport.list_messages, query, page_token=page_token,
+                max_results=page_size, fields=LIST_FIELDS
+            )
+
+        def list_messages(service):
+            params = {
+                'userId': 'me',
+                'q': query,
+                'maxResults': page_size,
+                'fields': LIST_FIELDS
+            }
+            if page_token:
+                params['pageToken'] = page_token
+
+            return service.users().messages().list(**params).execute()
+
+        return await self._async_service_call(list_messages)
+
+    async def iter_email_id_pages_async(self, query: str,
+                                        max_results: int = 1000) -> AsyncIterator[list[str]]:
+        """
+        Page through the IDs matching a query.
+
+        Large results are listed over up to ``max_concurrent`` date windows
+        at once (see ShardedIdEnumerator); pages still arrive newest first.
+
+        Args:
+            query: Gmail search query
+            max_results: Maximum number of emails
+
+        Yields:
+            Lists of email IDs, newest first
+        """
+        # Authenticates on first use; calls run on pooled per-thread services
+        if not self.service:
             raise RuntimeError("Gmail service not available")
 
-        email_ids = []
         next_page_token = None
         fetched_count = 0
 
         while fetched_count < max_results:
-            page_size = min(500, max_results - fetched_count)
+            page_size = min(PAGE_SIZE, max_results - fetched_count)
 
             try:
-                # Prepare API call - bind loop variables to avoid B023
-                def list_messages(ps=page_size, npt=next_page_token):
-                    params = {
-                        'userId': 'me',
-                        'q': query,
-                        'maxResults': ps,
-                        'fields': 'messages(id),nextPageToken'
-                    }
-                    if npt:
-                        params['pageToken'] = npt
-
-                    return service.users().messages().list(**params).execute()
-
-                # Execute async API call
-                result = await self._async_api_call(list_messages)
-
-                # Process results
-                messages = result.get('messages', [])
-                new_ids = [msg['id'] for msg in messages]
-                email_ids.extend(new_ids)
-                fetched_count += len(new_ids)
-
-                # Check for next page
-                next_page_token = result.get('nextPageToken')
-                if not next_page_token or fetched_count >= max_results:
-                    break
-
+                result = await self._list_page_async(query, next_page_token, page_size)
             except Exception as e:
                 self.logger.error(f"Error fetching email IDs: {e}")
                 break
 
-        self.logger.info(f"Fetched {len(email_ids)} email IDs asynchronously")
-        return email_ids
+            if (next_page_token is None and result.get('nextPageToken')
+                    and needs_sharding(max_results)):
+                enumerator = ShardedIdEnumerator(self._list_page_async,
+                                                 workers=self.max_concurrent)
+                pages = enumerator.iter_pages_async(query, max_results, first_page=result)
+                try:
+                    while True:
+                        try:
+                            new_ids = await anext(pages)
+                        except StopAsyncIteration:
+                            break
+                        except Exception as e:
+                            self.logger.error(f"Error fetching email IDs: {e}")
+                            break
+                        yield new_ids
+                finally:
+                    await pages.aclose()
+                return
+
+            # Process results
+            messages = result.get('messages', [])
+            new_ids = [msg['id'] for msg in messages]
+            fetched_count += len(new_ids)
+            if new_ids:
+                yield new_ids
+
+            # Check for next page
+            next_page_token = result.get('nextPageToken')
+            if not next_page_token or fetched_count >= max_results:
+                break
 
     async def fetch_email_async(self, email_id: str) -> dict[str, Any] | None:
         """
@@ -155,19 +282,25 @@ class AsyncGmailFetcher:
         Returns:
             Email data or None if failed
         """
-        service = self.service
-        if not service:
-            return None
-
         try:
-            def get_message():
-                return service.users().messages().get(
-                    userId='me',
-                    id=email_id,
-                    format='full'
-                ).execute()
+            message = self.message_cache.get(email_id) if self.message_cache else None
+            if message is None and not self.service:
+                return None
+
+            if message is None:
+                if self.transport is not None:
+                    message = await self._native_call(self.transport.get_message, email_id)
+                else:
+                    def get_message(service):
+                        return service.users().messages().get(
+                            userId='me',
+                            id=email_id,
+                            format='full'
+                        ).execute()
 
-            message = await self._async_api_call(get_message)
+                    message = await self._async_service_call(get_message)
+                if self.message_cache:
+                    self.message_cache.put(message)
 
             # Extract essential data
             email_data = {
@@ -194,36 +327,146 @@ class AsyncGmailFetcher:
             email_ids: List of email IDs to fetch
 
         Returns:
-            List of email data (None for failed fetches)
+            List of email data in input order (None for failed fetches)
         """
         self.logger.info(f"Fetching {len(email_ids)} emails concurrently")
 
-        # Create tasks for concurrent execution
-        tasks = [self.fetch_email_async(email_id) for email_id in email_ids]
+        results: dict[str, dict[str, Any] | None] = {}
+        async for email_id, email_data in self._fetch_stream(self._id_pages(email_ids)):
+            results[email_id] = email_data
 
-        # Execute with progress tracking
-        results = []
-        batch_size = min(self.max_concurrent, len(tasks))
+        self.logger.info(f"Completed fetching {len(results)} emails")
+        return [results.get(email_id) for email_id in email_ids]
+
+    async def stream_emails_async(
+        self,
+        query: str | None = None,
+        max_results: int = 1000,
+        email_ids: list[str] | None = None,
+        id_filter: Callable[[list[str]], list[str]] | None = None,
+        workers: int | None = None
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Stream emails as they are fetched.
 
-        for i in range(0, len(tasks), batch_size):
-            batch_tasks = tasks[i:i + batch_size]
-            batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
+        IDs are paged from the query (or taken from ``email_ids``) while
+        earlier pages are still being fetched. A fixed set of workers pulls
+        IDs from a bounded queue, so a slow message only occupies its own
+        worker and at most a few pages of IDs and results are held in
+        memory. Emails are yielded in completion order; failed fetches are
+        logged and counted in ``last_stream_stats``.
 
-            # Process batch results
-            for result in batch_results:
-                if isinstance(result, Exception):
-                    self.logger.error(f"Batch fetch error: {result}")
-                    results.append(None)
-                else:
-                    results.append(result)
+        Args:
+            query: Gmail search query (ignored when email_ids is given)
+            max_results: Maximum number of IDs to list
+            email_ids: Explicit IDs to fetch instead of running a query
+            id_filter: Applied to each page of IDs; returns the IDs to fetch
+                (e.g. MessageIndex.filter_new to skip downloaded messages)
+            workers: Concurrent fetch workers (defaults to max_concurrent)
 
-            # Memory check after each batch
-            memory_status = self.memory_tracker.check_memory()
-            if memory_status['status'] == 'warning':
-                self.logger.info(f"Memory usage: {memory_status['current_mb']:.1f} MB after {len(results)} emails")
+        Yields:
+            Email data dictionaries
+        """
+        pages = (self._id_pages(email_ids) if email_ids is not None
+                 else self.iter_email_id_pages_async(query or '', max_results))
+        async for _, email_data in self._fetch_stream(pages, id_filter, workers):
+            if email_data is not None:
+                yield email_data
+
+    @staticmethod
+    async def _id_pages(email_ids: list[str], page_size: int = 500) -> AsyncIterator[list[str]]:
+        """Present a list of IDs as pages, like iter_email_id_pages_async."""
+        for i in range(0, len(email_ids), page_size):
+            yield email_ids[i:i + page_size]
+
+    async def _fetch_stream(
+        self,
+        pages: AsyncIterator[list[str]],
+        id_filter: Callable[[list[str]], list[str]] | None = None,
+        workers: int | None = None
+    ) -> AsyncIterator[tuple[str, dict[str, Any] | None]]:
+        """
+        Fetch IDs from pages with a bounded pool of workers.
 
-        self.logger.info(f"Completed fetching {len(results)} emails")
-        return results
+        Yields:
+            (email_id, email data or None) in completion order
+        """
+        workers = max(1, workers or self.max_concurrent)
+        id_queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=workers * 2)
+        out_queue: asyncio.Queue[tuple[str, dict[str, Any] | None] | None] = (
+            asyncio.Queue(maxsize=workers * 2)
+        )
+        stats = {'listed': 0, 'skipped': 0, 'fetched': 0, 'failed': 0}
+        self.last_stream_stats = stats
+
+        async def stop_workers():
+            for _ in range(workers):
+                await id_queue.put(None)
+
+        async def produce():
+            # No sentinels once cancelled: nothing may be left to drain the queue
+            try:
+                async for page in pages:
+                    stats['listed'] += len(page)
+                    wanted = id_filter(page) if id_filter else page
+                    stats['skipped'] += len(page) - len(wanted)
+                    for email_id in wanted:
+                        await id_queue.put(email_id)
+            except Exception:
+                await stop_workers()
+                raise
+            await stop_workers()
+
+        async def work():
+            # Exits with None after a sentinel, or with the error that stopped it
+            exit_item = None
+            try:
+                while (email_id := await id_queue.get()) is not None:
+                    await out_queue.put((email_id, await self.fetch_email_async(email_id)))
+            except Exception as e:
+                exit_item = e
+            finally:
+                await out_queue.put(exit_item)
+
+        producer = asyncio.create_task(produce())
+        tasks = [asyncio.create_task(work()) for _ in range(workers)]
+        try:
+            running = workers
+            worker_error = None
+            while running:
+                item = await out_queue.get()
+                if item is None or isinstance(item, Exception):
+                    running -= 1
+                    worker_error = worker_error or item
+                    continue
+                stats['fetched' if item[1] is not None else 'failed'] += 1
+                if (stats['fetched'] + stats['failed']) % self.MEMORY_CHECK_INTERVAL == 0:
+                    self._check_memory(stats['fetched'] + stats['failed'])
+                yield item
+            if worker_error is not None:
+                # The producer may be blocked on a full queue nobody drains
+                raise worker_error
+            # Every worker took a sentinel, so the producer has finished
+            # queueing; surface errors from ID paging
+            await producer
+        finally:
+            for task in (producer, *tasks):
+                task.cancel()
+            await asyncio.gather(producer, *tasks, return_exceptions=True)
+
+        self.logger.info(
+            f"Streamed {stats['fetched']} emails ({stats['failed']} failed, "
+            f"{stats['skipped']} skipped of {stats['listed']} listed)"
+        )
+
+    def _check_memory(self, processed: int) -> None:
+        """Log memory usage when it reaches the warning level."""
+        memory_status = self.memory_tracker.check_memory()
+        if memory_status['status'] == 'warning':
+            self.logger.info(
+                f"Memory usage: {memory_status['current_mb']:.1f} MB after {processed} emails"
+            )
+            self.memory_tracker.force_gc()
 
     async def process_emails_async(self, query: str, max_results: int = 1000,
                                   output_dir: str = 'gmail_backup',
@@ -243,41 +486,22 @@ class AsyncGmailFetcher:
         output_path = Path(output_dir)
         output_path.mkdir(exist_ok=True)
 
-        # Fetch email IDs
-        email_ids = await self.fetch_email_ids_async(query, max_results)
-
-        if not email_ids:
-            self.logger.info("No emails found for query")
-            return
-
-        # Process in batches to manage memory
-        batch_size = min(self.max_concurrent * 2, 100)  # Reasonable batch size
-
-        for i in range(0, len(email_ids), batch_size):
-            batch_ids = email_ids[i:i + batch_size]
-            self.logger.info(f"Processing batch {i//batch_size + 1}: emails {i+1}-{min(i+batch_size, len(email_ids))}")
-
-            # Fetch batch of emails
-            email_data_list = await self.fetch_emails_batch_async(batch_ids)
-
-            # Process each email in the batch
-            for email_data in email_data_list:
-                if email_data:
-                    result = await self._save_email_async(email_data, output_path, format_type)
-                    yield {
-                        "email_id": email_data['id'],
-                        "success": result,
-                        "format": format_type
-                    }
-                else:
-                    yield {
-                        "email_id": "unknown",
-                        "success": False,
-                        "error": "Failed to fetch email data"
-                    }
-
-            # Force garbage collection after each batch
-            self.memory_tracker.force_gc()
+        async for email_id, email_data in self._fetch_stream(
+            self.iter_email_id_pages_async(query, max_results)
+        ):
+            if email_data:
+                result = await self._save_email_async(email_data, output_path, format_type)
+                yield {
+                    "email_id": email_id,
+                    "success": result,
+                    "format": format_type
+                }
+            else:
+                yield {
+                    "email_id": email_id,
+                    "success": False,
+                    "error": "Failed to fetch email data"
+                }
 
     async def _save_email_async(self, email_data: dict[str, Any], output_path: Path,
                                format_type: str) -> bool:
@@ -340,15 +564,17 @@ class AsyncGmailFetcher:
         Returns:
             Profile data or None if failed
         """
-        service = self.service
-        if not service:
+        if not self.service:
             return None
 
         try:
-            def get_profile():
-                return service.users().getProfile(userId='me').execute()
+            if self.transport is not None:
+                profile = await self._native_call(self.transport.get_profile)
+            else:
+                def get_profile(service):
+                    return service.users().getProfile(userId='me').execute()
 
-            profile = await self._async_api_call(get_profile)
+                profile = await self._async_service_call(get_profile)
             return {
                 'email': profile.get('emailAddress'),
                 'messages_total': profile.get('messagesTotal'),
@@ -391,5 +617,8 @@ class AsyncGmailFetcher:
             'memory': memory_stats,
             'rate_limiting': rate_stats,
             'concurrent_limit': self.max_concurrent,
-            'thread_pool_workers': self.max_workers
+            'thread_pool_workers': self.max_workers,
+            'service_pool': self.service_pool.get_stats(),
+            'transport': self.transport.get_stats() if self.transport else None,
+            'message_cache': self.message_cache.get_stats() if self.message_cache else None
         }
@@ -7,10 +7,14 @@ Usage:
     emails = client.batch_get_messages(message_ids)
 """
 
+import heapq
 import logging
+import random
+import time
+from collections import deque
 from collections.abc import Callable
-from dataclasses import dataclass, field
-from typing import Any
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, ClassVar
 
 try:
     from googleapiclient.errors import HttpError
@@ -24,9 +28,17 @@ except ImportError:
 from gmail_assistant.core.exceptions import BatchAPIError  # H-2 fix: Use centralized exception
 from gmail_assistant.core.schemas import Email
 
+if TYPE_CHECKING:
+    from .message_cache import MessageCache
+
 logger = logging.getLogger(__name__)
 
 
+# Status codes worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+_RATE_LIMIT_PHRASES = ('quota exceeded', 'rate limit', 'too many requests')
+
+
 @dataclass
 class BatchResult:
     """Result of a batch operation."""
@@ -35,6 +47,72 @@ class BatchResult:
     errors: list[dict[str, Any]] = field(default_factory=list)
 
 
+@dataclass
+class BatchStats:
+    """Throughput of batched message fetches."""
+    requested: int = 0
+    fetched: int = 0
+    cached: int = 0
+    failed: int = 0
+    retries: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+    batch_size: int = 0
+
+    @property
+    def messages_per_second(self) -> float:
+        """Fetched and cached messages per second of wall-clock time."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return (self.fetched + self.cached) / self.elapsed_seconds
+
+    def add(self, other: 'BatchStats') -> None:
+        """Accumulate another run's counters."""
+        for name in ('requested', 'fetched', 'cached', 'failed', 'retries',
+                     'batches', 'elapsed_seconds'):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.batch_size = other.batch_size
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for reporting."""
+        return {**asdict(self), 'messages_per_second': self.messages_per_second}
+
+
+def _status(exception: Exception) -> int | None:
+    """HTTP status of an API error, if it has one."""
+    status = getattr(getattr(exception, 'resp', None), 'status', None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_rate_limited(exception: Exception) -> bool:
+    """Check whether an error asks us to slow down (429 or quota 403)."""
+    status = _status(exception)
+    if status == 429:
+        return True
+    return status == 403 and any(p in str(exception).lower() for p in _RATE_LIMIT_PHRASES)
+
+
+def _is_retryable(exception: Exception) -> bool:
+    """Check whether a failed request is worth retrying."""
+    if isinstance(exception, HttpError):
+        return _status(exception) in RETRYABLE_STATUS or _is_rate_limited(exception)
+    # Connection resets and timeouts surface as OSError subclasses
+    return isinstance(exception, OSError)
+
+
+def _retry_after(exception: Exception) -> float | None:
+    """Server-requested delay from a Retry-After header, if any."""
+    headers = getattr(getattr(exception, 'resp', None), 'headers', None) or {}
+    try:
+        value = headers.get('Retry-After') or headers.get('retry-after')
+        return float(value) if value else None
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
 class GmailBatchClient:
     """
     Gmail Batch API client for efficient bulk operations.
@@ -49,20 +127,47 @@ class GmailBatchClient:
     """
 
     MAX_BATCH_SIZE = 100  # Gmail API limit
+    DEFAULT_BATCH_SIZE = 50  # Larger batches are more likely to be throttled
+    MIN_BATCH_SIZE = 5
+    BATCH_SIZE_STEP = 10
+    ERROR_RATE_THRESHOLD = 0.1  # Retryable share of a batch that halves the size
+
+    # Quota units charged per sub-request; a batch costs the sum of its parts
+    QUOTA_COSTS: ClassVar[dict[str, int]] = {
+        'get': 5,
+        'delete': 10,
+        'trash': 5,
+        'modify': 5,
+    }
 
     def __init__(
         self,
         service,
         rate_limiter: Any | None = None,
-        on_error: Callable[[str, Exception], None] | None = None
+        on_error: Callable[[str, Exception], None] | None = None,
+        message_cache: 'MessageCache | None' = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        target_latency: float = 10.0,
+        initial_batch_size: int = DEFAULT_BATCH_SIZE
     ):
         """
         Initialize batch client.
 
         Args:
             service: Authenticated Gmail API service
-            rate_limiter: Optional rate limiter for quota management
+            rate_limiter: Optional rate limiter for quota management; pass
+                get_gmail_rate_limiter() to share quota with other clients
             on_error: Optional error callback(message_id, exception)
+            message_cache: Optional cache serving full-format gets; only
+                uncached messages are requested
+            max_retries: Attempts per message after its first failure
+            base_delay: First retry delay in seconds; doubles per attempt
+            max_delay: Maximum retry delay in seconds
+            target_latency: Batch round-trip time above which the batch
+                size shrinks
+            initial_batch_size: Starting batch size for message gets
         """
         if not GMAIL_API_AVAILABLE:
             raise ImportError(
@@ -73,6 +178,17 @@ class GmailBatchClient:
         self.service = service
         self.rate_limiter = rate_limiter
         self.on_error = on_error
+        self.message_cache = message_cache
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.target_latency = target_latency
+        self.batch_size = max(self.MIN_BATCH_SIZE, min(initial_batch_size, self.MAX_BATCH_SIZE))
+
+        # Throughput of message gets: the last call and all calls so far
+        self.stats = BatchStats(batch_size=self.batch_size)
+        self.last_stats = BatchStats(batch_size=self.batch_size)
+        self.last_errors: dict[str, Exception] = {}
 
         # Internal state for batch callbacks
         self._results: dict[str, Any] = {}
@@ -88,6 +204,10 @@ class GmailBatchClient:
         """
         Fetch multiple messages in batched requests.
 
+        Sub-requests that fail with a rate-limit or server error are retried
+        in later batches; only messages that still fail after
+        ``max_retries`` attempts are reported through ``on_error``.
+
         Args:
             message_ids: List of Gmail message IDs
             format: Message format ('minimal', 'metadata', 'full', 'raw')
@@ -98,7 +218,8 @@ class GmailBatchClient:
             List of Email objects
 
         Raises:
-            BatchAPIError: If entire batch fails
+            BatchAPIError: If a whole batch fails with a non-retryable error
+                or keeps failing after retries
         """
         if not message_ids:
             return []
@@ -106,67 +227,25 @@ class GmailBatchClient:
         if metadata_headers is None:
             metadata_headers = ['From', 'To', 'Subject', 'Date', 'Cc', 'Bcc']
 
-        emails = []
-        total = len(message_ids)
-
-        logger.info(f"Batch fetching {total} messages in chunks of {self.MAX_BATCH_SIZE}")
-
-        # Process in batches
-        for i in range(0, total, self.MAX_BATCH_SIZE):
-            batch_ids = message_ids[i:i + self.MAX_BATCH_SIZE]
-            batch_num = (i // self.MAX_BATCH_SIZE) + 1
-            total_batches = (total + self.MAX_BATCH_SIZE - 1) // self.MAX_BATCH_SIZE
-
-            logger.debug(f"Processing batch {batch_num}/{total_batches} ({len(batch_ids)} messages)")
-
-            # Rate limiting
-            if self.rate_limiter:
-                self.rate_limiter.wait_if_needed(len(batch_ids))
-
-            # Create batch request
-            batch = self.service.new_batch_http_request()
-            self._results.clear()
-            self._errors.clear()
-
-            for msg_id in batch_ids:
-                request = self.service.users().messages().get(
-                    userId='me',
-                    id=msg_id,
-                    format=format,
-                    metadataHeaders=metadata_headers if format == 'metadata' else None
-                )
-                batch.add(request, callback=self._create_get_callback(msg_id))
-
-            # Execute batch
-            try:
-                batch.execute()
-            except HttpError as e:
-                logger.error(f"Batch request failed: {e}")
-                raise BatchAPIError(str(e), batch_ids) from e
-            except Exception as e:
-                logger.error(f"Unexpected batch error: {e}")
-                raise BatchAPIError(str(e), batch_ids) from e
+        responses, failures = self._get_messages(
+            message_ids, format, metadata_headers, progress_callback, raise_on_batch_error=True
+        )
 
-            # Process results
-            for msg_id in batch_ids:
-                if msg_id in self._results:
-                    try:
-                        email = Email.from_gmail_message(self._results[msg_id])
-                        emails.append(email)
-                    except Exception as e:
-                        logger.warning(f"Failed to parse message {msg_id}: {e}")
-                        if self.on_error:
-                            self.on_error(msg_id, e)
-                elif msg_id in self._errors:
-                    logger.warning(f"Failed to fetch {msg_id}: {self._errors[msg_id]}")
+        emails = []
+        for msg_id in message_ids:
+            if msg_id in responses:
+                try:
+                    emails.append(Email.from_gmail_message(responses[msg_id]))
+                except Exception as e:
+                    logger.warning(f"Failed to parse message {msg_id}: {e}")
                     if self.on_error:
-                        self.on_error(msg_id, self._errors[msg_id])
+                        self.on_error(msg_id, e)
+            elif msg_id in failures:
+                logger.warning(f"Failed to fetch {msg_id}: {failures[msg_id]}")
+                if self.on_error:
+                    self.on_error(msg_id, failures[msg_id])
 
-            # Progress callback
-            if progress_callback:
-                progress_callback(min(i + self.MAX_BATCH_SIZE, total), total)
-
-        logger.info(f"Batch fetch complete: {len(emails)}/{total} messages retrieved")
+        logger.info(f"Batch fetch complete: {len(emails)}/{len(message_ids)} messages retrieved")
         return emails
 
     def batch_get_messages_raw(
@@ -177,6 +256,10 @@ class GmailBatchClient:
         """
         Fetch multiple messages and return raw API responses.
 
+        Failed sub-requests and failed batches are retried like in
+        batch_get_messages. Messages that still fail are left out of the
+        result and listed in ``last_errors``.
+
         Args:
             message_ids: List of Gmail message IDs
             progress_callback: Optional progress callback
@@ -187,39 +270,224 @@ class GmailBatchClient:
         if not message_ids:
             return {}
 
-        results = {}
-        total = len(message_ids)
+        responses, failures = self._get_messages(
+            message_ids, 'full', None, progress_callback, raise_on_batch_error=False
+        )
+        for msg_id, error in failures.items():
+            logger.warning(f"Failed to fetch {msg_id}: {error}")
+        return responses
 
-        for i in range(0, total, self.MAX_BATCH_SIZE):
-            batch_ids = message_ids[i:i + self.MAX_BATCH_SIZE]
+    def _get_messages(
+        self,
+        message_ids: list[str],
+        format: str,
+        metadata_headers: list[str] | None,
+        progress_callback: Callable[[int, int], None] | None,
+        raise_on_batch_error: bool
+    ) -> tuple[dict[str, Any], dict[str, Exception]]:
+        """
+        Fetch messages in adaptively sized batches, retrying transient failures.
 
-            if self.rate_limiter:
-                self.rate_limiter.wait_if_needed(len(batch_ids))
+        Retryable failures are re-queued with exponential backoff and sent
+        in a later batch alongside fresh IDs. After every batch the batch
+        size is adjusted from its error rate and latency.
+
+        Returns:
+            Tuple of (responses by ID, permanent failures by ID)
+        """
+        stats = BatchStats(requested=len(message_ids))
+        start = time.monotonic()
+        total = len(message_ids)
+
+        responses: dict[str, Any] = {}
+        failures: dict[str, Exception] = {}
+        pending = deque(message_ids)
+        retry_queue: list[tuple[float, int, str]] = []  # heap of (ready_at, seq, msg_id)
+        attempts: dict[str, int] = {}
+        seq = 0
+
+        def requeue(msg_id: str, error: Exception) -> None:
+            nonlocal seq
+            attempts[msg_id] = attempts.get(msg_id, 0) + 1
+            if attempts[msg_id] > self.max_retries:
+                failures[msg_id] = error
+                return
+            delay = self._retry_delay(attempts[msg_id], error)
+            heapq.heappush(retry_queue, (time.monotonic() + delay, seq, msg_id))
+            seq += 1
+            stats.retries += 1
+
+        logger.info(f"Batch fetching {total} messages (batch size {self.batch_size})")
+
+        while pending or retry_queue:
+            batch_ids = self._next_batch(pending, retry_queue)
+            if not batch_ids:
+                # Only backed-off retries remain; wait for the earliest
+                time.sleep(max(0.0, retry_queue[0][0] - time.monotonic()))
+                continue
 
-            batch = self.service.new_batch_http_request()
             self._results.clear()
             self._errors.clear()
+            fetch_ids = self._load_cached(batch_ids) if format == 'full' else batch_ids
+            stats.cached += len(batch_ids) - len(fetch_ids)
+
+            if fetch_ids:
+                batch_error, latency = self._execute_get_batch(fetch_ids, format, metadata_headers)
+                stats.batches += 1
+
+                if batch_error is not None:
+                    if not _is_retryable(batch_error):
+                        if raise_on_batch_error:
+                            logger.error(f"Batch request failed: {batch_error}")
+                            raise BatchAPIError(str(batch_error), batch_ids) from batch_error
+                        logger.error(f"Batch failed: {batch_error}")
+                        failures.update(dict.fromkeys(fetch_ids, batch_error))
+                    else:
+                        logger.warning(f"Batch of {len(fetch_ids)} failed, retrying: {batch_error}")
+                        for msg_id in fetch_ids:
+                            requeue(msg_id, batch_error)
+                        if raise_on_batch_error and any(m in failures for m in fetch_ids):
+                            raise BatchAPIError(str(batch_error), batch_ids) from batch_error
+                    # Only throttling slows the shared bucket; 5xx and resets just retry
+                    throttle_error = batch_error if _is_rate_limited(batch_error) else None
+                    self._on_batch_done(len(fetch_ids), len(fetch_ids), latency, throttle_error)
+                else:
+                    retryable = 0
+                    throttle_error = None
+                    for msg_id in fetch_ids:
+                        error = self._errors.get(msg_id)
+                        if msg_id in self._results:
+                            continue
+                        if error is None:
+                            failures[msg_id] = BatchAPIError(
+                                f"No response for message {msg_id}", [msg_id]
+                            )
+                        elif _is_retryable(error):
+                            retryable += 1
+                            if _is_rate_limited(error):
+                                throttle_error = error
+                            requeue(msg_id, error)
+                        else:
+                            failures[msg_id] = error
+                    if format == 'full':
+                        self._store_fetched(fetch_ids)
+                    self._on_batch_done(len(fetch_ids), retryable, latency, throttle_error)
+
+            responses.update(self._results)
+            stats.fetched = len(responses) - stats.cached
 
-            for msg_id in batch_ids:
-                request = self.service.users().messages().get(
-                    userId='me',
-                    id=msg_id,
-                    format='full'
-                )
-                batch.add(request, callback=self._create_get_callback(msg_id))
+            if progress_callback:
+                progress_callback(len(responses) + len(failures), total)
+
+        stats.failed = len(failures)
+        stats.elapsed_seconds = time.monotonic() - start
+        stats.batch_size = self.batch_size
+        self.last_stats = stats
+        self.last_errors = failures
+        self.stats.add(stats)
+
+        logger.info(
+            f"Fetched {len(responses)}/{total} messages in {stats.batches} batches: "
+            f"{stats.retries} retries, {stats.failed} failed, "
+            f"{stats.messages_per_second:.1f} msg/s"
+        )
+        return responses, failures
+
+    def _next_batch(self, pending: deque, retry_queue: list[tuple[float, int, str]]) -> list[str]:
+        """Take up to batch_size IDs: due retries first, then fresh IDs."""
+        batch_ids = []
+        now = time.monotonic()
+        while retry_queue and retry_queue[0][0] <= now and len(batch_ids) < self.batch_size:
+            batch_ids.append(heapq.heappop(retry_queue)[2])
+        while pending and len(batch_ids) < self.batch_size:
+            batch_ids.append(pending.popleft())
+        return batch_ids
+
+    def _execute_get_batch(
+        self,
+        fetch_ids: list[str],
+        format: str,
+        metadata_headers: list[str] | None
+    ) -> tuple[Exception | None, float]:
+        """
+        Send one batch of messages.get requests.
 
-            try:
-                batch.execute()
-            except Exception as e:
-                logger.error(f"Batch failed: {e}")
-                continue
+        Returns:
+            Tuple of (whole-batch error or None, latency in seconds)
+        """
+        if self.rate_limiter:
+            self.rate_limiter.wait_if_needed(len(fetch_ids) * self.QUOTA_COSTS['get'])
+
+        batch = self.service.new_batch_http_request()
+        for msg_id in fetch_ids:
+            request = self.service.users().messages().get(
+                userId='me',
+                id=msg_id,
+                format=format,
+                metadataHeaders=metadata_headers if format == 'metadata' else None
+            )
+            batch.add(request, callback=self._create_get_callback(msg_id))
 
-            results.update(self._results)
+        start = time.monotonic()
+        try:
+            batch.execute()
+        except Exception as e:
+            return e, time.monotonic() - start
+        return None, time.monotonic() - start
 
-            if progress_callback:
-                progress_callback(min(i + self.MAX_BATCH_SIZE, total), total)
+    def _on_batch_done(self, sent: int, retryable: int, latency: float,
+                       throttle_error: Exception | None) -> None:
+        """
+        Adapt the batch size to a finished batch and report throttling.
 
-        return results
+        A high share of retryable errors halves the batch size, a slow
+        batch shrinks it by a quarter, and a full clean batch grows it by
+        BATCH_SIZE_STEP up to MAX_BATCH_SIZE.
+        """
+        error_rate = retryable / sent if sent else 0.0
+        if error_rate >= self.ERROR_RATE_THRESHOLD:
+            self.batch_size = max(self.MIN_BATCH_SIZE, self.batch_size // 2)
+        elif latency > self.target_latency:
+            self.batch_size = max(self.MIN_BATCH_SIZE, int(self.batch_size * 0.75))
+        elif retryable == 0 and sent >= self.batch_size:
+            self.batch_size = min(self.MAX_BATCH_SIZE, self.batch_size + self.BATCH_SIZE_STEP)
+
+        bucket = getattr(self.rate_limiter, 'bucket', None)
+        if bucket is not None:
+            if throttle_error is not None:
+                bucket.on_rate_limited(_retry_after(throttle_error))
+            elif retryable == 0:
+                bucket.record_success()
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        """Exponential backoff with jitter, honouring Retry-After."""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        delay += random.uniform(0, delay * 0.1)
+        retry_after = _retry_after(error)
+        return max(delay, retry_after) if retry_after else delay
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cumulative fetch throughput statistics."""
+        return {**self.stats.to_dict(), 'batch_size': self.batch_size}
+
+    def _load_cached(self, batch_ids: list[str]) -> list[str]:
+        """
+        Put cached full-format messages into the batch results.
+
+        Returns:
+            IDs that still need to be fetched
+        """
+        if self.message_cache is None:
+            return batch_ids
+        self._results.update(self.message_cache.get_many(batch_ids))
+        return [msg_id for msg_id in batch_ids if msg_id not in self._results]
+
+    def _store_fetched(self, fetch_ids: list[str]) -> None:
+        """Cache full-format messages fetched by the last batch."""
+        if self.message_cache is not None:
+            self.message_cache.put_many(
+                self._results[msg_id] for msg_id in fetch_ids if msg_id in self._results
+            )
 
     def _create_get_callback(self, msg_id: str) -> Callable:
         """Create callback for get message request."""
@@ -259,7 +527,7 @@ class GmailBatchClient:
             batch_ids = message_ids[i:i + self.MAX_BATCH_SIZE]
 
             if self.rate_limiter:
-                self.rate_limiter.wait_if_needed(len(batch_ids))
+                self.rate_limiter.wait_if_needed(len(batch_ids) * self.QUOTA_COSTS['delete'])
 
             batch = self.service.new_batch_http_request()
 
@@ -321,7 +589,7 @@ class GmailBatchClient:
             batch_ids = message_ids[i:i + self.MAX_BATCH_SIZE]
 
             if self.rate_limiter:
-                self.rate_limiter.wait_if_needed(len(batch_ids))
+                self.rate_limiter.wait_if_needed(len(batch_ids) * self.QUOTA_COSTS['trash'])
 
             batch = self.service.new_batch_http_request()
 
@@ -388,7 +656,7 @@ class GmailBatchClient:
             batch_ids = message_ids[i:i + self.MAX_BATCH_SIZE]
 
             if self.rate_limiter:
-                self.rate_limiter.wait_if_needed(len(batch_ids))
+                self.rate_limiter.wait_if_needed(len(batch_ids) * self.QUOTA_COSTS['modify'])
 
             batch = self.service.new_batch_http_request()
 
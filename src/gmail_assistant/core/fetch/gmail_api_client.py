@@ -17,6 +17,7 @@ from gmail_assistant.core.ai.newsletter_cleaner import AINewsletterDetector, Ema
 from gmail_assistant.core.auth.credential_manager import SecureCredentialManager
 from gmail_assistant.core.constants import SCOPES_MODIFY
 from gmail_assistant.core.exceptions import AuthError
+from gmail_assistant.utils.rate_limiter import get_gmail_rate_limiter
 
 from .batch_api import BatchAPIError, GmailBatchClient
 
@@ -50,7 +51,9 @@ class GmailAPIClient:
                 self.service = self.credential_manager.get_service()
                 # C-1: Initialize batch client for efficient bulk operations
                 if self.service:
-                    self.batch_client = GmailBatchClient(self.service)
+                    self.batch_client = GmailBatchClient(
+                        self.service, rate_limiter=get_gmail_rate_limiter()
+                    )
                 logger.info("Gmail API authentication successful via SecureCredentialManager")
                 print("Gmail API authentication successful")
             else:
@@ -25,19 +25,34 @@ from gmail_assistant.utils.memory_manager import (
     ProgressiveLoader,
     StreamingEmailProcessor,
 )
+from gmail_assistant.utils.rate_limiter import get_gmail_rate_limiter
+
+from .id_enumeration import PAGE_SIZE, ShardedIdEnumerator, needs_sharding, pooled_page_lister
+from .message_cache import MessageCache
+from .message_index import MessageIndex
+from .pipeline import DownloadPipeline, PipelineConfig
+from .service_pool import GmailServicePool
 
 
 class GmailFetcher:
-    def __init__(self, credentials_file: str = 'credentials.json'):
+    def __init__(self, credentials_file: str = 'credentials.json',
+                 message_cache: MessageCache | None = None):
         self.auth = ReadOnlyGmailAuth(credentials_file)
+        self.message_cache = message_cache
         self.memory_tracker = MemoryTracker()
         self.streaming_processor = StreamingEmailProcessor()
         self.progressive_loader = ProgressiveLoader()
-        self.html_converter = html2text.HTML2Text()
-        self.html_converter.ignore_links = False
-        self.html_converter.ignore_images = False
+        self.html_converter = self._create_html_converter()
         self.logger = logging.getLogger(__name__)
 
+    @staticmethod
+    def _create_html_converter() -> html2text.HTML2Text:
+        """Create a configured HTML-to-markdown converter (not thread-safe)."""
+        converter = html2text.HTML2Text()
+        converter.ignore_links = False
+        converter.ignore_images = False
+        return converter
+
     def authenticate(self):
         """Authenticate with Gmail API using secure credential storage"""
         result = self.auth.authenticate()
@@ -63,19 +78,34 @@ class GmailFetcher:
             self.logger.error(f"Error getting profile: {error}")
             return None
 
-    def search_messages(self, query: str = '', max_results: int = 100) -> list[str]:
-        """Search for messages matching query"""
+    def search_messages(self, query: str = '', max_results: int = 100,
+                        workers: int = 8) -> list[str]:
+        """
+        Search for messages matching query.
+
+        Large results are enumerated over concurrent date windows (see
+        ShardedIdEnumerator) instead of one page after another.
+
+        Args:
+            query: Gmail search query
+            max_results: Maximum number of message IDs
+            workers: Concurrent list requests when enumerating by date window
+        """
         try:
             self.logger.info(f"Searching for messages: '{query}'")
             results = self.service.users().messages().list(
                 userId='me',
                 q=query,
-                maxResults=max_results
+                maxResults=min(max_results, PAGE_SIZE)
             ).execute()
 
             messages = results.get('messages', [])
             message_ids = [msg['id'] for msg in messages]
 
+            if ('nextPageToken' in results and len(message_ids) < max_results
+                    and needs_sharding(max_results)):
+                message_ids = self._enumerate_message_ids(query, max_results, results, workers)
+
             # Handle pagination if needed
             while 'nextPageToken' in results and len(message_ids) < max_results:
                 page_token = results['nextPageToken']
@@ -96,6 +126,21 @@ class GmailFetcher:
             self.logger.error(f"Error searching messages: {error}")
             return []
 
+    def _enumerate_message_ids(self, query: str, max_results: int,
+                               first_page: dict, workers: int) -> list[str]:
+        """List a large result over date windows on per-thread services."""
+        pool = GmailServicePool(self.auth.credential_manager)
+        try:
+            enumerator = ShardedIdEnumerator(
+                pooled_page_lister(pool, get_gmail_rate_limiter()), workers=workers
+            )
+            message_ids = enumerator.enumerate(query, max_results, first_page=first_page)
+        finally:
+            pool.close()
+        # Everything is listed; nothing left to page
+        first_page.pop('nextPageToken', None)
+        return message_ids
+
     def _validate_api_response(self, response: dict | None,
                                 required_fields: list[str],
                                 context: str = "") -> dict:
@@ -126,35 +171,52 @@ class GmailFetcher:
         return response
 
     def get_message_details(self, message_id: str) -> dict | None:
-        """Get full message details with validation (M-3 security fix)"""
+        """Get full message details with validation (M-3 security fix)
+
+        Served from the message cache when one is configured.
+        """
+        if self.message_cache is not None:
+            cached = self.message_cache.get(message_id)
+            if cached is not None:
+                return cached
+
         try:
             message = self.service.users().messages().get(
                 userId='me',
                 id=message_id,
                 format='full'
             ).execute()
+            validated = self._validate_message(message, message_id)
+            if validated is not None and self.message_cache is not None:
+                self.message_cache.put(validated)
+            return validated
 
-            # Validate response structure (M-3 fix)
-            try:
-                validated = self._validate_api_response(
-                    message,
-                    required_fields=['id', 'threadId', 'payload'],
-                    context=f"for message {message_id}"
-                )
+        except HttpError as error:
+            self.logger.error(f"Error getting message {message_id}: {error}")
+            return None
 
-                # Validate payload has headers
-                if 'headers' not in validated.get('payload', {}):
-                    self.logger.warning(f"Message {message_id} missing payload headers")
-                    validated['payload']['headers'] = []
+    def _validate_message(self, message: dict | None, message_id: str) -> dict | None:
+        """Validate a full-format message response (M-3 fix).
 
-                return validated
+        Returns:
+            The validated message, or None if its structure is invalid.
+        """
+        try:
+            validated = self._validate_api_response(
+                message,
+                required_fields=['id', 'threadId', 'payload'],
+                context=f"for message {message_id}"
+            )
 
-            except ValueError as e:
-                self.logger.error(f"Invalid API response for message {message_id}: {e}")
-                return None
+            # Validate payload has headers
+            if 'headers' not in validated.get('payload', {}):
+                self.logger.warning(f"Message {message_id} missing payload headers")
+                validated['payload']['headers'] = []
 
-        except HttpError as error:
-            self.logger.error(f"Error getting message {message_id}: {error}")
+            return validated
+
+        except ValueError as e:
+            self.logger.error(f"Invalid API response for message {message_id}: {e}")
             return None
 
     def decode_base64(self, data: str) -> str:
@@ -275,8 +337,15 @@ class GmailFetcher:
 
         return "\n".join(eml_lines)
 
-    def create_markdown_content(self, message_data: dict) -> str:
-        """Create markdown content from message data"""
+    def create_markdown_content(self, message_data: dict,
+                                html_converter: html2text.HTML2Text | None = None) -> str:
+        """Create markdown content from message data.
+
+        Args:
+            message_data: Raw message data from Gmail API
+            html_converter: Converter to use instead of the shared one
+                (required when rendering from several threads)
+        """
         headers = self.extract_headers(message_data['payload'].get('headers', []))
         plain_text, html_body = self.get_message_body(message_data['payload'])
 
@@ -311,7 +380,8 @@ class GmailFetcher:
         # Convert HTML to markdown if available, otherwise use plain text
         if html_body:
             try:
-                markdown_body = self.html_converter.handle(html_body)
+                converter = html_converter or self.html_converter
+                markdown_body = converter.handle(html_body)
                 md_lines.append(markdown_body)
             except (ValueError, AttributeError, UnicodeDecodeError) as e:
                 self.logger.debug(f"HTML conversion failed: {e}")
@@ -401,23 +471,80 @@ class GmailFetcher:
         sub_dir.mkdir(parents=True, exist_ok=True)
         return sub_dir
 
-    def _save_email_files(self, message_data: dict, sub_dir: Path,
-                          base_filename: str, format_type: str) -> None:
-        """Save email in requested format(s).
+    def _plan_email_output(self, message_data: dict, output_dir: str,
+                           organize_by: str) -> tuple[Path, str]:
+        """Determine output directory and base filename for a message.
 
         Args:
             message_data: Raw message data from Gmail API
-            sub_dir: Directory to save files
+            output_dir: Base output directory
+            organize_by: Organization method ('date', 'sender', 'none')
+
+        Returns:
+            Tuple of (sub_dir, base_filename).
+        """
+        headers = self.extract_headers(message_data['payload'].get('headers', []))
+        date_str = headers.get('date', 'unknown_date')
+        subject = headers.get('subject', 'no_subject')
+        sender = headers.get('from', 'unknown_sender')
+
+        date_prefix, folder_date = self._parse_email_date(date_str)
+        sub_dir = self._get_output_path(output_dir, organize_by, folder_date, sender)
+        base_filename = f"{date_prefix}_{self.sanitize_filename(subject)}_{message_data['id']}"
+        return sub_dir, base_filename
+
+    def _render_email_files(self, message_data: dict, sub_dir: Path,
+                            base_filename: str, format_type: str,
+                            html_converter: html2text.HTML2Text | None = None
+                            ) -> list[tuple[Path, str]]:
+        """Render email in requested format(s) without touching disk.
+
+        Args:
+            message_data: Raw message data from Gmail API
+            sub_dir: Directory the files belong in
             base_filename: Base filename without extension
             format_type: Output format ('eml', 'markdown', 'both')
+            html_converter: Optional per-thread HTML converter
+
+        Returns:
+            List of (path, content) pairs to write.
         """
+        files = []
+
         if format_type in ['eml', 'both']:
             eml_content = self.create_eml_content(message_data)
-            self.atomic_write(sub_dir / f"{base_filename}.eml", eml_content)
+            files.append((sub_dir / f"{base_filename}.eml", eml_content))
 
         if format_type in ['markdown', 'both']:
-            md_content = self.create_markdown_content(message_data)
-            self.atomic_write(sub_dir / f"{base_filename}.md", md_content)
+            md_content = self.create_markdown_content(message_data, html_converter)
+            files.append((sub_dir / f"{base_filename}.md", md_content))
+
+        return files
+
+    def _save_email_files(self, message_data: dict, sub_dir: Path,
+                          base_filename: str, format_type: str) -> list[tuple[Path, str]]:
+        """Save email in requested format(s).
+
+        Args:
+            message_data: Raw message data from Gmail API
+            sub_dir: Directory to save files
+            base_filename: Base filename without extension
+            format_type: Output format ('eml', 'markdown', 'both')
+
+        Returns:
+            List of (path, content) pairs written.
+        """
+        files = self._render_email_files(message_data, sub_dir, base_filename, format_type)
+        for path, content in files:
+            self.atomic_write(path, content)
+        return files
+
+    @staticmethod
+    def _record_download(index: MessageIndex | None, message_id: str,
+                         files: list[tuple[Path, str]]) -> None:
+        """Record written files for a message in the download index."""
+        if index is not None and files:
+            index.record(message_id, files[0][0], *(content for _, content in files))
 
     def download_emails(self,
                        query: str = '',
@@ -425,7 +552,9 @@ class GmailFetcher:
                        output_dir: str = 'gmail_backup',
                        format_type: str = 'both',
                        organize_by: str = 'date',
-                       skip: int = 0) -> None:
+                       skip: int = 0,
+                       pipeline: PipelineConfig | None = None,
+                       skip_existing: bool = True) -> None:
         """Download emails and save as files.
 
         Args:
@@ -435,6 +564,10 @@ class GmailFetcher:
             format_type: Output format ('eml', 'markdown', 'both')
             organize_by: File organization ('date', 'sender', 'none')
             skip: Number of messages to skip from start
+            pipeline: Run fetch, render and write as concurrent stages with
+                these settings instead of one message at a time
+            skip_existing: Consult the output directory's MessageIndex and
+                only fetch messages not downloaded before
         """
         if not self.service:
             self.logger.error("Not authenticated. Run authenticate() first.")
@@ -453,7 +586,36 @@ class GmailFetcher:
             self.logger.info("No messages found")
             return
 
+        index = MessageIndex.for_output_dir(output_dir) if skip_existing else None
+        try:
+            if index is not None:
+                message_ids = index.filter_new(message_ids)
+                if not message_ids:
+                    self.logger.info("All matching messages are already downloaded")
+                    return
+            self._download_messages(message_ids, output_dir, format_type, organize_by,
+                                    pipeline, index)
+        finally:
+            if index is not None:
+                index.close()
+
+    def _download_messages(self, message_ids: list[str], output_dir: str, format_type: str,
+                           organize_by: str, pipeline: PipelineConfig | None,
+                           index: MessageIndex | None) -> None:
+        """Fetch and save a list of messages, recording each in the index."""
         self.logger.info(f"Downloading {len(message_ids)} emails...")
+
+        if pipeline is not None:
+            stats = DownloadPipeline(self, pipeline, index=index).run(
+                message_ids, output_dir, format_type, organize_by
+            )
+            self.logger.info(
+                f"Download complete: {stats.downloaded} successful, {stats.errors} errors"
+            )
+            self.logger.info(f"Output directory: {output_dir}")
+            self._log_cache_stats()
+            return
+
         downloaded, errors = 0, 0
 
         for i, message_id in enumerate(message_ids, 1):
@@ -466,16 +628,11 @@ class GmailFetcher:
                     errors += 1
                     continue
 
-                headers = self.extract_headers(message_data['payload'].get('headers', []))
-                date_str = headers.get('date', 'unknown_date')
-                subject = headers.get('subject', 'no_subject')
-                sender = headers.get('from', 'unknown_sender')
-
-                date_prefix, folder_date = self._parse_email_date(date_str)
-                sub_dir = self._get_output_path(output_dir, organize_by, folder_date, sender)
-                base_filename = f"{date_prefix}_{self.sanitize_filename(subject)}_{message_id}"
-
-                self._save_email_files(message_data, sub_dir, base_filename, format_type)
+                sub_dir, base_filename = self._plan_email_output(
+                    message_data, output_dir, organize_by
+                )
+                files = self._save_email_files(message_data, sub_dir, base_filename, format_type)
+                self._record_download(index, message_id, files)
                 self.logger.debug("Email saved successfully")
                 downloaded += 1
 
@@ -491,6 +648,17 @@ class GmailFetcher:
 
         self.logger.info(f"Download complete: {downloaded} successful, {errors} errors")
         self.logger.info(f"Output directory: {output_dir}")
+        self._log_cache_stats()
+
+    def _log_cache_stats(self) -> None:
+        """Log message cache hit rate, if a cache is configured."""
+        if self.message_cache is None:
+            return
+        stats = self.message_cache.get_stats()
+        self.logger.info(
+            f"Message cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']:.0%} hit rate)"
+        )
 
 def main():
     """Main function with CLI interface"""
@@ -507,6 +675,16 @@ def main():
     parser.add_argument('--auth-only', action='store_true', help='Only run authentication')
     parser.add_argument('--count-only', action='store_true', help='Only print count of matching messages (no download)')
     parser.add_argument('--skip', type=int, default=0, help='Skip first N matching messages before downloading')
+    parser.add_argument('--redownload', action='store_true',
+                       help='Ignore the download index and fetch every matching message again')
+    parser.add_argument('--pipeline', action='store_true',
+                       help='Overlap fetching, rendering and writing in concurrent stages')
+    parser.add_argument('--fetch-batch-size', type=int, default=50,
+                       help='Messages per batched API call in pipeline mode (default: 50)')
+    parser.add_argument('--render-workers', type=int, default=4,
+                       help='Render threads in pipeline mode (default: 4)')
+    parser.add_argument('--write-workers', type=int, default=2,
+                       help='Writer threads in pipeline mode (default: 2)')
 
     args = parser.parse_args()
 
@@ -542,7 +720,13 @@ def main():
         output_dir=args.output,
         format_type=args.format,
         organize_by=args.organize,
-        skip=args.skip or 0
+        skip=args.skip or 0,
+        pipeline=PipelineConfig(
+            fetch_batch_size=args.fetch_batch_size,
+            render_workers=args.render_workers,
+            write_workers=args.write_workers
+        ) if args.pipeline else None,
+        skip_existing=not args.redownload
     )
 
     return 0
@@ -16,14 +16,22 @@ Usage:
     for msg_id in result.added_message_ids:
         # Process new message
         pass
+
+    # Large backlogs - deliver page by page, fetching while paging
+    history_id, stats = client.stream_incremental_sync(
+        history_id, on_messages_added=save, state_manager=SyncStateManager(conn)
+    )
 """
 
 import logging
-from collections.abc import Callable
+import threading
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, ClassVar
+from typing import TYPE_CHECKING, Any, ClassVar
 
 try:
     from googleapiclient.errors import HttpError
@@ -36,9 +44,16 @@ from gmail_assistant.core.schemas import Email
 
 from .batch_api import GmailBatchClient
 
+if TYPE_CHECKING:
+    from .message_cache import MessageCache
+
 logger = logging.getLogger(__name__)
 
 
+class HistoryExpiredError(ValueError):
+    """The start history ID is too old for history.list; a full sync is required."""
+
+
 class HistoryEventType(str, Enum):
     """Types of history events from Gmail API."""
     MESSAGE_ADDED = "messageAdded"
@@ -132,7 +147,8 @@ class HistorySyncClient:
     def __init__(
         self,
         service,
-        batch_client: GmailBatchClient | None = None
+        batch_client: GmailBatchClient | None = None,
+        message_cache: 'MessageCache | None' = None
     ):
         """
         Initialize history sync client.
@@ -140,6 +156,8 @@ class HistorySyncClient:
         Args:
             service: Authenticated Gmail API service
             batch_client: Optional batch client for fetching messages
+            message_cache: Optional message cache kept current with label
+                changes and deletions seen during sync
         """
         if not GMAIL_API_AVAILABLE:
             raise ImportError(
@@ -149,11 +167,16 @@ class HistorySyncClient:
 
         self.service = service
         self.batch_client = batch_client
+        self.message_cache = message_cache
 
     def _get_batch_client(self) -> GmailBatchClient:
         """Get or create batch client."""
         if not self.batch_client:
-            self.batch_client = GmailBatchClient(self.service)
+            from gmail_assistant.utils.rate_limiter import get_gmail_rate_limiter
+            self.batch_client = GmailBatchClient(
+                self.service, rate_limiter=get_gmail_rate_limiter(),
+                message_cache=self.message_cache
+            )
         return self.batch_client
 
     def get_current_history_id(self) -> int:
@@ -298,7 +321,7 @@ class HistorySyncClient:
                 f"{len(net_deleted)} deleted, {len(label_changes)} label changes"
             )
 
-            return HistorySyncResult(
+            result = HistorySyncResult(
                 success=True,
                 new_history_id=latest_history_id,
                 events=events,
@@ -307,6 +330,9 @@ class HistorySyncClient:
                 label_changes=label_changes,
                 pages_processed=pages_processed
             )
+            if self.message_cache is not None:
+                self.message_cache.apply_history(result)
+            return result
 
         except HttpError as e:
             if e.resp.status == 404:
@@ -333,6 +359,98 @@ class HistorySyncClient:
                 error=str(e)
             )
 
+    def iter_history_pages(
+        self,
+        start_history_id: int,
+        label_filter: str | None = None,
+        max_pages: int = 100
+    ) -> Iterator[HistorySyncResult]:
+        """
+        Page through history, yielding the net changes of each page.
+
+        Unlike sync_from_history, nothing is accumulated across pages and no
+        HistoryEvent objects are built. A message added and deleted within
+        one page is dropped; changes spanning pages are reported in order
+        (an add on one page, its deletion on a later one).
+
+        Args:
+            start_history_id: History ID to start from
+            label_filter: Optional label to filter by (e.g., 'INBOX')
+            max_pages: Maximum pages to process (safety limit)
+
+        Yields:
+            One HistorySyncResult per page. Its new_history_id is the latest
+            record on the page (the mailbox's current history ID on the last
+            page), so it is safe to resume from once the page is handled.
+
+        Raises:
+            HttpError: If a history.list call fails (404 when the start
+                history ID has expired)
+        """
+        page_token = None
+        latest_history_id = start_history_id
+
+        for _ in range(max_pages):
+            request_params = {
+                'userId': 'me',
+                'startHistoryId': start_history_id,
+                'historyTypes': self.HISTORY_TYPES
+            }
+            if label_filter:
+                request_params['labelId'] = label_filter
+            if page_token:
+                request_params['pageToken'] = page_token
+
+            response = self.service.users().history().list(**request_params).execute()
+            page_token = response.get('nextPageToken')
+
+            added_ids: dict[str, None] = {}  # insertion-ordered set
+            deleted_ids: dict[str, None] = {}
+            removed_ids = set()
+            label_changes = []
+            for record in response.get('history', []):
+                record_id = int(record.get('id', 0))
+                latest_history_id = max(latest_history_id, record_id)
+
+                for msg in record.get('messagesAdded', []):
+                    added_ids[msg['message']['id']] = None
+                for msg in record.get('messagesDeleted', []):
+                    msg_id = msg['message']['id']
+                    removed_ids.add(msg_id)
+                    if msg_id in added_ids:
+                        del added_ids[msg_id]
+                    else:
+                        deleted_ids[msg_id] = None
+                for change in record.get('labelsAdded', []):
+                    label_changes.append(LabelChange(
+                        message_id=change['message']['id'],
+                        added_labels=change.get('labelIds', []),
+                        removed_labels=[],
+                        history_id=record_id
+                    ))
+                for change in record.get('labelsRemoved', []):
+                    label_changes.append(LabelChange(
+                        message_id=change['message']['id'],
+                        added_labels=[],
+                        removed_labels=change.get('labelIds', []),
+                        history_id=record_id
+                    ))
+
+            if not page_token and response.get('historyId'):
+                latest_history_id = max(latest_history_id, int(response['historyId']))
+
+            yield HistorySyncResult(
+                success=True,
+                new_history_id=latest_history_id,
+                added_message_ids=list(added_ids),
+                deleted_message_ids=list(deleted_ids),
+                label_changes=[c for c in label_changes if c.message_id not in removed_ids],
+                pages_processed=1
+            )
+
+            if not page_token:
+                return
+
     def fetch_added_messages(
         self,
         message_ids: list[str],
@@ -376,8 +494,12 @@ class HistorySyncClient:
             Tuple of (new_history_id, stats_dict)
 
         Raises:
-            ValueError: If history ID expired
+            HistoryExpiredError: If history ID expired
             RuntimeError: If sync fails
+
+        Note:
+            All history is paged before any message is fetched; use
+            stream_incremental_sync for large backlogs.
         """
         stats = {
             'added': 0,
@@ -391,7 +513,7 @@ class HistorySyncClient:
 
         if not result.success:
             if result.error == "HISTORY_EXPIRED":
-                raise ValueError(
+                raise HistoryExpiredError(
                     f"History ID {last_history_id} expired - full sync required"
                 )
             raise RuntimeError(f"History sync failed: {result.error}")
@@ -424,6 +546,174 @@ class HistorySyncClient:
 
         return result.new_history_id, stats
 
+    def stream_incremental_sync(
+        self,
+        last_history_id: int,
+        on_messages_added: Callable[[list[Email]], None] | None = None,
+        on_messages_deleted: Callable[[list[str]], None] | None = None,
+        on_labels_changed: Callable[[list[LabelChange]], None] | None = None,
+        fetch_full_messages: bool = True,
+        state_manager: 'SyncStateManager | None' = None,
+        source: str = 'gmail',
+        label_filter: str | None = None,
+        max_pages: int = 100,
+        service_factory: Callable[[], Any] | None = None,
+        fetch_workers: int = 2,
+        max_pending_pages: int = 4
+    ) -> tuple[int, dict[str, Any]]:
+        """
+        Perform incremental sync page by page, fetching while paging.
+
+        Each history page's added messages are fetched with batched gets on
+        a worker thread while later pages are still being listed. Callbacks
+        run on the calling thread, once per page and in history order, with
+        that page's net changes. After a page is delivered its history ID is
+        persisted through ``state_manager``, so an interrupted sync resumes
+        from the last delivered page instead of from last_history_id. If
+        listing fails, the pages listed before the failure are still
+        delivered.
+
+        Args:
+            last_history_id: Last synced history ID
+            on_messages_added: Callback for each page's new messages
+            on_messages_deleted: Callback for each page's deleted message IDs
+            on_labels_changed: Callback for each page's label changes
+            fetch_full_messages: Whether to fetch full message details
+            state_manager: Sync state to checkpoint the history ID in
+            source: Sync source identifier for state_manager
+            label_filter: Optional label to filter by (e.g., 'INBOX')
+            max_pages: Maximum pages to process; the rest is picked up by
+                the next sync
+            service_factory: Callable returning a Gmail service for a fetch
+                worker. googleapiclient services are not thread-safe, so
+                without one fetches run on the calling thread between pages.
+            fetch_workers: Concurrent fetch threads (with service_factory)
+            max_pending_pages: Pages fetched ahead of delivery before paging
+                waits (bounds memory)
+
+        Returns:
+            Tuple of (new_history_id, stats_dict)
+
+        Raises:
+            HistoryExpiredError: If history ID expired
+            RuntimeError: If sync fails
+        """
+        stats = {
+            'added': 0,
+            'deleted': 0,
+            'label_changes': 0,
+            'pages_processed': 0,
+            'fetch_errors': 0
+        }
+        history_id = last_history_id
+        fetch = fetch_full_messages and on_messages_added is not None
+        executor = None
+        if fetch and service_factory is not None:
+            executor = ThreadPoolExecutor(max_workers=max(1, fetch_workers),
+                                          thread_name_prefix='history-fetch')
+            fetch_page = self._threaded_fetcher(service_factory)
+        else:
+            fetch_page = self.fetch_added_messages
+        pending: deque[tuple[HistorySyncResult, Future | list | None]] = deque()
+
+        def deliver(page: HistorySyncResult, fetched: Future | list | None) -> None:
+            nonlocal history_id
+            added = len(page.added_message_ids)
+            if fetched is not None:
+                emails = fetched.result() if isinstance(fetched, Future) else fetched
+                stats['fetch_errors'] += added - len(emails)
+                added = len(emails)
+                if emails:
+                    on_messages_added(emails)
+            elif added and on_messages_added:
+                on_messages_added(page.added_message_ids)
+            stats['added'] += added
+            if self.message_cache is not None:
+                self.message_cache.apply_history(page)
+            if page.deleted_message_ids:
+                stats['deleted'] += len(page.deleted_message_ids)
+                if on_messages_deleted:
+                    on_messages_deleted(page.deleted_message_ids)
+            if page.label_changes:
+                stats['label_changes'] += len(page.label_changes)
+                if on_labels_changed:
+                    on_labels_changed(page.label_changes)
+
+            history_id = page.new_history_id
+            if state_manager is not None:
+                state_manager.update_history_id(history_id, synced_count=added, source=source)
+
+        pages = self.iter_history_pages(last_history_id, label_filter, max_pages)
+        paging_error = None
+        try:
+            while True:
+                try:
+                    page = next(pages)
+                except StopIteration:
+                    break
+                except HttpError as e:
+                    # Still deliver the pages listed before the failure
+                    paging_error = e
+                    break
+                stats['pages_processed'] += 1
+                fetched = None
+                if fetch and page.added_message_ids:
+                    if executor is not None:
+                        fetched = executor.submit(fetch_page, page.added_message_ids)
+                    else:
+                        fetched = fetch_page(page.added_message_ids)
+                pending.append((page, fetched))
+
+                # Deliver finished pages in order; wait when too far ahead
+                while pending and (len(pending) > max_pending_pages
+                                   or not isinstance(pending[0][1], Future)
+                                   or pending[0][1].done()):
+                    deliver(*pending.popleft())
+
+            while pending:
+                deliver(*pending.popleft())
+            if paging_error is not None:
+                raise paging_error
+
+        except HttpError as e:
+            if e.resp.status == 404:
+                raise HistoryExpiredError(
+                    f"History ID {last_history_id} expired - full sync required"
+                ) from e
+            raise RuntimeError(f"History sync failed: {e}") from e
+        finally:
+            for _, fetched in pending:
+                if isinstance(fetched, Future):
+                    fetched.cancel()
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+        logger.info(
+            f"Streamed history sync to {history_id}: {stats['added']} added, "
+            f"{stats['deleted']} deleted, {stats['label_changes']} label changes "
+            f"over {stats['pages_processed']} pages"
+        )
+        return history_id, stats
+
+    def _threaded_fetcher(
+        self,
+        service_factory: Callable[[], Any]
+    ) -> Callable[[list[str]], list[Email]]:
+        """Build a fetch function using one batch client per worker thread."""
+        from gmail_assistant.utils.rate_limiter import get_gmail_rate_limiter
+
+        local = threading.local()
+
+        def fetch(message_ids: list[str]) -> list[Email]:
+            if not hasattr(local, 'client'):
+                local.client = GmailBatchClient(
+                    service_factory(), rate_limiter=get_gmail_rate_limiter(),
+                    message_cache=self.message_cache
+                )
+            return local.client.batch_get_messages(message_ids)
+
+        return fetch
+
     def check_sync_required(
         self,
         stored_history_id: int
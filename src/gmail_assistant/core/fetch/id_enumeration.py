@@ -0,0 +1,443 @@
+"""
+Concurrent message ID enumeration over date-sharded queries.
+
+``messages.list`` pages are chained by ``nextPageToken``, so listing a
+large mailbox is a long serial run of round-trips. The enumerator splits
+the query into disjoint ``after:``/``before:`` windows of epoch seconds and
+lists the windows concurrently. A window whose first page has a
+``nextPageToken`` is split again (by its ``resultSizeEstimate``) until it is
+narrower than ``min_window``; only windows that dense are paged serially.
+Enumeration time therefore scales with concurrency rather than page count.
+
+Windows are ordered newest first and IDs are released in that order as
+soon as every newer window has finished, so the result is the same
+newest-first list (capped at ``max_results``) that serial paging returns,
+de-duplicated across window boundaries. Two open-ended windows before
+``start`` and after ``end`` catch messages with out-of-range dates.
+
+Usage:
+    enumerator = ShardedIdEnumerator(list_page, workers=8)
+    ids = enumerator.enumerate('label:inbox', max_results=100_000)
+
+``list_page(query, page_token, page_size)`` performs one ``messages.list``
+call and returns its response; use ``iter_pages_async``/``enumerate_async``
+with a coroutine function.
+"""
+
+import asyncio
+import heapq
+import logging
+import math
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Gmail launched in 2004; older mail only exists through imports
+GMAIL_EPOCH = 1072915200  # 2004-01-01T00:00:00Z
+PAGE_SIZE = 500  # messages.list maximum
+SERIAL_PAGES = 2  # Results needing at most this many pages are paged serially
+LIST_FIELDS = 'messages(id),nextPageToken,resultSizeEstimate'
+
+
+def needs_sharding(max_results: int | None, page_size: int = PAGE_SIZE,
+                   serial_pages: int = SERIAL_PAGES) -> bool:
+    """Check whether a result is large enough to enumerate by date windows."""
+    return max_results is None or max_results > page_size * serial_pages
+
+
+@dataclass(frozen=True)
+class DateWindow:
+    """Half-open window [start, end) of epoch seconds; None is unbounded."""
+    start: int | None
+    end: int | None
+
+    @property
+    def width(self) -> float:
+        """Window width in seconds (infinite when unbounded)."""
+        if self.start is None or self.end is None:
+            return math.inf
+        return self.end - self.start
+
+    def query(self, base_query: str) -> str:
+        """
+        Restrict a query to this window.
+
+        ``after:`` is given one second early so a message stamped exactly
+        on a boundary is listed by both neighbours rather than neither;
+        duplicates are dropped when windows are merged.
+        """
+        terms = [base_query] if base_query else []
+        if self.start is not None:
+            terms.append(f"after:{self.start - 1}")
+        if self.end is not None:
+            terms.append(f"before:{self.end}")
+        return ' '.join(terms)
+
+    def split(self, parts: int) -> list['DateWindow']:
+        """Split into up to ``parts`` contiguous windows, newest first."""
+        step = max(1, math.ceil(self.width / parts))
+        windows = []
+        end = self.end
+        while end > self.start:
+            start = max(self.start, end - step)
+            windows.append(DateWindow(start, end))
+            end = start
+        return windows
+
+
+@dataclass(eq=False)
+class _Shard:
+    """A window being listed and the IDs found in it so far."""
+    window: DateWindow
+    splittable: bool
+    ids: list[str] = field(default_factory=list)
+    done: bool = False
+
+    @property
+    def priority(self) -> float:
+        """Newest windows are listed first."""
+        return -(self.window.end if self.window.end is not None else math.inf)
+
+
+class _EnumerationState:
+    """Window bookkeeping shared by the threaded and asyncio drivers."""
+
+    def __init__(self, query: str, max_results: int | None, page_size: int,
+                 min_window: int, max_split: int):
+        self.query = query
+        self.max_results = max_results
+        self.page_size = page_size
+        self.min_window = min_window
+        self.max_split = max_split
+
+        self.shards: list[_Shard] = []  # newest first
+        self._tasks: list[tuple[float, int, _Shard, str | None]] = []
+        self._seq = 0
+        self._prefix = 0  # shards[:_prefix] are done and merged
+        self._seen: set[str] = set()
+        self.merged: list[str] = []
+        self._emitted = 0
+        self.stats = {'pages': 0, 'windows': 0, 'splits': 0}
+
+    def add(self, shards: list[_Shard], at: int | None = None) -> None:
+        """Insert shards (newest first) and schedule their first pages."""
+        if at is None:
+            self.shards.extend(shards)
+        else:
+            self.shards[at:at + 1] = shards
+        for shard in shards:
+            self._push(shard, None)
+        self.stats['windows'] += len(shards)
+
+    def _push(self, shard: _Shard, page_token: str | None) -> None:
+        heapq.heappush(self._tasks, (shard.priority, self._seq, shard, page_token))
+        self._seq += 1
+
+    def next_task(self) -> tuple[_Shard, str | None] | None:
+        """Next (shard, page_token) to list, newest window first."""
+        if not self._tasks:
+            return None
+        _, _, shard, page_token = heapq.heappop(self._tasks)
+        return shard, page_token
+
+    def record(self, shard: _Shard, page_token: str | None, response: dict[str, Any]) -> None:
+        """Apply one listed page: split a dense window or keep its IDs."""
+        self.stats['pages'] += 1
+        next_token = response.get('nextPageToken')
+
+        if (page_token is None and next_token and shard.splittable
+                and shard.window.width >= 2 * self.min_window):
+            estimate = response.get('resultSizeEstimate') or 0
+            parts = min(self.max_split, max(2, math.ceil(estimate / self.page_size)))
+            parts = min(parts, int(shard.window.width // self.min_window))
+            children = [_Shard(w, splittable=True) for w in shard.window.split(parts)]
+            self.add(children, at=self.shards.index(shard))
+            self.stats['splits'] += 1
+            return
+
+        shard.ids.extend(m['id'] for m in response.get('messages', []))
+        if next_token:
+            self._push(shard, next_token)
+        else:
+            shard.done = True
+        self._advance()
+
+    def _merge(self, shard: _Shard) -> None:
+        for msg_id in shard.ids:
+            if msg_id not in self._seen:
+                self._seen.add(msg_id)
+                self.merged.append(msg_id)
+        shard.ids = []
+
+    def _advance(self) -> None:
+        """
+        Merge finished shards that have no unfinished shard before them.
+
+        The first unfinished shard's IDs so far are merged too: every newer
+        window is complete, so its pages are already in final order.
+        """
+        while self._prefix < len(self.shards) and self.shards[self._prefix].done:
+            self._merge(self.shards[self._prefix])
+            self._prefix += 1
+        if self._prefix < len(self.shards):
+            self._merge(self.shards[self._prefix])
+
+    @property
+    def complete(self) -> bool:
+        """Every shard is merged, or the newest max_results IDs are known."""
+        if self.max_results is not None and len(self.merged) >= self.max_results:
+            return True
+        return self._prefix == len(self.shards)
+
+    def take_new(self) -> list[str]:
+        """IDs merged since the last call, capped at max_results."""
+        limit = len(self.merged)
+        if self.max_results is not None:
+            limit = min(limit, self.max_results)
+        new = self.merged[self._emitted:limit]
+        self._emitted = max(self._emitted, limit)
+        return new
+
+
+class ShardedIdEnumerator:
+    """
+    Enumerate message IDs for a query with concurrent date-window listing.
+
+    Features:
+    - Disjoint after:/before: windows listed concurrently
+    - Dense windows split by resultSizeEstimate down to min_window
+    - Newest-first, de-duplicated output released incrementally
+    - Threaded (sync list_page) and asyncio (async list_page) drivers
+    """
+
+    def __init__(
+        self,
+        list_page: Callable[..., Any],
+        workers: int = 8,
+        page_size: int = PAGE_SIZE,
+        start: int = GMAIL_EPOCH,
+        end: int | None = None,
+        min_window: int = 3600,
+        max_split: int = 16,
+        serial_pages: int = SERIAL_PAGES
+    ):
+        """
+        Initialize enumerator.
+
+        Args:
+            list_page: ``list_page(query, page_token, page_size)`` returning a
+                ``messages.list`` response (a coroutine function for the
+                async methods)
+            workers: Windows listed concurrently
+            page_size: IDs per ``messages.list`` page (max 500)
+            start: Oldest window boundary in epoch seconds
+            end: Newest window boundary (defaults to one day from now)
+            min_window: Narrowest window in seconds; denser windows are paged
+            max_split: Most windows a dense window is split into at once
+            serial_pages: A result needing at most this many pages is paged
+                serially instead of sharded
+        """
+        self.list_page = list_page
+        self.workers = max(1, workers)
+        self.page_size = page_size
+        self.start = start
+        self.end = end
+        self.min_window = min_window
+        self.max_split = max_split
+        self.serial_pages = serial_pages
+        self.last_stats: dict[str, int] = {}
+
+    def _probe_size(self, max_results: int | None) -> int:
+        return min(self.page_size, max_results) if max_results else self.page_size
+
+    def _plan(self, query: str, max_results: int | None,
+              first_page: dict[str, Any]) -> _EnumerationState:
+        """Build the window plan from the unsharded query's first page."""
+        state = _EnumerationState(query, max_results, self.page_size,
+                                  self.min_window, self.max_split)
+        self.last_stats = state.stats
+        state.stats['pages'] = 1
+
+        first_ids = [m['id'] for m in first_page.get('messages', [])]
+        next_token = first_page.get('nextPageToken')
+        whole = _Shard(DateWindow(None, None), splittable=False, ids=first_ids)
+        state.stats['windows'] = 1
+
+        if not next_token or (max_results and len(first_ids) >= max_results):
+            whole.done = True
+            state.shards.append(whole)
+            state._advance()
+        elif not needs_sharding(max_results, self.page_size, self.serial_pages):
+            # Small result: keep paging the unsharded query
+            state.shards.append(whole)
+            state._push(whole, next_token)
+        else:
+            end = self.end or int(time.time()) + 86400
+            estimate = first_page.get('resultSizeEstimate') or 0
+            parts = min(self.workers * 2, max(2, math.ceil(estimate / self.page_size)))
+            windows = DateWindow(self.start, end).split(parts)
+            state.stats['windows'] = 0
+            state.add(
+                [_Shard(DateWindow(end, None), splittable=False)]
+                + [_Shard(w, splittable=True) for w in windows]
+                + [_Shard(DateWindow(None, self.start), splittable=False)]
+            )
+            logger.info(
+                f"Enumerating ~{estimate} IDs over {len(windows)} date windows "
+                f"with {self.workers} workers"
+            )
+        return state
+
+    def _page_args(self, state: _EnumerationState, shard: _Shard,
+                   page_token: str | None) -> tuple[str, str | None, int]:
+        return shard.window.query(state.query), page_token, self.page_size
+
+    def iter_pages(self, query: str, max_results: int | None = None,
+                   first_page: dict[str, Any] | None = None) -> Iterator[list[str]]:
+        """
+        Enumerate IDs with a thread pool, yielding them newest first.
+
+        ``list_page`` must be safe to call from several threads (e.g. use a
+        per-thread service from GmailServicePool).
+
+        Args:
+            query: Gmail search query
+            max_results: Maximum IDs to return (None for all)
+            first_page: Already-fetched first page of the unsharded query
+
+        Yields:
+            Lists of newly available IDs
+        """
+        if first_page is None:
+            first_page = self.list_page(query, None, self._probe_size(max_results))
+        state = self._plan(query, max_results, first_page)
+        if new := state.take_new():
+            yield new
+        if state.complete:
+            return
+
+        with ThreadPoolExecutor(max_workers=self.workers,
+                                thread_name_prefix='id-enum') as executor:
+            in_flight: dict[Any, tuple[_Shard, str | None]] = {}
+            try:
+                while not state.complete:
+                    while len(in_flight) < self.workers and (task := state.next_task()):
+                        future = executor.submit(self.list_page, *self._page_args(state, *task))
+                        in_flight[future] = task
+                    if not in_flight:
+                        break
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        shard, page_token = in_flight.pop(future)
+                        state.record(shard, page_token, future.result())
+                    if new := state.take_new():
+                        yield new
+            finally:
+                for future in in_flight:
+                    future.cancel()
+
+        self._log_done(state)
+
+    def enumerate(self, query: str, max_results: int | None = None,
+                  first_page: dict[str, Any] | None = None) -> list[str]:
+        """Enumerate all IDs with a thread pool (see iter_pages)."""
+        ids = []
+        for page in self.iter_pages(query, max_results, first_page):
+            ids.extend(page)
+        return ids
+
+    async def iter_pages_async(self, query: str, max_results: int | None = None,
+                               first_page: dict[str, Any] | None = None
+                               ) -> AsyncIterator[list[str]]:
+        """
+        Enumerate IDs with concurrent coroutines, yielding them newest first.
+
+        Args:
+            query: Gmail search query
+            max_results: Maximum IDs to return (None for all)
+            first_page: Already-fetched first page of the unsharded query
+
+        Yields:
+            Lists of newly available IDs
+        """
+        if first_page is None:
+            first_page = await self.list_page(query, None, self._probe_size(max_results))
+        state = self._plan(query, max_results, first_page)
+        if new := state.take_new():
+            yield new
+        if state.complete:
+            return
+
+        in_flight: dict[asyncio.Task, tuple[_Shard, str | None]] = {}
+        try:
+            while not state.complete:
+                while len(in_flight) < self.workers and (task := state.next_task()):
+                    coro = self.list_page(*self._page_args(state, *task))
+                    in_flight[asyncio.ensure_future(coro)] = task
+                if not in_flight:
+                    break
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    shard, page_token = in_flight.pop(future)
+                    state.record(shard, page_token, future.result())
+                if new := state.take_new():
+                    yield new
+        finally:
+            for future in in_flight:
+                future.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+        self._log_done(state)
+
+    async def enumerate_async(self, query: str, max_results: int | None = None,
+                              first_page: dict[str, Any] | None = None) -> list[str]:
+        """Enumerate all IDs with coroutines (see iter_pages_async)."""
+        ids = []
+        async for page in self.iter_pages_async(query, max_results, first_page):
+            ids.extend(page)
+        return ids
+
+    def _log_done(self, state: _EnumerationState) -> None:
+        stats = state.stats
+        logger.info(
+            f"Enumerated {min(len(state.merged), state.max_results or math.inf)} IDs: "
+            f"{stats['pages']} pages, {stats['windows']} windows, {stats['splits']} splits"
+        )
+
+
+def pooled_page_lister(service_pool: Any, rate_limiter: Any = None) -> Callable[..., dict]:
+    """
+    Build a thread-safe ``list_page`` on per-thread pooled services.
+
+    Args:
+        service_pool: GmailServicePool
+        rate_limiter: Optional GmailRateLimiter charged per page
+
+    Returns:
+        Callable usable as ShardedIdEnumerator's list_page
+    """
+    def list_page(query: str, page_token: str | None, page_size: int) -> dict:
+        service = service_pool.get_service()
+        if service is None:
+            raise RuntimeError("Gmail service not available")
+        if rate_limiter is not None:
+            rate_limiter.wait_if_needed(5)
+        params = {'userId': 'me', 'q': query, 'maxResults': page_size, 'fields': LIST_FIELDS}
+        if page_token:
+            params['pageToken'] = page_token
+        return service.users().messages().list(**params).execute()
+
+    return list_page
+
+
+__all__ = [
+    'GMAIL_EPOCH',
+    'DateWindow',
+    'ShardedIdEnumerator',
+    'needs_sharding',
+    'pooled_page_lister',
+]
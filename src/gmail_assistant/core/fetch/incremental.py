@@ -25,6 +25,7 @@ from pathlib import Path
 
 from gmail_assistant.core.fetch.checkpoint import CheckpointManager, SyncCheckpoint
 from gmail_assistant.core.fetch.gmail_assistant import GmailFetcher
+from gmail_assistant.core.fetch.message_index import MessageIndex
 from gmail_assistant.utils.input_validator import ValidationError
 
 # Setup logging
@@ -113,8 +114,8 @@ class IncrementalGmailFetcher:
         query = f"after:{latest_date}"
         logger.info(f"Fetching emails with query: {query}")
 
-        # C-3: Check for resumable checkpoint
-        skip_count = 0
+        # C-3: Check for resumable checkpoint; already downloaded messages are
+        # skipped through the output directory's message index
         if resume:
             existing = self.checkpoint_manager.get_latest_checkpoint(
                 query=query,
@@ -124,8 +125,7 @@ class IncrementalGmailFetcher:
                 logger.info(f"Found resumable checkpoint: {existing.sync_id}")
                 resume_info = self.checkpoint_manager.get_resume_info(existing)
                 self.current_checkpoint = existing
-                skip_count = resume_info['skip_count']
-                logger.info(f"Resuming from message {skip_count}")
+                logger.info(f"Resuming after {resume_info['skip_count']} processed messages")
             else:
                 logger.info("No checkpoint found, starting fresh")
 
@@ -139,6 +139,7 @@ class IncrementalGmailFetcher:
         # Create output directory
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
+        index = MessageIndex.for_output_dir(output_path)
 
         try:
             # Search for new emails
@@ -163,10 +164,12 @@ class IncrementalGmailFetcher:
             self.current_checkpoint.total_messages = len(message_ids)
 
             # Download emails as EML format only
+            known = index.known_ids(message_ids)
+            if known:
+                logger.info(f"Skipping {len(known)} already downloaded emails")
             successful_downloads = 0
             for i, message_id in enumerate(message_ids, 1):
-                # C-3: Skip already processed messages when resuming
-                if i <= skip_count:
+                if message_id in known:
                     continue
 
                 try:
@@ -197,8 +200,10 @@ class IncrementalGmailFetcher:
 
                         # Save as EML in organized structure
                         eml_path = year_month_dir / filename
+                        raw_content = email_data.get('raw_content', '')
                         with open(eml_path, 'w', encoding='utf-8') as f:
-                            f.write(email_data.get('raw_content', ''))
+                            f.write(raw_content)
+                        index.record(message_id, eml_path, raw_content)
 
                         successful_downloads += 1
                         logger.info(f"Downloaded {i}/{len(message_ids)}: {filename}")
@@ -228,6 +233,8 @@ class IncrementalGmailFetcher:
                 self.checkpoint_manager.mark_interrupted(self.current_checkpoint)
             logger.error(f"Error during email fetch: {e}")
             return False, ""
+        finally:
+            index.close()
 
 
     def run_incremental_fetch(self,
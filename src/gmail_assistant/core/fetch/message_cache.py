@@ -0,0 +1,198 @@
+"""
+Read-through cache of ``messages.get`` responses keyed by gmail_id.
+
+A full-format message never changes after delivery except for its labels
+(and the historyId that records the change), so fetch paths can serve a
+repeated ``messages.get`` from the cache. History sync keeps cached
+entries current: label changes are patched into the cached message and
+deleted messages are dropped, so a warm re-run only pays for messages it
+has never seen.
+
+Entries live in ``CacheManager``'s content cache and therefore persist
+across runs.
+
+Usage:
+    cache = MessageCache()
+    fetcher = GmailFetcher(credentials_file, message_cache=cache)
+    ...
+    print(cache.get_stats()['hit_rate'])
+"""
+
+import logging
+import threading
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any
+
+from gmail_assistant.utils.cache_manager import CacheManager
+
+if TYPE_CHECKING:
+    from .history_sync import HistorySyncResult
+
+logger = logging.getLogger(__name__)
+
+
+class MessageCache:
+    """
+    Thread-safe read-through cache for full-format Gmail messages.
+
+    Only ``format='full'`` responses are cached; other formats return a
+    subset of the same data and are cheap to request.
+
+    Example:
+        >>> cache = MessageCache()
+        >>> message = cache.fetch('id1', lambda: service.users().messages().get(
+        ...     userId='me', id='id1', format='full').execute())
+    """
+
+    def __init__(self, cache_manager: CacheManager | None = None):
+        """
+        Initialize message cache.
+
+        Args:
+            cache_manager: Cache manager to store messages in; defaults to
+                a new one using the standard cache directory
+        """
+        self.cache_manager = cache_manager or CacheManager()
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'stored': 0,
+            'label_updates': 0,
+            'invalidated': 0,
+        }
+
+    def _count(self, name: str, delta: int = 1) -> None:
+        """Thread-safe increment of a stats counter."""
+        with self._lock:
+            self._stats[name] += delta
+
+    def get(self, message_id: str) -> dict[str, Any] | None:
+        """
+        Get a cached message, counting the lookup as a hit or miss.
+
+        Args:
+            message_id: Gmail message ID
+
+        Returns:
+            The cached message, or None
+        """
+        message = self.cache_manager.get_message(message_id)
+        self._count('hits' if message is not None else 'misses')
+        return message
+
+    def get_many(self, message_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """
+        Get the cached subset of several messages.
+
+        Args:
+            message_ids: Gmail message IDs
+
+        Returns:
+            Dictionary mapping message_id to cached message
+        """
+        found = {}
+        with self.cache_manager.content_cache.batch_operations():
+            for message_id in message_ids:
+                message = self.get(message_id)
+                if message is not None:
+                    found[message_id] = message
+        return found
+
+    def put(self, message: dict[str, Any]) -> None:
+        """
+        Store a full-format message.
+
+        Args:
+            message: ``messages.get`` response with at least an ``id``
+        """
+        if not message or 'id' not in message:
+            return
+        self.cache_manager.cache_message(message)
+        self._count('stored')
+
+    def put_many(self, messages: Iterable[dict[str, Any]]) -> None:
+        """Store several full-format messages in one batch."""
+        with self.cache_manager.content_cache.batch_operations():
+            for message in messages:
+                self.put(message)
+
+    def fetch(self, message_id: str,
+              loader: Callable[[], dict[str, Any] | None]) -> dict[str, Any] | None:
+        """
+        Return a cached message, or load and cache it.
+
+        Args:
+            message_id: Gmail message ID
+            loader: Performs the ``messages.get`` call on a miss
+
+        Returns:
+            The message, or None if the loader returned None
+        """
+        message = self.get(message_id)
+        if message is None:
+            message = loader()
+            if message is not None:
+                self.put(message)
+        return message
+
+    def invalidate(self, message_ids: Iterable[str]) -> int:
+        """
+        Drop messages from the cache.
+
+        Args:
+            message_ids: Gmail message IDs
+
+        Returns:
+            Number of cached messages removed
+        """
+        removed = 0
+        with self.cache_manager.content_cache.batch_operations():
+            for message_id in message_ids:
+                if self.cache_manager.invalidate_message(message_id):
+                    removed += 1
+        self._count('invalidated', removed)
+        return removed
+
+    def apply_history(self, result: 'HistorySyncResult') -> None:
+        """
+        Bring cached messages up to date with a history sync.
+
+        Label changes are applied to the cached copy in order; deleted
+        messages are removed.
+
+        Args:
+            result: Successful history sync result
+        """
+        updated = 0
+        with self.cache_manager.content_cache.batch_operations():
+            for change in result.label_changes:
+                message = self.cache_manager.get_message(change.message_id)
+                if message is None:
+                    continue
+                labels = [label for label in message.get('labelIds', [])
+                          if label not in change.removed_labels]
+                labels.extend(label for label in change.added_labels if label not in labels)
+                message['labelIds'] = labels
+                message['historyId'] = str(change.history_id)
+                self.cache_manager.cache_message(message)
+                updated += 1
+        self._count('label_updates', updated)
+
+        if result.deleted_message_ids:
+            self.invalidate(result.deleted_message_ids)
+
+    def close(self) -> None:
+        """Flush and close the underlying caches."""
+        self.cache_manager.close()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get hit/miss counters and the hit rate."""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+
+__all__ = ['MessageCache']
@@ -0,0 +1,192 @@
+"""
+Persistent index of messages already downloaded to a backup directory.
+
+Fetch paths consult the index in bulk after ``messages.list`` and only call
+``messages.get`` for IDs it does not know, so re-running a backup over an
+unchanged mailbox costs only the list calls. Unlike a positional
+``skip_count``, the index stays correct when the mailbox changes between
+runs.
+
+Each entry stores the gmail_id, the primary file written for it and a
+SHA-256 of the written content. The index lives next to the files it
+describes (``<output_dir>/.message_index.db``), so moving or copying a
+backup keeps its index.
+
+Usage:
+    index = MessageIndex.for_output_dir('gmail_backup')
+    new_ids = index.filter_new(message_ids)
+    ...
+    index.record(message_id, path, content)
+    index.close()
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class MessageIndex:
+    """
+    SQLite-backed set of downloaded gmail_ids with their file and content hash.
+
+    Thread-safe: pipeline writer threads may call record() concurrently.
+    Records are committed in groups of ``commit_every``; call flush() or
+    close() to persist the remainder.
+
+    Example:
+        >>> with MessageIndex.for_output_dir('gmail_backup') as index:
+        ...     todo = index.filter_new(['id1', 'id2'])
+    """
+
+    FILENAME = '.message_index.db'
+    LOOKUP_CHUNK_SIZE = 500  # stays below SQLite's bound-parameter limit
+
+    def __init__(self, db_path: str | Path, verify_files: bool = True,
+                 commit_every: int = 100):
+        """
+        Open (or create) a message index.
+
+        Args:
+            db_path: Path to the SQLite index file
+            verify_files: Treat entries whose file no longer exists as not
+                downloaded, so deleted files are fetched again
+            commit_every: Records buffered per commit
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.verify_files = verify_files
+        self.commit_every = commit_every
+
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS downloaded_messages (
+                gmail_id TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                downloaded_at TEXT NOT NULL
+            ) WITHOUT ROWID;
+        """)
+        self._conn.commit()
+        logger.debug(f"Message index opened: {self.db_path}")
+
+    @classmethod
+    def for_output_dir(cls, output_dir: str | Path, **kwargs) -> 'MessageIndex':
+        """Open the index stored inside a backup directory."""
+        return cls(Path(output_dir) / cls.FILENAME, **kwargs)
+
+    @staticmethod
+    def content_hash(*contents: str | bytes) -> str:
+        """SHA-256 over one or more written contents, in order."""
+        digest = hashlib.sha256()
+        for content in contents:
+            digest.update(content.encode('utf-8') if isinstance(content, str) else content)
+        return digest.hexdigest()
+
+    def lookup(self, message_ids: Iterable[str]) -> dict[str, tuple[str, str]]:
+        """
+        Fetch index entries for many IDs at once.
+
+        Returns:
+            Mapping of known gmail_id to (path, content_hash)
+        """
+        ids = list(dict.fromkeys(message_ids))
+        found: dict[str, tuple[str, str]] = {}
+        with self._lock:
+            for i in range(0, len(ids), self.LOOKUP_CHUNK_SIZE):
+                chunk = ids[i:i + self.LOOKUP_CHUNK_SIZE]
+                placeholders = ', '.join(['?'] * len(chunk))
+                rows = self._conn.execute(
+                    "SELECT gmail_id, path, content_hash FROM downloaded_messages "
+                    f"WHERE gmail_id IN ({placeholders})",
+                    chunk
+                )
+                found.update((gmail_id, (path, digest)) for gmail_id, path, digest in rows)
+        return found
+
+    def known_ids(self, message_ids: Iterable[str]) -> set[str]:
+        """
+        IDs among message_ids that are already downloaded.
+
+        With verify_files, entries whose file has been removed are not
+        counted as downloaded.
+        """
+        entries = self.lookup(message_ids)
+        if not self.verify_files:
+            return set(entries)
+        return {gmail_id for gmail_id, (path, _) in entries.items() if Path(path).exists()}
+
+    def filter_new(self, message_ids: list[str]) -> list[str]:
+        """Return message_ids not yet downloaded, preserving order."""
+        known = self.known_ids(message_ids)
+        if known:
+            logger.info(f"Message index: skipping {len(known)} already downloaded message(s)")
+        return [message_id for message_id in message_ids if message_id not in known]
+
+    def record(self, message_id: str, path: str | Path, *contents: str | bytes) -> None:
+        """
+        Record a downloaded message.
+
+        Args:
+            message_id: Gmail message ID
+            path: Primary file written for the message
+            *contents: Content written for the message, hashed for later checks
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO downloaded_messages "
+                "(gmail_id, path, content_hash, downloaded_at) VALUES (?, ?, ?, ?)",
+                (message_id, str(path), self.content_hash(*contents),
+                 datetime.now().isoformat())
+            )
+            self._pending += 1
+            if self._pending >= self.commit_every:
+                self._conn.commit()
+                self._pending = 0
+
+    def forget(self, message_ids: Iterable[str]) -> int:
+        """Remove entries, e.g. for messages deleted from the backup."""
+        with self._lock:
+            removed = self._conn.executemany(
+                "DELETE FROM downloaded_messages WHERE gmail_id = ?",
+                [(message_id,) for message_id in message_ids]
+            ).rowcount
+            self._conn.commit()
+            self._pending = 0
+        return removed
+
+    def flush(self) -> None:
+        """Commit buffered records."""
+        with self._lock:
+            self._conn.commit()
+            self._pending = 0
+
+    def close(self) -> None:
+        """Commit buffered records and close the index."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM downloaded_messages").fetchone()[0]
+
+    def __enter__(self) -> 'MessageIndex':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+__all__ = ['MessageIndex']
@@ -0,0 +1,302 @@
+"""
+Pipelined download engine for GmailFetcher.
+Overlaps network, CPU and disk work instead of handling one message at a time.
+
+A download is split into three stages connected by bounded queues:
+
+    fetch (batched messages.get) -> render (EML/Markdown) -> write (atomic_write)
+
+Bounded queues provide backpressure: when the writers fall behind, renderers
+block on a full queue, which in turn stalls the fetchers, so memory stays
+proportional to ``queue_size`` rather than to the number of messages.
+
+Usage:
+    pipeline = DownloadPipeline(fetcher, PipelineConfig(render_workers=4))
+    stats = pipeline.run(message_ids, output_dir='gmail_backup')
+    print(f"{stats.downloaded} saved, {stats.errors} errors")
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+try:
+    from googleapiclient.errors import HttpError
+except ImportError:
+    HttpError = Exception
+
+from gmail_assistant.utils.rate_limiter import get_gmail_rate_limiter
+
+from .batch_api import GmailBatchClient
+
+if TYPE_CHECKING:
+    from .gmail_assistant import GmailFetcher
+    from .message_index import MessageIndex
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's input
+_SENTINEL = object()
+
+
+@dataclass
+class PipelineConfig:
+    """
+    Stage widths and queue bounds for DownloadPipeline.
+
+    Attributes:
+        fetch_batch_size: Message IDs per batched messages.get call (max 100)
+        fetch_workers: Concurrent fetch threads. Values above 1 require a
+            ``service_factory`` that returns a separate service per thread,
+            because googleapiclient services are not thread-safe.
+        render_workers: Threads converting messages to EML/Markdown
+        write_workers: Threads writing rendered files to disk
+        queue_size: Maximum items buffered between two stages
+    """
+    fetch_batch_size: int = 50
+    fetch_workers: int = 1
+    render_workers: int = 4
+    write_workers: int = 2
+    queue_size: int = 200
+
+    def __post_init__(self) -> None:
+        if not 1 <= self.fetch_batch_size <= GmailBatchClient.MAX_BATCH_SIZE:
+            raise ValueError(
+                f"fetch_batch_size must be between 1 and {GmailBatchClient.MAX_BATCH_SIZE}"
+            )
+        for name in ('fetch_workers', 'render_workers', 'write_workers', 'queue_size'):
+            if getattr(self, name) < 1:
+                raise ValueError(f"{name} must be at least 1")
+
+
+@dataclass
+class PipelineStats:
+    """Outcome of a pipelined download."""
+    total: int = 0
+    fetched: int = 0
+    downloaded: int = 0
+    errors: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def messages_per_second(self) -> float:
+        """Downloaded messages per second of wall-clock time."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.downloaded / self.elapsed_seconds
+
+
+class DownloadPipeline:
+    """
+    Bounded producer/consumer pipeline for downloading messages to disk.
+
+    Produces the same directory layout, filenames and error accounting as
+    ``GmailFetcher.download_emails`` in sequential mode; only the scheduling
+    differs.
+    """
+
+    def __init__(
+        self,
+        fetcher: GmailFetcher,
+        config: PipelineConfig | None = None,
+        service_factory: Callable[[], Any] | None = None,
+        index: MessageIndex | None = None
+    ):
+        """
+        Initialize download pipeline.
+
+        Args:
+            fetcher: Authenticated GmailFetcher providing rendering helpers
+            config: Stage widths and queue bounds
+            service_factory: Callable returning a Gmail service for a fetch
+                worker. Defaults to the fetcher's shared service.
+            index: Download index to record written messages in
+        """
+        self.fetcher = fetcher
+        self.config = config or PipelineConfig()
+        self.index = index
+        self.service_factory = service_factory or (lambda: fetcher.service)
+        self.rate_limiter = get_gmail_rate_limiter()
+
+        if self.config.fetch_workers > 1 and service_factory is None:
+            logger.warning(
+                "fetch_workers > 1 without a service_factory shares one "
+                "non-thread-safe service; falling back to a single fetch worker"
+            )
+            self._fetch_workers = 1
+        else:
+            self._fetch_workers = self.config.fetch_workers
+
+        self._stats = PipelineStats()
+        self._stats_lock = threading.Lock()
+
+    def run(
+        self,
+        message_ids: list[str],
+        output_dir: str,
+        format_type: str = 'both',
+        organize_by: str = 'date'
+    ) -> PipelineStats:
+        """
+        Download messages through the fetch/render/write pipeline.
+
+        Args:
+            message_ids: Gmail message IDs to download
+            output_dir: Output directory path
+            format_type: Output format ('eml', 'markdown', 'both')
+            organize_by: File organization ('date', 'sender', 'none')
+
+        Returns:
+            PipelineStats for the run
+        """
+        self._stats = PipelineStats(total=len(message_ids))
+        if not message_ids:
+            return self._stats
+
+        start = time.monotonic()
+        batch_size = self.config.fetch_batch_size
+
+        id_queue: queue.Queue = queue.Queue()
+        for i in range(0, len(message_ids), batch_size):
+            id_queue.put(message_ids[i:i + batch_size])
+
+        render_queue: queue.Queue = queue.Queue(maxsize=self.config.queue_size)
+        write_queue: queue.Queue = queue.Queue(maxsize=self.config.queue_size)
+
+        fetchers = self._start_workers(
+            'fetch', self._fetch_worker, self._fetch_workers, id_queue, render_queue
+        )
+        renderers = self._start_workers(
+            'render', self._render_worker, self.config.render_workers,
+            render_queue, write_queue, output_dir, format_type, organize_by
+        )
+        writers = self._start_workers(
+            'write', self._write_worker, self.config.write_workers, write_queue
+        )
+
+        # Shut stages down in order so every queued item is drained
+        self._join_stage(fetchers, render_queue, self.config.render_workers)
+        self._join_stage(renderers, write_queue, self.config.write_workers)
+        self._join_stage(writers)
+
+        self._stats.elapsed_seconds = time.monotonic() - start
+        logger.info(
+            f"Pipeline complete: {self._stats.downloaded}/{self._stats.total} saved, "
+            f"{self._stats.errors} errors, {self._stats.messages_per_second:.1f} msg/s"
+        )
+        return self._stats
+
+    def _start_workers(self, name: str, target: Callable[..., None],
+                       count: int, *args: Any) -> list[threading.Thread]:
+        """Start ``count`` daemon threads running ``target(*args)``."""
+        threads = []
+        for i in range(count):
+            thread = threading.Thread(
+                target=target, args=args, name=f"pipeline-{name}-{i}", daemon=True
+            )
+            thread.start()
+            threads.append(thread)
+        return threads
+
+    @staticmethod
+    def _join_stage(threads: list[threading.Thread],
+                    downstream: queue.Queue | None = None,
+                    downstream_workers: int = 0) -> None:
+        """Wait for a stage to finish, then signal end-of-input downstream."""
+        for thread in threads:
+            thread.join()
+        if downstream is not None:
+            for _ in range(downstream_workers):
+                downstream.put(_SENTINEL)
+
+    def _record(self, **deltas: int) -> None:
+        """Thread-safe increment of stats counters."""
+        with self._stats_lock:
+            for name, delta in deltas.items():
+                setattr(self._stats, name, getattr(self._stats, name) + delta)
+
+    def _fetch_worker(self, id_queue: queue.Queue, render_queue: queue.Queue) -> None:
+        """Fetch stage: batched messages.get, validated, handed to renderers."""
+        client = GmailBatchClient(self.service_factory(), rate_limiter=self.rate_limiter,
+                                  message_cache=self.fetcher.message_cache)
+
+        while True:
+            try:
+                chunk = id_queue.get_nowait()
+            except queue.Empty:
+                return
+
+            try:
+                raw = client.batch_get_messages_raw(chunk)
+            except HttpError as e:
+                logger.error(f"API error downloading email: {e}")
+                self._record(errors=len(chunk))
+                continue
+
+            for message_id in chunk:
+                message = self.fetcher._validate_message(raw.get(message_id), message_id)
+                if message is None:
+                    logger.warning(f"Failed to fetch message {message_id}")
+                    self._record(errors=1)
+                    continue
+                self._record(fetched=1)
+                render_queue.put(message)
+
+    def _render_worker(self, render_queue: queue.Queue, write_queue: queue.Queue,
+                       output_dir: str, format_type: str, organize_by: str) -> None:
+        """Render stage: build EML/Markdown content and target paths."""
+        # html2text converters keep parser state, so each thread needs its own
+        html_converter = self.fetcher._create_html_converter()
+
+        while True:
+            message = render_queue.get()
+            if message is _SENTINEL:
+                return
+
+            try:
+                sub_dir, base_filename = self.fetcher._plan_email_output(
+                    message, output_dir, organize_by
+                )
+                files = self.fetcher._render_email_files(
+                    message, sub_dir, base_filename, format_type, html_converter
+                )
+                write_queue.put((message['id'], files))
+            except OSError as e:
+                logger.error(f"File system error: {e}")
+                self._record(errors=1)
+            except (ValueError, KeyError) as e:
+                logger.warning(f"Email parsing error: {e}")
+                self._record(errors=1)
+            except Exception as e:
+                # Keep draining so upstream stages never block on a dead consumer
+                logger.exception(f"Unexpected render error for {message.get('id')}: {e}")
+                self._record(errors=1)
+
+    def _write_worker(self, write_queue: queue.Queue) -> None:
+        """Write stage: persist rendered files atomically."""
+        while True:
+            item = write_queue.get()
+            if item is _SENTINEL:
+                return
+
+            try:
+                message_id, files = item
+                for path, content in files:
+                    self.fetcher.atomic_write(path, content)
+                self.fetcher._record_download(self.index, message_id, files)
+                self._record(downloaded=1)
+            except OSError as e:
+                logger.error(f"File system error: {e}")
+                self._record(errors=1)
+            except Exception as e:
+                logger.exception(f"Unexpected write error: {e}")
+                self._record(errors=1)
+
+
+__all__ = ['DownloadPipeline', 'PipelineConfig', 'PipelineStats']
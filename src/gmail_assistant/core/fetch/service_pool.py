@@ -0,0 +1,178 @@
+"""
+Per-thread Gmail service pool for concurrent API access.
+
+googleapiclient service objects wrap a single httplib2.Http, which is not
+thread-safe: sharing one service across a ThreadPoolExecutor produces
+sporadic SSL and "connection reset" errors under load. The pool gives every
+worker thread its own authorized HTTP transport (with keep-alive connections)
+while sharing one set of OAuth credentials and one parsed discovery document.
+
+Usage:
+    pool = GmailServicePool(credential_manager)
+
+    # Inside a worker thread
+    service = pool.get_service()
+    service.users().messages().get(userId='me', id=msg_id).execute()
+
+    print(pool.get_stats())
+    pool.close()
+"""
+
+import json
+import logging
+import threading
+from typing import Any
+
+try:
+    import google_auth_httplib2
+    import httplib2
+    from google.auth.transport.requests import Request
+    from googleapiclient import discovery_cache
+    from googleapiclient.discovery import build, build_from_document
+    GMAIL_API_AVAILABLE = True
+except ImportError:
+    GMAIL_API_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class GmailServicePool:
+    """
+    Thread-local pool of Gmail services built from shared credentials.
+
+    Features:
+    - One service and HTTP transport per worker thread
+    - Discovery document loaded once and reused for every service
+    - Single-flight token refresh shared by all workers
+    - Pool size and reuse counters for diagnostics
+    """
+
+    API_NAME = 'gmail'
+    API_VERSION = 'v1'
+
+    def __init__(self, credential_manager: Any, http_timeout: int = 60):
+        """
+        Initialize service pool.
+
+        Args:
+            credential_manager: SecureCredentialManager providing credentials
+            http_timeout: Socket timeout in seconds for each HTTP transport
+        """
+        if not GMAIL_API_AVAILABLE:
+            raise ImportError(
+                "google-api-python-client required. "
+                "Install with: pip install google-api-python-client"
+            )
+
+        self.credential_manager = credential_manager
+        self.http_timeout = http_timeout
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._discovery_doc: dict[str, Any] | None = None
+        self._transports: list[Any] = []
+
+        # Counters
+        self._checkouts = 0
+        self._token_refreshes = 0
+
+    def get_service(self) -> Any | None:
+        """
+        Get the calling thread's Gmail service, creating it on first use.
+
+        Returns:
+            Gmail service object, or None if not authenticated
+        """
+        credentials = self.credential_manager.get_credentials()
+        if credentials is None:
+            return None
+
+        self._ensure_fresh(credentials)
+
+        service = getattr(self._local, 'service', None)
+        if service is None:
+            service = self._build_service(credentials)
+            self._local.service = service
+
+        with self._lock:
+            self._checkouts += 1
+        return service
+
+    def _ensure_fresh(self, credentials: Any) -> None:
+        """Refresh expired credentials once on behalf of every worker."""
+        if credentials.valid:
+            return
+
+        with self._refresh_lock:
+            # Another worker may have refreshed while we waited
+            if credentials.valid:
+                return
+            credentials.refresh(Request())
+            self._token_refreshes += 1
+            logger.info("Refreshed shared Gmail credentials for service pool")
+
+    def _build_service(self, credentials: Any) -> Any:
+        """Build a service with its own authorized HTTP transport."""
+        http = google_auth_httplib2.AuthorizedHttp(
+            credentials, http=httplib2.Http(timeout=self.http_timeout)
+        )
+        doc = self._get_discovery_doc()
+
+        if doc is not None:
+            service = build_from_document(doc, http=http)
+        else:
+            service = build(self.API_NAME, self.API_VERSION, http=http,
+                            cache_discovery=False)
+
+        with self._lock:
+            self._transports.append(http)
+            size = len(self._transports)
+
+        logger.debug(
+            f"Created Gmail service for {threading.current_thread().name} (pool size {size})"
+        )
+        return service
+
+    def _get_discovery_doc(self) -> dict[str, Any] | None:
+        """Parse the bundled discovery document once for the lifetime of the pool."""
+        if self._discovery_doc is None:
+            with self._lock:
+                if self._discovery_doc is None:
+                    raw = discovery_cache.get_static_doc(self.API_NAME, self.API_VERSION)
+                    if raw is not None:
+                        self._discovery_doc = json.loads(raw)
+        return self._discovery_doc
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with pool size, checkouts, reuse and refresh counters
+        """
+        with self._lock:
+            pool_size = len(self._transports)
+            open_connections = sum(
+                len(getattr(getattr(t, 'http', None), 'connections', {}) or {})
+                for t in self._transports
+            )
+            return {
+                'pool_size': pool_size,
+                'checkouts': self._checkouts,
+                'reused': max(0, self._checkouts - pool_size),
+                'open_connections': open_connections,
+                'token_refreshes': self._token_refreshes,
+            }
+
+    def close(self) -> None:
+        """Close all pooled HTTP connections."""
+        with self._lock:
+            for transport in self._transports:
+                try:
+                    transport.close()
+                except Exception as e:
+                    logger.debug(f"Error closing pooled transport: {e}")
+            self._transports.clear()
+            # Threads that call get_service() again get fresh transports
+            self._local = threading.local()
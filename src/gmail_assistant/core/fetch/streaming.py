@@ -6,7 +6,7 @@ Processes emails progressively to handle large datasets efficiently.
 import logging
 from collections.abc import Iterator
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from gmail_assistant.core.auth.credential_manager import SecureCredentialManager
 from gmail_assistant.utils.memory_manager import (
@@ -15,25 +15,34 @@ from gmail_assistant.utils.memory_manager import (
     StreamingEmailProcessor,
 )
 
+from .id_enumeration import LIST_FIELDS, ShardedIdEnumerator, needs_sharding, pooled_page_lister
+from .service_pool import GmailServicePool
+
+if TYPE_CHECKING:
+    from .message_cache import MessageCache
+
 logger = logging.getLogger(__name__)
 
 
 class StreamingGmailFetcher:
     """Gmail fetcher optimized for large-scale operations with memory streaming."""
 
-    def __init__(self, credentials_file: str = 'credentials.json', batch_size: int = 100):
+    def __init__(self, credentials_file: str = 'credentials.json', batch_size: int = 100,
+                 message_cache: 'MessageCache | None' = None):
         """
         Initialize streaming Gmail fetcher.
 
         Args:
             credentials_file: Path to OAuth credentials
             batch_size: Number of emails to process in each batch
+            message_cache: Optional cache consulted before messages.get
         """
         self.credential_manager = SecureCredentialManager(credentials_file)
         self.memory_tracker = MemoryTracker()
         self.streaming_processor = StreamingEmailProcessor(chunk_size=batch_size)
         self.progressive_loader = ProgressiveLoader(batch_size=batch_size)
         self.batch_size = batch_size
+        self.message_cache = message_cache
         self.logger = logging.getLogger(__name__)
 
     @property
@@ -41,13 +50,18 @@ class StreamingGmailFetcher:
         """Get Gmail service with authentication."""
         return self.credential_manager.get_service()
 
-    def fetch_email_ids_streaming(self, query: str, max_results: int = 1000) -> Iterator[str]:
+    def fetch_email_ids_streaming(self, query: str, max_results: int = 1000,
+                                  workers: int = 8) -> Iterator[str]:
         """
         Fetch email IDs in streaming fashion.
 
+        Large results are listed over concurrent date windows; IDs are
+        still yielded newest first.
+
         Args:
             query: Gmail search query
             max_results: Maximum number of emails to fetch
+            workers: Concurrent list requests when enumerating by date window
 
         Yields:
             Email IDs
@@ -69,7 +83,7 @@ class StreamingGmailFetcher:
                     'userId': 'me',
                     'q': query,
                     'maxResults': page_size,
-                    'fields': 'messages(id),nextPageToken'
+                    'fields': LIST_FIELDS
                 }
 
                 if next_page_token:
@@ -78,6 +92,13 @@ class StreamingGmailFetcher:
                 # Execute request
                 result = service.users().messages().list(**request_params).execute()
 
+                if (not next_page_token and result.get('nextPageToken')
+                        and needs_sharding(max_results)):
+                    fetched_count = yield from self._fetch_email_ids_sharded(
+                        query, max_results, result, workers
+                    )
+                    break
+
                 # Process messages
                 messages = result.get('messages', [])
                 for message in messages:
@@ -104,6 +125,25 @@ class StreamingGmailFetcher:
 
         self.logger.info(f"Fetched {fetched_count} email IDs for query: {query}")
 
+    def _fetch_email_ids_sharded(self, query: str, max_results: int,
+                                 first_page: dict[str, Any], workers: int) -> Iterator[str]:
+        """Yield IDs from a ShardedIdEnumerator; returns the number yielded."""
+        pool = GmailServicePool(self.credential_manager)
+        enumerator = ShardedIdEnumerator(pooled_page_lister(pool), workers=workers)
+        fetched_count = 0
+        try:
+            for page in enumerator.iter_pages(query, max_results, first_page=first_page):
+                yield from page
+                fetched_count += len(page)
+
+                memory_status = self.memory_tracker.check_memory()
+                if memory_status['status'] == 'critical':
+                    self.logger.warning(f"High memory usage: {memory_status['current_mb']:.1f} MB")
+                    self.memory_tracker.force_gc()
+        finally:
+            pool.close()
+        return fetched_count
+
     def fetch_email_streaming(self, email_id: str) -> dict[str, Any] | None:
         """
         Fetch single email with memory optimization.
@@ -114,16 +154,21 @@ class StreamingGmailFetcher:
         Returns:
             Email data or None if failed
         """
-        service = self.service
-        if not service:
-            return None
+        message = self.message_cache.get(email_id) if self.message_cache else None
+        if message is None:
+            service = self.service
+            if not service:
+                return None
 
         try:
-            message = service.users().messages().get(
-                userId='me',
-                id=email_id,
-                format='full'
-            ).execute()
+            if message is None:
+                message = service.users().messages().get(
+                    userId='me',
+                    id=email_id,
+                    format='full'
+                ).execute()
+                if self.message_cache:
+                    self.message_cache.put(message)
 
             # Extract essential data only to minimize memory usage
             email_data = {
@@ -0,0 +1,490 @@
+"""
+Resident watch mode: apply mailbox changes as they happen.
+
+Instead of re-running a full fetch on a schedule, MailboxWatcher keeps one
+authenticated HistorySyncClient and polls the mailbox's current historyId
+(a single ``users.getProfile`` call). Only when it has advanced does the
+watcher run an incremental history sync and hand the deltas to its
+handlers (database, file backup, classifier).
+
+Polling is adaptive: right after a change the interval drops to
+``min_interval``; each idle poll multiplies it by ``backoff`` up to
+``max_interval``. Changes arriving in a burst are coalesced: after a change
+is detected the watcher waits ``coalesce_seconds`` so the whole burst is
+applied by one history sync.
+
+Usage:
+    watcher = MailboxWatcher(
+        HistorySyncClient(service, message_cache=cache),
+        SyncStateManager(conn),
+        handlers=[DatabaseWatchHandler(importer, classifier)]
+    )
+    watcher.run()  # until watcher.stop()
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from gmail_assistant.core.schemas import Email, ParticipantType
+
+from .history_sync import (
+    HistoryExpiredError,
+    HistorySyncClient,
+    LabelChange,
+    SyncStateManager,
+)
+from .pipeline import DownloadPipeline, PipelineConfig
+
+if TYPE_CHECKING:
+    from gmail_assistant.core.processing.classifier import EmailClassifier
+    from gmail_assistant.core.processing.database import EmailDatabaseImporter
+
+    from .gmail_assistant import GmailFetcher
+    from .message_index import MessageIndex
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WatchConfig:
+    """
+    Polling and sync settings for MailboxWatcher.
+
+    Attributes:
+        min_interval: Seconds between polls while mail is flowing
+        max_interval: Seconds between polls when idle
+        backoff: Interval multiplier applied after each idle poll
+        coalesce_seconds: Wait after detecting a change before syncing
+        label_filter: Only sync history for this label (e.g., 'INBOX')
+        max_pages: History pages per sync; the rest waits for the next poll
+        source: Sync state source identifier
+    """
+    min_interval: float = 5.0
+    max_interval: float = 300.0
+    backoff: float = 2.0
+    coalesce_seconds: float = 2.0
+    label_filter: str | None = None
+    max_pages: int = 100
+    source: str = 'gmail'
+
+
+class AdaptivePollInterval:
+    """Poll interval that is short while changes arrive and backs off when idle."""
+
+    def __init__(self, min_interval: float, max_interval: float, backoff: float = 2.0):
+        """
+        Initialize poll interval.
+
+        Args:
+            min_interval: Interval after a change
+            max_interval: Upper bound on the idle interval
+            backoff: Multiplier applied after each idle poll or error
+        """
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.backoff = max(1.0, backoff)
+        self.current = min_interval
+
+    def record(self, changed: bool) -> float:
+        """
+        Update the interval after a poll.
+
+        Args:
+            changed: Whether the poll found changes
+
+        Returns:
+            Seconds to wait before the next poll
+        """
+        if changed:
+            self.current = self.min_interval
+        else:
+            self.current = min(self.max_interval, self.current * self.backoff)
+        return self.current
+
+    def record_error(self) -> float:
+        """Back off after a failed poll."""
+        return self.record(changed=False)
+
+
+@dataclass
+class WatchStats:
+    """Counters for a MailboxWatcher run."""
+    polls: int = 0
+    syncs: int = 0
+    added: int = 0
+    deleted: int = 0
+    label_changes: int = 0
+    errors: int = 0
+    resets: int = 0
+    history_id: int | None = None
+    last_sync_at: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return asdict(self)
+
+
+class WatchHandler:
+    """
+    Receives the changes applied by MailboxWatcher.
+
+    Subclasses override the hooks they need. Hooks for one history page are
+    called together and in history order; on_sync_complete follows the last
+    page of a sync.
+    """
+
+    def on_messages_added(self, emails: list[Email]) -> None:
+        """Handle newly added messages."""
+
+    def on_messages_deleted(self, message_ids: list[str]) -> None:
+        """Handle deleted message IDs."""
+
+    def on_labels_changed(self, changes: list[LabelChange]) -> None:
+        """Handle label changes."""
+
+    def on_sync_complete(self, history_id: int) -> None:
+        """Called after a sync has been fully applied."""
+
+    def close(self) -> None:
+        """Release resources when the watcher stops."""
+
+
+class MailboxWatcher:
+    """
+    Long-running incremental sync driven by HistorySyncClient.
+
+    Features:
+    - One authenticated client and warm handlers for the whole run
+    - Cheap historyId check before any history.list call
+    - Adaptive poll interval with burst coalescing
+    - History ID checkpointed per history page through SyncStateManager
+    - Re-baselines when the stored history ID has expired
+
+    Example:
+        >>> watcher = MailboxWatcher(client, state, handlers=[handler])
+        >>> threading.Thread(target=watcher.run).start()
+        >>> watcher.stop()
+    """
+
+    def __init__(
+        self,
+        client: HistorySyncClient,
+        state_manager: SyncStateManager,
+        handlers: list[WatchHandler] | None = None,
+        config: WatchConfig | None = None,
+        service_factory: Callable[[], Any] | None = None
+    ):
+        """
+        Initialize watcher.
+
+        Args:
+            client: History sync client on an authenticated service
+            state_manager: Sync state holding the last applied history ID
+            handlers: Receivers of the applied changes
+            config: Polling and sync settings
+            service_factory: Per-thread Gmail service for fetching added
+                messages while history is still being paged
+        """
+        self.client = client
+        self.state_manager = state_manager
+        self.handlers = handlers or []
+        self.config = config or WatchConfig()
+        self.service_factory = service_factory
+        self.interval = AdaptivePollInterval(
+            self.config.min_interval, self.config.max_interval, self.config.backoff
+        )
+        self.stats = WatchStats(history_id=state_manager.get_history_id(self.config.source))
+        self._stop = threading.Event()
+
+    def _dispatch(self, hook: str, *args: Any) -> None:
+        for handler in self.handlers:
+            getattr(handler, hook)(*args)
+
+    def _baseline(self) -> int:
+        """Start watching from the mailbox's current history ID."""
+        history_id = self.client.get_current_history_id()
+        self.state_manager.update_history_id(history_id, source=self.config.source)
+        self.stats.history_id = history_id
+        return history_id
+
+    def poll_once(self) -> bool:
+        """
+        Check for changes and apply them.
+
+        Returns:
+            True if the mailbox had changed
+
+        Raises:
+            RuntimeError: If the history sync fails
+            HttpError: If the history ID check fails
+        """
+        self.stats.polls += 1
+        if self.stats.history_id is None:
+            logger.info(f"Watching from history ID {self._baseline()}")
+            return False
+
+        sync_required, _ = self.client.check_sync_required(self.stats.history_id)
+        if not sync_required:
+            return False
+
+        # Let a burst of changes settle so one sync applies all of it
+        if self.config.coalesce_seconds > 0:
+            self._stop.wait(self.config.coalesce_seconds)
+
+        try:
+            history_id, sync_stats = self.client.stream_incremental_sync(
+                self.stats.history_id,
+                on_messages_added=lambda emails: self._dispatch('on_messages_added', emails),
+                on_messages_deleted=lambda ids: self._dispatch('on_messages_deleted', ids),
+                on_labels_changed=lambda changes: self._dispatch('on_labels_changed', changes),
+                state_manager=self.state_manager,
+                source=self.config.source,
+                label_filter=self.config.label_filter,
+                max_pages=self.config.max_pages,
+                service_factory=self.service_factory
+            )
+        except HistoryExpiredError:
+            logger.warning(
+                f"History ID {self.stats.history_id} expired; changes since then were "
+                "missed and need a full fetch. Watching from the current history ID."
+            )
+            self.stats.resets += 1
+            self._baseline()
+            return True
+        except Exception:
+            # Pages applied before the failure were checkpointed; resume after them
+            self.stats.history_id = self.state_manager.get_history_id(self.config.source)
+            raise
+
+        self._dispatch('on_sync_complete', history_id)
+        self.stats.history_id = history_id
+        self.stats.syncs += 1
+        self.stats.added += sync_stats['added']
+        self.stats.deleted += sync_stats['deleted']
+        self.stats.label_changes += sync_stats['label_changes']
+        self.stats.last_sync_at = datetime.now().isoformat()
+        logger.info(
+            f"Synced to history ID {history_id}: {sync_stats['added']} added, "
+            f"{sync_stats['deleted']} deleted, {sync_stats['label_changes']} label changes"
+        )
+        return True
+
+    def run(self, max_polls: int | None = None) -> WatchStats:
+        """
+        Poll until stop() is called.
+
+        Errors are logged and followed by a longer interval rather than
+        ending the watch.
+
+        Args:
+            max_polls: Stop after this many polls (None to run until stopped)
+
+        Returns:
+            WatchStats for the run
+        """
+        try:
+            while not self._stop.is_set():
+                try:
+                    delay = self.interval.record(self.poll_once())
+                except Exception as e:
+                    self.stats.errors += 1
+                    delay = self.interval.record_error()
+                    logger.error(f"Watch poll failed: {e}; retrying in {delay:.0f}s")
+
+                if max_polls is not None and self.stats.polls >= max_polls:
+                    break
+                self._stop.wait(delay)
+        finally:
+            self._dispatch('close')
+        return self.stats
+
+    def stop(self) -> None:
+        """Stop a running watch after the current poll."""
+        self._stop.set()
+
+
+class DatabaseWatchHandler(WatchHandler):
+    """
+    Keep the email database and its classifications current.
+
+    Added messages are inserted through EmailDatabaseImporter on its open
+    connection and classified with the same page, before the sync saves
+    that page's history ID; deleted messages are removed and label changes
+    update the ``labels`` column. Rows are
+    keyed by ``gmail:<id>`` file paths since watched messages have no file.
+    """
+
+    def __init__(
+        self,
+        importer: 'EmailDatabaseImporter',
+        classifier: 'EmailClassifier | None' = None,
+        sender_stats_ttl: float = 3600.0
+    ):
+        """
+        Initialize database handler.
+
+        Args:
+            importer: Importer with a connected database
+            classifier: Classifier for newly added emails
+            sender_stats_ttl: Seconds before sender statistics are recomputed
+        """
+        self.importer = importer
+        self.classifier = classifier
+        self.sender_stats_ttl = sender_stats_ttl
+        self._classified = 0
+        self._classification_errors = 0
+        self._sender_stats: dict | None = None
+        self._sender_stats_at = 0.0
+
+        importer.create_database_schema()
+        columns = {row[1] for row in importer.conn.execute("PRAGMA table_info(emails)")}
+        if 'plain_text_content' not in columns:
+            importer.conn.execute("ALTER TABLE emails ADD COLUMN plain_text_content TEXT")
+            importer.conn.commit()
+        if classifier is not None:
+            classifier.create_classification_schema()
+
+    def email_row(self, email: Email) -> tuple:
+        """Build an INSERT_EMAIL_SQL parameter tuple from a fetched Email."""
+        recipients = [p.address for p in email.recipients if p.type == ParticipantType.TO]
+        return self.importer.email_row({
+            'filename': email.gmail_id,
+            'file_path': f"gmail:{email.gmail_id}",
+            'gmail_id': email.gmail_id,
+            'thread_id': email.thread_id,
+            'date_received': email.date.isoformat(),
+            'parsed_date': email.date.isoformat(),
+            'year_month': email.year_month,
+            'sender': email.sender,
+            'recipient': ', '.join(recipients),
+            'subject': email.subject,
+            'labels': ', '.join(email.labels),
+            'message_content': email.body_plain or email.snippet,
+            'extraction_timestamp': datetime.now().isoformat()
+        })
+
+    def on_messages_added(self, emails: list[Email]) -> None:
+        """Insert new emails."""
+        conn = self.importer.conn
+        self.importer.insert_emails([self.email_row(email) for email in emails])
+        conn.executemany(
+            "UPDATE emails SET plain_text_content = ? WHERE gmail_id = ?",
+            [(email.body_plain or email.snippet, email.gmail_id) for email in emails]
+        )
+        conn.commit()
+
+        if self.classifier is not None:
+            classified, errors = self.classifier.classify_gmail_ids(
+                conn, [email.gmail_id for email in emails], self._current_sender_stats()
+            )
+            self._classified += classified
+            self._classification_errors += errors
+
+    def on_messages_deleted(self, message_ids: list[str]) -> None:
+        """Remove deleted emails."""
+        conn = self.importer.conn
+        conn.executemany("DELETE FROM emails WHERE gmail_id = ?", [(i,) for i in message_ids])
+        conn.commit()
+
+    def on_labels_changed(self, changes: list[LabelChange]) -> None:
+        """Apply label changes to the labels column."""
+        conn = self.importer.conn
+        for change in changes:
+            row = conn.execute(
+                "SELECT labels FROM emails WHERE gmail_id = ?", (change.message_id,)
+            ).fetchone()
+            if row is None:
+                continue
+            labels = [label.strip() for label in (row[0] or '').split(',') if label.strip()]
+            labels = [label for label in labels if label not in change.removed_labels]
+            labels.extend(label for label in change.added_labels if label not in labels)
+            conn.execute("UPDATE emails SET labels = ? WHERE gmail_id = ?",
+                         (', '.join(labels), change.message_id))
+        conn.commit()
+
+    def _current_sender_stats(self) -> dict:
+        """Sender statistics, recomputed once they are older than the TTL."""
+        if (self._sender_stats is None
+                or time.monotonic() - self._sender_stats_at > self.sender_stats_ttl):
+            self._sender_stats = self.classifier.analyze_sender_patterns()
+            self._sender_stats_at = time.monotonic()
+        return self._sender_stats
+
+    def on_sync_complete(self, history_id: int) -> None:
+        """Report the emails classified during the sync."""
+        if self._classified or self._classification_errors:
+            logger.info(f"Classified {self._classified} new emails "
+                        f"({self._classification_errors} errors)")
+        self._classified = self._classification_errors = 0
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.importer.close_database()
+
+
+class BackupWatchHandler(WatchHandler):
+    """
+    Write added messages to the file backup.
+
+    Messages are saved by DownloadPipeline in the same layout as
+    ``GmailFetcher.download_emails``. Share the HistorySyncClient's
+    MessageCache with the fetcher so the pipeline reads the messages the
+    sync just fetched instead of requesting them again. Deleted messages
+    keep their backup files.
+    """
+
+    def __init__(
+        self,
+        fetcher: 'GmailFetcher',
+        output_dir: str | Path,
+        format_type: str = 'both',
+        organize_by: str = 'date',
+        index: 'MessageIndex | None' = None,
+        pipeline: PipelineConfig | None = None
+    ):
+        """
+        Initialize backup handler.
+
+        Args:
+            fetcher: Authenticated GmailFetcher providing rendering helpers
+            output_dir: Backup directory
+            format_type: Output format ('eml', 'markdown', 'both')
+            organize_by: File organization ('date', 'sender', 'none')
+            index: Download index to record written messages in
+            pipeline: Pipeline stage settings
+        """
+        self.output_dir = str(output_dir)
+        self.format_type = format_type
+        self.organize_by = organize_by
+        self.index = index
+        self.pipeline = DownloadPipeline(fetcher, pipeline, index=index)
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    def on_messages_added(self, emails: list[Email]) -> None:
+        """Save new messages."""
+        message_ids = [email.gmail_id for email in emails]
+        if self.index is not None:
+            message_ids = self.index.filter_new(message_ids)
+        self.pipeline.run(message_ids, self.output_dir, self.format_type, self.organize_by)
+
+    def close(self) -> None:
+        """Close the download index."""
+        if self.index is not None:
+            self.index.close()
+
+
+__all__ = [
+    'AdaptivePollInterval',
+    'BackupWatchHandler',
+    'DatabaseWatchHandler',
+    'MailboxWatcher',
+    'WatchConfig',
+    'WatchHandler',
+    'WatchStats',
+]
@@ -25,18 +25,57 @@ import logging
 import re
 import sqlite3
 import sys
+import time
 from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
+from .rule_matcher import RuleMatcher
+
+
+@dataclass
+class ClassificationRunStats:
+    """Throughput statistics for a classify_all_emails run."""
+    total: int = 0
+    processed: int = 0
+    errors: int = 0
+    chunks: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Classified rows per second of wall time."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.processed / self.elapsed_seconds
+
 
 class EmailClassifier:
     """Comprehensive email classification system with multi-phase analysis."""
 
+    UPDATE_SQL = '''
+        UPDATE emails SET
+            primary_category = ?,
+            domain_category = ?,
+            priority_level = ?,
+            source_type = ?,
+            action_required = ?,
+            confidence_score = ?,
+            classification_rules = ?,
+            classification_date = ?,
+            sender_frequency = ?,
+            is_thread = ?,
+            has_unsubscribe = ?,
+            automated_score = ?
+        WHERE id = ?
+    '''
+
     def __init__(self, db_path: str):
         """Initialize the classifier with database connection."""
         self.db_path = db_path
         self.logger = self._setup_logging()
+        self.last_run_stats: ClassificationRunStats | None = None
 
         # Classification categories
         self.primary_categories = [
@@ -170,6 +209,22 @@ class EmailClassifier:
             'automatically generated', 'no-reply', 'system message'
         ]
 
+        self._compile_classification_rules()
+
+    def _compile_classification_rules(self):
+        """Compile each rule family into a single-pass matcher."""
+        self._sender_matcher = RuleMatcher(self.sender_patterns)
+        self._subject_matcher = RuleMatcher(self.subject_patterns)
+        self._priority_matcher = RuleMatcher(self.priority_keywords, literal=True)
+        self._domain_matcher = RuleMatcher(self.domain_keywords, literal=True)
+        self._automation_matcher = RuleMatcher(
+            {'automation': self.automation_indicators}, literal=True
+        )
+        self._automated_sender_matcher = RuleMatcher(
+            {'automated': ['noreply', 'no-reply', 'donotreply', 'automated', 'system']},
+            literal=True
+        )
+
     def create_classification_schema(self) -> bool:
         """Create the classification columns in the database."""
         try:
@@ -298,26 +353,16 @@ class EmailClassifier:
         }
 
         sender_lower = sender.lower()
-        self._extract_domain(sender)
-        self._extract_email_prefix(sender)
-
-        # Check sender patterns
-        for category, patterns in self.sender_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, sender_lower):
-                    classification['primary_category'] = category
-                    classification['confidence'] += 0.8
-                    classification['rules_applied'].append(f'sender_pattern_{category}_{pattern}')
-                    break
-            if classification['primary_category']:
-                break
 
-        # Determine source type
-        automation_indicators = [
-            'noreply', 'no-reply', 'donotreply', 'automated', 'system'
-        ]
+        # Check sender patterns (first matching rule in priority order)
+        hit = self._sender_matcher.first(sender_lower)
+        if hit:
+            classification['primary_category'] = hit.family
+            classification['confidence'] += 0.8
+            classification['rules_applied'].append(f'sender_pattern_{hit.family}_{hit.pattern}')
 
-        if any(indicator in sender_lower for indicator in automation_indicators):
+        # Determine source type
+        if self._automated_sender_matcher.first(sender_lower):
             classification['source_type'] = 'Automated'
             classification['confidence'] += 0.3
             classification['rules_applied'].append('automated_sender')
@@ -366,24 +411,18 @@ class EmailClassifier:
             classification['rules_applied'].append('thread_indicator')
 
         # Check subject patterns
-        for category, patterns in self.subject_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, subject_lower):
-                    classification['primary_category'] = category
-                    classification['confidence'] += 0.6
-                    classification['rules_applied'].append(f'subject_pattern_{category}_{pattern}')
-                    break
-            if classification['primary_category']:
-                break
-
-        # Check priority indicators
-        for priority, keywords in self.priority_keywords.items():
-            for keyword in keywords:
-                if keyword in subject_lower:
-                    classification['priority_level'] = priority
-                    classification['confidence'] += 0.2
-                    classification['rules_applied'].append(f'priority_{priority}_{keyword}')
-                    break
+        hit = self._subject_matcher.first(subject_lower)
+        if hit:
+            classification['primary_category'] = hit.family
+            classification['confidence'] += 0.6
+            classification['rules_applied'].append(f'subject_pattern_{hit.family}_{hit.pattern}')
+
+        # Check priority indicators (later levels override earlier ones)
+        for priority, keywords in self._priority_matcher.scan(subject_lower).items():
+            keyword = next(iter(keywords))
+            classification['priority_level'] = priority
+            classification['confidence'] += 0.2
+            classification['rules_applied'].append(f'priority_{priority}_{keyword}')
 
         return classification
 
@@ -411,21 +450,18 @@ class EmailClassifier:
 
         # Check automation indicators
         automation_score = 0
-        for indicator in self.automation_indicators:
-            if indicator in content_lower:
-                automation_score += 0.2
-                classification['rules_applied'].append(f'automation_{indicator}')
+        for indicator in self._automation_matcher.scan(content_lower).get('automation', {}):
+            automation_score += 0.2
+            classification['rules_applied'].append(f'automation_{indicator}')
 
         classification['automated_score'] = min(automation_score, 1.0)
 
-        # Domain classification based on keywords
+        # Domain classification based on keyword counts from a single scan
         domain_scores = defaultdict(int)
-        for domain, keywords in self.domain_keywords.items():
-            for keyword in keywords:
-                count = content_lower.count(keyword)
-                if count > 0:
-                    domain_scores[domain] += count * 0.1
-                    classification['rules_applied'].append(f'domain_keyword_{domain}_{keyword}')
+        for domain, keyword_counts in self._domain_matcher.scan(content_lower).items():
+            for keyword, count in keyword_counts.items():
+                domain_scores[domain] += count * 0.1
+                classification['rules_applied'].append(f'domain_keyword_{domain}_{keyword}')
 
         if domain_scores:
             best_domain = max(domain_scores.items(), key=lambda x: x[1])
@@ -527,15 +563,76 @@ class EmailClassifier:
 
         return merged
 
-    def classify_emails_batch(self, batch_size: int = 100, offset: int = 0) -> tuple[int, int]:
-        """Classify a batch of emails."""
+    def _classify_row(self, sender: str | None, subject: str | None, content: str | None,
+                      labels: str | None, sender_stats: dict) -> dict[str, Any]:
+        """Run all classification analyses for one email and merge the results."""
+        sender_cls = self.classify_by_sender(sender or '', sender_stats)
+        subject_cls = self.classify_by_subject(subject or '')
+        content_cls = self.classify_by_content(content or '', labels or '')
+
+        final_classification = self.merge_classifications(
+            sender_cls, subject_cls, content_cls
+        )
+        final_classification['sender_frequency'] = (
+            sender_stats.get(sender, {}).get('frequency', 0)
+        )
+        return final_classification
+
+    def _classify_rows(self, rows: list[tuple], sender_stats: dict) -> tuple[list[tuple], int]:
+        """
+        Classify fetched rows into UPDATE parameter tuples.
+
+        Returns:
+            Tuple of (update parameters, error count)
+        """
+        updates = []
+        errors = 0
+
+        for email_id, sender, subject, content, labels in rows:
+            try:
+                cls = self._classify_row(sender, subject, content, labels, sender_stats)
+                updates.append((
+                    cls['primary_category'],
+                    cls['domain_category'],
+                    cls['priority_level'],
+                    cls['source_type'],
+                    cls['action_required'],
+                    cls['confidence_score'],
+                    cls['classification_rules'],
+                    cls['classification_date'],
+                    cls['sender_frequency'],
+                    cls['is_thread'],
+                    cls['has_unsubscribe'],
+                    cls['automated_score'],
+                    email_id
+                ))
+            except Exception as e:
+                self.logger.error(f"Error classifying email {email_id}: {e}")
+                errors += 1
+
+        return updates, errors
+
+    def classify_emails_batch(self, batch_size: int = 100, offset: int = 0,
+                              sender_stats: dict | None = None) -> tuple[int, int]:
+        """
+        Classify a single batch of unclassified emails.
+
+        Prefer classify_all_emails() for full runs: it walks the table by id
+        instead of OFFSET, which skips rows once earlier batches are classified.
+
+        Args:
+            batch_size: Number of emails to classify
+            offset: Offset into the unclassified rows
+            sender_stats: Precomputed analyze_sender_patterns() result
+        """
+        conn = None
         try:
             conn = sqlite3.connect(self.db_path, timeout=30.0)
             conn.execute("PRAGMA journal_mode=WAL")
             cursor = conn.cursor()
 
-            # Get sender statistics for frequency analysis
-            sender_stats = self.analyze_sender_patterns()
+            if sender_stats is None:
+                sender_stats = self.analyze_sender_patterns()
 
             # Get batch of unclassified emails
             cursor.execute('''
@@ -545,72 +642,12 @@ class EmailClassifier:
                 LIMIT ? OFFSET ?
             ''', (batch_size, offset))
 
-            emails = cursor.fetchall()
-            processed = 0
-            errors = 0
-
-            for email_id, sender, subject, content, labels in emails:
-                try:
-                    # Perform all classification analyses
-                    sender_cls = self.classify_by_sender(sender or '', sender_stats)
-                    subject_cls = self.classify_by_subject(subject or '')
-                    content_cls = self.classify_by_content(content or '', labels or '')
-
-                    # Merge results
-                    final_classification = self.merge_classifications(
-                        sender_cls, subject_cls, content_cls
-                    )
-
-                    # Add sender frequency
-                    final_classification['sender_frequency'] = (
-                        sender_stats.get(sender, {}).get('frequency', 0)
-                    )
-
-                    # Update database
-                    update_sql = '''
-                        UPDATE emails SET
-                            primary_category = ?,
-                            domain_category = ?,
-                            priority_level = ?,
-                            source_type = ?,
-                            action_required = ?,
-                            confidence_score = ?,
-                            classification_rules = ?,
-                            classification_date = ?,
-                            sender_frequency = ?,
-                            is_thread = ?,
-                            has_unsubscribe = ?,
-                            automated_score = ?
-                        WHERE id = ?
-                    '''
-
-                    cursor.execute(update_sql, (
-                        final_classification['primary_category'],
-                        final_classification['domain_category'],
-                        final_classification['priority_level'],
-                        final_classification['source_type'],
-                        final_classification['action_required'],
-                        final_classification['confidence_score'],
-                        final_classification['classification_rules'],
-                        final_classification['classification_date'],
-                        final_classification['sender_frequency'],
-                        final_classification['is_thread'],
-                        final_classification['has_unsubscribe'],
-                        final_classification['automated_score'],
-                        email_id
-                    ))
-
-                    processed += 1
-
-                    if processed % 10 == 0:
-                        self.logger.debug(f"Processed {processed} emails...")
-
-                except Exception as e:
-                    self.logger.error(f"Error classifying email {email_id}: {e}")
-                    errors += 1
+            updates, errors = self._classify_rows(cursor.fetchall(), sender_stats)
+            if updates:
+                with conn:
+                    conn.executemany(self.UPDATE_SQL, updates)
 
-            conn.commit()
-            return processed, errors
+            return len(updates), errors
 
         except Exception as e:
             self.logger.error(f"Error in batch classification: {e}")
@@ -619,41 +656,114 @@ class EmailClassifier:
             if conn:
                 conn.close()
 
-    def classify_all_emails(self, batch_size: int = 100) -> bool:
-        """Classify all emails in the database."""
+    def classify_gmail_ids(self, conn: sqlite3.Connection, gmail_ids: list[str],
+                           sender_stats: dict | None = None,
+                           chunk_size: int = 500) -> tuple[int, int]:
+        """
+        Classify specific unclassified emails on an open connection.
+
+        Used to classify newly inserted emails as they arrive without
+        reopening the database or scanning the rest of the table. IDs are
+        looked up chunk_size at a time to stay under SQLite's bound
+        variable limit.
+
+        Args:
+            conn: Open connection to the emails database
+            gmail_ids: Gmail message IDs to classify
+            sender_stats: Precomputed analyze_sender_patterns() result
+            chunk_size: IDs per query and update transaction
+
+        Returns:
+            Tuple of (classified count, error count)
+        """
+        if not gmail_ids:
+            return 0, 0
+        if sender_stats is None:
+            sender_stats = self.analyze_sender_patterns()
+
+        classified = errors = 0
+        for start in range(0, len(gmail_ids), chunk_size):
+            chunk = list(gmail_ids[start:start + chunk_size])
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(f'''
+                SELECT id, sender, subject, plain_text_content, labels
+                FROM emails
+                WHERE primary_category IS NULL AND gmail_id IN ({placeholders})
+            ''', chunk).fetchall()
+
+            updates, chunk_errors = self._classify_rows([tuple(row) for row in rows],
+                                                        sender_stats)
+            if updates:
+                with conn:
+                    conn.executemany(self.UPDATE_SQL, updates)
+            classified += len(updates)
+            errors += chunk_errors
+        return classified, errors
+
+    def classify_all_emails(self, batch_size: int = 1000) -> bool:
+        """
+        Classify all unclassified emails in the database.
+
+        Sender statistics are computed once for the whole run. Rows are walked
+        in id order (keyset pagination), so each chunk is an index range scan
+        regardless of how far the run has progressed, and each chunk's
+        updates are written with executemany in a single transaction.
+        Throughput is recorded in ``self.last_run_stats``.
+        """
+        conn = None
+        stats = ClassificationRunStats()
+        self.last_run_stats = stats
+        start = time.perf_counter()
+
         try:
             conn = sqlite3.connect(self.db_path, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
             cursor = conn.cursor()
 
             cursor.execute('SELECT COUNT(*) FROM emails WHERE primary_category IS NULL')
-            total_unclassified = cursor.fetchone()[0]
+            stats.total = cursor.fetchone()[0]
 
-            if total_unclassified == 0:
+            if stats.total == 0:
                 self.logger.info("All emails are already classified")
                 return True
 
-            self.logger.info(f"Classifying {total_unclassified} unclassified emails...")
-
-            total_processed = 0
-            total_errors = 0
-            offset = 0
-
-            while offset < total_unclassified:
-                batch_end = min(offset + batch_size, total_unclassified)
-                self.logger.info(f"Processing batch {offset // batch_size + 1}: "
-                               f"emails {offset + 1}-{batch_end} of {total_unclassified}")
-
-                processed, errors = self.classify_emails_batch(batch_size, offset)
-
-                total_processed += processed
-                total_errors += errors
-                offset += batch_size
+            self.logger.info(f"Classifying {stats.total} unclassified emails...")
+            sender_stats = self.analyze_sender_patterns()
 
-                if processed == 0:
+            last_id = -1
+            while True:
+                cursor.execute('''
+                    SELECT id, sender, subject, plain_text_content, labels
+                    FROM emails
+                    WHERE primary_category IS NULL AND id > ?
+                    ORDER BY id
+                    LIMIT ?
+                ''', (last_id, batch_size))
+                rows = cursor.fetchall()
+                if not rows:
                     break
-
-            self.logger.info(f"Classification complete: {total_processed} processed, {total_errors} errors")
-            return total_errors == 0
+                last_id = rows[-1][0]
+
+                updates, errors = self._classify_rows(rows, sender_stats)
+                if updates:
+                    with conn:
+                        conn.executemany(self.UPDATE_SQL, updates)
+
+                stats.processed += len(updates)
+                stats.errors += errors
+                stats.chunks += 1
+                stats.elapsed_seconds = time.perf_counter() - start
+                self.logger.info(
+                    f"Classified {stats.processed + stats.errors}/{stats.total} emails "
+                    f"({stats.rows_per_second:.0f} rows/s)"
+                )
+
+            stats.elapsed_seconds = time.perf_counter() - start
+            self.logger.info(
+                f"Classification complete: {stats.processed} processed, {stats.errors} errors "
+                f"in {stats.elapsed_seconds:.1f}s ({stats.rows_per_second:.0f} rows/s)"
+            )
+            return stats.errors == 0
 
         except Exception as e:
             self.logger.error(f"Error classifying all emails: {e}")
@@ -875,8 +985,8 @@ def main():
     parser.add_argument(
         '--batch-size',
         type=int,
-        default=100,
-        help='Batch size for processing (default: 100)'
+        default=1000,
+        help='Batch size for processing (default: 1000)'
     )
 
     parser.add_argument(
@@ -954,6 +1064,8 @@ def main():
     end_time = datetime.now()
 
     print(f"\n⏱️  Processing completed in {end_time - start_time}")
+    if classifier.last_run_stats and classifier.last_run_stats.processed:
+        print(f"   Throughput: {classifier.last_run_stats.rows_per_second:,.0f} rows/s")
 
     if success:
         print("✅ Classification completed successfully!")
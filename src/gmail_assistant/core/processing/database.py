@@ -4,16 +4,50 @@ Email Database Importer
 
 Creates a SQLite database and imports email data from monthly JSON files
 with proper schema design, indexing, and data validation.
+
+Emails are inserted with one executemany per file. For initial imports of
+large archives, bulk_load() additionally raises the page cache and drops
+the FTS triggers and secondary indexes for the duration of the load, then
+rebuilds them once at the end.
+
+Usage:
+    importer = EmailDatabaseImporter('emails.db', 'monthly_email_data')
+    importer.connect_database()
+    importer.create_database_schema()
+    stats = importer.import_all_monthly_files(bulk=True)
 """
 
 import argparse
 import json
 import logging
 import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 
 class EmailDatabaseImporter:
+    # Duplicate file paths are skipped by the UNIQUE(file_path) constraint
+    INSERT_EMAIL_SQL = """
+        INSERT INTO emails (
+            filename, file_path, gmail_id, thread_id, date_received,
+            parsed_date, year_month, sender, recipient, subject,
+            labels, message_content, extraction_timestamp
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(file_path) DO NOTHING
+    """
+
+    # Dropped during bulk loads; create_database_schema() recreates them
+    SECONDARY_INDEXES = (
+        'idx_emails_year_month', 'idx_emails_gmail_id', 'idx_emails_thread_id',
+        'idx_emails_sender', 'idx_emails_recipient', 'idx_emails_parsed_date',
+        'idx_emails_subject',
+    )
+    FTS_TRIGGERS = ('emails_fts_insert', 'emails_fts_delete', 'emails_fts_update')
+
+    DEFAULT_CACHE_SIZE = 10000
+    BULK_CACHE_SIZE_KIB = 262144  # 256 MiB page cache while bulk loading
+
     def __init__(self, db_path: str = "emails.db", json_folder: str = "monthly_email_data"):
         """
         Initialize the EmailDatabaseImporter.
@@ -25,6 +59,7 @@ class EmailDatabaseImporter:
         self.db_path = Path(db_path)
         self.json_folder = Path(json_folder)
         self.conn = None
+        self._indexes_deferred = False
 
         # Set up logging
         logging.basicConfig(
@@ -148,6 +183,105 @@ class EmailDatabaseImporter:
             self.logger.error(f"Error connecting to database: {e}")
             raise
 
+    @staticmethod
+    def email_row(email: dict, year_month: str = 'unknown') -> tuple:
+        """
+        Build an INSERT_EMAIL_SQL parameter tuple from an extracted email.
+
+        Args:
+            email: Email dictionary as produced by EmailDataExtractor
+            year_month: Month to use when the email has none
+        """
+        return (
+            email.get('filename', ''),
+            email.get('file_path', ''),
+            email.get('gmail_id', ''),
+            email.get('thread_id', ''),
+            email.get('date_received', ''),
+            email.get('parsed_date', ''),
+            email.get('year_month') or year_month,
+            email.get('sender', ''),
+            email.get('recipient', ''),
+            email.get('subject', ''),
+            email.get('labels', ''),
+            email.get('message_content', ''),
+            email.get('extraction_timestamp', '')
+        )
+
+    def insert_emails(self, rows: list[tuple]) -> int:
+        """
+        Insert email rows with a single executemany, skipping known file paths.
+
+        Does not commit.
+
+        Args:
+            rows: Parameter tuples from email_row()
+
+        Returns:
+            Number of rows actually inserted
+        """
+        if not rows:
+            return 0
+        return self.conn.executemany(self.INSERT_EMAIL_SQL, rows).rowcount
+
+    def begin_bulk_load(self, defer_indexes: bool = True):
+        """
+        Tune the connection for a large import.
+
+        Enlarges the page cache and keeps temp structures in memory. With
+        defer_indexes, the FTS triggers and secondary indexes are dropped so
+        inserts only touch the table and its UNIQUE(file_path) index; call
+        end_bulk_load() to rebuild them. If the process dies before that,
+        run rebuild_indexes() to restore them.
+
+        Args:
+            defer_indexes: Drop FTS triggers and secondary indexes until the end
+        """
+        self.conn.commit()
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute(f"PRAGMA cache_size = -{self.BULK_CACHE_SIZE_KIB}")
+        self.conn.execute("PRAGMA temp_store = MEMORY")
+
+        if defer_indexes:
+            for trigger in self.FTS_TRIGGERS:
+                self.conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            for index in self.SECONDARY_INDEXES:
+                self.conn.execute(f"DROP INDEX IF EXISTS {index}")
+            self.conn.commit()
+            self.logger.info("Bulk load: FTS triggers and secondary indexes deferred")
+
+        self._indexes_deferred = defer_indexes
+
+    def end_bulk_load(self):
+        """Commit a bulk load, rebuild deferred indexes and restore settings."""
+        self.conn.commit()
+        if self._indexes_deferred:
+            self.rebuild_indexes()
+            self._indexes_deferred = False
+        self.conn.execute(f"PRAGMA cache_size = {self.DEFAULT_CACHE_SIZE}")
+        self.conn.execute("PRAGMA temp_store = DEFAULT")
+
+    def rebuild_indexes(self):
+        """Recreate secondary indexes and FTS triggers and rebuild the FTS index."""
+        self.logger.info("Rebuilding indexes and full-text search index...")
+        self.create_database_schema()
+        self.conn.execute("INSERT INTO emails_fts(emails_fts) VALUES('rebuild')")
+        self.conn.commit()
+
+    @contextmanager
+    def bulk_load(self, defer_indexes: bool = True) -> Iterator['EmailDatabaseImporter']:
+        """
+        Context manager around begin_bulk_load()/end_bulk_load().
+
+        Indexes are rebuilt even if the import raises.
+        """
+        self.begin_bulk_load(defer_indexes)
+        try:
+            yield self
+        finally:
+            self.end_bulk_load()
+
     def close_database(self):
         """Close the database connection."""
         if self.conn:
@@ -178,9 +312,6 @@ class EmailDatabaseImporter:
             self.logger.warning(f"No emails found in {json_file}")
             return 0, 0
 
-        imported_count = 0
-        skipped_count = 0
-
         # Check if this batch was already imported
         existing_batch = self.conn.execute(
             "SELECT id FROM import_batches WHERE year_month = ?",
@@ -191,47 +322,22 @@ class EmailDatabaseImporter:
             self.logger.warning(f"Batch {year_month} already imported, skipping...")
             return 0, len(emails)
 
-        # Import emails
-        for email in emails:
-            try:
-                # Check if email already exists (by file_path)
-                existing = self.conn.execute(
-                    "SELECT id FROM emails WHERE file_path = ?",
-                    (email.get('file_path', ''),)
-                ).fetchone()
-
-                if existing:
-                    skipped_count += 1
-                    continue
-
-                # Insert email
-                self.conn.execute("""
-                    INSERT INTO emails (
-                        filename, file_path, gmail_id, thread_id, date_received,
-                        parsed_date, year_month, sender, recipient, subject,
-                        labels, message_content, extraction_timestamp
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    email.get('filename', ''),
-                    email.get('file_path', ''),
-                    email.get('gmail_id', ''),
-                    email.get('thread_id', ''),
-                    email.get('date_received', ''),
-                    email.get('parsed_date', ''),
-                    email.get('year_month', year_month),
-                    email.get('sender', ''),
-                    email.get('recipient', ''),
-                    email.get('subject', ''),
-                    email.get('labels', ''),
-                    email.get('message_content', ''),
-                    email.get('extraction_timestamp', '')
-                ))
-
-                imported_count += 1
-
-            except sqlite3.Error as e:
-                self.logger.error(f"Error importing email {email.get('filename', 'unknown')}: {e}")
-                skipped_count += 1
+        # Import emails in one statement; retry row by row to isolate bad rows
+        rows = [self.email_row(email, year_month) for email in emails]
+        try:
+            imported_count = self.insert_emails(rows)
+        except sqlite3.Error as e:
+            self.logger.warning(f"Batch insert failed for {json_file}, retrying per email: {e}")
+            self.conn.rollback()
+            imported_count = 0
+            for email, row in zip(emails, rows, strict=True):
+                try:
+                    imported_count += self.conn.execute(self.INSERT_EMAIL_SQL, row).rowcount
+                except sqlite3.Error as row_error:
+                    self.logger.error(
+                        f"Error importing email {email.get('filename', 'unknown')}: {row_error}"
+                    )
+        skipped_count = len(emails) - imported_count
 
         # Record the import batch
         try:
@@ -254,10 +360,15 @@ class EmailDatabaseImporter:
         self.conn.commit()
         return imported_count, skipped_count
 
-    def import_all_monthly_files(self) -> dict[str, int]:
+    def import_all_monthly_files(self, bulk: bool = False,
+                                 defer_indexes: bool = True) -> dict[str, int]:
         """
         Import all monthly JSON files from the specified folder.
 
+        Args:
+            bulk: Run the import inside bulk_load()
+            defer_indexes: With bulk, drop and rebuild FTS triggers and indexes
+
         Returns:
             Dictionary with import statistics
         """
@@ -283,6 +394,16 @@ class EmailDatabaseImporter:
 
         self.logger.info(f"Found {len(json_files)} monthly JSON files to import")
 
+        if bulk:
+            with self.bulk_load(defer_indexes):
+                self._import_files(json_files, stats)
+        else:
+            self._import_files(json_files, stats)
+
+        return stats
+
+    def _import_files(self, json_files: list[Path], stats: dict[str, int]):
+        """Import monthly JSON files, accumulating into stats."""
         for json_file in json_files:
             try:
                 self.logger.info(f"Processing {json_file.name}...")
@@ -298,8 +419,6 @@ class EmailDatabaseImporter:
                 self.logger.error(f"Failed to process {json_file}: {e}")
                 stats['failed_files'] += 1
 
-        return stats
-
     def update_statistics(self):
         """Update the email_stats table with current database statistics."""
         try:
@@ -449,6 +568,10 @@ def main():
                        help='Search emails for a query')
     parser.add_argument('--force-recreate', action='store_true',
                        help='Delete existing database and recreate')
+    parser.add_argument('--bulk', action='store_true',
+                       help='Bulk load: defer FTS and secondary indexes, rebuild once at the end')
+    parser.add_argument('--keep-indexes', action='store_true',
+                       help='With --bulk, keep indexes and FTS triggers live during the load')
 
     args = parser.parse_args()
 
@@ -501,7 +624,8 @@ def main():
 
         # Import emails
         print("Starting email import...")
-        stats = importer.import_all_monthly_files()
+        stats = importer.import_all_monthly_files(bulk=args.bulk,
+                                                  defer_indexes=not args.keep_indexes)
 
         # Update statistics
         importer.update_statistics()
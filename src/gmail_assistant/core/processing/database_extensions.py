@@ -58,6 +58,18 @@ class EmailDatabaseExtensions:
     -- We'll handle this in Python as SQLite doesn't support ADD COLUMN IF NOT EXISTS
     """
 
+    # Columns copied from email data on insert (when present and not None)
+    INSERT_FIELDS = (
+        'thread_id', 'subject', 'sender', 'recipient', 'date_received',
+        'parsed_date', 'year_month', 'labels', 'message_content', 'filename',
+        'file_path', 'extraction_timestamp',
+    )
+
+    # Columns refreshed on update; None keeps the stored value
+    UPDATE_FIELDS = (
+        'subject', 'sender', 'recipient', 'parsed_date', 'labels', 'message_content',
+    )
+
     def __init__(self, db_path: str):
         """
         Initialize database extensions.
@@ -238,7 +250,13 @@ class EmailDatabaseExtensions:
         gmail_id_key: str = 'gmail_id'
     ) -> UpsertResult:
         """
-        Batch upsert emails with transaction.
+        Batch upsert emails in a single transaction.
+
+        Set-based equivalent of calling upsert_email() per email: existing
+        gmail_ids are looked up in chunks, new emails are inserted with one
+        executemany per set of present fields, and existing ones are updated
+        with one executemany that keeps columns the email does not provide.
+        Repeated gmail_ids are applied in batch order. The batch commits once.
 
         Args:
             emails: List of email dictionaries
@@ -249,29 +267,28 @@ class EmailDatabaseExtensions:
         """
         result = UpsertResult()
         conn = self.connect()
+        now = datetime.now().isoformat()
 
-        try:
-            # Start transaction
-            conn.execute("BEGIN TRANSACTION")
-
-            for email in emails:
-                gmail_id = email.get(gmail_id_key) or email.get('id')
-                if not gmail_id:
-                    result.skipped += 1
-                    continue
-
-                try:
-                    _was_inserted, action = self.upsert_email(gmail_id, email)
-                    if action == 'inserted':
-                        result.inserted += 1
-                    elif action == 'updated':
-                        result.updated += 1
-                    else:
-                        result.skipped += 1
-                except Exception as e:
-                    logger.error(f"Failed to upsert email {gmail_id}: {e}")
-                    result.failed += 1
+        # Round n holds the n-th occurrence of each gmail_id, so repeated ids
+        # are applied in batch order, each round seeing the previous one
+        rounds: list[list[tuple[str, dict[str, Any]]]] = []
+        occurrences: dict[str, int] = {}
+        for email in emails:
+            gmail_id = email.get(gmail_id_key) or email.get('id')
+            if not gmail_id:
+                result.skipped += 1
+                continue
+            n = occurrences.get(gmail_id, 0)
+            occurrences[gmail_id] = n + 1
+            if n == len(rounds):
+                rounds.append([])
+            rounds[n].append((gmail_id, email))
 
+        try:
+            if not conn.in_transaction:
+                conn.execute("BEGIN TRANSACTION")
+            for batch in rounds:
+                self._upsert_round(batch, now, result)
             conn.commit()
 
         except Exception as e:
@@ -286,6 +303,82 @@ class EmailDatabaseExtensions:
         )
         return result
 
+    def _upsert_round(self, batch: list[tuple[str, dict[str, Any]]], now: str,
+                      result: UpsertResult) -> None:
+        """Upsert emails with distinct gmail_ids using one statement per shape."""
+        exists = self.check_exists_batch([gmail_id for gmail_id, _ in batch])
+
+        inserts: dict[tuple[str, ...], list[tuple]] = {}
+        updates: list[tuple] = []
+        for gmail_id, email in batch:
+            if not exists[gmail_id]:
+                fields = tuple(k for k in self.INSERT_FIELDS if email.get(k) is not None)
+                inserts.setdefault(fields, []).append(
+                    (gmail_id, now, now, *(email[k] for k in fields))
+                )
+                continue
+            values = [email.get(k) for k in self.UPDATE_FIELDS]
+            if any(v is not None for v in values):
+                updates.append((*values, now, gmail_id))
+            else:
+                result.skipped += 1
+
+        for fields, rows in inserts.items():
+            columns = ('gmail_id', 'import_timestamp', 'updated_at', *fields)
+            sql = (f"INSERT INTO emails ({', '.join(columns)}) "
+                   f"VALUES ({', '.join(['?'] * len(columns))})")
+            inserted, skipped, failed = self._execute_rows(sql, rows, id_index=0)
+            result.inserted += inserted
+            result.skipped += skipped
+            result.failed += failed
+
+        if updates:
+            assignments = ', '.join(f"{k} = COALESCE(?, {k})" for k in self.UPDATE_FIELDS)
+            sql = f"UPDATE emails SET {assignments}, updated_at = ? WHERE gmail_id = ?"
+            updated, skipped, failed = self._execute_rows(sql, updates, id_index=-1)
+            result.updated += updated
+            result.skipped += skipped
+            result.failed += failed
+
+    def _execute_rows(self, sql: str, rows: list[tuple], id_index: int) -> tuple[int, int, int]:
+        """
+        Run one statement for many rows inside the open transaction.
+
+        If any row violates a constraint, the statement is rolled back to a
+        savepoint and retried row by row so only the offending rows are lost.
+
+        Args:
+            sql: Parameterized statement
+            rows: Parameter tuples
+            id_index: Position of the gmail_id in each tuple (for logging)
+
+        Returns:
+            Tuple of (applied, skipped on integrity errors, failed)
+        """
+        conn = self.conn
+        conn.execute("SAVEPOINT upsert_rows")
+        try:
+            conn.executemany(sql, rows)
+            conn.execute("RELEASE upsert_rows")
+            return len(rows), 0, 0
+        except sqlite3.Error as e:
+            logger.warning(f"Batch statement failed, retrying row by row: {e}")
+            conn.execute("ROLLBACK TO upsert_rows")
+            conn.execute("RELEASE upsert_rows")
+
+        applied = skipped = failed = 0
+        for row in rows:
+            try:
+                conn.execute(sql, row)
+                applied += 1
+            except sqlite3.IntegrityError as e:
+                logger.warning(f"Integrity error upserting {row[id_index]}: {e}")
+                skipped += 1
+            except sqlite3.Error as e:
+                logger.error(f"Failed to upsert email {row[id_index]}: {e}")
+                failed += 1
+        return applied, skipped, failed
+
     def check_exists(self, gmail_id: str) -> bool:
         """Check if email exists by gmail_id."""
         conn = self.connect()
@@ -4,15 +4,35 @@ Email Data Extractor
 
 Extracts email metadata and content from regenerated markdown files
 and organizes them into monthly JSON files.
+
+For large archives, process_emails_streaming() walks the folder lazily,
+parses files in a process pool and writes rows to a sink (SQLite or
+per-month NDJSON) in bounded batches, so peak memory does not grow with
+the number of emails.
+
+Usage:
+    extractor = EmailDataExtractor('analysis_output/regenerated')
+    with SQLiteEmailSink('emails.db') as sink:
+        stats = extractor.process_emails_streaming(sink, workers=4)
 """
 
 import argparse
 import contextlib
 import json
+import os
 import re
+import sqlite3
 import subprocess
+from collections.abc import Iterable, Iterator
 from datetime import datetime
+from functools import partial
+from itertools import islice
 from pathlib import Path
+from typing import Protocol
+
+from gmail_assistant.utils.process_pool import bounded_process_map
+
+from .database import EmailDatabaseImporter
 
 
 class EmailDataExtractor:
@@ -304,6 +324,99 @@ class EmailDataExtractor:
 
         return stats
 
+    def iter_md_files(self) -> Iterator[Path]:
+        """
+        Lazily walk the base folder for markdown files.
+
+        Unreadable directories are reported and skipped instead of aborting
+        the walk.
+
+        Yields:
+            Markdown file paths in directory walk order
+        """
+        def on_error(error: OSError) -> None:
+            print(f"Skipping problematic directory {error.filename}: {error}")
+
+        for root, _dirs, files in os.walk(self.base_folder, onerror=on_error):
+            for name in files:
+                if name.endswith('.md'):
+                    yield Path(root) / name
+
+    def iter_emails(self, files: Iterable[Path] | None = None, workers: int = 1,
+                    chunk_size: int = 64) -> Iterator[tuple[Path, dict | None]]:
+        """
+        Extract emails lazily, optionally in a process pool.
+
+        Files are sent to workers in chunks, and at most ``2 * workers``
+        chunks are in flight, so memory stays bounded however many files
+        there are. Results come back in file order.
+
+        Args:
+            files: Files to extract (defaults to iter_md_files())
+            workers: Worker processes; 1 extracts in this process
+            chunk_size: Files per worker task
+
+        Yields:
+            Tuple of (file path, email data or None if extraction failed)
+        """
+        files = iter(self.iter_md_files() if files is None else files)
+        chunks = iter(lambda: list(islice(files, chunk_size)), [])
+
+        for chunk, emails in bounded_process_map(partial(_extract_chunk, self), chunks, workers):
+            yield from zip(chunk, emails, strict=True)
+
+    def process_emails_streaming(self, sink: 'EmailSink', workers: int | None = None,
+                                 batch_size: int = 500) -> dict[str, int]:
+        """
+        Extract all emails straight into a sink with constant memory.
+
+        Unlike process_all_emails(), emails are never collected in memory:
+        they are handed to the sink in batches of ``batch_size`` as they are
+        extracted. The sink is not closed.
+
+        Args:
+            sink: Destination for extracted emails
+            workers: Worker processes (defaults to the CPU count)
+            batch_size: Emails per sink write
+
+        Returns:
+            Dictionary with statistics about processed emails
+        """
+        workers = workers or os.cpu_count() or 1
+        stats = {
+            'total_processed': 0,
+            'successful_extractions': 0,
+            'failed_extractions': 0,
+            'months_created': 0
+        }
+        months: set[str] = set()
+        batch: list[dict] = []
+
+        print(f"Streaming emails from {self.base_folder} with {workers} worker(s)")
+
+        for file_path, email_data in self.iter_emails(workers=workers):
+            stats['total_processed'] += 1
+
+            if email_data:
+                months.add(email_data.get('year_month') or 'unknown')
+                batch.append(email_data)
+                stats['successful_extractions'] += 1
+                if len(batch) >= batch_size:
+                    sink.write_batch(batch)
+                    batch = []
+            else:
+                stats['failed_extractions'] += 1
+                print(f"Failed to extract data from: {file_path}")
+
+            if stats['total_processed'] % 1000 == 0:
+                print(f"Processed {stats['total_processed']} files...")
+
+        if batch:
+            sink.write_batch(batch)
+
+        stats['months_created'] = len(months)
+        return stats
+
     def generate_summary_report(self, stats: dict[str, int]) -> None:
         """Generate a summary report of the extraction process."""
         summary = {
@@ -330,6 +443,153 @@ class EmailDataExtractor:
         print(f"- Summary saved to: {summary_file}")
 
 
+def _extract_chunk(extractor: EmailDataExtractor, paths: list[Path]) -> list[dict | None]:
+    """Extract a chunk of files."""
+    return [extractor.extract_email_metadata(path) for path in paths]
+
+
+class EmailSink(Protocol):
+    """Destination for batches of extracted emails."""
+
+    def write_batch(self, emails: list[dict]) -> None:
+        """Persist a batch of extracted emails."""
+        ...
+
+    def close(self) -> None:
+        """Flush and release resources."""
+        ...
+
+
+class NDJSONEmailSink:
+    """
+    Append extracted emails to per-month NDJSON files.
+
+    Each batch is grouped by month and appended to
+    ``<year_month>_emails.ndjson``, one JSON object per line, so no file
+    handle or month of emails is held between batches.
+    """
+
+    def __init__(self, output_folder: str | Path):
+        self.output_folder = Path(output_folder)
+        self.output_folder.mkdir(parents=True, exist_ok=True)
+        self.emails_written = 0
+
+    def write_batch(self, emails: list[dict]) -> None:
+        by_month: dict[str, list[str]] = {}
+        for email in emails:
+            year_month = email.get('year_month') or 'unknown'
+            by_month.setdefault(year_month, []).append(
+                json.dumps(email, ensure_ascii=False) + '\n'
+            )
+
+        for year_month, lines in by_month.items():
+            output_file = self.output_folder / f"{year_month}_emails.ndjson"
+            with open(output_file, 'a', encoding='utf-8') as f:
+                f.writelines(lines)
+
+        self.emails_written += len(emails)
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> 'NDJSONEmailSink':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class SQLiteEmailSink:
+    """
+    Insert extracted emails into the EmailDatabaseImporter schema.
+
+    Each batch is one executemany transaction. Emails already present (same
+    file_path) are ignored, so an interrupted extraction can simply be
+    re-run. Per-month counts are recorded in import_batches on close, counted
+    from the emails table so re-runs do not inflate them. With
+    ``bulk=True`` the sink runs inside EmailDatabaseImporter's bulk-load
+    mode and rebuilds indexes on close.
+    """
+
+    def __init__(self, db_path: str | Path, source: str = '', bulk: bool = False):
+        """
+        Open the database and create the schema if needed.
+
+        Args:
+            db_path: SQLite database file
+            source: Source description recorded in import_batches
+            bulk: Defer FTS and secondary indexes until close (initial imports)
+        """
+        self.source = source
+        self.importer = EmailDatabaseImporter(str(db_path))
+        self.importer.connect_database()
+        self.importer.create_database_schema()
+        self.conn = self.importer.conn
+        self.bulk = bulk
+        if bulk:
+            self.importer.begin_bulk_load()
+
+        self.emails_written = 0
+        self.emails_skipped = 0
+        self._months: set[str] = set()
+
+    def write_batch(self, emails: list[dict]) -> None:
+        rows = [EmailDatabaseImporter.email_row(email) for email in emails]
+        self._months.update(row[6] for row in rows)
+
+        with self.conn:
+            inserted = self.importer.insert_emails(rows)
+
+        self.emails_written += inserted
+        self.emails_skipped += len(rows) - inserted
+
+    def _record_batches(self) -> None:
+        """Upsert import_batches totals for the months this sink wrote to."""
+        months = sorted(self._months)
+        placeholders = ','.join('?' * len(months))
+        # Totals come from the table, so duplicates ignored on a re-run are not
+        # counted twice and the date range covers every stored email
+        try:
+            with self.conn:
+                self.conn.execute(f"""
+                    INSERT INTO import_batches (
+                        year_month, email_count, source_file, date_range_first,
+                        date_range_last, extraction_timestamp
+                    )
+                    SELECT year_month, COUNT(*), ?,
+                        (SELECT date_received FROM emails AS o WHERE o.year_month = e.year_month
+                         ORDER BY parsed_date LIMIT 1),
+                        (SELECT date_received FROM emails AS o WHERE o.year_month = e.year_month
+                         ORDER BY parsed_date DESC LIMIT 1),
+                        ?
+                    FROM emails AS e WHERE year_month IN ({placeholders})
+                    GROUP BY year_month
+                    ON CONFLICT(year_month) DO UPDATE SET
+                        email_count = excluded.email_count,
+                        date_range_first = excluded.date_range_first,
+                        date_range_last = excluded.date_range_last
+                """, [self.source, datetime.now().isoformat(), *months])
+        except sqlite3.Error as e:
+            self.importer.logger.error(f"Error recording import batches: {e}")
+
+    def close(self) -> None:
+        if self.conn is None:
+            return
+        try:
+            if self.bulk:
+                self.importer.end_bulk_load()
+            self._record_batches()
+        finally:
+            self.importer.close_database()
+            self.conn = None
+
+    def __enter__(self) -> 'SQLiteEmailSink':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
 def main():
     """Main function to run the email data extractor."""
     parser = argparse.ArgumentParser(description='Extract email data from regenerated markdown files')
@@ -339,6 +599,18 @@ def main():
     parser.add_argument('--output', '-o',
                        default='monthly_email_data',
                        help='Output folder for monthly JSON files')
+    parser.add_argument('--format', '-f', choices=['json', 'ndjson', 'sqlite'],
+                       default='json',
+                       help='Output format: monthly JSON (in memory), streamed '
+                            'monthly NDJSON, or streamed SQLite (default: json)')
+    parser.add_argument('--db', '-d', default='emails.db',
+                       help='Database file for --format sqlite (default: emails.db)')
+    parser.add_argument('--bulk', action='store_true',
+                       help='With --format sqlite, defer index builds until the end')
+    parser.add_argument('--workers', '-w', type=int, default=None,
+                       help='Worker processes for streaming formats (default: CPU count)')
+    parser.add_argument('--batch-size', type=int, default=500,
+                       help='Emails per write for streaming formats (default: 500)')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Enable verbose output')
 
@@ -353,7 +625,15 @@ def main():
     print("-" * 50)
 
     # Process all emails
-    stats = extractor.process_all_emails()
+    if args.format == 'sqlite':
+        with SQLiteEmailSink(args.db, source=str(extractor.base_folder),
+                             bulk=args.bulk) as sink:
+            stats = extractor.process_emails_streaming(sink, args.workers, args.batch_size)
+    elif args.format == 'ndjson':
+        with NDJSONEmailSink(extractor.output_folder) as sink:
+            stats = extractor.process_emails_streaming(sink, args.workers, args.batch_size)
+    else:
+        stats = extractor.process_all_emails()
 
     # Generate summary report
     extractor.generate_summary_report(stats)
@@ -7,7 +7,7 @@ and populates it with clean, readable plain text versions of the email content
 by stripping all markdown formatting while preserving spacing and readability.
 
 Usage:
-    python email_plaintext_processor.py --db emails.db [--batch-size 100] [--dry-run]
+    python email_plaintext_processor.py --db emails.db [--batch-size 100] [--workers 8] [--dry-run]
 
 Author: Gmail Fetcher System
 Date: 2025-09-18
@@ -16,11 +16,15 @@ Date: 2025-09-18
 import argparse
 import html
 import logging
+import os
 import re
 import sqlite3
 import sys
+from collections.abc import Iterator
 from datetime import datetime
 
+from gmail_assistant.utils.process_pool import bounded_process_map
+
 
 class EmailPlaintextProcessor:
     """Process emails to extract plain text content from markdown-formatted messages."""
@@ -103,141 +107,108 @@ class EmailPlaintextProcessor:
         Returns:
             Clean plain text with preserved spacing and readability
         """
-        if not markdown_content:
-            return ""
-
-        # Start with the original content
-        text = markdown_content
-
-        # Decode HTML entities first
-        text = html.unescape(text)
-
-        # Remove markdown table syntax but preserve content
-        # Handle table rows: | cell1 | cell2 | -> cell1 cell2
-        text = re.sub(r'\|\s*([^|]+?)\s*\|', r'\1', text)
-        # Remove table separators: | --- | --- |
-        text = re.sub(r'\|\s*-+\s*\|', '', text)
-        # Remove standalone table markers
-        text = re.sub(r'^\|\s*\|\s*$', '', text, flags=re.MULTILINE)
-
-        # Remove markdown headers but keep the text
-        text = re.sub(r'^#{1,6}\s+(.+)$', r'\1', text, flags=re.MULTILINE)
-
-        # Remove bold and italic formatting but keep text
-        text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)  # **bold**
-        text = re.sub(r'\*(.*?)\*', r'\1', text)      # *italic*
-        text = re.sub(r'__(.*?)__', r'\1', text)      # __bold__
-        text = re.sub(r'_(.*?)_', r'\1', text)        # _italic_
-
-        # Convert links to readable format: [text](url) -> text (url)
-        text = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'\1 (\2)', text)
-
-        # Remove inline code backticks
-        text = re.sub(r'`([^`]+)`', r'\1', text)
-
-        # Remove code block syntax
-        text = re.sub(r'^```.*?$', '', text, flags=re.MULTILINE)
-
-        # Remove blockquote markers but keep indentation
-        text = re.sub(r'^>\s*', '  ', text, flags=re.MULTILINE)
-
-        # Remove horizontal rules
-        text = re.sub(r'^[-=]{3,}$', '', text, flags=re.MULTILINE)
-
-        # Remove list markers but keep indentation and content
-        text = re.sub(r'^\s*[-*+]\s+', '  • ', text, flags=re.MULTILINE)
-        text = re.sub(r'^\s*\d+\.\s+', '  ', text, flags=re.MULTILINE)
-
-        # Remove escape characters
-        text = re.sub(r'\\(.)', r'\1', text)
-
-        # Clean up excessive whitespace while preserving paragraph breaks
-        # Replace multiple spaces with single space
-        text = re.sub(r' {2,}', ' ', text)
-
-        # Replace multiple newlines with double newlines (paragraph breaks)
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        return markdown_to_plaintext(markdown_content)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection configured for concurrent access."""
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    @staticmethod
+    def _fetch_pending(conn: sqlite3.Connection, after_id: int,
+                       limit: int) -> list[tuple[int, str | None]]:
+        """
+        Fetch the next rows needing plain text, walking the primary key.
 
-        # Remove leading/trailing whitespace from each line but preserve indentation
-        lines = []
-        for line in text.split('\n'):
-            # Only strip trailing whitespace, preserve leading spaces for indentation
-            lines.append(line.rstrip())
+        Keyset paging stays correct while the same column is being filled in,
+        where OFFSET paging would skip rows.
+        """
+        return conn.execute("""
+            SELECT id, message_content
+            FROM emails
+            WHERE id > ? AND (plain_text_content IS NULL OR plain_text_content = '')
+            ORDER BY id
+            LIMIT ?
+        """, (after_id, limit)).fetchall()
+
+    def _store_results(self, conn: sqlite3.Connection,
+                       results: list[tuple[int, str | None, str | None]],
+                       dry_run: bool) -> tuple[int, int]:
+        """
+        Write converted rows with a single executemany.
 
-        text = '\n'.join(lines)
+        Returns:
+            Tuple of (processed_count, error_count)
+        """
+        updates = []
+        error_count = 0
+        for email_id, plain_text, error in results:
+            if error is None:
+                updates.append((plain_text, email_id))
+            else:
+                self.logger.error(f"Error processing email {email_id}: {error}")
+                error_count += 1
 
-        # Remove leading and trailing empty lines
-        text = text.strip()
+        if updates and not dry_run:
+            conn.executemany(
+                "UPDATE emails SET plain_text_content = ? WHERE id = ?", updates
+            )
+            conn.commit()
 
-        return text
+        return len(updates), error_count
 
-    def process_emails_batch(self, offset: int, limit: int, dry_run: bool = False) -> tuple[int, int]:
+    def process_emails_batch(self, after_id: int, limit: int,
+                             dry_run: bool = False) -> tuple[int, int, int | None]:
         """
-        Process a batch of emails to extract plain text content.
+        Process one batch of emails to extract plain text content.
 
         Args:
-            offset: Starting position for the batch
+            after_id: Only emails with a larger id are considered
             limit: Number of emails to process
             dry_run: If True, don't actually update the database
 
         Returns:
-            Tuple of (processed_count, error_count)
+            Tuple of (processed_count, error_count, last_id); last_id is None
+            when no emails remained
         """
         conn = None
         try:
-            conn = sqlite3.connect(self.db_path, timeout=30.0)
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA busy_timeout=30000")
-            cursor = conn.cursor()
-
-            # Fetch batch of emails that need processing
-            cursor.execute("""
-                SELECT id, message_content, subject
-                FROM emails
-                WHERE plain_text_content IS NULL OR plain_text_content = ''
-                LIMIT ? OFFSET ?
-            """, (limit, offset))
+            conn = self._connect()
+            rows = self._fetch_pending(conn, after_id, limit)
+            if not rows:
+                return 0, 0, None
 
-            emails = cursor.fetchall()
-            processed_count = 0
-            error_count = 0
-
-            for email_id, message_content, subject in emails:
-                try:
-                    # Convert to plain text
-                    plain_text = self.markdown_to_plaintext(message_content or "")
-
-                    if not dry_run:
-                        # Update the database
-                        cursor.execute("""
-                            UPDATE emails
-                            SET plain_text_content = ?
-                            WHERE id = ?
-                        """, (plain_text, email_id))
-
-                    processed_count += 1
-
-                    # Log progress for every 10th email or if subject is interesting
-                    if processed_count % 10 == 0 or len(plain_text) > 1000:
-                        preview = plain_text[:100].replace('\n', ' ') + '...' if len(plain_text) > 100 else plain_text
-                        self.logger.debug(f"Processed email {email_id}: '{subject[:50]}...' -> '{preview}'")
-
-                except Exception as e:
-                    self.logger.error(f"Error processing email {email_id}: {e}")
-                    error_count += 1
-
-            if not dry_run:
-                conn.commit()
-
-            return processed_count, error_count
+            processed_count, error_count = self._store_results(
+                conn, _convert_rows(rows), dry_run
+            )
+            return processed_count, error_count, rows[-1][0]
 
         except Exception as e:
             self.logger.error(f"Error processing batch: {e}")
-            return 0, 1
+            return 0, 1, None
         finally:
             if conn:
                 conn.close()
 
+    def _convert_batches(self, conn: sqlite3.Connection,
+                         workers: int) -> Iterator[list[tuple[int, str | None, str | None]]]:
+        """
+        Convert pending rows batch by batch, in order.
+
+        Batches are read by keyset and, with more than one worker, converted
+        in a process pool with at most ``2 * workers`` batches in flight.
+        """
+        def batches() -> Iterator[list[tuple[int, str | None]]]:
+            after_id = 0
+            while rows := self._fetch_pending(conn, after_id, self.batch_size):
+                after_id = rows[-1][0]
+                yield rows
+
+        for _rows, results in bounded_process_map(_convert_rows, batches(), workers):
+            yield results
+
     def get_processing_stats(self) -> tuple[int, int]:
         """
         Get statistics about emails needing processing.
@@ -269,16 +240,22 @@ class EmailPlaintextProcessor:
             if conn:
                 conn.close()
 
-    def process_all_emails(self, dry_run: bool = False) -> bool:
+    def process_all_emails(self, dry_run: bool = False, workers: int | None = None) -> bool:
         """
         Process all emails in the database to extract plain text content.
 
+        Rows are read on a single connection by keyset, converted in a
+        process pool and written back per batch with ``executemany``.
+
         Args:
             dry_run: If True, don't actually update the database
+            workers: Worker processes (defaults to the CPU count; 1 converts
+                in this process)
 
         Returns:
             True if successful, False otherwise
         """
+        conn = None
         try:
             total_emails, emails_needing_processing = self.get_processing_stats()
 
@@ -286,26 +263,20 @@ class EmailPlaintextProcessor:
                 self.logger.info("All emails already have plain text content")
                 return True
 
-            self.logger.info(f"Processing {emails_needing_processing} of {total_emails} emails...")
+            workers = workers or os.cpu_count() or 1
+            self.logger.info(f"Processing {emails_needing_processing} of {total_emails} emails "
+                             f"with {workers} worker(s)...")
 
             total_processed = 0
             total_errors = 0
-            offset = 0
-
-            while offset < emails_needing_processing:
-                self.logger.info(f"Processing batch {offset // self.batch_size + 1} "
-                               f"({offset + 1}-{min(offset + self.batch_size, emails_needing_processing)} "
-                               f"of {emails_needing_processing})")
-
-                processed, errors = self.process_emails_batch(offset, self.batch_size, dry_run)
+            conn = self._connect()
 
+            for batch_number, results in enumerate(self._convert_batches(conn, workers), 1):
+                processed, errors = self._store_results(conn, results, dry_run)
                 total_processed += processed
                 total_errors += errors
-                offset += self.batch_size
-
-                # Break if no more emails were processed
-                if processed == 0:
-                    break
+                self.logger.info(f"Batch {batch_number}: {total_processed + total_errors} "
+                                 f"of {emails_needing_processing} emails handled")
 
             self.logger.info(f"Processing complete: {total_processed} processed, {total_errors} errors")
 
@@ -319,6 +290,9 @@ class EmailPlaintextProcessor:
         except Exception as e:
             self.logger.error(f"Error in process_all_emails: {e}")
             return False
+        finally:
+            if conn:
+                conn.close()
 
     def show_sample_comparison(self, limit: int = 3) -> None:
         """
@@ -364,6 +338,78 @@ class EmailPlaintextProcessor:
                 conn.close()
 
 
+# Markdown-stripping substitutions, applied in order
+_SUBSTITUTIONS: tuple[tuple[re.Pattern[str], str], ...] = (
+    # Table rows: | cell1 | cell2 | -> cell1 cell2
+    (re.compile(r'\|\s*([^|]+?)\s*\|'), r'\1'),
+    # Table separators: | --- | --- |
+    (re.compile(r'\|\s*-+\s*\|'), ''),
+    # Standalone table markers
+    (re.compile(r'^\|\s*\|\s*$', re.MULTILINE), ''),
+    # Headers
+    (re.compile(r'^#{1,6}\s+(.+)$', re.MULTILINE), r'\1'),
+    # Bold and italic
+    (re.compile(r'\*\*(.*?)\*\*'), r'\1'),
+    (re.compile(r'\*(.*?)\*'), r'\1'),
+    (re.compile(r'__(.*?)__'), r'\1'),
+    (re.compile(r'_(.*?)_'), r'\1'),
+    # Links: [text](url) -> text (url)
+    (re.compile(r'\[([^\]]+)\]\(([^)]+)\)'), r'\1 (\2)'),
+    # Inline code and code fences
+    (re.compile(r'`([^`]+)`'), r'\1'),
+    (re.compile(r'^```.*?$', re.MULTILINE), ''),
+    # Blockquote markers, keeping indentation
+    (re.compile(r'^>\s*', re.MULTILINE), '  '),
+    # Horizontal rules
+    (re.compile(r'^[-=]{3,}$', re.MULTILINE), ''),
+    # List markers
+    (re.compile(r'^\s*[-*+]\s+', re.MULTILINE), '  • '),
+    (re.compile(r'^\s*\d+\.\s+', re.MULTILINE), '  '),
+    # Escape characters
+    (re.compile(r'\\(.)'), r'\1'),
+    # Runs of spaces, then runs of blank lines
+    (re.compile(r' {2,}'), ' '),
+    (re.compile(r'\n{3,}'), '\n\n'),
+    # Trailing whitespace on each line
+    (re.compile(r'[^\S\n]+$', re.MULTILINE), ''),
+)
+
+
+def markdown_to_plaintext(markdown_content: str) -> str:
+    """
+    Convert markdown content to clean, readable plain text.
+
+    Args:
+        markdown_content: The markdown-formatted email content
+
+    Returns:
+        Clean plain text with preserved spacing and readability
+    """
+    if not markdown_content:
+        return ""
+
+    text = html.unescape(markdown_content)
+    for pattern, replacement in _SUBSTITUTIONS:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+def _convert_rows(rows: list[tuple[int, str | None]]) -> list[tuple[int, str | None, str | None]]:
+    """
+    Convert a batch of (id, message_content) rows.
+
+    Returns:
+        One (id, plain text, error) tuple per row
+    """
+    results = []
+    for email_id, message_content in rows:
+        try:
+            results.append((email_id, markdown_to_plaintext(message_content or ""), None))
+        except Exception as e:
+            results.append((email_id, None, f"{type(e).__name__}: {e}"))
+    return results
+
+
 def main():
     """Main entry point for the script."""
     parser = argparse.ArgumentParser(
@@ -383,6 +429,13 @@ def main():
         help='Number of emails to process in each batch (default: 100)'
     )
 
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes for conversion (default: CPU count)'
+    )
+
     parser.add_argument(
         '--dry-run',
         action='store_true',
@@ -444,7 +497,7 @@ def main():
 
     # Process all emails
     start_time = datetime.now()
-    success = processor.process_all_emails(args.dry_run)
+    success = processor.process_all_emails(args.dry_run, args.workers)
     end_time = datetime.now()
 
     duration = end_time - start_time
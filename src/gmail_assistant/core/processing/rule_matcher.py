@@ -0,0 +1,236 @@
+"""
+Compiled multi-pattern matching for classification rules.
+
+Classification rules are dictionaries of ``{family: [pattern, ...]}`` (a
+family is a category, priority level or other rule group). Checking them one
+``re.search``/``str.count`` at a time costs one pass over the text per
+pattern, so classification slows down linearly as rules are added.
+
+RuleMatcher compiles a rule dictionary once:
+
+- Literal keywords go into a single Aho-Corasick automaton (pyahocorasick),
+  so one pass over the text finds every keyword occurrence regardless of how
+  many keywords there are. Without pyahocorasick it falls back to
+  ``str.count`` per keyword.
+- Regex patterns are combined into one alternation per family, so a text is
+  searched once per family rather than once per pattern; individual patterns
+  are only consulted inside a family that matched.
+
+Usage:
+    matcher = RuleMatcher({'Support': [r'support@', r'help@'],
+                           'Marketing': [r'promo@']})
+    hit = matcher.first(sender.lower())      # RuleHit('Support', 'support@')
+
+    keywords = RuleMatcher(domain_keywords, literal=True)
+    keywords.scan(content.lower())           # {'Finance': {'bank': 2}, ...}
+"""
+
+import re
+from collections.abc import Iterable, Mapping
+from typing import NamedTuple
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+class RuleHit(NamedTuple):
+    """A matching rule: the family it belongs to and the pattern that matched."""
+    family: str
+    pattern: str
+
+
+class RuleMatcher:
+    """
+    Compiled matcher for a dictionary of rule families.
+
+    Families and patterns keep their dictionary/list order, which is the
+    priority order used by first(). scan() counts keyword occurrences (every
+    start position with the automaton, ``str.count`` semantics without it)
+    and non-overlapping ``re.finditer`` matches for regex patterns.
+    """
+
+    def __init__(self, rules: Mapping[str, Iterable[str]], literal: bool = False):
+        """
+        Compile rule families.
+
+        Args:
+            rules: Mapping of family name to patterns, in priority order
+            literal: Treat patterns as plain substrings instead of regexes
+        """
+        self.literal = literal
+
+        # (family, pattern) in priority order; the index is the priority
+        self._entries: list[RuleHit] = []
+        self._families: dict[str, list[int]] = {}
+        for family, patterns in rules.items():
+            indices = self._families.setdefault(family, [])
+            for pattern in patterns:
+                indices.append(len(self._entries))
+                self._entries.append(RuleHit(family, pattern))
+
+        self._automaton = None
+        self._family_regex: list[tuple[str, re.Pattern]] = []
+        self._pattern_regex: dict[int, re.Pattern] = {}
+
+        if literal:
+            if AHOCORASICK_AVAILABLE and self._entries:
+                self._automaton = ahocorasick.Automaton()
+                by_keyword: dict[str, list[int]] = {}
+                for index, (_family, keyword) in enumerate(self._entries):
+                    if keyword:
+                        by_keyword.setdefault(keyword, []).append(index)
+                for keyword, indices in by_keyword.items():
+                    self._automaton.add_word(keyword, indices)
+                self._automaton.make_automaton()
+        else:
+            for family, indices in self._families.items():
+                patterns = [self._entries[i].pattern for i in indices]
+                if patterns:
+                    self._family_regex.append(
+                        (family, re.compile('|'.join(f'(?:{p})' for p in patterns)))
+                    )
+                for i in indices:
+                    self._pattern_regex[i] = re.compile(self._entries[i].pattern)
+
+    def first(self, text: str) -> RuleHit | None:
+        """
+        Find the highest-priority matching rule.
+
+        Equivalent to checking families in order and, within the first family
+        that matches, returning its first matching pattern.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            RuleHit, or None if nothing matches
+        """
+        if not text:
+            return None
+
+        if self.literal:
+            hits = self._literal_counts(text)
+            return self._entries[min(hits)] if hits else None
+
+        for family, regex in self._family_regex:
+            if regex.search(text):
+                for i in self._families[family]:
+                    if self._pattern_regex[i].search(text):
+                        return self._entries[i]
+        return None
+
+    def scan(self, text: str) -> dict[str, dict[str, int]]:
+        """
+        Find every matching rule with occurrence counts.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Mapping of family -> {pattern: count}, both in rule order
+        """
+        if not text:
+            return {}
+
+        if self.literal:
+            counts = self._literal_counts(text)
+        else:
+            counts = {}
+            for family, regex in self._family_regex:
+                if not regex.search(text):
+                    continue
+                for i in self._families[family]:
+                    count = sum(1 for _ in self._pattern_regex[i].finditer(text))
+                    if count:
+                        counts[i] = count
+
+        hits: dict[str, dict[str, int]] = {}
+        for index in sorted(counts):
+            family, pattern = self._entries[index]
+            hits.setdefault(family, {})[pattern] = counts[index]
+        return hits
+
+    def _literal_counts(self, text: str) -> dict[int, int]:
+        """Count keyword occurrences, keyed by entry index."""
+        counts: dict[int, int] = {}
+        if self._automaton is not None:
+            # Skip hits overlapping the previous one so counts match str.count
+            last_end: dict[int, int] = {}
+            for end, indices in self._automaton.iter(text):
+                for index in indices:
+                    start = end - len(self._entries[index][1]) + 1
+                    if start > last_end.get(index, -1):
+                        last_end[index] = end
+                        counts[index] = counts.get(index, 0) + 1
+        else:
+            for index, (_family, keyword) in enumerate(self._entries):
+                count = text.count(keyword) if keyword else 0
+                if count:
+                    counts[index] = count
+        return counts
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CategoryRules:
+    """
+    Category rules of the form used by the analysis engines.
+
+    Each category maps to ``{'priority': int, 'keywords': [...],
+    'sender_patterns': [...]}``. A message belongs to the highest-priority
+    category with a keyword in its text or a pattern matching its sender.
+    """
+
+    def __init__(self, rules: Mapping[str, Mapping], lowercase_patterns: bool = False):
+        """
+        Compile category rules.
+
+        Args:
+            rules: Mapping of category name to rule definition
+            lowercase_patterns: Lowercase sender patterns (senders are matched lowercased)
+        """
+        ordered = sorted(rules.items(), key=lambda item: item[1].get('priority', 10))
+        self._rank = {category: rank for rank, (category, _) in enumerate(ordered)}
+        self._rules = dict(ordered)
+
+        self.keywords = RuleMatcher(
+            {category: rule.get('keywords', []) for category, rule in ordered},
+            literal=True
+        )
+        self.senders = RuleMatcher({
+            category: [p.lower() if lowercase_patterns else p
+                       for p in rule.get('sender_patterns', [])]
+            for category, rule in ordered
+        })
+
+    def categorize(self, text: str, sender: str, default: str = 'Other') -> str:
+        """
+        Pick the highest-priority matching category.
+
+        Args:
+            text: Lowercased subject and content
+            sender: Lowercased sender
+            default: Category to use when nothing matches
+        """
+        hits = [hit.family for hit in (self.keywords.first(text), self.senders.first(sender))
+                if hit is not None]
+        if not hits:
+            return default
+        return min(hits, key=self._rank.__getitem__)
+
+    def count_matches(self, text: str, sender: str, category: str) -> tuple[int, int]:
+        """
+        Count the distinct keywords and sender patterns of a category that match.
+
+        Returns:
+            Tuple of (matching patterns, total patterns) for the category
+        """
+        rule = self._rules.get(category, {})
+        total = len(rule.get('keywords', [])) + len(rule.get('sender_patterns', []))
+        matched = (len(self.keywords.scan(text).get(category, {})) +
+                   len(self.senders.scan(sender).get(category, {})))
+        return matched, total
@@ -33,15 +33,21 @@ from gmail_assistant.core.auth.credential_manager import SecureCredentialManager
 from gmail_assistant.core.constants import SCOPES_MODIFY
 
 # Local imports
-from gmail_assistant.utils.rate_limiter import GmailRateLimiter, QuotaTracker
+from gmail_assistant.utils.rate_limiter import (
+    GmailRateLimiter,
+    QuotaTracker,
+    get_gmail_rate_limiter,
+)
 
 
 class GmailDeleter:
-    def __init__(self, credentials_file: str = 'credentials.json'):
+    def __init__(self, credentials_file: str = 'credentials.json',
+                 rate_limiter: GmailRateLimiter | None = None):
         """Initialize Gmail API client with secure authentication and rate limiting"""
         self.SCOPES = SCOPES_MODIFY
         self.credential_manager = SecureCredentialManager(credentials_file)
-        self.rate_limiter = GmailRateLimiter(requests_per_second=8.0)  # Conservative rate
+        # Quota is per user, so share one bucket with every other Gmail client
+        self.rate_limiter = rate_limiter or get_gmail_rate_limiter()
         self.quota_tracker = QuotaTracker()
         self.console = Console()
         self.logger = logging.getLogger(__name__)
@@ -164,7 +170,7 @@ class GmailDeleter:
                     progress.advance(deletion_task)
 
                     # Advanced rate limiting with exponential backoff
-                    self.rate_limiter.wait_if_needed(quota_cost=50)  # Batch delete costs more
+                    self.rate_limiter.wait_if_needed(quota_cost=QuotaTracker.QUOTA_COSTS['batch_delete'])
 
                 except HttpError as error:
                     self.console.print(f"Batch delete failed: {error}", style="yellow")
@@ -182,7 +188,7 @@ class GmailDeleter:
                             deleted_count += 1
                             failed_count -= 1
                             progress.advance(individual_task)
-                            self.rate_limiter.wait_if_needed(quota_cost=10)  # Individual delete
+                            self.rate_limiter.wait_if_needed(quota_cost=QuotaTracker.QUOTA_COSTS['delete_message'])
                         except HttpError:
                             progress.advance(individual_task)
                             pass  # Keep failed count
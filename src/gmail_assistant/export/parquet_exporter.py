@@ -7,6 +7,12 @@ Features:
 - Compression for storage efficiency
 - Partitioning by date for time-based analysis
 - Schema evolution support
+- Streaming export: partitions are read with fetchmany() and written as
+  Arrow record batches, so memory stays bounded by the batch size
+- Parallel export: partitions can be exported by a pool of worker
+  processes, each with its own read-only SQLite connection
+- Incremental export: only partitions whose watermark changed since the
+  previous export are rewritten
 
 Usage:
     exporter = ParquetExporter(db_path)
@@ -14,8 +20,13 @@ Usage:
     print(f"Exported {stats['total_rows']} rows")
 """
 
+import json
 import logging
+import shutil
 import sqlite3
+import zlib
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any, ClassVar
@@ -25,11 +36,13 @@ logger = logging.getLogger(__name__)
 # Check for PyArrow availability
 try:
     import pyarrow as pa
+    import pyarrow.compute as pc
     import pyarrow.parquet as pq
     PYARROW_AVAILABLE = True
 except ImportError:
     PYARROW_AVAILABLE = False
     pa = None
+    pc = None
     pq = None
     logger.info("PyArrow not installed - Parquet export unavailable. "
                 "Install with: pip install pyarrow")
@@ -73,6 +86,16 @@ class ParquetExporter:
         ('is_read', 'bool'),
     ]
 
+    # Source columns read per partition, in query order. Only the length of
+    # message_content is exported, so it is computed in SQL.
+    SOURCE_COLUMNS: ClassVar[list[str]] = [
+        'gmail_id', 'thread_id', 'subject', 'sender', 'recipient',
+        'parsed_date', 'year_month', 'labels', 'message_length',
+    ]
+
+    # Change-tracking columns used for partition watermarks, when present
+    WATERMARK_COLUMNS: ClassVar[list[str]] = ['updated_at', 'import_timestamp']
+
     def __init__(self, db_path: Path):
         """
         Initialize Parquet exporter.
@@ -118,17 +141,33 @@ class ParquetExporter:
         partition_by: str = 'year_month',
         compression: str = 'snappy',
         batch_size: int = 10000,
-        include_deleted: bool = False
+        include_deleted: bool = False,
+        row_group_size: int | None = None,
+        jobs: int = 1,
+        incremental: bool = False
     ) -> dict[str, Any]:
         """
         Export emails to Parquet files.
 
+        Each partition is streamed from SQLite batch_size rows at a time and
+        written through a ParquetWriter, so memory use does not grow with
+        the size of the database. With jobs > 1, partitions are exported in
+        parallel by worker processes.
+
+        A watermark (row count and latest update time) is saved for every
+        partition. With incremental=True the watermark also carries a
+        checksum, partitions whose watermark matches the previous export are
+        kept as they are, and partitions that no longer exist are deleted.
+
         Args:
             output_dir: Output directory for Parquet files
             partition_by: Partition column (year_month, sender_domain)
             compression: Compression codec (snappy, gzip, zstd, none)
-            batch_size: Rows per batch for memory efficiency
+            batch_size: Rows fetched from SQLite and converted per batch
             include_deleted: Include soft-deleted emails
+            row_group_size: Rows per Parquet row group (default: batch_size)
+            jobs: Worker processes; 1 exports in this process
+            incremental: Only rewrite partitions changed since the last export
 
         Returns:
             Export statistics dictionary
@@ -142,6 +181,12 @@ class ParquetExporter:
             'total_size_bytes': 0,
             'partitions': [],
             'compression': compression,
+            'partition_by': partition_by,
+            'include_deleted': include_deleted,
+            'incremental': incremental,
+            'jobs': jobs,
+            'partitions_skipped': 0,
+            'partitions_deleted': 0,
             'started_at': datetime.now().isoformat(),
         }
 
@@ -151,42 +196,64 @@ class ParquetExporter:
         conn.row_factory = sqlite3.Row
 
         try:
-            # Build delete filter
-            delete_filter = "" if include_deleted else "WHERE deleted_at IS NULL"
+            watermarks = self._partition_watermarks(
+                conn, partition_by, include_deleted, checksum=incremental
+            )
+            partition_values = list(watermarks)
 
-            # Get partition values
-            partition_query = f"""
-                SELECT DISTINCT {partition_by}
-                FROM emails
-                {delete_filter}
-                AND {partition_by} IS NOT NULL
-                ORDER BY {partition_by}
-            """
-            partitions = conn.execute(partition_query).fetchall()
-
-            logger.info(f"Exporting {len(partitions)} partitions")
-
-            for partition_row in partitions:
-                partition_value = partition_row[0]
-                if not partition_value:
-                    continue
-
-                # Export partition
-                partition_stats = self._export_partition(
-                    conn=conn,
-                    output_dir=output_dir,
-                    partition_by=partition_by,
-                    partition_value=partition_value,
-                    schema=schema,
-                    compression=compression,
-                    include_deleted=include_deleted
+            previous = self._load_previous_watermarks(
+                output_dir, partition_by, compression, include_deleted
+            ) if incremental else {}
+
+            changed = [
+                value for value in partition_values
+                if not self._watermark_unchanged(previous.get(value), watermarks[value])
+                or not (output_dir / f"{partition_by}={value}" / "data.parquet").exists()
+            ]
+
+            for value in sorted(set(previous) - set(watermarks)):
+                shutil.rmtree(output_dir / f"{partition_by}={value}", ignore_errors=True)
+                stats['partitions_deleted'] += 1
+
+            logger.info(
+                f"Exporting {len(changed)} of {len(partition_values)} partitions"
+            )
+
+            partition_args = {
+                'output_dir': output_dir,
+                'partition_by': partition_by,
+                'compression': compression,
+                'include_deleted': include_deleted,
+                'batch_size': batch_size,
+                'row_group_size': row_group_size or batch_size,
+            }
+
+            if jobs <= 1 or len(changed) <= 1:
+                results = (
+                    (value, self._export_partition(
+                        conn=conn, partition_value=value, schema=schema, **partition_args
+                    ))
+                    for value in changed
+                )
+            else:
+                results = self._export_partitions_parallel(
+                    changed, partition_args, jobs
                 )
 
-                stats['total_rows'] += partition_stats['rows']
+            for partition_value, partition_stats in results:
                 stats['files_created'] += 1
-                stats['total_size_bytes'] += partition_stats['size_bytes']
+                watermarks[partition_value]['size_bytes'] = partition_stats['size_bytes']
+
+            for partition_value in partition_values:
+                watermark = watermarks[partition_value]
+                if 'size_bytes' not in watermark:
+                    watermark['size_bytes'] = previous[partition_value]['size_bytes']
+                    stats['partitions_skipped'] += 1
+                stats['total_rows'] += watermark['rows']
+                stats['total_size_bytes'] += watermark['size_bytes']
                 stats['partitions'].append(partition_value)
 
+            stats['partition_watermarks'] = watermarks
             stats['completed_at'] = datetime.now().isoformat()
             stats['success'] = True
 
@@ -209,6 +276,122 @@ class ParquetExporter:
         finally:
             conn.close()
 
+    def _partition_watermarks(
+        self,
+        conn: sqlite3.Connection,
+        partition_by: str,
+        include_deleted: bool,
+        checksum: bool = True
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Compute the watermark of every partition in one scan.
+
+        The checksum is a sum of per-row CRC32s over the exported source
+        columns, so it does not depend on row order and never reads the
+        message content itself. It costs a Python call per row, so it is
+        only computed when asked for (None otherwise).
+        """
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(emails)")}
+        timestamps = [name for name in self.WATERMARK_COLUMNS if name in columns]
+        if len(timestamps) > 1:
+            latest = f"MAX(COALESCE({', '.join(timestamps)}))"
+        elif timestamps:
+            latest = f"MAX({timestamps[0]})"
+        else:
+            latest = "NULL"
+
+        delete_filter = "" if include_deleted else "AND deleted_at IS NULL"
+        if checksum:
+            hashed = [
+                'COALESCE(length(message_content), 0)' if name == 'message_length' else name
+                for name in self.SOURCE_COLUMNS
+            ]
+            conn.create_function(
+                'export_row_crc', len(hashed), _row_crc, deterministic=True
+            )
+            row_checksum = f"SUM(export_row_crc({', '.join(hashed)}))"
+        else:
+            row_checksum = "NULL"
+
+        query = f"""
+            SELECT
+                {partition_by}, COUNT(*), {latest}, {row_checksum}
+            FROM emails
+            WHERE {partition_by} IS NOT NULL AND {partition_by} != ''
+            {delete_filter}
+            GROUP BY {partition_by}
+            ORDER BY {partition_by}
+        """
+
+        return {
+            row[0]: {'rows': row[1], 'max_updated': row[2], 'checksum': row[3]}
+            for row in conn.execute(query)
+        }
+
+    @staticmethod
+    def _watermark_unchanged(previous: dict[str, Any] | None,
+                             current: dict[str, Any]) -> bool:
+        """Check whether a partition is unchanged since the previous export."""
+        return previous is not None and 'size_bytes' in previous and all(
+            previous.get(key) == current[key] for key in ('rows', 'max_updated', 'checksum')
+        )
+
+    def _load_previous_watermarks(
+        self,
+        output_dir: Path,
+        partition_by: str,
+        compression: str,
+        include_deleted: bool
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Load partition watermarks from the previous export.
+
+        Returns an empty dict, forcing a full export, when there is no usable
+        metadata or the previous export used different settings.
+        """
+        metadata_path = output_dir / '_export_metadata.json'
+        try:
+            with open(metadata_path) as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        settings = (
+            metadata.get('partition_by'),
+            metadata.get('compression'),
+            metadata.get('include_deleted'),
+        )
+        if not metadata.get('success') or settings != (partition_by, compression, include_deleted):
+            return {}
+        return metadata.get('partition_watermarks') or {}
+
+    def _export_partitions_parallel(
+        self,
+        partition_values: list[str],
+        partition_args: dict[str, Any],
+        jobs: int
+    ) -> list[tuple[str, dict[str, int]]]:
+        """
+        Export partitions in a process pool.
+
+        Each worker opens its own read-only connection, so compression and
+        batch building run outside this process's GIL. Results are returned
+        in partition order.
+        """
+        workers = min(jobs, len(partition_values))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                (value, executor.submit(
+                    _export_partition_worker, self, partition_value=value, **partition_args
+                ))
+                for value in partition_values
+            ]
+            try:
+                return [(value, future.result()) for value, future in futures]
+            except BaseException:
+                executor.shutdown(cancel_futures=True)
+                raise
+
     def _export_partition(
         self,
         conn: sqlite3.Connection,
@@ -217,93 +400,140 @@ class ParquetExporter:
         partition_value: str,
         schema: 'pa.Schema',
         compression: str,
-        include_deleted: bool
+        include_deleted: bool,
+        batch_size: int = 10000,
+        row_group_size: int | None = None
     ) -> dict[str, int]:
-        """Export a single partition."""
+        """
+        Stream a single partition into its Parquet file.
+
+        Rows are fetched batch_size at a time and converted into Arrow record
+        batches; batches are buffered until row_group_size rows and then
+        written as one row group.
+        """
         delete_filter = "" if include_deleted else "AND deleted_at IS NULL"
+        row_group_size = row_group_size or batch_size
 
         query = f"""
             SELECT
                 gmail_id, thread_id, subject, sender, recipient,
-                parsed_date, year_month, labels, message_content
+                parsed_date, year_month, labels,
+                COALESCE(length(message_content), 0) AS message_length
             FROM emails
             WHERE {partition_by} = ?
             {delete_filter}
         """
 
-        rows = conn.execute(query, (partition_value,)).fetchall()
-
-        if not rows:
-            return {'rows': 0, 'size_bytes': 0}
+        cursor = conn.cursor()
+        cursor.row_factory = None  # plain tuples, transposed per batch
+        cursor.execute(query, (partition_value,))
 
-        # Build data arrays
-        data = self._build_data_arrays(rows)
-
-        # Create Arrow table
-        table = pa.table(data, schema=schema)
-
-        # Write Parquet file
         partition_dir = output_dir / f"{partition_by}={partition_value}"
-        partition_dir.mkdir(parents=True, exist_ok=True)
         output_file = partition_dir / "data.parquet"
+        writer = None
+        pending: list[pa.RecordBatch] = []
+        pending_rows = 0
+        total_rows = 0
 
-        pq.write_table(
-            table,
-            output_file,
-            compression=compression if compression != 'none' else None
-        )
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+
+                if writer is None:
+                    partition_dir.mkdir(parents=True, exist_ok=True)
+                    writer = pq.ParquetWriter(
+                        output_file,
+                        schema,
+                        compression=compression if compression != 'none' else None
+                    )
+
+                pending.append(self._build_record_batch(rows, schema))
+                pending_rows += len(rows)
+                total_rows += len(rows)
+                if pending_rows >= row_group_size:
+                    writer.write_table(pa.Table.from_batches(pending, schema=schema),
+                                       row_group_size=row_group_size)
+                    pending, pending_rows = [], 0
+
+            if pending:
+                writer.write_table(pa.Table.from_batches(pending, schema=schema),
+                                   row_group_size=row_group_size)
+        finally:
+            cursor.close()
+            if writer is not None:
+                writer.close()
 
-        logger.debug(f"Exported partition {partition_value}: {len(rows)} rows")
+        if writer is None:
+            return {'rows': 0, 'size_bytes': 0}
+
+        logger.debug(f"Exported partition {partition_value}: {total_rows} rows")
 
         return {
-            'rows': len(rows),
+            'rows': total_rows,
             'size_bytes': output_file.stat().st_size
         }
 
-    def _build_data_arrays(self, rows: list) -> dict[str, list]:
-        """Build data arrays from database rows."""
-        data = {
-            'gmail_id': [],
-            'thread_id': [],
-            'subject': [],
-            'sender': [],
-            'sender_domain': [],
-            'recipient': [],
-            'parsed_date': [],
-            'year_month': [],
-            'labels': [],
-            'message_length': [],
-            'has_attachments': [],
-            'is_read': [],
+    def _build_record_batch(self, rows: Sequence[Sequence],
+                            schema: 'pa.Schema') -> 'pa.RecordBatch':
+        """
+        Build a record batch column-wise from rows in SOURCE_COLUMNS order.
+
+        Label and sender derived columns are computed once per distinct value,
+        which repeat heavily across a mailbox.
+        """
+        source = dict(zip(self.SOURCE_COLUMNS, zip(*rows, strict=True), strict=True))
+
+        def text(name: str) -> 'pa.Array':
+            return pc.fill_null(pa.array(source[name], pa.string()), '')
+
+        sender = text('sender')
+        labels = text('labels')
+
+        columns = {
+            'gmail_id': pa.array(source['gmail_id'], pa.string()),
+            'thread_id': pa.array(source['thread_id'], pa.string()),
+            'subject': text('subject'),
+            'sender': sender,
+            'sender_domain': self._map_distinct(sender, self._extract_domain, pa.string()),
+            'recipient': text('recipient'),
+            'parsed_date': self._parse_datetime_column(source['parsed_date']),
+            'year_month': text('year_month'),
+            'labels': self._map_distinct(labels, self._parse_labels, pa.list_(pa.string())),
+            'message_length': pa.array(source['message_length'], pa.int32()),
+            'has_attachments': self._map_distinct(labels, self._check_attachments, pa.bool_()),
+            'is_read': self._map_distinct(
+                labels, lambda value: not self._check_unread(value), pa.bool_()
+            ),
         }
 
-        for row in rows:
-            data['gmail_id'].append(row['gmail_id'])
-            data['thread_id'].append(row['thread_id'])
-            data['subject'].append(row['subject'] or '')
-            data['sender'].append(row['sender'] or '')
-            data['sender_domain'].append(
-                self._extract_domain(row['sender'])
-            )
-            data['recipient'].append(row['recipient'] or '')
-            data['parsed_date'].append(
-                self._parse_datetime(row['parsed_date'])
-            )
-            data['year_month'].append(row['year_month'] or '')
-            data['labels'].append(
-                self._parse_labels(row['labels'])
-            )
-            data['message_length'].append(
-                len(row['message_content']) if row['message_content'] else 0
-            )
-            data['has_attachments'].append(
-                self._check_attachments(row['labels'])
-            )
-            data['is_read'].append(
-                not self._check_unread(row['labels'])
-            )
+        return pa.RecordBatch.from_arrays(
+            [columns[name] for name in schema.names], schema=schema
+        )
+
+    @staticmethod
+    def _map_distinct(values: 'pa.Array', func: Callable[[str], Any],
+                      pa_type: 'pa.DataType') -> 'pa.Array':
+        """Apply a Python function once per distinct value of a string array."""
+        encoded = pc.dictionary_encode(values)
+        mapped = pa.array([func(value) for value in encoded.dictionary.to_pylist()], pa_type)
+        return mapped.take(encoded.indices)
+
+    def _parse_datetime_column(self, values: Sequence[str | None]) -> 'pa.Array':
+        """
+        Parse ISO date strings to timestamps.
 
-        return data
+        Uses Arrow's vectorized cast; columns it cannot parse (for example
+        values with UTC offsets) fall back to _parse_datetime per value.
+        """
+        strings = pa.array(values, pa.string())
+        strings = pc.if_else(pc.equal(strings, ''), pa.scalar(None, pa.string()), strings)
+        try:
+            return pc.cast(strings, pa.timestamp('us'))
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            return pa.array([self._parse_datetime(value) for value in values],
+                            pa.timestamp('us'))
 
     def _extract_domain(self, sender: str) -> str:
         """Extract domain from sender email."""
@@ -346,7 +576,6 @@ class ParquetExporter:
 
     def _save_export_metadata(self, output_dir: Path, stats: dict) -> None:
         """Save export metadata file."""
-        import json
         metadata_path = output_dir / '_export_metadata.json'
         with open(metadata_path, 'w') as f:
             json.dump(stats, f, indent=2, default=str)
@@ -481,3 +710,20 @@ class ParquetExporter:
 
         finally:
             conn.close()
+
+
+def _export_partition_worker(exporter: ParquetExporter, **partition_args: Any) -> dict[str, int]:
+    """Export one partition in a worker process over a read-only connection."""
+    uri = f"{exporter.db_path.resolve().as_uri()}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    try:
+        return exporter._export_partition(
+            conn=conn, schema=exporter._get_arrow_schema(), **partition_args
+        )
+    finally:
+        conn.close()
+
+
+def _row_crc(*values: Any) -> int:
+    """CRC32 of one row's exported columns, used for partition checksums."""
+    return zlib.crc32('\x1f'.join('' if v is None else str(v) for v in values).encode())
@@ -8,6 +8,7 @@ import json
 import logging
 import re
 import sys
+from functools import cached_property
 from pathlib import Path
 from urllib.parse import urlparse
 
@@ -45,12 +46,19 @@ class EmailContentParser:
     def __init__(self, config_file: str | None = None):
         self.config = self._load_config(config_file)
         self.validator = InputValidator()
+        # Running [total quality, runs] per strategy, keyed by (email type, sender domain)
+        # and by (email type, None)
+        self.strategy_stats: dict[tuple[str, str | None], dict[str, list[float]]] = {}
         self.setup_parsers()
 
     def _load_config(self, config_file: str | None) -> dict:
         """Load parser configuration"""
         default_config = {
             "strategies": ["smart", "readability", "trafilatura", "html2text", "markdownify"],
+            # Stop trying strategies once one scores at least this (None = try all)
+            "quality_threshold": 0.8,
+            # Try the strategies that scored best for similar emails first
+            "adaptive_ordering": True,
             "newsletter_patterns": {
                 "theresanaiforthat.com": {
                     "content_selectors": [".email-content", "#main-content", ".newsletter-body"],
@@ -115,9 +123,11 @@ class EmailContentParser:
                        'tbody', 'tr', 'td', 'th', 'div', 'span']
         }
 
-    def detect_email_type(self, html_content: str, sender: str = "") -> str:
+    def detect_email_type(self, html_content: str, sender: str = "",
+                          soup: BeautifulSoup | None = None) -> str:
         """Detect the type of email for targeted parsing"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if soup is None:
+            soup = BeautifulSoup(html_content, 'html.parser')
 
         # Newsletter patterns
         if any(domain in sender.lower() for domain in ["newsletter", "digest", "update"]):
@@ -258,9 +268,13 @@ class EmailContentParser:
 
     def parse_with_smart_strategy(self, html_content: str, sender: str = "") -> tuple[str, float]:
         """Smart parsing strategy that adapts to content type"""
+        return self._smart_strategy(_ParseContext(self, html_content, sender))
+
+    def _smart_strategy(self, context: '_ParseContext') -> tuple[str, float]:
+        """Smart strategy over a shared parse context"""
         try:
-            email_type = self.detect_email_type(html_content, sender)
-            cleaned_html = self.clean_html(html_content, sender)
+            email_type = context.email_type
+            cleaned_html = context.cleaned_html(context.sender)
 
             if not cleaned_html.strip():
                 return "", 0.0
@@ -281,7 +295,8 @@ class EmailContentParser:
             markdown = self._post_process_markdown(markdown)
 
             # Calculate quality score
-            quality = self._calculate_quality_score(markdown, html_content)
+            quality = self._calculate_quality_score(markdown, context.html,
+                                                    html_text=context.html_text)
 
             return markdown, quality
 
@@ -341,18 +356,23 @@ class EmailContentParser:
 
     def parse_with_readability(self, html_content: str) -> tuple[str, float]:
         """Parse using readability for content extraction"""
+        return self._readability_strategy(_ParseContext(self, html_content))
+
+    def _readability_strategy(self, context: '_ParseContext') -> tuple[str, float]:
+        """Readability strategy over a shared parse context"""
         if not HAS_READABILITY:
             return "", 0.0
 
         try:
-            doc = Document(html_content)
+            doc = Document(context.html)
             clean_html = doc.summary()
 
             # Convert to markdown
             markdown = self.html2text_parser.handle(clean_html)
             markdown = self._post_process_markdown(markdown)
 
-            quality = self._calculate_quality_score(markdown, html_content)
+            quality = self._calculate_quality_score(markdown, context.html,
+                                                    html_text=context.html_text)
             return markdown, quality
 
         except Exception as e:
@@ -361,14 +381,19 @@ class EmailContentParser:
 
     def parse_with_trafilatura(self, html_content: str) -> tuple[str, float]:
         """Parse using trafilatura for content extraction"""
+        return self._trafilatura_strategy(_ParseContext(self, html_content))
+
+    def _trafilatura_strategy(self, context: '_ParseContext') -> tuple[str, float]:
+        """Trafilatura strategy over a shared parse context"""
         if not HAS_TRAFILATURA:
             return "", 0.0
 
         try:
-            text = trafilatura.extract(html_content, output_format='markdown')
+            text = trafilatura.extract(context.html, output_format='markdown')
             if text:
                 markdown = self._post_process_markdown(text)
-                quality = self._calculate_quality_score(markdown, html_content)
+                quality = self._calculate_quality_score(markdown, context.html,
+                                                        html_text=context.html_text)
                 return markdown, quality
 
         except Exception as e:
@@ -378,12 +403,17 @@ class EmailContentParser:
 
     def parse_with_html2text(self, html_content: str) -> tuple[str, float]:
         """Parse using html2text library"""
+        return self._html2text_strategy(_ParseContext(self, html_content))
+
+    def _html2text_strategy(self, context: '_ParseContext') -> tuple[str, float]:
+        """HTML2Text strategy over a shared parse context"""
         try:
-            cleaned_html = self.clean_html(html_content)
+            cleaned_html = context.cleaned_html()
             markdown = self.html2text_parser.handle(cleaned_html)
             markdown = self._post_process_markdown(markdown)
 
-            quality = self._calculate_quality_score(markdown, html_content)
+            quality = self._calculate_quality_score(markdown, context.html,
+                                                    html_text=context.html_text)
             return markdown, quality
 
         except Exception as e:
@@ -392,12 +422,17 @@ class EmailContentParser:
 
     def parse_with_markdownify(self, html_content: str) -> tuple[str, float]:
         """Parse using markdownify library"""
+        return self._markdownify_strategy(_ParseContext(self, html_content))
+
+    def _markdownify_strategy(self, context: '_ParseContext') -> tuple[str, float]:
+        """Markdownify strategy over a shared parse context"""
         try:
-            cleaned_html = self.clean_html(html_content)
+            cleaned_html = context.cleaned_html()
             markdown = markdownify.markdownify(cleaned_html, **self.markdownify_settings)
             markdown = self._post_process_markdown(markdown)
 
-            quality = self._calculate_quality_score(markdown, html_content)
+            quality = self._calculate_quality_score(markdown, context.html,
+                                                    html_text=context.html_text)
             return markdown, quality
 
         except Exception as e:
@@ -517,15 +552,21 @@ class EmailContentParser:
 
         return '\n'.join(cleaned_lines)
 
-    def _calculate_quality_score(self, markdown: str, original_html: str) -> float:
-        """Calculate quality score for the parsed markdown"""
+    def _calculate_quality_score(self, markdown: str, original_html: str,
+                                 html_text: str | None = None) -> float:
+        """Calculate quality score for the parsed markdown
+
+        html_text is the original HTML's text when already known, which saves
+        parsing the HTML again.
+        """
         if not markdown.strip():
             return 0.0
 
         score = 0.0
 
         # Content preservation (40% of score)
-        html_text = BeautifulSoup(original_html, 'html.parser').get_text()
+        if html_text is None:
+            html_text = BeautifulSoup(original_html, 'html.parser').get_text()
         if html_text.strip():
             content_ratio = len(markdown.strip()) / len(html_text.strip())
             score += min(content_ratio, 1.0) * 0.4
@@ -555,6 +596,49 @@ class EmailContentParser:
 
         return min(score, 1.0)
 
+    @cached_property
+    def _strategy_methods(self) -> dict:
+        """Strategy name to implementation over a shared parse context"""
+        return {
+            "smart": self._smart_strategy,
+            "readability": self._readability_strategy,
+            "trafilatura": self._trafilatura_strategy,
+            "html2text": self._html2text_strategy,
+            "markdownify": self._markdownify_strategy,
+        }
+
+    def _order_strategies(self, context: '_ParseContext') -> list[str]:
+        """
+        Order configured strategies by their average quality on earlier emails
+        of the same type from the same sender domain (or, failing that, of the
+        same type). Strategies with no history keep their configured order
+        after the ranked ones.
+        """
+        strategies = [s for s in self.config["strategies"] if s in self._strategy_methods]
+        if not self.config.get("adaptive_ordering", True):
+            return strategies
+
+        for key in ((context.email_type, context.sender_domain), (context.email_type, None)):
+            stats = self.strategy_stats.get(key)
+            if stats:
+                break
+        else:
+            return strategies
+
+        def mean_quality(strategy: str) -> float:
+            total, runs = stats.get(strategy, (0.0, 0))
+            return total / runs if runs else -1.0
+
+        return sorted(strategies, key=mean_quality, reverse=True)
+
+    def _record_strategy_quality(self, context: '_ParseContext', strategy: str,
+                                 quality: float) -> None:
+        """Record a strategy's quality for future ordering"""
+        for key in ((context.email_type, context.sender_domain), (context.email_type, None)):
+            entry = self.strategy_stats.setdefault(key, {}).setdefault(strategy, [0.0, 0])
+            entry[0] += quality
+            entry[1] += 1
+
     def parse_email_content(self, html_content: str, plain_text: str = "",
                           sender: str = "", subject: str = "") -> dict[str, str | float]:
         """
@@ -597,23 +681,16 @@ class EmailContentParser:
             }
 
         results = []
+        context = _ParseContext(self, html_content, sender)
+        threshold = self.config.get("quality_threshold")
+        early_exit = False
 
-        # Try each strategy
-        for strategy in self.config["strategies"]:
+        # Try strategies, best historical performers first, until one is good enough
+        for strategy in self._order_strategies(context):
             logger.info(f"Trying strategy: {strategy}")
 
-            if strategy == "smart":
-                markdown, quality = self.parse_with_smart_strategy(html_content, sender)
-            elif strategy == "readability":
-                markdown, quality = self.parse_with_readability(html_content)
-            elif strategy == "trafilatura":
-                markdown, quality = self.parse_with_trafilatura(html_content)
-            elif strategy == "html2text":
-                markdown, quality = self.parse_with_html2text(html_content)
-            elif strategy == "markdownify":
-                markdown, quality = self.parse_with_markdownify(html_content)
-            else:
-                continue
+            markdown, quality = self._strategy_methods[strategy](context)
+            self._record_strategy_quality(context, strategy, quality)
 
             if markdown and quality > 0:
                 results.append({
@@ -623,6 +700,10 @@ class EmailContentParser:
                     "length": len(markdown)
                 })
 
+                if threshold is not None and quality >= threshold:
+                    early_exit = True
+                    break
+
         # Choose best result
         if not results:
             # Fallback to plain text if available
@@ -646,17 +727,63 @@ class EmailContentParser:
 
         # Add metadata
         best_result["metadata"] = {
-            "email_type": self.detect_email_type(html_content, sender),
+            "email_type": context.email_type,
             "sender": sender,
             "subject": subject,
             "strategies_tried": len(results),
-            "alternative_results": len(results) - 1
+            "alternative_results": len(results) - 1,
+            "early_exit": early_exit
         }
 
         logger.info(f"Best strategy: {best_result['strategy']} (quality: {best_result['quality']:.2f})")
 
         return best_result
 
+
+class _ParseContext:
+    """
+    Per-email parse state shared by all strategies.
+
+    The original HTML is parsed at most once, for email type detection and
+    quality scoring, and cleaned HTML is produced at most once per set of
+    sender-specific cleaning rules.
+    """
+
+    def __init__(self, parser: EmailContentParser, html: str, sender: str = ""):
+        self.parser = parser
+        self.html = html
+        self.sender = sender
+        self._cleaned: dict[str, str] = {}
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        """Original HTML parsed once; must not be modified"""
+        return BeautifulSoup(self.html, 'html.parser')
+
+    @cached_property
+    def html_text(self) -> str:
+        """Text of the original HTML"""
+        return self.soup.get_text()
+
+    @cached_property
+    def email_type(self) -> str:
+        """Detected email type"""
+        return self.parser.detect_email_type(self.html, self.sender, soup=self.soup)
+
+    @cached_property
+    def sender_domain(self) -> str:
+        """Sender's domain"""
+        return self.parser._extract_domain(self.sender)
+
+    def cleaned_html(self, sender: str = "") -> str:
+        """Cleaned HTML, cached per applicable sender-specific rule set"""
+        domain = self.parser._extract_domain(sender)
+        key = domain if domain in self.parser.config["newsletter_patterns"] else ""
+        if key not in self._cleaned:
+            self._cleaned[key] = self.parser.clean_html(self.html, sender)
+        return self._cleaned[key]
+
+
 def main():
     """Test the parser with sample content"""
 
@@ -0,0 +1,264 @@
+"""
+Parallel, incremental file conversion runner.
+
+Shared by the EML-to-Markdown converters. Source files are fanned out to a
+process pool in chunks, and sources whose size and modification time (or,
+when only the time changed, SHA-256) match their last successful conversion
+are skipped. Failures are collected into the summary instead of being
+logged one by one.
+
+Usage:
+    runner = ConversionRunner(convert_one, output_root, workers=8)
+    summary = runner.run(eml_files, base_dir=input_dir)
+    print(summary.format())
+"""
+
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from gmail_assistant.utils.process_pool import bounded_process_map
+
+logger = logging.getLogger(__name__)
+
+STATE_FILENAME = '.conversion_state.json'
+
+
+@dataclass
+class ConversionFailure:
+    """A source file that could not be converted."""
+    source: str
+    error: str
+
+
+@dataclass
+class ConversionSummary:
+    """Outcome of a conversion run."""
+    total: int = 0
+    converted: int = 0
+    skipped: int = 0
+    failures: list[ConversionFailure] = field(default_factory=list)
+
+    @property
+    def failed(self) -> int:
+        """Number of files that failed to convert."""
+        return len(self.failures)
+
+    @property
+    def done(self) -> int:
+        """Number of files handled so far."""
+        return self.converted + self.skipped + self.failed
+
+    def format(self, max_failures: int = 10) -> str:
+        """Human-readable summary listing the first failures."""
+        lines = [
+            f"Total: {self.total}, converted: {self.converted}, "
+            f"up to date: {self.skipped}, failed: {self.failed}"
+        ]
+        for failure in self.failures[:max_failures]:
+            lines.append(f"  FAILED {failure.source}: {failure.error}")
+        if self.failed > max_failures:
+            lines.append(f"  ... and {self.failed - max_failures} more")
+        return '\n'.join(lines)
+
+
+class ConversionRunner:
+    """
+    Convert many source files in parallel, skipping unchanged ones.
+
+    ``convert`` is called with a source path and returns the output path it
+    wrote; it signals failure by raising or by returning None. It runs in
+    worker processes, so it must be picklable (a module-level function or a
+    functools.partial of one).
+
+    Conversion state is kept in a JSON file under ``output_root`` keyed by
+    the source path relative to the run's base directory.
+    """
+
+    def __init__(
+        self,
+        convert: Callable[[Path], Path | None],
+        output_root: Path,
+        workers: int | None = None,
+        chunk_size: int = 32,
+        expected_output: Callable[[Path], Path] | None = None,
+        force: bool = False,
+        progress: Callable[[ConversionSummary], None] | None = None
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            convert: Function converting one source file
+            output_root: Output root; the state file is stored here
+            workers: Worker processes (defaults to the CPU count; 1 runs inline)
+            chunk_size: Source files per worker task
+            expected_output: Maps a source to its output path when that is
+                known without converting; lets sources with no recorded state
+                be skipped when the output is newer
+            force: Convert every source regardless of recorded state
+            progress: Called with the running summary after each chunk
+        """
+        self.convert = convert
+        self.output_root = Path(output_root)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.expected_output = expected_output
+        self.force = force
+        self.progress = progress
+        self.state_path = self.output_root / STATE_FILENAME
+        self.state = self._load_state()
+
+    def run(self, sources: Iterable[Path], base_dir: Path) -> ConversionSummary:
+        """
+        Convert sources that are new or changed since their last conversion.
+
+        Args:
+            sources: Source files
+            base_dir: Directory the state keys are relative to
+
+        Returns:
+            Summary of the run
+        """
+        sources = list(sources)
+        summary = ConversionSummary(total=len(sources))
+
+        pending = []
+        for source in sources:
+            if not self.force and self._is_up_to_date(source, base_dir):
+                summary.skipped += 1
+            else:
+                pending.append(source)
+
+        logger.info(f"{len(pending)} of {summary.total} files need conversion")
+
+        try:
+            for chunk, results in self._convert_chunks(pending):
+                for source, (output, sha256, error) in zip(chunk, results, strict=True):
+                    if error is None:
+                        self._record(source, base_dir, Path(output), sha256)
+                        summary.converted += 1
+                    else:
+                        summary.failures.append(ConversionFailure(str(source), error))
+                if self.progress:
+                    self.progress(summary)
+        finally:
+            self._save_state()
+
+        return summary
+
+    def _convert_chunks(self, sources: list[Path]) -> Iterator[tuple[list[Path], list]]:
+        """Convert sources in chunks, keeping at most 2 * workers chunks in flight."""
+        source_iter = iter(sources)
+        chunks = iter(lambda: list(islice(source_iter, self.chunk_size)), [])
+        workers = 1 if len(sources) <= self.chunk_size else self.workers
+        yield from bounded_process_map(partial(_convert_chunk, self.convert), chunks, workers)
+
+    def _is_up_to_date(self, source: Path, base_dir: Path) -> bool:
+        """Check whether a source's recorded output is still current."""
+        key = self._key(source, base_dir)
+        stat = source.stat()
+        entry = self.state.get(key)
+
+        if entry is None:
+            if self.expected_output is None:
+                return False
+            output = self.expected_output(source)
+            if not output.exists() or output.stat().st_mtime_ns < stat.st_mtime_ns:
+                return False
+            self._record(source, base_dir, output, None)
+            return True
+
+        if not self._resolve_output(entry['output']).exists():
+            return False
+        if entry['size'] != stat.st_size:
+            return False
+        if entry['mtime_ns'] == stat.st_mtime_ns:
+            return True
+
+        # Touched but possibly unchanged: compare content
+        if entry.get('sha256') and entry['sha256'] == _sha256(source):
+            entry['mtime_ns'] = stat.st_mtime_ns
+            return True
+        return False
+
+    def _record(self, source: Path, base_dir: Path, output: Path, sha256: str | None) -> None:
+        """Record a successful conversion."""
+        stat = source.stat()
+        try:
+            output_ref = output.relative_to(self.output_root).as_posix()
+        except ValueError:
+            output_ref = str(output)
+        self.state[self._key(source, base_dir)] = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': sha256,
+            'output': output_ref,
+        }
+
+    def _resolve_output(self, output_ref: str) -> Path:
+        """Resolve a recorded output path."""
+        output = Path(output_ref)
+        return output if output.is_absolute() else self.output_root / output
+
+    @staticmethod
+    def _key(source: Path, base_dir: Path) -> str:
+        """State key for a source file."""
+        try:
+            return source.relative_to(base_dir).as_posix()
+        except ValueError:
+            return str(source)
+
+    def _load_state(self) -> dict[str, dict[str, Any]]:
+        """Load recorded conversion state."""
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self) -> None:
+        """Atomically save conversion state."""
+        self.output_root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.state_path)
+
+
+def _sha256(path: Path) -> str:
+    """SHA-256 of a file's content."""
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b''):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def _convert_chunk(convert: Callable[[Path], Path | None],
+                   sources: list[Path]) -> list[tuple[str | None, str | None, str | None]]:
+    """
+    Convert a chunk of sources.
+
+    Returns:
+        One (output path, source SHA-256, error) tuple per source
+    """
+    results = []
+    for source in sources:
+        try:
+            sha256 = _sha256(source)
+            output = convert(source)
+            if output is None:
+                results.append((None, None, 'no output produced'))
+            else:
+                results.append((str(output), sha256, None))
+        except Exception as e:
+            results.append((None, None, f"{type(e).__name__}: {e}"))
+    return results
@@ -24,9 +24,11 @@ import sys
 from email import policy
 from email.parser import BytesParser
 from email.utils import getaddresses, parsedate_to_datetime
+from functools import partial
 from pathlib import Path
 
 # Local imports
+from gmail_assistant.parsers.conversion_runner import ConversionRunner, ConversionSummary
 from gmail_assistant.utils.input_validator import InputValidator, ValidationError
 
 # Dependency checks (fail fast with actionable hints)
@@ -308,6 +310,10 @@ def process_eml(eml_path: Path, base_dir: Path, out_root: Path) -> Path | None:
     out_path.write_text(final_md, encoding="utf-8", newline="\n")
     return out_path
 
+def reformatted_md_path(md_path: Path, base_dir: Path, out_root: Path) -> Path:
+    rel = md_path.parent.relative_to(base_dir)
+    return out_root / rel / sanitize_filename(md_path.stem + ".md")
+
 def reformat_md(md_path: Path, base_dir: Path, out_root: Path, use_mdformat: bool = True) -> Path | None:
     enc = detect_encoding(md_path)
     text = md_path.read_text(encoding=enc, errors="replace")
@@ -326,10 +332,8 @@ def reformat_md(md_path: Path, base_dir: Path, out_root: Path, use_mdformat: boo
     text = re.sub(r"^(\s*>+)\s*", r"\1 ", text, flags=re.MULTILINE)
 
     # Write temp and run mdformat if available
-    rel = md_path.parent.relative_to(base_dir)
-    out_dir = out_root / rel
-    out_dir.mkdir(parents=True, exist_ok=True)
-    out_path = out_dir / sanitize_filename(md_path.stem + ".md")
+    out_path = reformatted_md_path(md_path, base_dir, out_root)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
     out_path.write_text(text, encoding="utf-8", newline="\n")
 
     if _mdformat_available and use_mdformat:
@@ -358,6 +362,8 @@ def main():
     ap.add_argument("--process-md", action="store_true", help="Also reformat existing .md files (off by default)")
     ap.add_argument("--no-mdformat", action="store_true", help="Disable mdformat step even if installed")
     ap.add_argument("--output", default="", help="Optional output root; defaults to <base_parent>/<base_name>_clean")
+    ap.add_argument("--workers", type=int, default=0, help="Worker processes (0 = CPU count)")
+    ap.add_argument("--force", action="store_true", help="Reconvert files whose output is up to date")
     args = ap.parse_args()
 
     logging.basicConfig(
@@ -417,23 +423,34 @@ def main():
     if args.dry_run:
         return
 
-    processed = 0
-    for eml in eml_paths:
-        try:
-            outp = process_eml(eml, base_dir, out_root)
-            processed += 1
-            logging.debug("Processed EML -> %s", outp)
-        except Exception as e:
-            logging.error("Failed EML %s: %s", eml, e)
+    def show_progress(summary: ConversionSummary) -> None:
+        logging.info("Progress: %d/%d", summary.done, summary.total)
 
-    for md in md_paths:
-        try:
-            outp = reformat_md(md, base_dir, out_root, use_mdformat=not args.no_mdformat)
-            logging.debug("Reformatted MD -> %s", outp)
-        except Exception as e:
-            logging.error("Failed MD %s: %s", md, e)
+    eml_runner = ConversionRunner(
+        partial(process_eml, base_dir=base_dir, out_root=out_root),
+        out_root,
+        workers=args.workers,
+        force=args.force,
+        progress=show_progress,
+    )
+    eml_summary = eml_runner.run(eml_paths, base_dir=base_dir)
+    logging.info("EML conversion: %s", eml_summary.format())
+
+    if md_paths:
+        md_runner = ConversionRunner(
+            partial(reformat_md, base_dir=base_dir, out_root=out_root,
+                    use_mdformat=not args.no_mdformat),
+            out_root,
+            workers=args.workers,
+            expected_output=partial(reformatted_md_path, base_dir=base_dir, out_root=out_root),
+            force=args.force,
+            progress=show_progress,
+        )
+        md_summary = md_runner.run(md_paths, base_dir=base_dir)
+        logging.info("MD reformat: %s", md_summary.format())
 
-    logging.info("Done. Processed %d EML files. Reformatted %d MD files.", processed, len(md_paths))
+    logging.info("Done. Processed %d EML files. Reformatted %d MD files.",
+                 eml_summary.converted, md_summary.converted if md_paths else 0)
     logging.info("Outputs under: %s", out_root)
 
 if __name__ == "__main__":
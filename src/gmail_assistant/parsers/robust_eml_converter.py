@@ -13,12 +13,16 @@ A bulletproof converter that:
 import email
 import email.policy
 import logging
+from collections.abc import Callable
+from functools import partial
 from pathlib import Path
+from typing import Any
 
 import frontmatter
 
 # Import our advanced parser
 from gmail_assistant.parsers.advanced_email_parser import EmailContentParser
+from gmail_assistant.parsers.conversion_runner import ConversionRunner, ConversionSummary
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -314,45 +318,7 @@ class RobustEMLConverter:
         """
         try:
             logger.info(f"Converting {eml_path.name} to markdown...")
-
-            # Extract email parts
-            email_parts = self.extract_email_parts(eml_path)
-
-            if not email_parts['html'] and not email_parts['text']:
-                logger.error(f"No content found in {eml_path}")
-                return False
-
-            # Use advanced parser for content conversion
-            result = self.advanced_parser.parse_email_content(
-                html_content=email_parts['html'],
-                plain_text=email_parts['text'],
-                sender=email_parts['metadata'].get('from', ''),
-                subject=email_parts['metadata'].get('subject', '')
-            )
-
-            # Create YAML front matter
-            front_matter = {
-                'subject': email_parts['metadata'].get('subject', ''),
-                'from': email_parts['metadata'].get('from', ''),
-                'to': email_parts['metadata'].get('to', ''),
-                'date': email_parts['metadata'].get('date'),
-                'message_id': email_parts['metadata'].get('message_id', ''),
-                'conversion_strategy': result.get('strategy', 'unknown'),
-                'quality_score': result.get('quality', 0.0),
-                'source_file': str(eml_path.name)
-            }
-
-            # Create markdown document with front matter
-            post = frontmatter.Post(result['markdown'], **front_matter)
-            markdown_content = frontmatter.dumps(post)
-
-            # Ensure output directory exists
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # Write markdown file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(markdown_content)
-
+            self._write_markdown(eml_path, output_path)
             logger.info(f"Successfully converted to {output_path}")
             return True
 
@@ -360,42 +326,97 @@ class RobustEMLConverter:
             logger.error(f"Failed to convert {eml_path}: {e}")
             return False
 
-    def convert_directory(self, input_dir: Path, output_dir: Path, limit: int = 0) -> dict[str, int]:
+    def _write_markdown(self, eml_path: Path, output_path: Path) -> None:
+        """
+        Convert one EML file and write the markdown output
+
+        Raises:
+            ValueError: If the email has no content
+        """
+        # Extract email parts
+        email_parts = self.extract_email_parts(eml_path)
+
+        if not email_parts['html'] and not email_parts['text']:
+            raise ValueError(f"No content found in {eml_path}")
+
+        # Use advanced parser for content conversion
+        result = self.advanced_parser.parse_email_content(
+            html_content=email_parts['html'],
+            plain_text=email_parts['text'],
+            sender=email_parts['metadata'].get('from', ''),
+            subject=email_parts['metadata'].get('subject', '')
+        )
+
+        # Create YAML front matter
+        front_matter = {
+            'subject': email_parts['metadata'].get('subject', ''),
+            'from': email_parts['metadata'].get('from', ''),
+            'to': email_parts['metadata'].get('to', ''),
+            'date': email_parts['metadata'].get('date'),
+            'message_id': email_parts['metadata'].get('message_id', ''),
+            'conversion_strategy': result.get('strategy', 'unknown'),
+            'quality_score': result.get('quality', 0.0),
+            'source_file': str(eml_path.name)
+        }
+
+        # Create markdown document with front matter
+        post = frontmatter.Post(result['markdown'], **front_matter)
+        markdown_content = frontmatter.dumps(post)
+
+        # Ensure output directory exists
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write markdown file
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(markdown_content)
+
+    def convert_directory(self, input_dir: Path, output_dir: Path, limit: int = 0,
+                          workers: int | None = None, force: bool = False,
+                          progress: Callable[[ConversionSummary], None] | None = None
+                          ) -> dict[str, Any]:
         """
         Convert all EML files in directory tree to markdown
 
+        Files are converted in a process pool. EML files whose markdown
+        output is already up to date are skipped unless force is set.
+
         Args:
             input_dir: Input directory with EML files
             output_dir: Output directory for markdown files
             limit: Maximum files to process (0 = no limit)
+            workers: Worker processes (defaults to the CPU count)
+            force: Reconvert files even if their output is up to date
+            progress: Called with the running summary as chunks complete
 
         Returns:
             Conversion statistics
         """
-        eml_files = list(input_dir.glob("**/*.eml"))
+        eml_files = sorted(input_dir.glob("**/*.eml"))
 
         if limit > 0:
             eml_files = eml_files[:limit]
 
-        stats = {
-            'total': len(eml_files),
-            'success': 0,
-            'failed': 0
-        }
+        logger.info(f"Found {len(eml_files)} EML files to convert")
 
-        logger.info(f"Found {stats['total']} EML files to convert")
+        runner = ConversionRunner(
+            partial(_convert_eml_file, self, input_dir, output_dir),
+            output_dir,
+            workers=workers,
+            expected_output=partial(_markdown_output_path, input_dir, output_dir),
+            force=force,
+            progress=progress
+        )
+        summary = runner.run(eml_files, base_dir=input_dir)
 
-        for eml_file in eml_files:
-            # Preserve directory structure
-            rel_path = eml_file.relative_to(input_dir)
-            output_path = output_dir / rel_path.with_suffix('.md')
-
-            if self.convert_eml_to_markdown(eml_file, output_path):
-                stats['success'] += 1
-            else:
-                stats['failed'] += 1
+        stats = {
+            'total': summary.total,
+            'success': summary.converted,
+            'skipped': summary.skipped,
+            'failed': summary.failed,
+            'failures': summary.failures
+        }
 
-        logger.info(f"Conversion complete: {stats['success']} success, {stats['failed']} failed")
+        logger.info(f"Conversion complete: {summary.format()}")
         return stats
 
     def _extract_mime_content(self, mime_body: str, content_type: str) -> str:
@@ -513,6 +534,19 @@ class RobustEMLConverter:
             logger.error(f"Failed to extract MIME content: {e}")
             return ""
 
+def _markdown_output_path(input_dir: Path, output_dir: Path, eml_path: Path) -> Path:
+    """Markdown output path mirroring the EML file's place in the input tree"""
+    return output_dir / eml_path.relative_to(input_dir).with_suffix('.md')
+
+
+def _convert_eml_file(converter: RobustEMLConverter, input_dir: Path, output_dir: Path,
+                      eml_path: Path) -> Path:
+    """Convert one EML file in a worker process, raising on failure"""
+    output_path = _markdown_output_path(input_dir, output_dir, eml_path)
+    converter._write_markdown(eml_path, output_path)
+    return output_path
+
+
 def main():
     """CLI interface for testing"""
     import argparse
@@ -521,6 +555,8 @@ def main():
     parser.add_argument("--input", required=True, help="Input directory with EML files")
     parser.add_argument("--output", required=True, help="Output directory for markdown files")
     parser.add_argument("--limit", type=int, default=0, help="Limit number of files to process")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Reconvert files that are up to date")
     parser.add_argument("--verbose", action="store_true", help="Verbose logging")
 
     args = parser.parse_args()
@@ -528,14 +564,23 @@ def main():
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
+    def show_progress(summary: ConversionSummary) -> None:
+        print(f"\rProgress: {summary.done}/{summary.total}", end='', flush=True)
+
     converter = RobustEMLConverter()
-    stats = converter.convert_directory(Path(args.input), Path(args.output), args.limit)
+    stats = converter.convert_directory(Path(args.input), Path(args.output), args.limit,
+                                        workers=args.workers, force=args.force,
+                                        progress=show_progress)
 
     print("\nConversion Results:")
     print(f"Total files: {stats['total']}")
     print(f"Successful: {stats['success']}")
+    print(f"Up to date: {stats['skipped']}")
     print(f"Failed: {stats['failed']}")
-    print(f"Success rate: {stats['success']/stats['total']*100:.1f}%")
+    for failure in stats['failures'][:10]:
+        print(f"  {failure.source}: {failure.error}")
+    if stats['total']:
+        print(f"Success rate: {(stats['success'] + stats['skipped'])/stats['total']*100:.1f}%")
 
 if __name__ == "__main__":
     main()
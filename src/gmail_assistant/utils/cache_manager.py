@@ -1,13 +1,16 @@
 """
 Intelligent caching system for Gmail Fetcher.
-Provides memory-efficient caching with automatic cleanup and persistence.
+Provides memory-efficient caching with automatic cleanup and persistence
+to an SQLite key/value store.
 """
 
 import hashlib
 import json
 import logging
+import sqlite3
 import threading
 import time
+import zlib
 from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
@@ -17,6 +20,13 @@ from .memory_manager import MemoryOptimizedCache, MemoryTracker
 
 logger = logging.getLogger(__name__)
 
+STORE_FILENAME = 'cache.db'
+ACCESS_FLUSH_SIZE = 256
+COMPRESS_THRESHOLD = 4096
+
+_JSON_TAG = b'j'
+_ZLIB_TAG = b'z'
+
 
 @dataclass
 class CacheEntry:
@@ -28,6 +38,7 @@ class CacheEntry:
     access_count: int
     ttl: float | None = None
     size_bytes: int = 0
+    persisted: bool = False
 
     def is_expired(self) -> bool:
         """Check if cache entry is expired."""
@@ -50,6 +61,10 @@ class CacheEntry:
 class IntelligentCache:
     """
     Intelligent caching system with multiple storage layers and automatic optimization.
+
+    The disk tier is an SQLite key/value table holding each value as compact
+    (optionally zlib-compressed) JSON alongside its TTL and LRU columns, so
+    puts and gets touch a single row and startup reads nothing up front.
     """
 
     def __init__(self,
@@ -78,17 +93,61 @@ class IntelligentCache:
             self.disk_cache_dir = Path.home() / '.gmail_assistant_cache'
 
         self.disk_cache_dir.mkdir(exist_ok=True)
+        self.store_path = self.disk_cache_dir / STORE_FILENAME
 
-        # Cache metadata
+        # Metadata for entries held by this process; persisted entries keep
+        # theirs in the store
         self.metadata: dict[str, CacheEntry] = {}
         self.lock = threading.RLock()
 
-        # Load existing metadata
-        self._load_metadata()
+        # Access updates for persisted entries, flushed in one executemany
+        self._pending_access: dict[str, tuple[float, int]] = {}
+        self._batch_depth = 0
+
+        self._conn: sqlite3.Connection | None = None
+        if self.enable_persistence:
+            self._open_store()
 
         # Cleanup expired entries
         self._cleanup_expired()
 
+    def _open_store(self) -> None:
+        """Open the SQLite store, creating its schema if needed."""
+        self._conn = sqlite3.connect(self.store_path, timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=30000")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL,
+                access_count INTEGER NOT NULL DEFAULT 0,
+                ttl REAL,
+                expires_at REAL,
+                size_bytes INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache_entries(expires_at)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_lru ON cache_entries(last_accessed)"
+        )
+        self._conn.commit()
+        self._remove_legacy_files()
+
+    def _remove_legacy_files(self) -> None:
+        """Remove the per-entry JSON files written by earlier versions."""
+        legacy_metadata = self.disk_cache_dir / 'metadata.json'
+        if not legacy_metadata.exists():
+            return
+        for cache_file in self.disk_cache_dir.glob('*.cache'):
+            cache_file.unlink(missing_ok=True)
+        legacy_metadata.unlink(missing_ok=True)
+        logger.info("Removed legacy JSON cache files")
+
     def _get_cache_key(self, key: str) -> str:
         """Generate consistent cache key."""
         if isinstance(key, str) and len(key) < 100:
@@ -97,10 +156,6 @@ class IntelligentCache:
         # Hash long keys
         return hashlib.sha256(key.encode()).hexdigest()[:16]
 
-    def _get_disk_path(self, cache_key: str) -> Path:
-        """Get disk cache file path."""
-        return self.disk_cache_dir / f"{cache_key}.cache"
-
     def _estimate_size(self, value: Any) -> int:
         """Estimate size of value in bytes."""
         try:
@@ -134,11 +189,15 @@ class IntelligentCache:
             # Check memory cache first
             value = self.memory_cache.get(cache_key)
             if value is not None:
+                entry = self.metadata.get(cache_key)
+                if entry is not None and entry.is_expired():
+                    self._remove(cache_key)
+                    return default
                 self._update_access_metadata(cache_key)
                 return value
 
             # Check disk cache
-            if self.enable_persistence:
+            if self._conn is not None:
                 value = self._load_from_disk(cache_key)
                 if value is not None:
                     # Promote to memory cache
@@ -165,10 +224,20 @@ class IntelligentCache:
 
         with self.lock:
             try:
+                # Serialize once: the encoding sizes the entry and is what
+                # gets persisted
+                payload = None
+                if self._conn is not None:
+                    try:
+                        payload, size_bytes = _encode_value(value)
+                    except (TypeError, ValueError) as e:
+                        logger.warning(f"Value not JSON serializable for cache {cache_key}: {e}")
+                        size_bytes = 1024
+                else:
+                    size_bytes = self._estimate_size(value)
+
                 # Create cache entry
                 now = time.time()
-                size_bytes = self._estimate_size(value)
-
                 entry = CacheEntry(
                     key=cache_key,
                     value=value,
@@ -184,12 +253,17 @@ class IntelligentCache:
 
                 # Store metadata
                 self.metadata[cache_key] = entry
+                self._pending_access.pop(cache_key, None)
 
-                # Persist to disk if enabled and valuable
-                if self.enable_persistence and self._should_persist(entry):
-                    self._save_to_disk(cache_key, value)
+                # Persist to disk if enabled and valuable; otherwise drop any
+                # stale persisted copy
+                if self._conn is not None:
+                    if payload is not None and self._should_persist(entry):
+                        entry.persisted = self._save_to_disk(entry, payload)
+                    else:
+                        self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (cache_key,))
+                    self._commit()
 
-                self._save_metadata()
                 return True
 
             except Exception as e:
@@ -213,116 +287,142 @@ class IntelligentCache:
         return memory_status['status'] in ['warning', 'critical']
 
     def _load_from_disk(self, cache_key: str) -> Any:
-        """Load value from disk cache using JSON for security."""
+        """Load value from the disk store, dropping it if expired or unreadable."""
         try:
-            disk_path = self._get_disk_path(cache_key)
-            if not disk_path.exists():
+            row = self._conn.execute("""
+                SELECT value, created_at, last_accessed, access_count, ttl, size_bytes
+                FROM cache_entries WHERE key = ?
+            """, (cache_key,)).fetchone()
+            if row is None:
                 return None
 
-            # Check if entry is expired
-            if cache_key in self.metadata:
-                entry = self.metadata[cache_key]
-                if entry.is_expired():
-                    disk_path.unlink(missing_ok=True)
-                    del self.metadata[cache_key]
-                    return None
-
-            # Load value using JSON (secure deserialization)
-            with open(disk_path, encoding='utf-8') as f:
-                return json.load(f)
-
-        except json.JSONDecodeError as e:
-            logger.warning(f"Invalid JSON in cache file {cache_key}, removing: {e}")
-            disk_path.unlink(missing_ok=True)
+            blob, created_at, last_accessed, access_count, ttl, size_bytes = row
+            entry = CacheEntry(
+                key=cache_key,
+                value=None,  # Held by the memory cache once promoted
+                created_at=created_at,
+                last_accessed=last_accessed,
+                access_count=access_count,
+                ttl=ttl,
+                size_bytes=size_bytes,
+                persisted=True
+            )
+            if entry.is_expired():
+                self._remove(cache_key)
+                return None
+
+            value = _decode_value(blob)
+            self.metadata[cache_key] = entry
+            return value
+
+        except (ValueError, zlib.error) as e:
+            logger.warning(f"Invalid cache entry {cache_key}, removing: {e}")
+            self._remove(cache_key)
             return None
         except Exception as e:
             logger.error(f"Error loading from disk cache {cache_key}: {e}")
             return None
 
-    def _save_to_disk(self, cache_key: str, value: Any) -> bool:
-        """Save value to disk cache using JSON for security."""
+    def _save_to_disk(self, entry: CacheEntry, payload: bytes) -> bool:
+        """Write an encoded value and its metadata to the disk store."""
         try:
-            disk_path = self._get_disk_path(cache_key)
-            with open(disk_path, 'w', encoding='utf-8') as f:
-                json.dump(value, f, default=str, indent=2)
+            expires_at = entry.created_at + entry.ttl if entry.ttl is not None else None
+            self._conn.execute("""
+                INSERT OR REPLACE INTO cache_entries
+                    (key, value, created_at, last_accessed, access_count, ttl, expires_at, size_bytes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (entry.key, payload, entry.created_at, entry.last_accessed,
+                  entry.access_count, entry.ttl, expires_at, entry.size_bytes))
             return True
 
-        except (TypeError, ValueError) as e:
-            logger.warning(f"Value not JSON serializable for cache {cache_key}: {e}")
-            return False
         except Exception as e:
-            logger.error(f"Error saving to disk cache {cache_key}: {e}")
+            logger.error(f"Error saving to disk cache {entry.key}: {e}")
             return False
 
     def _update_access_metadata(self, cache_key: str) -> None:
         """Update access metadata for cache entry."""
-        if cache_key in self.metadata:
-            entry = self.metadata[cache_key]
-            entry.last_accessed = time.time()
-            entry.access_count += 1
-
-    def _load_metadata(self) -> None:
-        """Load cache metadata from disk."""
+        entry = self.metadata.get(cache_key)
+        if entry is None:
+            return
+
+        now = time.time()
+        entry.last_accessed = now
+        entry.access_count += 1
+
+        if entry.persisted and self._conn is not None:
+            _, count = self._pending_access.get(cache_key, (now, 0))
+            self._pending_access[cache_key] = (now, count + 1)
+            if len(self._pending_access) >= ACCESS_FLUSH_SIZE and not self._batch_depth:
+                self._flush_access_updates()
+
+    def _flush_access_updates(self) -> None:
+        """Write buffered access updates to the disk store."""
+        if not self._pending_access or self._conn is None:
+            return
+        updates = [(last_accessed, count, key)
+                   for key, (last_accessed, count) in self._pending_access.items()]
+        self._pending_access.clear()
         try:
-            metadata_path = self.disk_cache_dir / 'metadata.json'
-            if metadata_path.exists():
-                with open(metadata_path) as f:
-                    data = json.load(f)
-
-                # Reconstruct metadata
-                for key, entry_data in data.items():
-                    entry = CacheEntry(
-                        key=entry_data['key'],
-                        value=None,  # Value loaded separately
-                        created_at=entry_data['created_at'],
-                        last_accessed=entry_data['last_accessed'],
-                        access_count=entry_data['access_count'],
-                        ttl=entry_data.get('ttl'),
-                        size_bytes=entry_data.get('size_bytes', 0)
-                    )
-                    self.metadata[key] = entry
+            self._conn.executemany("""
+                UPDATE cache_entries
+                SET last_accessed = MAX(last_accessed, ?), access_count = access_count + ?
+                WHERE key = ?
+            """, updates)
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error saving cache access metadata: {e}")
+
+    def _commit(self) -> None:
+        """Commit the disk store unless a batch is open."""
+        if not self._batch_depth:
+            self._conn.commit()
+
+    def _drop_from_memory(self, cache_key: str) -> bool:
+        """Remove a key from the memory cache."""
+        if cache_key not in self.memory_cache.cache:
+            return False
+        del self.memory_cache.cache[cache_key]
+        if cache_key in self.memory_cache.access_order:
+            self.memory_cache.access_order.remove(cache_key)
+        return True
 
-        except Exception as e:
-            logger.error(f"Error loading cache metadata: {e}")
+    def _remove(self, cache_key: str) -> bool:
+        """Remove a key from every tier."""
+        found = self._drop_from_memory(cache_key)
+        found = self.metadata.pop(cache_key, None) is not None or found
+        self._pending_access.pop(cache_key, None)
 
-    def _save_metadata(self) -> None:
-        """Save cache metadata to disk."""
-        try:
-            metadata_path = self.disk_cache_dir / 'metadata.json'
-            data = {key: entry.to_dict() for key, entry in self.metadata.items()}
+        if self._conn is not None:
+            cursor = self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (cache_key,))
+            found = cursor.rowcount > 0 or found
+            self._commit()
 
-            with open(metadata_path, 'w') as f:
-                json.dump(data, f, indent=2)
-
-        except Exception as e:
-            logger.error(f"Error saving cache metadata: {e}")
+        return found
 
     def _cleanup_expired(self) -> int:
         """Clean up expired cache entries."""
-        expired_keys = []
+        now = time.time()
 
         with self.lock:
-            for key, entry in self.metadata.items():
-                if entry.is_expired():
-                    expired_keys.append(key)
-
+            expired_keys = [key for key, entry in self.metadata.items() if entry.is_expired()]
             for key in expired_keys:
-                # Remove from memory cache
-                if key in self.memory_cache.cache:
-                    del self.memory_cache.cache[key]
-
-                # Remove from disk
-                disk_path = self._get_disk_path(key)
-                disk_path.unlink(missing_ok=True)
-
-                # Remove metadata
+                self._drop_from_memory(key)
                 del self.metadata[key]
+                self._pending_access.pop(key, None)
+
+            removed = len(expired_keys)
+            if self._conn is not None:
+                cursor = self._conn.execute(
+                    "DELETE FROM cache_entries WHERE expires_at < ?", (now,)
+                )
+                # Keys expired in memory were also counted if they were persisted
+                removed = max(removed, cursor.rowcount)
+                self._commit()
 
-            if expired_keys:
-                self._save_metadata()
-                logger.info(f"Cleaned up {len(expired_keys)} expired cache entries")
+            if removed:
+                logger.info(f"Cleaned up {removed} expired cache entries")
 
-        return len(expired_keys)
+        return removed
 
     def invalidate(self, key: str) -> bool:
         """
@@ -337,28 +437,7 @@ class IntelligentCache:
         cache_key = self._get_cache_key(key)
 
         with self.lock:
-            found = False
-
-            # Remove from memory cache
-            if cache_key in self.memory_cache.cache:
-                del self.memory_cache.cache[key]
-                found = True
-
-            # Remove from disk
-            disk_path = self._get_disk_path(cache_key)
-            if disk_path.exists():
-                disk_path.unlink()
-                found = True
-
-            # Remove metadata
-            if cache_key in self.metadata:
-                del self.metadata[cache_key]
-                found = True
-
-            if found:
-                self._save_metadata()
-
-            return found
+            return self._remove(cache_key)
 
     def clear(self) -> None:
         """Clear entire cache."""
@@ -367,47 +446,79 @@ class IntelligentCache:
             self.memory_cache.clear()
 
             # Clear disk cache
-            if self.enable_persistence:
-                for cache_file in self.disk_cache_dir.glob('*.cache'):
-                    cache_file.unlink()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM cache_entries")
+                self._commit()
 
             # Clear metadata
             self.metadata.clear()
-            self._save_metadata()
+            self._pending_access.clear()
 
             logger.info("Cache cleared completely")
 
+    def close(self) -> None:
+        """Flush pending writes and close the disk store."""
+        with self.lock:
+            if self._conn is not None:
+                self._flush_access_updates()
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
+
     def get_stats(self) -> dict[str, Any]:
         """Get comprehensive cache statistics."""
         with self.lock:
             memory_stats = self.memory_cache.get_stats()
 
             # Calculate disk usage
-            disk_files = list(self.disk_cache_dir.glob('*.cache'))
-            disk_size_mb = sum(f.stat().st_size for f in disk_files) / (1024 * 1024)
-
-            # Calculate hit/miss ratios
-            total_entries = len(self.metadata)
-            total_accesses = sum(entry.access_count for entry in self.metadata.values())
+            disk_entries = disk_bytes = disk_accesses = disk_expired = 0
+            if self._conn is not None:
+                self._flush_access_updates()
+                disk_entries, disk_bytes, disk_accesses, disk_expired = self._conn.execute("""
+                    SELECT COUNT(*), COALESCE(SUM(length(value)), 0),
+                           COALESCE(SUM(access_count), 0),
+                           COALESCE(SUM(expires_at < ?), 0)
+                    FROM cache_entries
+                """, (time.time(),)).fetchone()
+
+            # Entries only held in memory are not counted by the store
+            memory_only = [entry for entry in self.metadata.values() if not entry.persisted]
+            total_entries = disk_entries + len(memory_only)
+            total_accesses = disk_accesses + sum(entry.access_count for entry in memory_only)
 
             return {
                 'memory_cache': memory_stats,
                 'disk_cache': {
-                    'files': len(disk_files),
-                    'size_mb': disk_size_mb,
-                    'directory': str(self.disk_cache_dir)
+                    'entries': disk_entries,
+                    'size_mb': disk_bytes / (1024 * 1024),
+                    'directory': str(self.disk_cache_dir),
+                    'path': str(self.store_path)
                 },
                 'total_entries': total_entries,
                 'total_accesses': total_accesses,
                 'average_accesses': total_accesses / max(total_entries, 1),
-                'expired_cleanup_available': len([e for e in self.metadata.values() if e.is_expired()])
+                'expired_cleanup_available': disk_expired + len(
+                    [e for e in memory_only if e.is_expired()]
+                )
             }
 
     @contextmanager
     def batch_operations(self):
-        """Context manager for batch cache operations."""
+        """
+        Context manager for batch cache operations.
+
+        Disk writes made inside the block are committed together when the
+        outermost block exits.
+        """
         with self.lock:
-            yield self
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if not self._batch_depth and self._conn is not None:
+                    self._flush_access_updates()
+                    self._conn.commit()
 
     def optimize(self) -> dict[str, int]:
         """
@@ -441,35 +552,65 @@ class IntelligentCache:
 
     def _cleanup_lru_disk_entries(self, target_mb: int = 250) -> float:
         """Clean up least recently used disk entries."""
-        freed_mb = 0.0
-
-        # Sort entries by last access time
-        sorted_entries = sorted(
-            self.metadata.items(),
-            key=lambda x: x[1].last_accessed
-        )
-
-        current_disk_mb = self.get_stats()['disk_cache']['size_mb']
+        if self._conn is None:
+            return 0.0
 
-        for key, _entry in sorted_entries:
-            if current_disk_mb <= target_mb:
-                break
+        with self.lock:
+            self._flush_access_updates()
+            current_bytes = self._conn.execute(
+                "SELECT COALESCE(SUM(length(value)), 0) FROM cache_entries"
+            ).fetchone()[0]
+            target_bytes = target_mb * 1024 * 1024
+
+            evicted = []
+            freed_bytes = 0
+            cursor = self._conn.execute(
+                "SELECT key, length(value) FROM cache_entries ORDER BY last_accessed"
+            )
+            for key, size in cursor:
+                if current_bytes - freed_bytes <= target_bytes:
+                    break
+                evicted.append((key,))
+                freed_bytes += size
+            cursor.close()
+
+            # Remove from the store but keep in memory if present
+            self._conn.executemany("DELETE FROM cache_entries WHERE key = ?", evicted)
+            self._commit()
+            for (key,) in evicted:
+                if key in self.metadata:
+                    self.metadata[key].persisted = False
+
+            freed_mb = freed_bytes / (1024 * 1024)
+            if freed_mb > 0:
+                logger.info(f"Freed {freed_mb:.1f} MB from disk cache")
+
+            return freed_mb
+
+
+def _encode_value(value: Any) -> tuple[bytes, int]:
+    """
+    Encode a value as compact JSON, compressing large payloads.
 
-            disk_path = self._get_disk_path(key)
-            if disk_path.exists():
-                size_mb = disk_path.stat().st_size / (1024 * 1024)
-                disk_path.unlink()
-                freed_mb += size_mb
-                current_disk_mb -= size_mb
+    JSON rather than pickle keeps loading cache entries safe.
 
-                # Remove from metadata but keep in memory if present
-                del self.metadata[key]
+    Returns:
+        Tuple of (tagged payload, uncompressed size in bytes)
+    """
+    raw = json.dumps(value, default=str, separators=(',', ':')).encode('utf-8')
+    if len(raw) > COMPRESS_THRESHOLD:
+        return _ZLIB_TAG + zlib.compress(raw, 1), len(raw)
+    return _JSON_TAG + raw, len(raw)
 
-        if freed_mb > 0:
-            self._save_metadata()
-            logger.info(f"Freed {freed_mb:.1f} MB from disk cache")
 
-        return freed_mb
+def _decode_value(payload: bytes) -> Any:
+    """Decode a payload written by _encode_value."""
+    tag, body = payload[:1], payload[1:]
+    if tag == _ZLIB_TAG:
+        body = zlib.decompress(body)
+    elif tag != _JSON_TAG:
+        raise ValueError(f"unknown cache payload tag {tag!r}")
+    return json.loads(body)
 
 
 class CacheManager:
@@ -477,12 +618,21 @@ class CacheManager:
     Global cache manager for Gmail Fetcher operations.
     """
 
-    def __init__(self):
-        """Initialize cache manager with specialized caches."""
+    # Full messages are immutable apart from labels, which history sync patches
+    MESSAGE_TTL = 30 * 86400
+
+    def __init__(self, cache_dir: Path | None = None):
+        """
+        Initialize cache manager with specialized caches.
+
+        Args:
+            cache_dir: Directory for the disk caches (None for the default)
+        """
 
         # Email metadata cache (small, frequently accessed)
         self.metadata_cache = IntelligentCache(
             memory_limit_mb=50,
+            disk_cache_dir=cache_dir,
             default_ttl=7200,  # 2 hours
             enable_persistence=True
         )
@@ -490,6 +640,7 @@ class CacheManager:
         # Email content cache (large, less frequently accessed)
         self.content_cache = IntelligentCache(
             memory_limit_mb=200,
+            disk_cache_dir=cache_dir,
             default_ttl=86400,  # 24 hours
             enable_persistence=True
         )
@@ -497,6 +648,7 @@ class CacheManager:
         # Query results cache (medium, variable access)
         self.query_cache = IntelligentCache(
             memory_limit_mb=100,
+            disk_cache_dir=cache_dir,
             default_ttl=3600,  # 1 hour
             enable_persistence=True
         )
@@ -504,6 +656,7 @@ class CacheManager:
         # Profile and settings cache (tiny, long-lived)
         self.profile_cache = IntelligentCache(
             memory_limit_mb=10,
+            disk_cache_dir=cache_dir,
             default_ttl=86400,  # 24 hours
             enable_persistence=True
         )
@@ -524,6 +677,18 @@ class CacheManager:
         """Get cached email content."""
         return self.content_cache.get(f"content:{email_id}")
 
+    def cache_message(self, message: dict[str, Any]) -> None:
+        """Cache a full-format messages.get response."""
+        self.content_cache.put(f"message:{message['id']}", message, ttl=self.MESSAGE_TTL)
+
+    def get_message(self, message_id: str) -> dict[str, Any] | None:
+        """Get a cached full-format message."""
+        return self.content_cache.get(f"message:{message_id}")
+
+    def invalidate_message(self, message_id: str) -> bool:
+        """Invalidate a cached full-format message."""
+        return self.content_cache.invalidate(f"message:{message_id}")
+
     def cache_query_results(self, query: str, results: list[str]) -> None:
         """Cache query results."""
         query_hash = hashlib.sha256(query.encode()).hexdigest()[:16]
@@ -546,6 +711,7 @@ class CacheManager:
         """Invalidate all cached data for an email."""
         self.metadata_cache.invalidate(f"metadata:{email_id}")
         self.content_cache.invalidate(f"content:{email_id}")
+        self.invalidate_message(email_id)
 
     def clear_all(self) -> None:
         """Clear all caches."""
@@ -571,3 +737,9 @@ class CacheManager:
             'query_cache': self.query_cache.optimize(),
             'profile_cache': self.profile_cache.optimize()
         }
+
+    def close(self) -> None:
+        """Flush and close all caches."""
+        for cache in (self.metadata_cache, self.content_cache,
+                      self.query_cache, self.profile_cache):
+            cache.close()
@@ -0,0 +1,56 @@
+"""
+Ordered, bounded fan-out of work items to a process pool.
+
+Used by the batch converters and extractors that hand chunks of files or
+rows to worker processes. Only a fixed number of tasks are submitted ahead
+of the consumer, so memory stays bounded however many items there are.
+"""
+
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def bounded_process_map(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    workers: int,
+    max_in_flight: int | None = None
+) -> Iterator[tuple[T, R]]:
+    """
+    Apply func to each item, yielding (item, result) pairs in input order.
+
+    With more than one worker, items are processed in a process pool with at
+    most ``max_in_flight`` (default ``2 * workers``) submitted ahead of the
+    consumer; func must then be picklable, i.e. a module-level function or a
+    functools.partial of one. With one worker, items are processed inline.
+
+    Args:
+        func: Function applied to each item
+        items: Work items, consumed lazily
+        workers: Worker processes; 1 runs in this process
+        max_in_flight: Tasks submitted ahead of the consumer
+
+    Yields:
+        Tuple of (item, func(item))
+    """
+    if workers <= 1:
+        for item in items:
+            yield item, func(item)
+        return
+
+    limit = max_in_flight or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight: deque[tuple[T, Future]] = deque()
+        for item in items:
+            in_flight.append((item, executor.submit(func, item)))
+            if len(in_flight) >= limit:
+                done_item, future = in_flight.popleft()
+                yield done_item, future.result()
+        while in_flight:
+            done_item, future = in_flight.popleft()
+            yield done_item, future.result()
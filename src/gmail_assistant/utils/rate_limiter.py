@@ -2,9 +2,15 @@
 Advanced rate limiting with exponential backoff for Gmail API.
 Implements proper quota management and request throttling.
 
+Throttling is a token bucket measured in Gmail quota units, so a 50-unit
+batchDelete costs ten times a 5-unit messages.get. Callers reserve tokens
+under a short lock and sleep outside it, so concurrent workers proceed in
+parallel up to the quota instead of being serialised.
+
 H-2 fix: Uses centralized RateLimitError from exceptions.py
 """
 
+import asyncio
 import logging
 import random
 import threading
@@ -15,11 +21,147 @@ from typing import Any, ClassVar
 from googleapiclient.errors import HttpError
 from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 
+from gmail_assistant.core.constants import DEFAULT_QUOTA_COST, GMAIL_QUOTA_UNITS_PER_SECOND
 from gmail_assistant.core.exceptions import RateLimitError
 
 logger = logging.getLogger(__name__)
 
 
+class QuotaTokenBucket:
+    """
+    Token bucket measured in Gmail quota units.
+
+    Tokens refill continuously at ``rate`` units per second up to
+    ``capacity`` (the burst size). A caller reserves its cost under the lock
+    and is told how long to wait; the wait happens outside the lock. Because
+    reservations may drive the bucket into debt, callers are admitted in
+    arrival order and a single expensive request cannot starve cheap ones.
+
+    The rate adapts to server feedback: a 429 halves it (down to
+    ``min_rate``) and successful calls restore it gradually.
+    """
+
+    def __init__(self,
+                 rate: float = GMAIL_QUOTA_UNITS_PER_SECOND,
+                 capacity: float | None = None,
+                 min_rate: float | None = None,
+                 backoff_factor: float = 0.5,
+                 recovery_factor: float = 0.05):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Refill rate in quota units per second
+            capacity: Maximum burst in quota units (default: one second of rate)
+            min_rate: Floor for the adaptive rate (default: 10% of rate)
+            backoff_factor: Multiplier applied to the rate on a 429
+            recovery_factor: Fraction of the full rate restored per success
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.min_rate = min_rate if min_rate is not None else rate * 0.1
+        self.backoff_factor = backoff_factor
+        self.recovery_factor = recovery_factor
+
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+
+        # Statistics (protected by _lock)
+        self.throttle_events = 0
+        self.total_wait = 0.0
+
+    def _refill(self, now: float) -> None:
+        """Add tokens accrued since the last refill. Caller holds the lock."""
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._last_refill = now
+
+    def reserve(self, cost: float) -> float:
+        """
+        Reserve tokens without waiting.
+
+        Args:
+            cost: Quota units to consume
+
+        Returns:
+            Seconds the caller must wait before issuing the request
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= cost
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.total_wait += wait
+            return wait
+
+    def acquire(self, cost: float) -> float:
+        """
+        Block the calling thread until ``cost`` units are available.
+
+        Returns:
+            Seconds waited
+        """
+        wait = self.reserve(cost)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, cost: float) -> float:
+        """
+        Suspend the calling coroutine until ``cost`` units are available.
+
+        Returns:
+            Seconds waited
+        """
+        wait = self.reserve(cost)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def on_rate_limited(self, retry_after: float | None = None) -> None:
+        """
+        React to a 429/quota error: cut the rate and optionally pause.
+
+        Args:
+            retry_after: Server-requested pause in seconds, if any
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+            # Discard any burst allowance and push everyone back by retry_after
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._tokens -= retry_after * self.rate
+            self.throttle_events += 1
+            logger.warning(f"Rate limited by Gmail; quota rate reduced to {self.rate:.0f} units/s")
+
+    def record_success(self) -> None:
+        """Gradually restore the rate after throttling."""
+        if self.rate >= self.max_rate:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.max_rate * self.recovery_factor)
+
+    def get_stats(self) -> dict[str, float]:
+        """Get bucket statistics."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                'rate': self.rate,
+                'max_rate': self.max_rate,
+                'capacity': self.capacity,
+                'available_tokens': self._tokens,
+                'throttle_events': self.throttle_events,
+                'total_wait_seconds': self.total_wait,
+            }
+
+
 class GmailRateLimiter:
     """
     Gmail API rate limiter with exponential backoff and quota management.
@@ -28,6 +170,9 @@ class GmailRateLimiter:
     - 1,000,000,000 quota units per day
     - 250 quota units per user per second
     - Most operations cost 5-10 quota units
+
+    Use get_gmail_rate_limiter() to share one limiter between all clients
+    acting for the same user, since the quota is per user, not per client.
     """
 
     def __init__(self,
@@ -35,16 +180,22 @@ class GmailRateLimiter:
                  max_retries: int = 5,
                  base_delay: float = 1.0,
                  max_delay: float = 300.0,
-                 jitter: bool = True):
+                 jitter: bool = True,
+                 quota_units_per_second: float | None = None,
+                 burst_capacity: float | None = None):
         """
         Initialize rate limiter.
 
         Args:
-            requests_per_second: Maximum requests per second
+            requests_per_second: Maximum 5-unit requests per second; used to
+                derive the quota rate when quota_units_per_second is not given
             max_retries: Maximum retry attempts
             base_delay: Base delay for exponential backoff
             max_delay: Maximum delay between retries
             jitter: Whether to add random jitter to delays
+            quota_units_per_second: Token bucket refill rate in quota units
+            burst_capacity: Token bucket size in quota units (default: a single
+                request, i.e. a steady rate with no burst)
         """
         self.requests_per_second = requests_per_second
         self.max_retries = max_retries
@@ -62,38 +213,77 @@ class GmailRateLimiter:
 
         # Rate limiting state
         self.min_interval = 1.0 / requests_per_second
+        if quota_units_per_second is None:
+            quota_units_per_second = requests_per_second * DEFAULT_QUOTA_COST
+        if burst_capacity is None:
+            burst_capacity = DEFAULT_QUOTA_COST
+        self.bucket = QuotaTokenBucket(rate=quota_units_per_second, capacity=burst_capacity)
 
-        logger.info(f"Initialized rate limiter: {requests_per_second} req/s, "
+        logger.info(f"Initialized rate limiter: {quota_units_per_second:.0f} quota units/s, "
                    f"max_retries={max_retries}, base_delay={base_delay}s")
 
-    def wait_if_needed(self, quota_cost: int = 5):
+    def wait_if_needed(self, quota_cost: int = DEFAULT_QUOTA_COST) -> float:
         """
         Wait if necessary to respect rate limits.
-        Thread-safe implementation using lock.
+        Thread-safe; the wait happens outside any lock.
 
         Args:
             quota_cost: Quota units this request will consume
+
+        Returns:
+            Seconds waited
         """
-        with self._lock:
-            current_time = time.time()
+        waited = self.bucket.acquire(quota_cost)
+        if waited > 0:
+            logger.debug(f"Rate limiting: waited {waited:.2f}s for {quota_cost} units")
+        self._record_request(quota_cost)
+        return waited
 
-            # Calculate time since last request
-            time_since_last = current_time - self.last_request_time
+    async def wait_if_needed_async(self, quota_cost: int = DEFAULT_QUOTA_COST) -> float:
+        """
+        Async variant of wait_if_needed that never blocks the event loop.
 
-            # Wait if we need to respect rate limit
-            if time_since_last < self.min_interval:
-                wait_time = self.min_interval - time_since_last
-                logger.debug(f"Rate limiting: waiting {wait_time:.2f}s")
-                time.sleep(wait_time)
-                current_time = time.time()
+        Args:
+            quota_cost: Quota units this request will consume
+
+        Returns:
+            Seconds waited
+        """
+        waited = await self.bucket.acquire_async(quota_cost)
+        self._record_request(quota_cost)
+        return waited
 
-            # Update tracking (protected by lock)
-            self.last_request_time = current_time
+    def _record_request(self, quota_cost: int) -> None:
+        """Update request tracking counters."""
+        with self._lock:
+            self.last_request_time = time.time()
             self.request_count += 1
             self.quota_units_used += quota_cost
 
             logger.debug(f"Request #{self.request_count}, quota used: {self.quota_units_used}")
 
+    def is_rate_limit_error(self, exception: Exception) -> bool:
+        """
+        Check whether an exception signals quota exhaustion (429 or quota 403).
+
+        Args:
+            exception: The exception that occurred
+
+        Returns:
+            True if the server asked us to slow down
+        """
+        if not isinstance(exception, HttpError):
+            return False
+
+        status_code = exception.resp.status
+        if status_code == 429:
+            return True
+        if status_code == 403:
+            error_details = str(exception).lower()
+            return any(phrase in error_details for phrase in
+                       ['quota exceeded', 'rate limit', 'too many requests'])
+        return False
+
     def exponential_backoff(self, attempt: int) -> float:
         """
         Calculate exponential backoff delay.
@@ -197,6 +387,7 @@ class GmailRateLimiter:
                 # Success - reset any backoff state
                 if attempt > 0:
                     logger.info(f"Function succeeded after {attempt} retries")
+                self.bucket.record_success()
 
                 return result
 
@@ -219,6 +410,10 @@ class GmailRateLimiter:
                 if error_delay:
                     delay = max(delay, error_delay)
 
+                # Slow every worker sharing this limiter, not just this one
+                if self.is_rate_limit_error(e):
+                    self.bucket.on_rate_limited(error_delay)
+
                 logger.warning(f"Attempt {attempt + 1} failed: {e}. "
                               f"Retrying in {delay:.2f}s")
 
@@ -235,14 +430,39 @@ class GmailRateLimiter:
         Returns:
             Dictionary with rate limiting stats
         """
+        bucket_stats = self.bucket.get_stats()
         return {
             'requests_made': self.request_count,
             'quota_units_used': self.quota_units_used,
             'requests_per_second_limit': self.requests_per_second,
-            'last_request_time': self.last_request_time
+            'last_request_time': self.last_request_time,
+            'quota_units_per_second': bucket_stats['rate'],
+            'burst_capacity': bucket_stats['capacity'],
+            'throttle_events': bucket_stats['throttle_events'],
+            'total_wait_seconds': bucket_stats['total_wait_seconds'],
         }
 
 
+# Process-wide limiter: Gmail enforces quota per user, so every client
+# acting for the same account must draw from the same bucket.
+_gmail_rate_limiter: GmailRateLimiter | None = None
+_gmail_rate_limiter_lock = threading.Lock()
+
+
+def get_gmail_rate_limiter() -> GmailRateLimiter:
+    """Get the shared Gmail API rate limiter (250 quota units/user/second)."""
+    global _gmail_rate_limiter
+    if _gmail_rate_limiter is None:
+        with _gmail_rate_limiter_lock:
+            if _gmail_rate_limiter is None:
+                _gmail_rate_limiter = GmailRateLimiter(
+                    requests_per_second=GMAIL_QUOTA_UNITS_PER_SECOND / DEFAULT_QUOTA_COST,
+                    quota_units_per_second=GMAIL_QUOTA_UNITS_PER_SECOND,
+                    burst_capacity=GMAIL_QUOTA_UNITS_PER_SECOND
+                )
+    return _gmail_rate_limiter
+
+
 def retry_on_rate_limit(max_attempts: int = 5,
                        base_delay: float = 1.0,
                        max_delay: float = 300.0,
@@ -283,6 +503,8 @@ class QuotaTracker:
     QUOTA_COSTS: ClassVar[dict[str, int]] = {
         'list_messages': 5,
         'get_message': 5,
+        'modify_message': 5,
+        'trash_message': 5,
         'delete_message': 10,
         'batch_delete': 50,
         'get_profile': 1,
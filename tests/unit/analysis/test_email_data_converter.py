@@ -585,6 +585,84 @@ class TestLatestEmailsConversion:
             assert not output_file.exists()
 
 
+
+@pytest.fixture
+def dated_backup_directory(tmp_path):
+    """Create a YYYY/MM organised backup with emails from recent and old days."""
+    def write_eml(day, index):
+        folder = tmp_path / f"{day:%Y}" / f"{day:%m}"
+        folder.mkdir(parents=True, exist_ok=True)
+        received = datetime.combine(day, datetime.min.time()).replace(hour=12)
+        eml_file = folder / f"{day:%Y-%m-%d}_120000_email_{index}_{index:016x}.eml"
+        eml_file.write_bytes(f"""From: sender{index}@example.com
+Subject: Email {index}
+Date: {email.utils.format_datetime(received.astimezone())}
+Content-Type: text/plain
+
+Body {index}.
+""".encode())
+        return eml_file
+
+    today = datetime.now().date()
+    recent = [write_eml(today - timedelta(days=n), n) for n in (1, 2, 3)]
+    old = write_eml(today - timedelta(days=400), 400)
+    return tmp_path, recent, old
+
+
+class TestSinglePassConversion:
+    """Tests for the single-scan convert_latest_emails implementation."""
+
+    def test_filters_by_window(self, converter, dated_backup_directory, tmp_path):
+        """Test only emails received inside the window are written."""
+        backup_dir, _, _ = dated_backup_directory
+        output_file = tmp_path / 'out' / 'latest.parquet'
+
+        count = converter.convert_latest_emails(backup_dir, output_file, days_back=2, workers=1)
+
+        df = pd.read_parquet(output_file)
+        assert count == 2
+        assert sorted(df['subject']) == ['Email 1', 'Email 2']
+
+    def test_out_of_window_files_not_opened(self, converter, dated_backup_directory, monkeypatch):
+        """Test folders and filenames outside the window are pruned before parsing."""
+        backup_dir, recent, old = dated_backup_directory
+        opened = []
+        original = converter.extract_from_eml
+        monkeypatch.setattr(converter, 'extract_from_eml',
+                            lambda path: opened.append(path) or original(path))
+
+        converter.convert_latest_emails(backup_dir, backup_dir / 'latest.parquet',
+                                        days_back=1, workers=1)
+
+        assert old not in opened
+        assert recent[2] not in opened  # Three days old, outside the widened window
+        assert recent[0] in opened
+
+    def test_undated_filename_is_parsed(self, converter, dated_backup_directory, tmp_path):
+        """Test files without a date prefix are still filtered by their Date header."""
+        backup_dir, recent, _ = dated_backup_directory
+        recent[0].rename(backup_dir / 'renamed_email.eml')
+
+        count = converter.convert_latest_emails(backup_dir, tmp_path / 'latest.parquet',
+                                                days_back=1, workers=1)
+
+        assert count == 1
+
+    def test_parallel_matches_serial(self, converter, dated_backup_directory, tmp_path):
+        """Test parsing in worker processes gives the same output."""
+        backup_dir, _, _ = dated_backup_directory
+
+        converter.convert_latest_emails(backup_dir, tmp_path / 'serial.parquet',
+                                        days_back=3, workers=1)
+        converter.convert_latest_emails(backup_dir, tmp_path / 'parallel.parquet',
+                                        days_back=3, workers=2)
+
+        serial = pd.read_parquet(tmp_path / 'serial.parquet').sort_values('gmail_id')
+        parallel = pd.read_parquet(tmp_path / 'parallel.parquet').sort_values('gmail_id')
+        assert serial['gmail_id'].tolist() == parallel['gmail_id'].tolist()
+        assert len(serial) == 3
+
+
 # Data Type Tests
 class TestDataTypes:
     """Tests for proper data type handling."""
@@ -618,7 +696,7 @@ Date: Mon, 10 Jan 2025 10:00:00 +0000
 Content-Type: text/plain; charset="utf-8"
 
 Content with unicode: ñ ü ö
-""".encode('utf-8')
+""".encode()
 
         with tempfile.NamedTemporaryFile(mode='wb', suffix='_test.eml', delete=False) as f:
             f.write(unicode_eml)
@@ -667,7 +745,7 @@ Date: Mon, 10 Jan 2025 10:00:00 +0000
 Content-Type: text/plain; charset="utf-8"
 
 {long_content}
-""".encode('utf-8')
+""".encode()
 
         with tempfile.NamedTemporaryFile(mode='wb', suffix='_test.eml', delete=False) as f:
             f.write(long_eml)
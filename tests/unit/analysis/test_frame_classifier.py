@@ -0,0 +1,166 @@
+"""
+Tests for frame_classifier.py module.
+Tests column-wise classification and its parity with the row-wise classifiers.
+"""
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gmail_assistant.analysis.daily_email_analyzer import HierarchicalClassifier
+from gmail_assistant.analysis.email_analyzer import EmailAnalysisEngine
+from gmail_assistant.analysis.frame_classifier import (
+    FrameClassifier,
+    automation_scores,
+    text_column,
+)
+
+
+@pytest.fixture
+def classification_rules():
+    """Classification rules with overlapping keywords across priorities."""
+    return {
+        'Financial': {
+            'priority': 1,
+            'keywords': ['payment', 'invoice', 'receipt'],
+            'sender_patterns': ['billing@', r'finance\.'],
+            'confidence_threshold': 0.9
+        },
+        'Notifications': {
+            'priority': 2,
+            'keywords': ['alert', 'reminder', 'payment'],
+            'sender_patterns': ['noreply@', 'no-reply@'],
+        },
+        'Marketing/News': {
+            'priority': 3,
+            'keywords': ['newsletter', 'digest', 'sale'],
+            'sender_patterns': ['news@', 'Promo@'],
+        }
+    }
+
+
+@pytest.fixture
+def mixed_dataframe():
+    """Random emails including missing values and mixed-case senders."""
+    rng = random.Random(7)
+    words = ['payment', 'invoice', 'receipt', 'alert', 'reminder', 'newsletter',
+             'digest', 'sale', 'meeting', 'lunch', 'hello', 'the', 'a']
+    senders = ['billing@corp.com', 'noreply@github.com', 'News@Substack.com',
+               'promo@shop.com', 'friend@gmail.com', 'alerts@finance.bank.com',
+               'bot@mailchimp.com', None]
+    subjects = ['Re: hello', 'AUTO: nightly job', 'ALERT: disk', 'Your invoice', None]
+    n = 400
+    return pd.DataFrame({
+        'subject': [rng.choice(subjects) if rng.random() < 0.5
+                    else ' '.join(rng.choices(words, k=4)) for _ in range(n)],
+        'sender': [rng.choice(senders) for _ in range(n)],
+        'plain_text_content': [' '.join(rng.choices(words, k=20)) if rng.random() > 0.1
+                               else None for _ in range(n)],
+    })
+
+
+def assert_same_columns(rowwise, vectorized, columns):
+    for column in columns:
+        assert rowwise[column].astype(object).tolist() == \
+            vectorized[column].astype(object).tolist(), column
+
+
+class TestTextColumn:
+    """Tests for text_column."""
+
+    def test_missing_column_is_empty(self):
+        df = pd.DataFrame({'subject': ['A', 'B']})
+        assert text_column(df, 'sender').tolist() == ['', '']
+
+    def test_missing_values_match_str(self):
+        df = pd.DataFrame({'subject': ['Hello', None, np.nan]})
+        expected = [str(value) for value in df['subject']]
+        assert text_column(df, 'subject', lower=False).tolist() == expected
+        assert text_column(df, 'subject').tolist() == [v.lower() for v in expected]
+
+
+class TestFrameClassifier:
+    """Tests for FrameClassifier.classify."""
+
+    def test_priority_order(self, classification_rules):
+        classifier = FrameClassifier(classification_rules)
+        df = pd.DataFrame({
+            'subject': ['payment alert', 'weekly digest', 'hello'],
+            'sender': ['noreply@x.com', 'someone@x.com', 'friend@x.com'],
+            'plain_text_content': ['', '', ''],
+        })
+
+        result = classifier.classify(df)
+
+        assert result.category.tolist() == ['Financial', 'Marketing/News', 'Other']
+        assert result.totals.tolist() == [5, 5, 0]
+        assert result.matches.tolist() == [1, 1, 0]
+
+    def test_index_preserved(self, classification_rules):
+        df = pd.DataFrame({'subject': ['invoice'], 'sender': ['a@b.c'],
+                           'plain_text_content': ['']}, index=[42])
+        result = FrameClassifier(classification_rules).classify(df)
+        assert result.category.index.tolist() == [42]
+
+    def test_lowercase_patterns(self, classification_rules):
+        df = pd.DataFrame({'subject': [''], 'sender': ['PROMO@shop.com'],
+                           'plain_text_content': ['']})
+
+        assert FrameClassifier(classification_rules).classify(df).category[0] == 'Other'
+        lowered = FrameClassifier(classification_rules, lowercase_patterns=True)
+        assert lowered.classify(df).category[0] == 'Marketing/News'
+
+    def test_empty_dataframe(self, classification_rules):
+        df = pd.DataFrame({'subject': [], 'sender': [], 'plain_text_content': []})
+        result = FrameClassifier(classification_rules).classify(df)
+        assert len(result.category) == 0
+
+    def test_no_rules(self):
+        df = pd.DataFrame({'subject': ['invoice']})
+        result = FrameClassifier({}, default='Unsorted').classify(df)
+        assert result.category.tolist() == ['Unsorted']
+
+
+class TestAutomationScores:
+    """Tests for automation_scores."""
+
+    def test_scores(self):
+        df = pd.DataFrame({
+            'sender': ['noreply@mailchimp.com', 'friend@gmail.com', 'alerts@example.com'],
+            'subject': ['Hello', 'ALERT: disk', 'AUTO: job'],
+        })
+
+        scores = automation_scores(df, ['noreply', 'alert'], ['mailchimp.com'], r'^(ALERT|AUTO):')
+
+        assert scores.tolist() == [2.0, 0.5, 1.5]
+
+    def test_empty_dataframe(self):
+        df = pd.DataFrame({'sender': [], 'subject': []})
+        assert automation_scores(df, ['noreply'], [], r'^AUTO:').empty
+
+
+class TestRowwiseParity:
+    """Vectorized classification must match the row-wise methods exactly."""
+
+    def test_hierarchical_classifier(self, classification_rules, mixed_dataframe):
+        classifier = HierarchicalClassifier(classification_rules)
+        classifier.add_custom_categories({
+            'Custom': {'priority': 0, 'keywords': ['lunch'], 'sender_patterns': ['Bot@']}
+        })
+
+        rowwise = classifier.classify_emails(mixed_dataframe, vectorized=False)
+        vectorized = classifier.classify_emails(mixed_dataframe)
+
+        assert_same_columns(rowwise, vectorized,
+                            ['category', 'classification_confidence', 'is_automated'])
+
+    def test_email_analysis_engine(self, mixed_dataframe, tmp_path):
+        engine = EmailAnalysisEngine({'log_file': str(tmp_path / 'analysis.log')})
+
+        rowwise = engine.classify_emails(mixed_dataframe.copy(), vectorized=False)
+        vectorized = engine.classify_emails(mixed_dataframe.copy())
+
+        assert_same_columns(rowwise, vectorized,
+                            ['category', 'classification_confidence', 'is_automated'])
@@ -0,0 +1,68 @@
+"""
+Tests for export.py command module.
+Tests export_parquet function.
+"""
+
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture
+def email_db(tmp_path):
+    """Create a small email database with two monthly partitions."""
+    db_path = tmp_path / "emails.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE emails (
+            gmail_id TEXT, thread_id TEXT, subject TEXT, sender TEXT,
+            recipient TEXT, parsed_date TEXT, year_month TEXT, labels TEXT,
+            message_content TEXT, deleted_at TEXT
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO emails VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL)",
+        [
+            ('msg1', 't1', 'A', 'a@example.com', 'me@gmail.com',
+             '2025-01-15T10:00:00', '2025-01', 'INBOX', 'body'),
+            ('msg2', 't2', 'B', 'b@example.com', 'me@gmail.com',
+             '2025-02-15T10:00:00', '2025-02', 'INBOX', 'body'),
+        ]
+    )
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+class TestExportParquet:
+    """Tests for export_parquet function."""
+
+    def test_export_missing_database(self, tmp_path):
+        """Test export raises error for missing database."""
+        from gmail_assistant.cli.commands.export import export_parquet
+        from gmail_assistant.core.exceptions import ConfigError
+
+        with pytest.raises(ConfigError, match="not found"):
+            export_parquet(tmp_path / "missing.db", tmp_path / "out")
+
+    def test_export_with_jobs(self, email_db, tmp_path):
+        """Test export with parallel jobs writes every partition."""
+        pytest.importorskip("pyarrow")
+        from gmail_assistant.cli.commands.export import export_parquet
+
+        stats = export_parquet(email_db, tmp_path / "out", jobs=2)
+
+        assert stats['total_rows'] == 2
+        assert stats['partitions'] == ['2025-01', '2025-02']
+        assert (tmp_path / "out" / "year_month=2025-02" / "data.parquet").exists()
+
+    def test_export_incremental(self, email_db, tmp_path):
+        """Test a repeated incremental export skips unchanged partitions."""
+        pytest.importorskip("pyarrow")
+        from gmail_assistant.cli.commands.export import export_parquet
+
+        export_parquet(email_db, tmp_path / "out", incremental=True)
+        stats = export_parquet(email_db, tmp_path / "out", incremental=True)
+
+        assert stats['files_created'] == 0
+        assert stats['partitions_skipped'] == 2
@@ -136,25 +136,36 @@ class TestFetchEmails:
         mock_checkpoint.total_messages = 3
         mock_checkpoint_mgr = mock.MagicMock()
         mock_checkpoint_mgr.get_latest_checkpoint.return_value = mock_checkpoint
-        mock_checkpoint_mgr.get_resume_info.return_value = {'skip_count': 1}
         mock_checkpoint_class.return_value = mock_checkpoint_mgr
 
         creds_path = tmp_path / "creds.json"
         creds_path.write_text('{}')
 
+        # The interrupted run downloaded msg2 (not the first by position)
+        from gmail_assistant.core.fetch.message_index import MessageIndex
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+        saved = output_dir / "00001_Test_msg2.json"
+        saved.write_text('{}')
+        with MessageIndex.for_output_dir(output_dir) as index:
+            index.record('msg2', saved, '{}')
+
         result = fetch_emails(
             query="is:unread",
             max_emails=100,
-            output_dir=tmp_path / "output",
+            output_dir=output_dir,
             output_format="json",
             credentials_path=creds_path,
             resume=True
         )
 
-        # Should skip first message
+        # Should skip the already downloaded message
         assert result['total'] == 3
-        # 2 messages fetched (skipping first one)
+        assert result['skipped'] == 1
+        # 2 messages fetched (skipping msg2)
         assert result['fetched'] == 2
+        fetched_ids = [c.args[0] for c in mock_fetcher.get_message_details.call_args_list]
+        assert fetched_ids == ['msg1', 'msg3']
 
     @mock.patch('gmail_assistant.cli.commands.fetch.CheckpointManager')
     @mock.patch('gmail_assistant.cli.commands.fetch.GmailFetcher')
@@ -267,6 +267,82 @@ class TestFetchCommand:
         mock_async.assert_called_once()
 
 
+class TestFetchAsync:
+    """Tests for the streaming async fetch."""
+
+    def test_writes_each_streamed_email(self, tmp_path):
+        """Test streamed emails are saved and indexed as they arrive."""
+        from gmail_assistant.cli.main import _fetch_async
+
+        fetcher = mock.MagicMock()
+        fetcher.last_stream_stats = {'listed': 3, 'skipped': 1, 'fetched': 2, 'failed': 0}
+
+        async def stream(query, max_results, id_filter=None):
+            assert id_filter(['a', 'b']) == ['a', 'b']
+            for msg_id in ('a', 'b'):
+                yield {'id': msg_id, 'subject': f"Subject {msg_id}"}
+
+        fetcher.stream_emails_async = stream
+        fetcher.__aenter__ = mock.AsyncMock(return_value=fetcher)
+        fetcher.__aexit__ = mock.AsyncMock(return_value=False)
+
+        with mock.patch('gmail_assistant.core.fetch.async_fetcher.AsyncGmailFetcher',
+                        return_value=fetcher):
+            result = _fetch_async('q', 10, tmp_path, 'json', tmp_path / 'creds.json', 4,
+                                  use_cache=False)
+
+        assert result == {'fetched': 2, 'skipped': 1, 'total': 3}
+        assert len(list(tmp_path.glob("*.json"))) == 2
+
+
+class TestWatchCommand:
+    """Tests for watch command."""
+
+    @pytest.fixture
+    def runner(self):
+        """Create CLI runner."""
+        return CliRunner()
+
+    @mock.patch('gmail_assistant.cli.main.AppConfig')
+    @mock.patch('gmail_assistant.cli.main.watch_mailbox')
+    def test_watch_passes_options(self, mock_watch, mock_config, runner, tmp_path):
+        """Test watch builds the polling config and reports the run."""
+        from gmail_assistant.cli.main import main
+
+        mock_cfg = mock.MagicMock()
+        mock_cfg.output_dir = str(tmp_path)
+        mock_cfg.credentials_path = tmp_path / "creds.json"
+        mock_config.load.return_value = mock_cfg
+        mock_watch.return_value = {'polls': 4, 'added': 2, 'deleted': 1, 'label_changes': 0}
+
+        result = runner.invoke(main, [
+            'watch', '--db', str(tmp_path / 'emails.db'), '--label', 'INBOX',
+            '--min-interval', '2', '--max-interval', '60'
+        ])
+
+        assert result.exit_code == 0
+        assert '2 added' in result.output
+        kwargs = mock_watch.call_args.kwargs
+        assert kwargs['output_dir'] == tmp_path
+        assert kwargs['db_path'] == tmp_path / 'emails.db'
+        assert (kwargs['config'].min_interval, kwargs['config'].max_interval) == (2, 60)
+        assert kwargs['config'].label_filter == 'INBOX'
+
+    @mock.patch('gmail_assistant.cli.main.AppConfig')
+    @mock.patch('gmail_assistant.cli.main.watch_mailbox')
+    def test_watch_no_backup(self, mock_watch, mock_config, runner, tmp_path):
+        """Test --no-backup only keeps the database current."""
+        from gmail_assistant.cli.main import main
+
+        mock_config.load.return_value = mock.MagicMock(output_dir=str(tmp_path))
+        mock_watch.return_value = {'polls': 1, 'added': 0, 'deleted': 0, 'label_changes': 0}
+
+        result = runner.invoke(main, ['watch', '--db', str(tmp_path / 'e.db'), '--no-backup'])
+
+        assert result.exit_code == 0
+        assert mock_watch.call_args.kwargs['output_dir'] is None
+
+
 class TestDeleteCommand:
     """Tests for delete command."""
 
@@ -411,6 +487,49 @@ class TestAnalyzeCommand:
         assert call_kwargs['output_file'] == output_file
 
 
+
+class TestExportCommand:
+    """Tests for export command."""
+
+    @pytest.fixture
+    def runner(self):
+        """Create CLI runner."""
+        return CliRunner()
+
+    @mock.patch('gmail_assistant.cli.main.export_parquet')
+    def test_export_with_jobs(self, mock_export, runner, tmp_path):
+        """Test export passes --jobs through."""
+        from gmail_assistant.cli.main import main
+
+        db_path = tmp_path / "emails.db"
+        db_path.touch()
+
+        result = runner.invoke(main, [
+            'export',
+            '--db', str(db_path),
+            '--output-dir', str(tmp_path / "parquet"),
+            '--jobs', '4'
+        ])
+
+        assert result.exit_code == 0
+        call_kwargs = mock_export.call_args.kwargs
+        assert call_kwargs['jobs'] == 4
+        assert call_kwargs['compression'] == 'snappy'
+
+    def test_export_rejects_zero_jobs(self, runner, tmp_path):
+        """Test export rejects --jobs below 1."""
+        from gmail_assistant.cli.main import main
+
+        db_path = tmp_path / "emails.db"
+        db_path.touch()
+
+        result = runner.invoke(main, [
+            'export', '--db', str(db_path), '-o', str(tmp_path), '--jobs', '0'
+        ])
+
+        assert result.exit_code == 2
+
+
 class TestAuthCommand:
     """Tests for auth command."""
 
@@ -39,7 +39,7 @@ def mock_service():
 @pytest.fixture
 def deleter(mock_credentials, mock_service):
     """Create GmailDeleter instance with mocked dependencies."""
-    with patch('gmail_assistant.deletion.deleter.GmailRateLimiter') as mock_rate, \
+    with patch('gmail_assistant.deletion.deleter.get_gmail_rate_limiter') as mock_rate, \
          patch('gmail_assistant.deletion.deleter.QuotaTracker') as mock_quota, \
          patch('gmail_assistant.deletion.deleter.Console'), \
          patch('gmail_assistant.deletion.deleter.Progress'), \
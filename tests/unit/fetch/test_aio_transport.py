@@ -0,0 +1,340 @@
+"""
+Tests for aio_transport.py module.
+Tests AsyncGmailTransport against a local aiohttp stand-in for the Gmail API.
+"""
+
+import asyncio
+import json
+from unittest import mock
+
+import pytest
+import pytest_asyncio
+
+aiohttp = pytest.importorskip('aiohttp')
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from gmail_assistant.core.exceptions import APIError, AuthError, RateLimitError
+from gmail_assistant.core.fetch.aio_transport import (
+    AsyncGmailTransport,
+    _decode_batch,
+    _encode_batch,
+)
+
+
+class FakeCredentials:
+    """OAuth credentials whose refresh issues a new numbered token."""
+
+    def __init__(self, valid=True):
+        self.token = 'token-0'
+        self.valid = valid
+        self.refreshes = 0
+
+    def refresh(self, request):
+        self.refreshes += 1
+        self.token = f"token-{self.refreshes}"
+        self.valid = True
+
+
+class FakeGmail:
+    """Minimal Gmail REST server with scriptable failures."""
+
+    def __init__(self):
+        self.failures = {}  # path -> list of (status, headers) to answer first
+        self.batch_failures = {}  # message id -> list of statuses
+        self.valid_tokens = {'token-0'}
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.delay = 0.0
+
+        self.app = web.Application()
+        self.app.router.add_get('/gmail/v1/users/me/messages', self.list_messages)
+        self.app.router.add_get('/gmail/v1/users/me/messages/{id}', self.get_message)
+        self.app.router.add_get('/gmail/v1/users/me/history', self.list_history)
+        self.app.router.add_post('/batch/gmail/v1', self.batch)
+
+    async def _check(self, request):
+        self.requests.append((request.path, request.query_string))
+        token = request.headers.get('Authorization', '').removeprefix('Bearer ')
+        if token not in self.valid_tokens:
+            return web.json_response({'error': {'message': 'Invalid Credentials'}}, status=401)
+        scripted = self.failures.get(request.path)
+        if scripted:
+            status, headers = scripted.pop(0)
+            message = 'Rate Limit Exceeded' if status in (403, 429) else 'Backend Error'
+            return web.json_response({'error': {'message': message}}, status=status,
+                                     headers=headers)
+        return None
+
+    async def list_messages(self, request):
+        return await self._check(request) or web.json_response({
+            'messages': [{'id': 'm1'}, {'id': 'm2'}],
+            'nextPageToken': 'next',
+            'query': request.query.get('q'),
+        })
+
+    async def get_message(self, request):
+        failure = await self._check(request)
+        if failure:
+            return failure
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        msg_id = request.match_info['id']
+        return web.json_response({
+            'id': msg_id,
+            'threadId': f"t-{msg_id}",
+            'payload': {'headers': []},
+            'format': request.query.get('format'),
+        })
+
+    async def list_history(self, request):
+        return await self._check(request) or web.json_response({
+            'historyId': '200',
+            'types': request.query.getall('historyTypes', []),
+        })
+
+    async def batch(self, request):
+        failure = await self._check(request)
+        if failure:
+            return failure
+        content_type = request.headers['Content-Type']
+        boundary = content_type.split('boundary=')[1]
+        body = (await request.read()).decode()
+        out = []
+        for part in body.split(f"--{boundary}")[1:-1]:
+            content_id = part.split('Content-ID: <')[1].split('>')[0]
+            path = part.split('GET ')[1].split('?')[0]
+            msg_id = path.rsplit('/', 1)[1]
+            statuses = self.batch_failures.get(msg_id)
+            if statuses:
+                status = statuses.pop(0)
+                payload = json.dumps({'error': {'message': 'Rate Limit Exceeded'}})
+            else:
+                status = 200
+                payload = json.dumps({'id': msg_id})
+            out.append(
+                "--resp\r\nContent-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} X\r\nContent-Type: application/json\r\n\r\n"
+                f"{payload}\r\n"
+            )
+        out.append("--resp--\r\n")
+        return web.Response(body=''.join(out).encode(),
+                            headers={'Content-Type': 'multipart/mixed; boundary=resp'})
+
+
+@pytest_asyncio.fixture
+async def gmail():
+    """Start the stand-in server."""
+    fake = FakeGmail()
+    server = TestServer(fake.app)
+    await server.start_server()
+    fake.url = str(server.make_url(''))
+    yield fake
+    await server.close()
+
+
+@pytest.fixture
+def credentials():
+    """Credentials shared by the transport."""
+    return FakeCredentials()
+
+
+@pytest_asyncio.fixture
+async def transport(gmail, credentials):
+    """Transport pointed at the stand-in server."""
+    manager = mock.MagicMock()
+    manager.get_credentials.return_value = credentials
+    transport = AsyncGmailTransport(manager, base_url=gmail.url, base_delay=0,
+                                    max_retries=3)
+    yield transport
+    await transport.close()
+
+
+class TestBatchEncoding:
+    """Tests for multipart batch encoding."""
+
+    def test_round_trip(self):
+        """Test encoded sub-requests carry their index as Content-ID."""
+        body = _encode_batch('b', ['/a', '/b'])
+        assert body.count(b'--b\r\n') == 2
+        assert b'Content-ID: <item1>\r\n\r\nGET /b\r\n' in body
+        assert body.endswith(b'--b--\r\n')
+
+    def test_decode(self):
+        """Test sub-responses are mapped back to request indexes."""
+        body = (b"--x\r\nContent-ID: <response-item1>\r\n\r\n"
+                b"HTTP/1.1 404 Not Found\r\ncontent-type: application/json\r\n\r\n{}\r\n"
+                b"--x\r\nContent-ID: <response-item0>\r\n\r\n"
+                b"HTTP/1.1 200 OK\r\n\r\n{\"id\": \"a\"}\r\n--x--\r\n")
+
+        parts = _decode_batch('multipart/mixed; boundary=x', body)
+
+        assert parts[0][0] == 200
+        assert json.loads(parts[0][2]) == {'id': 'a'}
+        assert parts[1][0] == 404
+        assert parts[1][1]['Content-Type'] == 'application/json'
+
+    def test_decode_rejects_non_multipart(self):
+        """Test a non-multipart response is an API error."""
+        with pytest.raises(APIError):
+            _decode_batch('application/json', b'{}')
+
+
+class TestAsyncGmailTransport:
+    """Tests for requests against the stand-in server."""
+
+    @pytest.mark.asyncio
+    async def test_list_and_get(self, transport, gmail):
+        """Test list and get decode JSON and pass query parameters."""
+        page = await transport.list_messages('is:unread', max_results=2)
+        message = await transport.get_message('m1', format='metadata',
+                                              metadata_headers=['From', 'Subject'])
+
+        assert [m['id'] for m in page['messages']] == ['m1', 'm2']
+        assert page['query'] == 'is:unread'
+        assert message['format'] == 'metadata'
+        assert 'metadataHeaders=From&metadataHeaders=Subject' in gmail.requests[-1][1]
+
+    @pytest.mark.asyncio
+    async def test_list_history_repeats_types(self, transport):
+        """Test repeated query parameters are sent once per value."""
+        result = await transport.list_history(100, history_types=['messageAdded', 'labelAdded'])
+        assert result['types'] == ['messageAdded', 'labelAdded']
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_retried(self, transport, gmail):
+        """Test 429 responses are retried and reported to the rate limiter."""
+        transport.rate_limiter = mock.MagicMock()
+        transport.rate_limiter.wait_if_needed_async = mock.AsyncMock()
+        gmail.failures['/gmail/v1/users/me/messages/m1'] = [
+            (429, {'Retry-After': '0'}), (503, {})
+        ]
+
+        message = await transport.get_message('m1')
+
+        assert message['id'] == 'm1'
+        stats = transport.get_stats()
+        assert (stats['retries'], stats['throttled']) == (2, 1)
+        transport.rate_limiter.bucket.on_rate_limited.assert_called_once_with(0.0)
+        assert transport.rate_limiter.wait_if_needed_async.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_retries_exhausted(self, transport, gmail):
+        """Test persistent throttling surfaces as RateLimitError."""
+        gmail.failures['/gmail/v1/users/me/messages/m1'] = [(429, {})] * 10
+
+        with pytest.raises(RateLimitError):
+            await transport.get_message('m1')
+
+    @pytest.mark.asyncio
+    async def test_client_error_not_retried(self, transport, gmail):
+        """Test a 404 fails immediately."""
+        gmail.failures['/gmail/v1/users/me/messages/m1'] = [(404, {})]
+
+        with pytest.raises(APIError):
+            await transport.get_message('m1')
+        assert transport.get_stats()['retries'] == 0
+
+    @pytest.mark.asyncio
+    async def test_expired_token_refreshed_once(self, transport, gmail, credentials):
+        """Test concurrent requests share one refresh of an expired token."""
+        credentials.valid = False
+        gmail.valid_tokens = {'token-1'}
+
+        await asyncio.gather(*(transport.get_message(f"m{i}") for i in range(10)))
+
+        assert credentials.refreshes == 1
+
+    @pytest.mark.asyncio
+    async def test_rejected_token_refreshed(self, transport, gmail, credentials):
+        """Test a 401 forces a refresh and the request is retried."""
+        gmail.valid_tokens = {'token-1'}
+
+        message = await transport.get_message('m1')
+
+        assert message['id'] == 'm1'
+        assert credentials.refreshes == 1
+        assert transport.get_stats()['token_refreshes'] == 1
+
+    @pytest.mark.asyncio
+    async def test_revoked_token_raises(self, transport, gmail):
+        """Test a token rejected after refresh raises AuthError."""
+        gmail.valid_tokens = set()
+
+        with pytest.raises(AuthError):
+            await transport.get_message('m1')
+
+    @pytest.mark.asyncio
+    async def test_many_requests_in_flight(self, transport, gmail):
+        """Test requests run concurrently on the pooled session."""
+        gmail.delay = 0.05
+
+        results = await asyncio.gather(*(transport.get_message(f"m{i}") for i in range(50)))
+
+        assert len(results) == 50
+        assert gmail.max_in_flight > 10
+
+    @pytest.mark.asyncio
+    async def test_batch_get_retries_throttled_items(self, transport, gmail):
+        """Test throttled sub-requests are re-sent in a follow-up batch."""
+        gmail.batch_failures = {'m2': [429], 'm3': [404]}
+
+        messages, errors = await transport.batch_get_messages(['m1', 'm2', 'm3'])
+
+        assert set(messages) == {'m1', 'm2'}
+        assert list(errors) == ['m3']
+        assert transport.get_stats()['batch_requests'] == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_limit(self, transport):
+        """Test batches larger than the Gmail limit are rejected."""
+        with pytest.raises(ValueError):
+            await transport.batch_get_messages([str(i) for i in range(101)])
+
+    @pytest.mark.asyncio
+    async def test_missing_credentials(self, gmail):
+        """Test requests fail cleanly without credentials."""
+        manager = mock.MagicMock()
+        manager.get_credentials.return_value = None
+        transport = AsyncGmailTransport(manager, base_url=gmail.url)
+
+        with pytest.raises(AuthError):
+            await transport.get_profile()
+
+
+class TestAsyncFetcherNativeTransport:
+    """Tests for AsyncGmailFetcher on the native transport."""
+
+    @pytest.mark.asyncio
+    async def test_fetcher_uses_transport(self, gmail, credentials):
+        """Test ID listing and message fetches go over aiohttp."""
+        with mock.patch('gmail_assistant.core.fetch.async_fetcher.SecureCredentialManager') as MockCM:
+            MockCM.return_value.get_credentials.return_value = credentials
+            from gmail_assistant.core.fetch.async_fetcher import AsyncGmailFetcher
+
+            async with AsyncGmailFetcher(native_transport=True) as fetcher:
+                fetcher.transport.base_url = gmail.url
+                ids = await fetcher.fetch_email_ids_async('in:inbox', max_results=2)
+                emails = await fetcher.fetch_emails_batch_async(ids)
+                stats = fetcher.get_performance_stats()
+
+        assert ids == ['m1', 'm2']
+        assert [e['threadId'] for e in emails] == ['t-m1', 't-m2']
+        assert stats['transport']['requests'] == 3
+        assert stats['service_pool']['checkouts'] == 0
+
+    def test_thread_pool_fallback(self):
+        """Test the transport can be disabled."""
+        with mock.patch('gmail_assistant.core.fetch.async_fetcher.SecureCredentialManager'):
+            from gmail_assistant.core.fetch.async_fetcher import AsyncGmailFetcher
+
+            fetcher = AsyncGmailFetcher(native_transport=False)
+
+        assert fetcher.transport is None
+        assert fetcher.get_performance_stats()['transport'] is None
@@ -4,6 +4,7 @@ Tests AsyncGmailFetcher class for asynchronous operations.
 """
 
 import asyncio
+import sqlite3
 from unittest import mock
 
 import pytest
@@ -99,7 +100,7 @@ class TestSyncApiCall:
     def test_sync_api_call_uses_rate_limiter(self):
         """Test sync API call uses rate limiter."""
         with mock.patch('gmail_assistant.core.fetch.async_fetcher.SecureCredentialManager'):
-            with mock.patch('gmail_assistant.core.fetch.async_fetcher.GmailRateLimiter') as MockRL:
+            with mock.patch('gmail_assistant.core.fetch.async_fetcher.get_gmail_rate_limiter') as MockRL:
                 with mock.patch('gmail_assistant.core.fetch.async_fetcher.MemoryTracker'):
                     mock_rl = mock.MagicMock()
                     mock_rl.rate_limited_call.return_value = "result"
@@ -157,6 +158,20 @@ class TestFetchEmailAsync:
                     assert result is None
 
 
+    @pytest.mark.asyncio
+    async def test_fetch_email_cache_error_returns_none(self):
+        """Test a failing message cache is reported as a failed fetch."""
+        with mock.patch('gmail_assistant.core.fetch.async_fetcher.SecureCredentialManager'), \
+                mock.patch('gmail_assistant.core.fetch.async_fetcher.MemoryTracker'):
+            from gmail_assistant.core.fetch.async_fetcher import AsyncGmailFetcher
+
+            cache = mock.MagicMock()
+            cache.get.side_effect = sqlite3.OperationalError("database is locked")
+            fetcher = AsyncGmailFetcher(native_transport=False, message_cache=cache)
+
+            assert await fetcher.fetch_email_async("msg123") is None
+
+
 class TestGetProfileAsync:
     """Tests for get_profile_async method."""
 
@@ -252,3 +267,136 @@ class TestSearchEmailsAsync:
                     with mock.patch.object(fetcher, 'fetch_email_ids_async', return_value=[]):
                         results = await fetcher.search_emails_async("is:unread")
                         assert results == []
+
+
+class TestStreamEmailsAsync:
+    """Tests for the bounded streaming API."""
+
+    @pytest.fixture
+    def fetcher(self):
+        """Create a fetcher whose single-message fetch is scripted."""
+        with mock.patch('gmail_assistant.core.fetch.async_fetcher.SecureCredentialManager'):
+            with mock.patch('gmail_assistant.core.fetch.async_fetcher.MemoryTracker'):
+                from gmail_assistant.core.fetch.async_fetcher import AsyncGmailFetcher
+
+                fetcher = AsyncGmailFetcher(max_concurrent=4, native_transport=False)
+
+        fetcher.delays = {}
+        fetcher.events = []
+        fetcher.in_flight = 0
+        fetcher.max_in_flight = 0
+
+        async def fetch_email(email_id):
+            fetcher.events.append(('fetch', email_id))
+            fetcher.in_flight += 1
+            fetcher.max_in_flight = max(fetcher.max_in_flight, fetcher.in_flight)
+            try:
+                await asyncio.sleep(fetcher.delays.get(email_id, 0.001))
+            finally:
+                fetcher.in_flight -= 1
+            return None if email_id.startswith('bad') else {'id': email_id}
+
+        fetcher.fetch_email_async = fetch_email
+        return fetcher
+
+    def _pages(self, fetcher, *pages):
+        async def iter_pages(query, max_results):
+            for page in pages:
+                fetcher.events.append(('page', page[0]))
+                yield list(page)
+        return iter_pages
+
+    @pytest.mark.asyncio
+    async def test_slow_message_does_not_block_others(self, fetcher):
+        """Test messages are yielded in completion order."""
+        fetcher.delays = {'m0': 0.2}
+        fetcher.iter_email_id_pages_async = self._pages(fetcher, [f"m{i}" for i in range(12)])
+
+        ids = [email['id'] async for email in fetcher.stream_emails_async('q')]
+
+        assert sorted(ids) == sorted(f"m{i}" for i in range(12))
+        assert ids[-1] == 'm0'
+
+    @pytest.mark.asyncio
+    async def test_in_flight_bounded_by_workers(self, fetcher):
+        """Test no more than `workers` messages are fetched at once."""
+        fetcher.iter_email_id_pages_async = self._pages(fetcher, [f"m{i}" for i in range(50)])
+
+        emails = [email async for email in fetcher.stream_emails_async('q', workers=3)]
+
+        assert len(emails) == 50
+        assert fetcher.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_paging_overlaps_fetching(self, fetcher):
+        """Test the first page is being fetched before the last is listed."""
+        fetcher.iter_email_id_pages_async = self._pages(
+            fetcher, *([f"p{p}m{i}" for i in range(10)] for p in range(5))
+        )
+
+        [email async for email in fetcher.stream_emails_async('q')]
+
+        first_fetch = fetcher.events.index(('fetch', 'p0m0'))
+        assert first_fetch < fetcher.events.index(('page', 'p4m0'))
+
+    @pytest.mark.asyncio
+    async def test_filter_and_failures_counted(self, fetcher):
+        """Test filtered IDs are skipped and failed fetches are not yielded."""
+        fetcher.iter_email_id_pages_async = self._pages(fetcher, ['m1', 'old', 'bad1'])
+
+        emails = [email async for email in fetcher.stream_emails_async(
+            'q', id_filter=lambda ids: [i for i in ids if i != 'old']
+        )]
+
+        assert emails == [{'id': 'm1'}]
+        assert fetcher.last_stream_stats == {'listed': 3, 'skipped': 1, 'fetched': 1, 'failed': 1}
+
+    @pytest.mark.asyncio
+    async def test_early_exit_stops_workers(self, fetcher):
+        """Test leaving the loop early cancels outstanding work."""
+        fetcher.iter_email_id_pages_async = self._pages(fetcher, [f"m{i}" for i in range(100)])
+
+        stream = fetcher.stream_emails_async('q')
+        async for _ in stream:
+            break
+        await stream.aclose()
+        await asyncio.sleep(0.01)
+
+        assert len([e for e in fetcher.events if e[0] == 'fetch']) < 20
+        assert fetcher.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_paging_error_propagates(self, fetcher):
+        """Test an error listing IDs surfaces to the consumer."""
+        async def failing_pages(query, max_results):
+            yield ['m1']
+            raise RuntimeError("listing failed")
+
+        fetcher.iter_email_id_pages_async = failing_pages
+
+        with pytest.raises(RuntimeError, match="listing failed"):
+            [email async for email in fetcher.stream_emails_async('q')]
+
+    @pytest.mark.asyncio
+    async def test_worker_error_does_not_hang(self, fetcher):
+        """Test a crashed worker pool raises instead of waiting on a blocked producer."""
+        async def crash(email_id):
+            raise RuntimeError("worker crashed")
+
+        fetcher.fetch_email_async = crash
+        fetcher.iter_email_id_pages_async = self._pages(fetcher, [f"m{i}" for i in range(50)])
+
+        async def consume():
+            return [email async for email in fetcher.stream_emails_async('q', workers=2)]
+
+        with pytest.raises(RuntimeError, match="worker crashed"):
+            await asyncio.wait_for(consume(), timeout=5)
+
+    @pytest.mark.asyncio
+    async def test_batch_preserves_order(self, fetcher):
+        """Test fetch_emails_batch_async returns results in input order."""
+        fetcher.delays = {'m1': 0.05}
+
+        results = await fetcher.fetch_emails_batch_async(['m1', 'bad', 'm2'])
+
+        assert results == [{'id': 'm1'}, None, {'id': 'm2'}]
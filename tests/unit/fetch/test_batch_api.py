@@ -169,6 +169,179 @@ class TestBatchGetMessagesRaw:
         assert result == {}
 
 
+def _http_error(status):
+    """Create an HttpError with the given status."""
+    import httplib2
+    from googleapiclient.errors import HttpError
+    return HttpError(httplib2.Response({'status': status}), b'error')
+
+
+class ScriptedBatch:
+    """Batch request that fails the IDs scheduled to fail in this batch."""
+
+    def __init__(self, service):
+        self.service = service
+        self.ids = []
+        self._callbacks = []
+
+    def add(self, request, callback):
+        self.ids.append(request)
+        self._callbacks.append((request, callback))
+
+    def execute(self):
+        self.service.batches.append(self.ids)
+        if self.service.batch_failures:
+            raise self.service.batch_failures.pop(0)
+        for msg_id, callback in self._callbacks:
+            failures = self.service.item_failures.get(msg_id)
+            if failures:
+                callback(msg_id, None, failures.pop(0))
+            else:
+                callback(msg_id, {'id': msg_id}, None)
+
+
+class TestAdaptiveBatching:
+    """Tests for retries and adaptive batch sizing."""
+
+    @pytest.fixture
+    def service(self):
+        """Gmail service whose batches follow a failure script."""
+        service = mock.MagicMock()
+        service.users().messages().get.side_effect = lambda **kwargs: kwargs['id']
+        service.batches = []
+        service.batch_failures = []
+        service.item_failures = {}
+        service.new_batch_http_request.side_effect = lambda: ScriptedBatch(service)
+        return service
+
+    def _client(self, service, **kwargs):
+        from gmail_assistant.core.fetch.batch_api import GmailBatchClient
+        kwargs.setdefault('base_delay', 0)
+        return GmailBatchClient(service, **kwargs)
+
+    def test_rate_limited_item_retried_in_later_batch(self, service):
+        """Test a 429 sub-request is re-queued instead of dropped."""
+        service.item_failures = {'m2': [_http_error(429)]}
+        client = self._client(service, initial_batch_size=10)
+
+        results = client.batch_get_messages_raw(['m1', 'm2', 'm3'])
+
+        assert set(results) == {'m1', 'm2', 'm3'}
+        assert service.batches == [['m1', 'm2', 'm3'], ['m2']]
+        assert client.last_stats.retries == 1
+        assert client.last_errors == {}
+
+    def test_non_retryable_item_reported(self, service):
+        """Test a 404 sub-request fails without retry."""
+        service.item_failures = {'m1': [_http_error(404)]}
+        on_error = mock.MagicMock()
+        client = self._client(service, on_error=on_error)
+
+        with mock.patch('gmail_assistant.core.fetch.batch_api.Email') as MockEmail:
+            emails = client.batch_get_messages(['m1', 'm2'])
+
+        assert len(emails) == 1
+        MockEmail.from_gmail_message.assert_called_once_with({'id': 'm2'})
+        assert on_error.call_args[0][0] == 'm1'
+        assert len(service.batches) == 1
+
+    def test_retries_exhausted(self, service):
+        """Test a message failing every attempt ends up in last_errors."""
+        service.item_failures = {'m1': [_http_error(503)] * 10}
+        client = self._client(service, max_retries=2)
+
+        results = client.batch_get_messages_raw(['m1'])
+
+        assert results == {}
+        assert len(service.batches) == 3
+        assert 'm1' in client.last_errors
+
+    def test_whole_batch_failure_retried(self, service):
+        """Test a transient whole-batch failure re-sends every ID."""
+        service.batch_failures = [_http_error(500)]
+        client = self._client(service)
+
+        results = client.batch_get_messages_raw(['m1', 'm2'])
+
+        assert set(results) == {'m1', 'm2'}
+        assert len(service.batches) == 2
+
+    def test_non_retryable_batch_failure_raises(self, service):
+        """Test batch_get_messages raises on a permanent batch failure."""
+        from gmail_assistant.core.fetch.batch_api import BatchAPIError
+
+        service.batch_failures = [_http_error(400)]
+        client = self._client(service)
+
+        with pytest.raises(BatchAPIError):
+            client.batch_get_messages(['m1'])
+
+    def test_batch_size_shrinks_on_errors_and_grows_when_clean(self, service):
+        """Test the batch size follows the sub-request error rate."""
+        ids = [f"m{i}" for i in range(20)]
+        service.item_failures = {msg_id: [_http_error(429)] for msg_id in ids[:5]}
+        client = self._client(service, initial_batch_size=20)
+
+        client.batch_get_messages_raw(ids)
+        assert client.batch_size == 10
+
+        client.batch_get_messages_raw([f"n{i}" for i in range(10)])
+        assert client.batch_size == 10 + client.BATCH_SIZE_STEP
+
+    def test_slow_batch_shrinks_size(self, service):
+        """Test batches slower than the target latency shrink the size."""
+        client = self._client(service, initial_batch_size=20, target_latency=-1)
+
+        client.batch_get_messages_raw(['m1'])
+
+        assert client.batch_size == 15
+
+    def test_rate_limiter_bucket_notified(self, service):
+        """Test throttled batches back off the shared token bucket."""
+        service.item_failures = {'m1': [_http_error(429)]}
+        limiter = mock.MagicMock()
+        client = self._client(service, rate_limiter=limiter)
+
+        client.batch_get_messages_raw(['m1'])
+
+        limiter.bucket.on_rate_limited.assert_called_once()
+        limiter.bucket.record_success.assert_called_once()
+
+    def test_whole_batch_server_error_does_not_throttle_bucket(self, service):
+        """Test a whole-batch 503 retries without slowing the shared bucket."""
+        service.batch_failures = [_http_error(503)]
+        limiter = mock.MagicMock()
+        client = self._client(service, rate_limiter=limiter)
+
+        results = client.batch_get_messages_raw(['m1', 'm2'])
+
+        assert set(results) == {'m1', 'm2'}
+        limiter.bucket.on_rate_limited.assert_not_called()
+
+    def test_whole_batch_rate_limit_throttles_bucket(self, service):
+        """Test a whole-batch 429 backs off the shared bucket."""
+        service.batch_failures = [_http_error(429)]
+        limiter = mock.MagicMock()
+        client = self._client(service, rate_limiter=limiter)
+
+        client.batch_get_messages_raw(['m1'])
+
+        limiter.bucket.on_rate_limited.assert_called_once()
+
+    def test_stats(self, service):
+        """Test throughput stats accumulate across calls."""
+        client = self._client(service)
+
+        client.batch_get_messages_raw(['m1', 'm2'])
+        client.batch_get_messages_raw(['m3'])
+
+        stats = client.get_stats()
+        assert stats['requested'] == 3
+        assert stats['fetched'] == 3
+        assert stats['batches'] == 2
+        assert stats['messages_per_second'] > 0
+
+
 class TestBatchDeleteMessages:
     """Tests for batch_delete_messages method."""
 
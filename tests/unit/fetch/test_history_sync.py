@@ -181,7 +181,10 @@ class TestGetBatchClient:
 
             result = client._get_batch_client()
 
-            MockBatch.assert_called_once_with(mock_service)
+            from gmail_assistant.utils.rate_limiter import get_gmail_rate_limiter
+            MockBatch.assert_called_once_with(
+                mock_service, rate_limiter=get_gmail_rate_limiter(), message_cache=None
+            )
             assert result == mock_batch
 
     def test_get_batch_client_returns_existing(self):
@@ -292,6 +295,212 @@ class TestFetchAddedMessages:
         assert result == []
 
 
+def _history_service(pages, fail_on=None):
+    """Gmail service whose history.list walks ``pages`` by page token."""
+    service = mock.MagicMock()
+    service.list_calls = []
+
+    def list_history(**params):
+        index = int(params.get('pageToken', 0))
+        service.list_calls.append(index)
+        request = mock.MagicMock()
+        if index == fail_on:
+            from googleapiclient.errors import HttpError
+            request.execute.side_effect = HttpError(mock.MagicMock(status=500), b'error')
+        else:
+            page = dict(pages[index])
+            if index + 1 < len(pages):
+                page['nextPageToken'] = str(index + 1)
+            request.execute.return_value = page
+        return request
+
+    service.users().history().list.side_effect = list_history
+    return service
+
+
+def _added(record_id, *message_ids):
+    return {'id': str(record_id),
+            'messagesAdded': [{'message': {'id': m, 'labelIds': ['INBOX']}} for m in message_ids]}
+
+
+def _deleted(record_id, *message_ids):
+    return {'id': str(record_id),
+            'messagesDeleted': [{'message': {'id': m}} for m in message_ids]}
+
+
+class TestIterHistoryPages:
+    """Tests for iter_history_pages method."""
+
+    def test_yields_net_changes_per_page(self):
+        """Test each page reports its own net changes."""
+        from gmail_assistant.core.fetch.history_sync import HistorySyncClient
+
+        service = _history_service([
+            {'history': [
+                _added(101, 'a', 'b'),
+                _deleted(102, 'b'),
+                {'id': '103', 'labelsAdded': [{'message': {'id': 'b'}, 'labelIds': ['X']}]},
+            ]},
+            {'history': [_deleted(104, 'a'), _added(105, 'c')], 'historyId': '110'},
+        ])
+
+        pages = list(HistorySyncClient(service).iter_history_pages(100))
+
+        assert [p.added_message_ids for p in pages] == [['a'], ['c']]
+        assert [p.deleted_message_ids for p in pages] == [[], ['a']]
+        assert pages[0].label_changes == []
+        assert [p.new_history_id for p in pages] == [103, 110]
+
+    def test_max_pages_limits_paging(self):
+        """Test paging stops after max_pages."""
+        from gmail_assistant.core.fetch.history_sync import HistorySyncClient
+
+        service = _history_service([{'history': [_added(101 + i, f"m{i}")]} for i in range(5)])
+
+        pages = list(HistorySyncClient(service).iter_history_pages(100, max_pages=2))
+
+        assert len(pages) == 2
+        assert service.list_calls == [0, 1]
+
+
+class TestStreamIncrementalSync:
+    """Tests for stream_incremental_sync method."""
+
+    @pytest.fixture
+    def state_manager(self):
+        """Sync state manager on an in-memory database."""
+        from gmail_assistant.core.fetch.history_sync import SyncStateManager
+
+        conn = sqlite3.connect(':memory:')
+        yield SyncStateManager(conn)
+        conn.close()
+
+    @staticmethod
+    def _batch_client():
+        batch = mock.MagicMock()
+        batch.batch_get_messages.side_effect = (
+            lambda ids, format='full': [f"email-{i}" for i in ids]
+        )
+        return batch
+
+    def test_delivers_pages_in_order_and_checkpoints(self, state_manager):
+        """Test callbacks run per page and the history ID is saved after each."""
+        from gmail_assistant.core.fetch.history_sync import HistorySyncClient
+
+        service = _history_service([
+            {'history': [_added(101, 'a', 'b')]},
+            {'history': [_deleted(102, 'a')]},
+            {'history': [_added(103, 'c')], 'historyId': '120'},
+        ])
+        client = HistorySyncClient(service, batch_client=self._batch_client())
+        delivered = []
+
+        def on_added(emails):
+            delivered.append(('added', emails, state_manager.get_history_id()))
+
+        def on_deleted(ids):
+            delivered.append(('deleted', ids, state_manager.get_history_id()))
+
+        history_id, stats = client.stream_incremental_sync(
+            100, on_messages_added=on_added, on_messages_deleted=on_deleted,
+            state_manager=state_manager
+        )
+
+        assert delivered == [
+            ('added', ['email-a', 'email-b'], None),
+            ('deleted', ['a'], 101),
+            ('added', ['email-c'], 102),
+        ]
+        assert history_id == state_manager.get_history_id() == 120
+        assert (stats['added'], stats['deleted'], stats['pages_processed']) == (3, 1, 3)
+        assert state_manager.get_sync_stats()['total_synced'] == 3
+
+    def test_failure_keeps_last_delivered_checkpoint(self, state_manager):
+        """Test an interrupted sync can resume from the last delivered page."""
+        from gmail_assistant.core.fetch.history_sync import HistorySyncClient
+
+        service = _history_service(
+            [{'history': [_added(101 + i, f"m{i}")]} for i in range(4)], fail_on=2
+        )
+        client = HistorySyncClient(service, batch_client=self._batch_client())
+        added = []
+
+        with pytest.raises(RuntimeError):
+            client.stream_incremental_sync(100, on_messages_added=added.extend,
+                                           state_manager=state_manager)
+
+        assert added == ['email-m0', 'email-m1']
+        assert state_manager.get_history_id() == 102
+
+    def test_expired_history_raises_history_expired_error(self):
+        """Test a 404 from history.list asks for a full sync."""
+        from googleapiclient.errors import HttpError
+
+        from gmail_assistant.core.fetch.history_sync import (
+            HistoryExpiredError,
+            HistorySyncClient,
+        )
+
+        service = mock.MagicMock()
+        service.users().history().list().execute.side_effect = HttpError(
+            mock.MagicMock(status=404), b'not found'
+        )
+
+        with pytest.raises(HistoryExpiredError):
+            HistorySyncClient(service).stream_incremental_sync(100)
+
+    def test_ids_passed_when_not_fetching(self):
+        """Test added IDs are delivered without fetching when requested."""
+        from gmail_assistant.core.fetch.history_sync import HistorySyncClient
+
+        batch = self._batch_client()
+        client = HistorySyncClient(_history_service([{'history': [_added(101, 'a')]}]),
+                                   batch_client=batch)
+        added = []
+
+        client.stream_incremental_sync(100, on_messages_added=added.extend,
+                                       fetch_full_messages=False)
+
+        assert added == ['a']
+        batch.batch_get_messages.assert_not_called()
+
+    def test_fetches_overlap_paging(self):
+        """Test a page's messages are fetched while later pages are listed."""
+        import threading
+
+        from gmail_assistant.core.fetch.history_sync import HistorySyncClient
+
+        service = _history_service([{'history': [_added(101 + i, f"m{i}")]} for i in range(3)])
+        last_page_listed = threading.Event()
+        list_history = service.users().history().list.side_effect
+
+        def tracking_list(**params):
+            if params.get('pageToken') == '2':
+                last_page_listed.set()
+            return list_history(**params)
+
+        service.users().history().list.side_effect = tracking_list
+
+        class BlockingBatchClient:
+            def __init__(self, *args, **kwargs):
+                pass
+
+            def batch_get_messages(self, ids, format='full'):
+                # Only returns once paging has moved on past this page
+                assert last_page_listed.wait(timeout=5)
+                return [f"email-{i}" for i in ids]
+
+        added = []
+        with mock.patch('gmail_assistant.core.fetch.history_sync.GmailBatchClient',
+                        BlockingBatchClient):
+            history_id, stats = HistorySyncClient(service).stream_incremental_sync(
+                100, on_messages_added=added.extend, service_factory=mock.MagicMock
+            )
+
+        assert added == ['email-m0', 'email-m1', 'email-m2']
+        assert (history_id, stats['fetch_errors']) == (103, 0)
+
+
 class TestCheckSyncRequired:
     """Tests for check_sync_required method."""
 
@@ -0,0 +1,254 @@
+"""
+Tests for id_enumeration.py module.
+Tests DateWindow and ShardedIdEnumerator against an in-memory mailbox.
+"""
+
+import asyncio
+import re
+import threading
+import time
+from itertools import pairwise
+
+import pytest
+
+from gmail_assistant.core.fetch.id_enumeration import (
+    DateWindow,
+    ShardedIdEnumerator,
+    needs_sharding,
+)
+
+START = 1_600_000_000
+END = START + 100 * 86400
+
+
+class FakeMailbox:
+    """``messages.list`` over (id, epoch seconds) pairs, newest first."""
+
+    def __init__(self, timestamps, delay=0.0):
+        self.messages = sorted(
+            ((f"m{i}", ts) for i, ts in enumerate(timestamps)),
+            key=lambda m: m[1], reverse=True
+        )
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _matching(self, query):
+        after = re.search(r'after:(\d+)', query)
+        before = re.search(r'before:(\d+)', query)
+        return [
+            msg_id for msg_id, ts in self.messages
+            if (not after or ts > int(after.group(1)))
+            and (not before or ts < int(before.group(1)))
+        ]
+
+    def _page(self, query, page_token, page_size):
+        matching = self._matching(query)
+        offset = int(page_token or 0)
+        response = {
+            'messages': [{'id': msg_id} for msg_id in matching[offset:offset + page_size]],
+            'resultSizeEstimate': len(matching),
+        }
+        if offset + page_size < len(matching):
+            response['nextPageToken'] = str(offset + page_size)
+        return response
+
+    def list_page(self, query, page_token, page_size):
+        with self._lock:
+            self.calls.append(query)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            return self._page(query, page_token, page_size)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    async def list_page_async(self, query, page_token, page_size):
+        self.calls.append(query)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return self._page(query, page_token, page_size)
+        finally:
+            self.in_flight -= 1
+
+    def serial(self, max_results=None):
+        ids = [msg_id for msg_id, _ in self.messages]
+        return ids if max_results is None else ids[:max_results]
+
+
+def _enumerator(mailbox, **kwargs):
+    kwargs.setdefault('page_size', 10)
+    kwargs.setdefault('workers', 4)
+    return ShardedIdEnumerator(mailbox.list_page, start=START, end=END, **kwargs)
+
+
+def _spread(count, start=START, end=END):
+    step = (end - start) // count
+    return [start + i * step for i in range(count)]
+
+
+class TestDateWindow:
+    """Tests for DateWindow."""
+
+    def test_query_overlaps_lower_boundary(self):
+        """Test after: is one second early so boundary messages are kept."""
+        window = DateWindow(100, 200)
+        assert window.query('from:a') == 'from:a after:99 before:200'
+        assert DateWindow(None, 200).query('') == 'before:200'
+
+    def test_split_is_contiguous_and_newest_first(self):
+        """Test split windows tile the original from newest to oldest."""
+        windows = DateWindow(0, 100).split(3)
+
+        assert windows[0].end == 100 and windows[-1].start == 0
+        for newer, older in pairwise(windows):
+            assert newer.start == older.end
+
+    def test_needs_sharding(self):
+        """Test only results larger than a few pages are sharded."""
+        assert not needs_sharding(1000)
+        assert needs_sharding(1001)
+        assert needs_sharding(None)
+
+
+class TestShardedIdEnumerator:
+    """Tests for ShardedIdEnumerator."""
+
+    def test_matches_serial_order(self):
+        """Test sharded output equals newest-first serial paging."""
+        mailbox = FakeMailbox(_spread(237))
+
+        ids = _enumerator(mailbox).enumerate('in:inbox')
+
+        assert ids == mailbox.serial()
+
+    def test_boundary_messages_not_duplicated(self):
+        """Test a message on a window boundary is listed once."""
+        boundary = START + 50 * 86400
+        mailbox = FakeMailbox([boundary] * 3 + _spread(60))
+
+        ids = _enumerator(mailbox).enumerate('')
+
+        assert len(ids) == len(set(ids)) == 63
+        assert set(ids) == set(mailbox.serial())
+
+    def test_dense_window_is_split(self):
+        """Test a window holding many pages is subdivided."""
+        burst = START + 10 * 86400
+        mailbox = FakeMailbox([burst + i * 60 for i in range(200)] + _spread(20))
+        enumerator = _enumerator(mailbox)
+
+        ids = enumerator.enumerate('')
+
+        assert ids == mailbox.serial()
+        assert enumerator.last_stats['splits'] > 0
+
+    def test_max_results_returns_newest_prefix(self):
+        """Test max_results keeps the newest IDs and stops early."""
+        mailbox = FakeMailbox(_spread(300))
+        enumerator = _enumerator(mailbox, workers=1)
+
+        ids = enumerator.enumerate('', max_results=45)
+
+        assert ids == mailbox.serial(45)
+        assert enumerator.last_stats['pages'] < 30
+
+    def test_out_of_range_dates_are_listed(self):
+        """Test the open-ended edge windows catch messages outside the range."""
+        mailbox = FakeMailbox([START - 5000, END + 5000, *_spread(50)])
+
+        ids = _enumerator(mailbox).enumerate('')
+
+        assert ids == mailbox.serial()
+
+    def test_single_page_makes_no_more_calls(self):
+        """Test a result that fits one page is returned as is."""
+        mailbox = FakeMailbox(_spread(7))
+
+        ids = _enumerator(mailbox).enumerate('')
+
+        assert ids == mailbox.serial()
+        assert len(mailbox.calls) == 1
+
+    def test_small_result_pages_serially(self):
+        """Test results within serial_pages keep the unsharded query."""
+        mailbox = FakeMailbox(_spread(100))
+
+        ids = _enumerator(mailbox).enumerate('q', max_results=15)
+
+        assert ids == mailbox.serial(15)
+        assert mailbox.calls == ['q', 'q']
+
+    def test_uses_first_page(self):
+        """Test a caller's first page is not requested again."""
+        mailbox = FakeMailbox(_spread(40))
+        first_page = mailbox.list_page('', None, 10)
+
+        ids = _enumerator(mailbox).enumerate('', first_page=first_page)
+
+        assert ids == mailbox.serial()
+        assert mailbox.calls.count('') == 1
+
+    def test_lists_windows_concurrently(self):
+        """Test several windows are in flight at once."""
+        mailbox = FakeMailbox(_spread(200), delay=0.01)
+
+        _enumerator(mailbox, workers=4).enumerate('')
+
+        assert mailbox.max_in_flight > 1
+        assert mailbox.max_in_flight <= 4
+
+    def test_iter_pages_streams_in_order(self):
+        """Test pages are yielded incrementally in newest-first order."""
+        mailbox = FakeMailbox(_spread(120))
+
+        pages = list(_enumerator(mailbox).iter_pages(''))
+
+        assert len(pages) > 1
+        assert [msg_id for page in pages for msg_id in page] == mailbox.serial()
+
+    def test_list_error_propagates(self):
+        """Test a failed list call surfaces to the caller."""
+        mailbox = FakeMailbox(_spread(100))
+        first_page = mailbox.list_page('', None, 10)
+
+        def failing(query, page_token, page_size):
+            raise RuntimeError("list failed")
+
+        enumerator = ShardedIdEnumerator(failing, page_size=10, start=START, end=END)
+        with pytest.raises(RuntimeError):
+            enumerator.enumerate('', first_page=first_page)
+
+
+class TestShardedIdEnumeratorAsync:
+    """Tests for the asyncio driver."""
+
+    @pytest.mark.asyncio
+    async def test_matches_serial_order(self):
+        """Test async enumeration equals serial paging."""
+        burst = START + 30 * 86400
+        mailbox = FakeMailbox([burst + i for i in range(80)] + _spread(150))
+        enumerator = ShardedIdEnumerator(mailbox.list_page_async, workers=4, page_size=10,
+                                         start=START, end=END)
+
+        ids = await enumerator.enumerate_async('')
+
+        assert ids == mailbox.serial()
+
+    @pytest.mark.asyncio
+    async def test_lists_windows_concurrently(self):
+        """Test coroutines list several windows at once."""
+        mailbox = FakeMailbox(_spread(200), delay=0.005)
+        enumerator = ShardedIdEnumerator(mailbox.list_page_async, workers=3, page_size=10,
+                                         start=START, end=END)
+
+        ids = await enumerator.enumerate_async('', max_results=150)
+
+        assert ids == mailbox.serial(150)
+        assert 1 < mailbox.max_in_flight <= 3
@@ -0,0 +1,194 @@
+"""
+Tests for message_cache.py module.
+Tests MessageCache and its use by the fetch paths.
+"""
+
+from unittest import mock
+
+import pytest
+
+from gmail_assistant.core.fetch.history_sync import HistorySyncResult, LabelChange
+from gmail_assistant.core.fetch.message_cache import MessageCache
+from gmail_assistant.utils.cache_manager import CacheManager
+
+
+def _message(message_id, labels=('INBOX',)):
+    return {
+        'id': message_id,
+        'threadId': f"thread-{message_id}",
+        'labelIds': list(labels),
+        'historyId': '100',
+        'payload': {'headers': []},
+    }
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a message cache in a temporary directory."""
+    cache = MessageCache(CacheManager(cache_dir=tmp_path))
+    yield cache
+    cache.close()
+
+
+class FakeBatch:
+    """Batch request that answers every get with a minimal message."""
+
+    def __init__(self):
+        self.requested = []
+        self._callbacks = []
+
+    def add(self, request, callback):
+        self.requested.append(request)
+        self._callbacks.append((request, callback))
+
+    def execute(self):
+        for message_id, callback in self._callbacks:
+            callback(message_id, _message(message_id), None)
+
+
+@pytest.fixture
+def batch_service():
+    """Gmail service whose batch requests are FakeBatch instances."""
+    service = mock.MagicMock()
+    service.users().messages().get.side_effect = lambda **kwargs: kwargs['id']
+    service.batches = []
+
+    def new_batch():
+        batch = FakeBatch()
+        service.batches.append(batch)
+        return batch
+
+    service.new_batch_http_request.side_effect = new_batch
+    return service
+
+
+class TestMessageCache:
+    """Tests for MessageCache."""
+
+    def test_miss_then_hit(self, cache):
+        """Test lookups are counted and the hit rate reported."""
+        assert cache.get('m1') is None
+        cache.put(_message('m1'))
+        assert cache.get('m1')['id'] == 'm1'
+
+        stats = cache.get_stats()
+        assert (stats['hits'], stats['misses'], stats['stored']) == (1, 1, 1)
+        assert stats['hit_rate'] == 0.5
+
+    def test_fetch_loads_once(self, cache):
+        """Test fetch only calls the loader on a miss."""
+        loader = mock.MagicMock(return_value=_message('m1'))
+
+        cache.fetch('m1', loader)
+        cache.fetch('m1', loader)
+
+        loader.assert_called_once()
+
+    def test_survives_restart(self, tmp_path, cache):
+        """Test cached messages persist across cache instances."""
+        cache.put(_message('m1'))
+        cache.close()
+
+        reopened = MessageCache(CacheManager(cache_dir=tmp_path))
+        try:
+            assert reopened.get('m1')['threadId'] == 'thread-m1'
+        finally:
+            reopened.close()
+
+    def test_apply_history_patches_labels_and_drops_deleted(self, cache):
+        """Test label changes update cached copies and deletions remove them."""
+        cache.put(_message('m1', labels=('INBOX', 'UNREAD')))
+        cache.put(_message('m2'))
+        result = HistorySyncResult(
+            success=True,
+            new_history_id=200,
+            deleted_message_ids=['m2'],
+            label_changes=[
+                LabelChange('m1', added_labels=['STARRED'], removed_labels=['UNREAD'],
+                            history_id=150),
+                LabelChange('unknown', added_labels=['STARRED'], removed_labels=[],
+                            history_id=151),
+            ]
+        )
+
+        cache.apply_history(result)
+
+        message = cache.get('m1')
+        assert message['labelIds'] == ['INBOX', 'STARRED']
+        assert message['historyId'] == '150'
+        assert cache.get('m2') is None
+        stats = cache.get_stats()
+        assert (stats['label_updates'], stats['invalidated']) == (1, 1)
+
+
+class TestFetchPathsUseCache:
+    """Tests for read-through caching in the fetch paths."""
+
+    def test_batch_client_fetches_only_uncached(self, cache, batch_service):
+        """Test full-format batch gets skip cached messages."""
+        from gmail_assistant.core.fetch.batch_api import GmailBatchClient
+
+        cache.put(_message('m1'))
+        client = GmailBatchClient(batch_service, message_cache=cache)
+
+        results = client.batch_get_messages_raw(['m1', 'm2'])
+
+        assert set(results) == {'m1', 'm2'}
+        assert batch_service.batches[0].requested == ['m2']
+        assert cache.get('m2') is not None
+
+    def test_batch_client_skips_request_when_all_cached(self, cache, batch_service):
+        """Test no batch is sent when every message is cached."""
+        from gmail_assistant.core.fetch.batch_api import GmailBatchClient
+
+        cache.put(_message('m1'))
+        client = GmailBatchClient(batch_service, message_cache=cache)
+
+        with mock.patch('gmail_assistant.core.fetch.batch_api.Email') as MockEmail:
+            emails = client.batch_get_messages(['m1'], format='full')
+
+        MockEmail.from_gmail_message.assert_called_once_with(cache.get('m1'))
+        assert len(emails) == 1
+        assert batch_service.batches == []
+
+    def test_batch_client_metadata_format_not_cached(self, cache, batch_service):
+        """Test only full-format responses go through the cache."""
+        from gmail_assistant.core.fetch.batch_api import GmailBatchClient
+
+        client = GmailBatchClient(batch_service, message_cache=cache)
+        client.batch_get_messages(['m1'], format='metadata')
+
+        assert cache.get_stats()['stored'] == 0
+
+    def test_gmail_fetcher_reads_through(self, cache):
+        """Test get_message_details only requests a message once."""
+        from gmail_assistant.core.fetch.gmail_assistant import GmailFetcher
+
+        with mock.patch('gmail_assistant.core.fetch.gmail_assistant.ReadOnlyGmailAuth') as MockAuth:
+            service = MockAuth.return_value.service
+            service.users().messages().get().execute.return_value = _message('m1')
+            fetcher = GmailFetcher(message_cache=cache)
+
+            first = fetcher.get_message_details('m1')
+            second = fetcher.get_message_details('m1')
+
+        assert first['id'] == second['id'] == 'm1'
+        assert service.users().messages().get().execute.call_count == 1
+
+    def test_history_sync_updates_cache(self, cache):
+        """Test HistorySyncClient applies label changes to the cache."""
+        from gmail_assistant.core.fetch.history_sync import HistorySyncClient
+
+        cache.put(_message('m1'))
+        service = mock.MagicMock()
+        service.users().history().list().execute.return_value = {
+            'history': [{
+                'id': '300',
+                'labelsAdded': [{'message': {'id': 'm1'}, 'labelIds': ['IMPORTANT']}],
+            }]
+        }
+
+        result = HistorySyncClient(service, message_cache=cache).sync_from_history(100)
+
+        assert result.success
+        assert 'IMPORTANT' in cache.get('m1')['labelIds']
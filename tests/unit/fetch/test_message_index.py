@@ -0,0 +1,175 @@
+"""
+Tests for message_index.py module.
+Tests MessageIndex persistence and GmailFetcher skip-existing downloads.
+"""
+
+import base64
+import threading
+from unittest import mock
+
+import pytest
+
+from gmail_assistant.core.fetch.gmail_assistant import GmailFetcher
+from gmail_assistant.core.fetch.message_index import MessageIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Create a message index inside a temporary backup directory."""
+    index = MessageIndex.for_output_dir(tmp_path)
+    yield index
+    index.close()
+
+
+def write_file(tmp_path, name, content='data'):
+    path = tmp_path / name
+    path.write_text(content)
+    return path
+
+
+class TestMessageIndex:
+    """Tests for MessageIndex lookups and records."""
+
+    def test_stored_in_output_dir(self, index, tmp_path):
+        assert index.db_path == tmp_path / MessageIndex.FILENAME
+        assert index.db_path.exists()
+
+    def test_filter_new_preserves_order(self, index, tmp_path):
+        index.record('b', write_file(tmp_path, 'b.eml'), 'data')
+
+        assert index.filter_new(['c', 'b', 'a', 'b']) == ['c', 'a']
+
+    def test_record_and_lookup(self, index, tmp_path):
+        path = write_file(tmp_path, 'a.eml')
+        index.record('a', path, 'eml content', 'md content')
+
+        entries = index.lookup(['a', 'missing'])
+
+        assert entries == {
+            'a': (str(path), MessageIndex.content_hash('eml content', 'md content'))
+        }
+
+    def test_deleted_file_downloaded_again(self, index, tmp_path):
+        path = write_file(tmp_path, 'a.eml')
+        index.record('a', path, 'data')
+        path.unlink()
+
+        assert index.known_ids(['a']) == set()
+
+    def test_verify_files_disabled(self, tmp_path):
+        with MessageIndex.for_output_dir(tmp_path, verify_files=False) as index:
+            index.record('a', tmp_path / 'never-written.eml', 'data')
+            assert index.known_ids(['a']) == {'a'}
+
+    def test_lookup_many_ids(self, index, tmp_path):
+        path = write_file(tmp_path, 'shared.eml')
+        ids = [f'id{i}' for i in range(MessageIndex.LOOKUP_CHUNK_SIZE * 2 + 5)]
+        for message_id in ids[::3]:
+            index.record(message_id, path, message_id)
+
+        assert index.known_ids(ids) == set(ids[::3])
+
+    def test_persists_across_instances(self, tmp_path):
+        path = write_file(tmp_path, 'a.eml')
+        with MessageIndex.for_output_dir(tmp_path, commit_every=1000) as index:
+            index.record('a', path, 'data')
+
+        with MessageIndex.for_output_dir(tmp_path) as reopened:
+            assert len(reopened) == 1
+            assert reopened.filter_new(['a', 'b']) == ['b']
+
+    def test_forget(self, index, tmp_path):
+        index.record('a', write_file(tmp_path, 'a.eml'), 'data')
+
+        assert index.forget(['a', 'missing']) == 1
+        assert len(index) == 0
+
+    def test_concurrent_records(self, index, tmp_path):
+        path = write_file(tmp_path, 'a.eml')
+
+        def record_range(start):
+            for i in range(start, start + 50):
+                index.record(f'id{i}', path, str(i))
+
+        threads = [threading.Thread(target=record_range, args=(n * 50,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(index) == 200
+
+
+def _make_message(msg_id):
+    body = base64.urlsafe_b64encode(f"Body of {msg_id}".encode()).decode()
+    return {
+        'id': msg_id,
+        'threadId': f"thread_{msg_id}",
+        'labelIds': ['INBOX'],
+        'payload': {
+            'mimeType': 'text/plain',
+            'headers': [
+                {'name': 'From', 'value': 'sender@example.com'},
+                {'name': 'Subject', 'value': f"Subject {msg_id}"},
+                {'name': 'Date', 'value': 'Mon, 15 Jan 2024 10:30:00 +0000'},
+            ],
+            'body': {'data': body},
+        },
+    }
+
+
+@pytest.fixture
+def fetcher():
+    """Create GmailFetcher with a mocked service and message lookups."""
+    with mock.patch('gmail_assistant.core.fetch.gmail_assistant.ReadOnlyGmailAuth'):
+        fetcher = GmailFetcher()
+    fetcher.auth.service = mock.Mock()
+    fetcher.search_messages = mock.Mock(return_value=['m1', 'm2', 'm3'])
+    fetcher.get_message_details = mock.Mock(side_effect=_make_message)
+    return fetcher
+
+
+class TestDownloadEmailsSkipExisting:
+    """Tests for GmailFetcher.download_emails(skip_existing=...)."""
+
+    def test_second_run_fetches_nothing(self, fetcher, tmp_path):
+        fetcher.download_emails(output_dir=str(tmp_path), format_type='eml')
+        assert fetcher.get_message_details.call_count == 3
+
+        fetcher.download_emails(output_dir=str(tmp_path), format_type='eml')
+
+        assert fetcher.get_message_details.call_count == 3
+        with MessageIndex.for_output_dir(tmp_path) as index:
+            assert len(index) == 3
+
+    def test_only_new_messages_fetched(self, fetcher, tmp_path):
+        fetcher.download_emails(output_dir=str(tmp_path), format_type='eml')
+        fetcher.search_messages.return_value = ['m4', 'm1', 'm2', 'm3']
+        fetcher.get_message_details.reset_mock()
+
+        fetcher.download_emails(output_dir=str(tmp_path), format_type='eml')
+
+        fetched = [c.args[0] for c in fetcher.get_message_details.call_args_list]
+        assert fetched == ['m4']
+
+    def test_redownload_ignores_index(self, fetcher, tmp_path):
+        fetcher.download_emails(output_dir=str(tmp_path), format_type='eml')
+
+        fetcher.download_emails(output_dir=str(tmp_path), format_type='eml',
+                                skip_existing=False)
+
+        assert fetcher.get_message_details.call_count == 6
+
+    def test_records_hash_of_written_content(self, fetcher, tmp_path):
+        fetcher.search_messages.return_value = ['m1']
+
+        fetcher.download_emails(output_dir=str(tmp_path), format_type='both',
+                                organize_by='none')
+
+        with MessageIndex.for_output_dir(tmp_path) as index:
+            path, digest = index.lookup(['m1'])['m1']
+        eml_path = tmp_path / path
+        md_path = eml_path.with_suffix('.md')
+        assert eml_path.suffix == '.eml'
+        assert digest == MessageIndex.content_hash(eml_path.read_text(encoding='utf-8'),
+                                                   md_path.read_text(encoding='utf-8'))
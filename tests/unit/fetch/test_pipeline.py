@@ -0,0 +1,230 @@
+"""
+Tests for pipeline.py module.
+Tests DownloadPipeline stage coordination and GmailFetcher integration.
+"""
+
+import base64
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from gmail_assistant.core.fetch.gmail_assistant import GmailFetcher
+from gmail_assistant.core.fetch.message_index import MessageIndex
+from gmail_assistant.core.fetch.pipeline import (
+    DownloadPipeline,
+    PipelineConfig,
+    PipelineStats,
+)
+
+
+def _make_message(msg_id: str) -> dict:
+    """Build a minimal full-format Gmail message."""
+    body = base64.urlsafe_b64encode(f"Body of {msg_id}".encode()).decode()
+    return {
+        'id': msg_id,
+        'threadId': f"thread_{msg_id}",
+        'labelIds': ['INBOX'],
+        'payload': {
+            'mimeType': 'text/plain',
+            'headers': [
+                {'name': 'From', 'value': 'sender@example.com'},
+                {'name': 'Subject', 'value': f"Subject {msg_id}"},
+                {'name': 'Date', 'value': 'Mon, 15 Jan 2024 10:30:00 +0000'},
+            ],
+            'body': {'data': body},
+        },
+    }
+
+
+class FakeBatch:
+    """Stand-in for BatchHttpRequest that answers from a message table."""
+
+    def __init__(self, messages: dict, failing: set):
+        self._messages = messages
+        self._failing = failing
+        self._requests = []
+
+    def add(self, request, callback):
+        self._requests.append((request, callback))
+
+    def execute(self):
+        for request, callback in self._requests:
+            msg_id = request.msg_id
+            if msg_id in self._failing or msg_id not in self._messages:
+                callback(msg_id, None, Exception(f"404 {msg_id}"))
+            else:
+                callback(msg_id, self._messages[msg_id], None)
+
+
+class FakeService:
+    """Gmail service exposing messages().get and new_batch_http_request."""
+
+    def __init__(self, messages: dict, failing: set | None = None):
+        self._messages = messages
+        self._failing = failing or set()
+        self.batches = 0
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def get(self, userId, id, format='full', **kwargs):
+        return mock.Mock(msg_id=id)
+
+    def new_batch_http_request(self):
+        self.batches += 1
+        return FakeBatch(self._messages, self._failing)
+
+
+@pytest.fixture
+def fetcher():
+    """Create GmailFetcher without real authentication."""
+    with mock.patch('gmail_assistant.core.fetch.gmail_assistant.ReadOnlyGmailAuth'):
+        return GmailFetcher()
+
+
+class TestPipelineConfig:
+    """Tests for PipelineConfig validation."""
+
+    def test_defaults(self):
+        config = PipelineConfig()
+        assert config.fetch_batch_size == 50
+        assert config.render_workers >= 1
+
+    def test_batch_size_above_api_limit_rejected(self):
+        with pytest.raises(ValueError):
+            PipelineConfig(fetch_batch_size=101)
+
+    def test_zero_workers_rejected(self):
+        with pytest.raises(ValueError):
+            PipelineConfig(write_workers=0)
+
+
+class TestPipelineStats:
+    """Tests for PipelineStats."""
+
+    def test_messages_per_second(self):
+        stats = PipelineStats(downloaded=50, elapsed_seconds=2.0)
+        assert stats.messages_per_second == 25.0
+
+    def test_messages_per_second_zero_elapsed(self):
+        assert PipelineStats(downloaded=5).messages_per_second == 0.0
+
+
+class TestDownloadPipeline:
+    """Tests for DownloadPipeline.run."""
+
+    def test_downloads_all_messages(self, fetcher, tmp_path):
+        ids = [f"msg{i}" for i in range(25)]
+        service = FakeService({i: _make_message(i) for i in ids})
+        fetcher.auth.service = service
+
+        config = PipelineConfig(fetch_batch_size=10, render_workers=3,
+                                write_workers=2, queue_size=2)
+        stats = DownloadPipeline(fetcher, config).run(ids, str(tmp_path), 'both', 'date')
+
+        assert stats.downloaded == 25
+        assert stats.errors == 0
+        assert service.batches == 3
+        assert len(list(tmp_path.rglob('*.eml'))) == 25
+        assert len(list(tmp_path.rglob('*.md'))) == 25
+
+    def test_matches_sequential_layout(self, fetcher, tmp_path):
+        ids = ['abc', 'def']
+        messages = {i: _make_message(i) for i in ids}
+        fetcher.auth.service = FakeService(messages)
+
+        DownloadPipeline(fetcher, PipelineConfig()).run(
+            ids, str(tmp_path / 'pipe'), 'eml', 'date'
+        )
+        for msg_id in ids:
+            sub_dir, base = fetcher._plan_email_output(
+                messages[msg_id], str(tmp_path / 'seq'), 'date'
+            )
+            fetcher._save_email_files(messages[msg_id], sub_dir, base, 'eml')
+
+        pipe = sorted(p.relative_to(tmp_path / 'pipe') for p in (tmp_path / 'pipe').rglob('*.eml'))
+        seq = sorted(p.relative_to(tmp_path / 'seq') for p in (tmp_path / 'seq').rglob('*.eml'))
+        assert pipe == seq
+        assert pipe[0].parts[:2] == ('2024', '01')
+
+    def test_failed_fetches_counted_as_errors(self, fetcher, tmp_path):
+        ids = ['ok1', 'bad', 'ok2']
+        fetcher.auth.service = FakeService(
+            {i: _make_message(i) for i in ids}, failing={'bad'}
+        )
+
+        stats = DownloadPipeline(fetcher).run(ids, str(tmp_path), 'eml', 'none')
+
+        assert stats.downloaded == 2
+        assert stats.errors == 1
+        assert stats.fetched == 2
+
+    def test_write_errors_counted(self, fetcher, tmp_path):
+        ids = ['a', 'b']
+        fetcher.auth.service = FakeService({i: _make_message(i) for i in ids})
+
+        with mock.patch.object(fetcher, 'atomic_write', side_effect=OSError("disk full")):
+            stats = DownloadPipeline(fetcher).run(ids, str(tmp_path), 'eml', 'none')
+
+        assert stats.downloaded == 0
+        assert stats.errors == 2
+
+    def test_records_written_messages_in_index(self, fetcher, tmp_path):
+        ids = ['ok1', 'bad', 'ok2']
+        fetcher.auth.service = FakeService(
+            {i: _make_message(i) for i in ids}, failing={'bad'}
+        )
+
+        with MessageIndex.for_output_dir(tmp_path) as index:
+            DownloadPipeline(fetcher, index=index).run(ids, str(tmp_path), 'eml', 'none')
+            assert index.filter_new(ids) == ['bad']
+
+    def test_empty_ids(self, fetcher, tmp_path):
+        stats = DownloadPipeline(fetcher).run([], str(tmp_path))
+        assert stats.total == 0
+        assert stats.downloaded == 0
+
+    def test_multiple_fetch_workers_require_factory(self, fetcher):
+        pipeline = DownloadPipeline(fetcher, PipelineConfig(fetch_workers=4))
+        assert pipeline._fetch_workers == 1
+
+    def test_service_factory_enables_parallel_fetch(self, fetcher, tmp_path):
+        ids = [f"m{i}" for i in range(12)]
+        messages = {i: _make_message(i) for i in ids}
+        factory = mock.Mock(side_effect=lambda: FakeService(messages))
+
+        stats = DownloadPipeline(
+            fetcher,
+            PipelineConfig(fetch_batch_size=3, fetch_workers=2),
+            service_factory=factory
+        ).run(ids, str(tmp_path), 'eml', 'none')
+
+        assert factory.call_count == 2
+        assert stats.downloaded == 12
+
+
+class TestDownloadEmailsPipelineMode:
+    """Tests for GmailFetcher.download_emails(pipeline=...)."""
+
+    def test_download_emails_uses_pipeline(self, fetcher, tmp_path):
+        ids = ['p1', 'p2', 'p3']
+        service = FakeService({i: _make_message(i) for i in ids})
+        service.list = mock.Mock(return_value=mock.Mock(
+            execute=mock.Mock(return_value={'messages': [{'id': i} for i in ids]})
+        ))
+        fetcher.auth.service = service
+
+        fetcher.download_emails(
+            output_dir=str(tmp_path),
+            format_type='markdown',
+            organize_by='none',
+            pipeline=PipelineConfig(fetch_batch_size=2)
+        )
+
+        md_files = list(Path(tmp_path).glob('*.md'))
+        assert len(md_files) == 3
+        assert service.batches == 2
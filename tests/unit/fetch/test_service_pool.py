@@ -0,0 +1,159 @@
+"""
+Tests for service_pool.py module.
+Tests GmailServicePool per-thread service creation and shared credentials.
+"""
+
+import threading
+from unittest import mock
+
+import pytest
+
+from gmail_assistant.core.fetch.service_pool import GmailServicePool
+
+
+@pytest.fixture
+def credentials():
+    """Create valid mock OAuth credentials."""
+    creds = mock.MagicMock()
+    creds.valid = True
+    return creds
+
+
+@pytest.fixture
+def credential_manager(credentials):
+    """Create credential manager returning shared credentials."""
+    manager = mock.MagicMock()
+    manager.get_credentials.return_value = credentials
+    return manager
+
+
+@pytest.fixture
+def pool(credential_manager):
+    """Create service pool with cheap service construction."""
+    pool = GmailServicePool(credential_manager)
+    with mock.patch(
+        'gmail_assistant.core.fetch.service_pool.build_from_document',
+        side_effect=lambda doc, http: mock.MagicMock(http=http)
+    ):
+        yield pool
+    pool.close()
+
+
+class TestGetService:
+    """Tests for GmailServicePool.get_service."""
+
+    def test_same_thread_reuses_service(self, pool):
+        first = pool.get_service()
+        second = pool.get_service()
+
+        assert first is second
+        stats = pool.get_stats()
+        assert stats['pool_size'] == 1
+        assert stats['checkouts'] == 2
+        assert stats['reused'] == 1
+
+    def test_each_thread_gets_own_service(self, pool):
+        services = {}
+        barrier = threading.Barrier(4)
+
+        def worker(n):
+            barrier.wait()
+            services[n] = pool.get_service()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len({id(s) for s in services.values()}) == 4
+        assert len({id(s.http) for s in services.values()}) == 4
+        assert pool.get_stats()['pool_size'] == 4
+
+    def test_services_share_credentials(self, pool, credentials):
+        service = pool.get_service()
+        assert service.http.credentials is credentials
+
+    def test_not_authenticated_returns_none(self, credential_manager):
+        credential_manager.get_credentials.return_value = None
+        pool = GmailServicePool(credential_manager)
+
+        assert pool.get_service() is None
+        assert pool.get_stats()['pool_size'] == 0
+
+    def test_discovery_document_parsed_once(self, pool):
+        with mock.patch(
+            'gmail_assistant.core.fetch.service_pool.discovery_cache.get_static_doc',
+            return_value='{"name": "gmail"}'
+        ) as get_doc:
+            threads = [threading.Thread(target=pool.get_service) for _ in range(3)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        assert get_doc.call_count == 1
+
+
+class TestTokenRefresh:
+    """Tests for shared token refresh."""
+
+    def test_expired_credentials_refreshed_once(self, pool, credentials):
+        credentials.valid = False
+
+        def refresh(request):
+            credentials.valid = True
+
+        credentials.refresh.side_effect = refresh
+
+        threads = [threading.Thread(target=pool.get_service) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert credentials.refresh.call_count == 1
+        assert pool.get_stats()['token_refreshes'] == 1
+
+
+class TestClose:
+    """Tests for GmailServicePool.close."""
+
+    def test_close_releases_transports(self, pool):
+        service = pool.get_service()
+        with mock.patch.object(type(service.http), 'close') as close:
+            pool.close()
+
+        close.assert_called_once()
+        assert pool.get_stats()['pool_size'] == 0
+
+    def test_service_rebuilt_after_close(self, pool):
+        first = pool.get_service()
+        pool.close()
+        assert pool.get_service() is not first
+
+
+class TestAsyncFetcherIntegration:
+    """Tests for AsyncGmailFetcher use of the pool."""
+
+    def test_service_call_uses_pooled_service(self):
+        with mock.patch('gmail_assistant.core.fetch.async_fetcher.SecureCredentialManager'):
+            from gmail_assistant.core.fetch.async_fetcher import AsyncGmailFetcher
+
+            fetcher = AsyncGmailFetcher()
+            pooled = mock.MagicMock()
+            fetcher.service_pool = mock.MagicMock()
+            fetcher.service_pool.get_service.return_value = pooled
+
+            result = fetcher._sync_service_call(lambda service, x: (service, x), 7)
+
+        assert result == (pooled, 7)
+
+    def test_performance_stats_include_pool(self):
+        with mock.patch('gmail_assistant.core.fetch.async_fetcher.SecureCredentialManager'):
+            from gmail_assistant.core.fetch.async_fetcher import AsyncGmailFetcher
+
+            fetcher = AsyncGmailFetcher()
+            stats = fetcher.get_performance_stats()
+
+        assert stats['service_pool']['pool_size'] == 0
@@ -0,0 +1,398 @@
+"""
+Tests for watch.py module.
+Tests MailboxWatcher against a local fake Gmail server and the watch handlers.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from gmail_assistant.core.fetch.history_sync import (
+    HistorySyncClient,
+    LabelChange,
+    SyncStateManager,
+)
+from gmail_assistant.core.fetch.watch import (
+    AdaptivePollInterval,
+    DatabaseWatchHandler,
+    MailboxWatcher,
+    WatchConfig,
+    WatchHandler,
+)
+from gmail_assistant.core.schemas import Email
+
+
+class FakeGmailServer:
+    """Local Gmail REST server holding a mailbox and its history."""
+
+    def __init__(self, history_page_size=2):
+        self.history_page_size = history_page_size
+        self.history_id = 100
+        self.expired_before = 0
+        self.fail_history_pages = set()  # page offsets answered with a 500
+        self.messages = {}
+        self.history = []
+        self.requests = []
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server.handle_get(self)
+
+            def do_POST(self):
+                server.handle_batch(self)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/"
+        self._thread = threading.Thread(target=self.httpd.serve_forever,
+                                        kwargs={'poll_interval': 0.05}, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def service(self):
+        """Build a googleapiclient Gmail service pointed at this server."""
+        import httplib2
+        from googleapiclient import discovery_cache
+        from googleapiclient.discovery import build_from_document
+
+        doc = json.loads(discovery_cache.get_static_doc('gmail', 'v1'))
+        doc['rootUrl'] = self.url
+        return build_from_document(doc, http=httplib2.Http())
+
+    # Mailbox changes
+
+    def _record(self, **change):
+        with self._lock:
+            self.history_id += 1
+            self.history.append({'id': str(self.history_id), **change})
+
+    def deliver(self, message_id, subject='Hello', sender='friend@example.com'):
+        self.messages[message_id] = {
+            'id': message_id,
+            'threadId': f"t-{message_id}",
+            'labelIds': ['INBOX', 'UNREAD'],
+            'snippet': f"About {subject}",
+            'historyId': str(self.history_id + 1),
+            'payload': {'headers': [
+                {'name': 'From', 'value': sender},
+                {'name': 'To', 'value': 'me@example.com'},
+                {'name': 'Subject', 'value': subject},
+                {'name': 'Date', 'value': 'Mon, 12 Oct 2026 10:00:00 +0000'},
+            ]},
+        }
+        self._record(messagesAdded=[{'message': {'id': message_id, 'labelIds': ['INBOX']}}])
+
+    def delete(self, message_id):
+        self.messages.pop(message_id, None)
+        self._record(messagesDeleted=[{'message': {'id': message_id}}])
+
+    def add_label(self, message_id, label):
+        self._record(labelsAdded=[{'message': {'id': message_id}, 'labelIds': [label]}])
+
+    # HTTP
+
+    def _send_json(self, handler, status, body):
+        data = json.dumps(body).encode()
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def handle_get(self, handler):
+        url = urlparse(handler.path)
+        params = parse_qs(url.query)
+        self.requests.append(url.path)
+
+        if url.path == '/gmail/v1/users/me/profile':
+            return self._send_json(handler, 200, {
+                'emailAddress': 'me@example.com', 'historyId': str(self.history_id)
+            })
+        if url.path == '/gmail/v1/users/me/history':
+            start = int(params['startHistoryId'][0])
+            offset = int(params.get('pageToken', ['0'])[0])
+            if start < self.expired_before:
+                return self._send_json(handler, 404, {'error': {'message': 'Not Found'}})
+            if offset in self.fail_history_pages:
+                return self._send_json(handler, 500, {'error': {'message': 'Backend Error'}})
+            records = [r for r in self.history if int(r['id']) > start]
+            page = records[offset:offset + self.history_page_size]
+            body = {'history': page, 'historyId': str(self.history_id)}
+            if offset + self.history_page_size < len(records):
+                body['nextPageToken'] = str(offset + self.history_page_size)
+            return self._send_json(handler, 200, body)
+        return self._send_json(handler, 404, {'error': {'message': 'Not Found'}})
+
+    def handle_batch(self, handler):
+        self.requests.append(urlparse(handler.path).path)
+        body = handler.rfile.read(int(handler.headers['Content-Length'])).decode()
+
+        parts = []
+        for match in re.finditer(r'Content-ID: <([^>]+)>.*?GET (\S+) HTTP', body, re.S):
+            content_id, path = match.groups()
+            message_id = urlparse(path).path.rsplit('/', 1)[-1]
+            message = self.messages.get(message_id)
+            status = '200 OK' if message else '404 Not Found'
+            payload = json.dumps(message or {'error': {'message': 'Not Found'}})
+            parts.append(
+                f"--batch_resp\r\nContent-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n\r\n{payload}\r\n"
+            )
+        data = (''.join(parts) + '--batch_resp--\r\n').encode()
+
+        handler.send_response(200)
+        handler.send_header('Content-Type', 'multipart/mixed; boundary=batch_resp')
+        handler.send_header('Content-Length', str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+
+class RecordingHandler(WatchHandler):
+    """Watch handler that records every hook call."""
+
+    def __init__(self):
+        self.added = []
+        self.deleted = []
+        self.label_changes = []
+        self.completed = []
+        self.closed = False
+
+    def on_messages_added(self, emails):
+        self.added.extend(email.gmail_id for email in emails)
+
+    def on_messages_deleted(self, message_ids):
+        self.deleted.extend(message_ids)
+
+    def on_labels_changed(self, changes):
+        self.label_changes.extend((c.message_id, c.added_labels) for c in changes)
+
+    def on_sync_complete(self, history_id):
+        self.completed.append(history_id)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def gmail():
+    """Running fake Gmail server."""
+    server = FakeGmailServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def state():
+    """Sync state on an in-memory database."""
+    conn = sqlite3.connect(':memory:')
+    yield SyncStateManager(conn)
+    conn.close()
+
+
+def _watcher(gmail, state, handler, **config):
+    config.setdefault('coalesce_seconds', 0)
+    return MailboxWatcher(
+        HistorySyncClient(gmail.service()), state, handlers=[handler],
+        config=WatchConfig(**config), service_factory=gmail.service
+    )
+
+
+class TestAdaptivePollInterval:
+    """Tests for AdaptivePollInterval."""
+
+    def test_backs_off_when_idle_and_resets_on_change(self):
+        """Test idle polls lengthen the interval up to the maximum."""
+        interval = AdaptivePollInterval(5, 30, backoff=2)
+
+        assert [interval.record(False) for _ in range(4)] == [10, 20, 30, 30]
+        assert interval.record(True) == 5
+        assert interval.record_error() == 10
+
+
+class TestMailboxWatcher:
+    """Tests for MailboxWatcher against the fake Gmail server."""
+
+    def test_first_poll_baselines_at_current_history(self, gmail, state):
+        """Test a new watch starts from the mailbox's current history ID."""
+        gmail.deliver('old')
+        handler = RecordingHandler()
+
+        changed = _watcher(gmail, state, handler).poll_once()
+
+        assert changed is False
+        assert state.get_history_id() == gmail.history_id
+        assert handler.added == []
+
+    def test_applies_new_mail_and_changes(self, gmail, state):
+        """Test added, deleted and relabelled messages reach the handler."""
+        handler = RecordingHandler()
+        watcher = _watcher(gmail, state, handler)
+        watcher.poll_once()
+
+        for message_id in ('m1', 'm2', 'm3'):
+            gmail.deliver(message_id)
+        assert watcher.poll_once() is True
+        assert handler.added == ['m1', 'm2', 'm3']
+        assert state.get_history_id() == gmail.history_id
+
+        gmail.delete('m1')
+        gmail.add_label('m2', 'STARRED')
+        assert watcher.poll_once() is True
+
+        assert handler.deleted == ['m1']
+        assert handler.label_changes == [('m2', ['STARRED'])]
+        assert handler.completed == [gmail.history_id - 2, gmail.history_id]
+        assert (watcher.stats.syncs, watcher.stats.added) == (2, 3)
+
+    def test_idle_poll_only_checks_profile(self, gmail, state):
+        """Test no history is listed while the history ID is unchanged."""
+        watcher = _watcher(gmail, state, RecordingHandler())
+        watcher.poll_once()
+        gmail.requests.clear()
+
+        assert watcher.poll_once() is False
+        assert gmail.requests == ['/gmail/v1/users/me/profile']
+
+    def test_resumes_from_checkpoint_after_failure(self, gmail, state):
+        """Test a failed sync continues after the last applied page."""
+        handler = RecordingHandler()
+        watcher = _watcher(gmail, state, handler)
+        watcher.poll_once()
+        for message_id in ('m1', 'm2', 'm3', 'm4'):
+            gmail.deliver(message_id)
+        gmail.fail_history_pages.add(2)
+
+        with pytest.raises(RuntimeError):
+            watcher.poll_once()
+        assert handler.added == ['m1', 'm2']
+
+        gmail.fail_history_pages.clear()
+        assert watcher.poll_once() is True
+        assert handler.added == ['m1', 'm2', 'm3', 'm4']
+
+    def test_expired_history_rebaselines(self, gmail, state):
+        """Test an expired history ID restarts the watch from now."""
+        state.update_history_id(50)
+        gmail.expired_before = 90
+        gmail.deliver('m1')
+        watcher = _watcher(gmail, state, RecordingHandler())
+
+        assert watcher.poll_once() is True
+        assert watcher.stats.resets == 1
+        assert state.get_history_id() == gmail.history_id
+
+    def test_handler_error_resumes_instead_of_rebaselining(self, gmail, state):
+        """Test a ValueError from a handler is not taken for an expired history ID."""
+
+        class FailingHandler(RecordingHandler):
+            def __init__(self):
+                super().__init__()
+                self.fail = True
+
+            def on_messages_added(self, emails):
+                if self.fail:
+                    raise ValueError("bad row")
+                super().on_messages_added(emails)
+
+        handler = FailingHandler()
+        watcher = _watcher(gmail, state, handler)
+        watcher.poll_once()
+        start_id = state.get_history_id()
+        gmail.deliver('m1')
+
+        with pytest.raises(ValueError):
+            watcher.poll_once()
+        assert watcher.stats.resets == 0
+        assert state.get_history_id() == start_id
+
+        handler.fail = False
+        assert watcher.poll_once() is True
+        assert handler.added == ['m1']
+
+    def test_run_polls_until_limit_and_closes_handlers(self, gmail, state):
+        """Test run keeps polling after a failed poll and closes handlers."""
+        handler = RecordingHandler()
+        state.update_history_id(100)
+        gmail.deliver('m1')
+        gmail.fail_history_pages.add(0)
+        watcher = _watcher(gmail, state, handler, min_interval=0.01, max_interval=0.02)
+
+        stats = watcher.run(max_polls=2)
+
+        assert (stats.polls, stats.errors) == (2, 2)
+        assert handler.closed
+
+
+class TestDatabaseWatchHandler:
+    """Tests for DatabaseWatchHandler."""
+
+    @pytest.fixture
+    def importer(self, tmp_path):
+        """Connected email database importer."""
+        from gmail_assistant.core.processing.database import EmailDatabaseImporter
+
+        importer = EmailDatabaseImporter(str(tmp_path / 'emails.db'))
+        importer.connect_database()
+        yield importer
+        importer.close_database()
+
+    @staticmethod
+    def _email(gmail_id, sender='news@example.com'):
+        return Email(gmail_id=gmail_id, thread_id=f"t-{gmail_id}", subject='Weekly digest',
+                     sender=sender, date=datetime(2026, 10, 12), labels=['INBOX'],
+                     snippet='unsubscribe here')
+
+    def test_inserts_classifies_and_applies_changes(self, importer, tmp_path):
+        """Test the database follows adds, label changes and deletions."""
+        from gmail_assistant.core.processing.classifier import EmailClassifier
+
+        handler = DatabaseWatchHandler(importer, EmailClassifier(str(tmp_path / 'emails.db')))
+
+        handler.on_messages_added([self._email('g1'), self._email('g2')])
+        handler.on_sync_complete(200)
+        handler.on_labels_changed([LabelChange('g1', ['STARRED'], ['INBOX'], 201)])
+        handler.on_messages_deleted(['g2'])
+
+        rows = importer.conn.execute(
+            "SELECT gmail_id, year_month, labels, primary_category FROM emails"
+        ).fetchall()
+        assert [tuple(row)[:3] for row in rows] == [('g1', '2026-10', 'STARRED')]
+        assert rows[0]['primary_category'] is not None
+
+    def test_classifies_each_page_before_sync_completes(self, importer, tmp_path):
+        """Test added emails are classified with their page, not at the end of the sync."""
+        from gmail_assistant.core.processing.classifier import EmailClassifier
+
+        handler = DatabaseWatchHandler(importer, EmailClassifier(str(tmp_path / 'emails.db')))
+
+        handler.on_messages_added([self._email('g1')])
+
+        row = importer.conn.execute("SELECT primary_category FROM emails").fetchone()
+        assert row['primary_category'] is not None
+
+    def test_without_classifier_only_inserts(self, importer):
+        """Test classification is optional."""
+        handler = DatabaseWatchHandler(importer)
+
+        handler.on_messages_added([self._email('g1')])
+        handler.on_sync_complete(200)
+
+        row = importer.conn.execute(
+            "SELECT file_path, plain_text_content FROM emails"
+        ).fetchone()
+        assert tuple(row) == ('gmail:g1', 'unsubscribe here')
@@ -510,6 +510,89 @@ class TestMainParsingMethod:
         assert result['markdown'] in ["Fallback content", "*(Content could not be parsed)*", bad_html.strip()]
 
 
+# ==============================================================================
+# TestStrategySelection
+# ==============================================================================
+
+class TestStrategySelection:
+    """Test shared-parse, early-exit strategy selection."""
+
+    def _stub_strategies(self, parser, qualities):
+        """Replace strategy implementations with stubs returning fixed qualities."""
+        calls = []
+
+        def make(name, quality):
+            def run(context):
+                calls.append(name)
+                return f"# {name}", quality
+            return run
+
+        parser._strategy_methods.update(
+            {name: make(name, quality) for name, quality in qualities.items()}
+        )
+        parser.config["strategies"] = list(qualities)
+        return calls
+
+    def test_early_exit_at_threshold(self, parser, sample_html_simple):
+        """Test strategies stop once one reaches the quality threshold."""
+        parser.config["quality_threshold"] = 0.8
+        calls = self._stub_strategies(parser, {"html2text": 0.5, "smart": 0.9, "markdownify": 1.0})
+
+        result = parser.parse_email_content(html_content=sample_html_simple)
+
+        assert calls == ["html2text", "smart"]
+        assert result['strategy'] == "smart"
+        assert result['metadata']['early_exit'] is True
+
+    def test_no_threshold_tries_all(self, parser, sample_html_simple):
+        """Test a None threshold evaluates every strategy and keeps the best."""
+        parser.config["quality_threshold"] = None
+        calls = self._stub_strategies(parser, {"html2text": 0.5, "smart": 0.9, "markdownify": 0.7})
+
+        result = parser.parse_email_content(html_content=sample_html_simple)
+
+        assert len(calls) == 3
+        assert result['strategy'] == "smart"
+        assert result['metadata']['early_exit'] is False
+
+    def test_adaptive_ordering_by_sender_domain(self, parser, sample_html_simple):
+        """Test the best strategy for a sender domain is tried first next time."""
+        parser.config["quality_threshold"] = None
+        calls = self._stub_strategies(parser, {"html2text": 0.5, "smart": 0.6, "markdownify": 0.9})
+        parser.parse_email_content(html_content=sample_html_simple, sender="a@news.example.com")
+
+        calls.clear()
+        parser.config["quality_threshold"] = 0.8
+        result = parser.parse_email_content(html_content=sample_html_simple,
+                                            sender="b@news.example.com")
+
+        assert calls == ["markdownify"]
+        assert result['strategy'] == "markdownify"
+
+    def test_adaptive_ordering_disabled(self, parser, sample_html_simple):
+        """Test configured order is kept when adaptive ordering is off."""
+        parser.config.update({"quality_threshold": 0.8, "adaptive_ordering": False})
+        calls = self._stub_strategies(parser, {"html2text": 0.5, "markdownify": 0.9})
+        parser.parse_email_content(html_content=sample_html_simple)
+
+        calls.clear()
+        parser.parse_email_content(html_content=sample_html_simple)
+
+        assert calls == ["html2text", "markdownify"]
+
+    def test_html_parsed_once_for_detection_and_scoring(self, parser, sample_html_newsletter):
+        """Test the original HTML is not re-parsed per strategy."""
+        parser.config.update({"quality_threshold": None,
+                              "strategies": ["smart", "html2text", "markdownify"]})
+
+        with mock.patch('gmail_assistant.parsers.advanced_email_parser.BeautifulSoup',
+                        wraps=BeautifulSoup) as soup_cls:
+            parser.parse_email_content(html_content=sample_html_newsletter)
+
+        parsed = [call.args[0] for call in soup_cls.call_args_list]
+        assert parsed.count(sample_html_newsletter) == 2  # Shared soup + one clean_html
+
+
 # ==============================================================================
 # TestConfigurationLoading
 # ==============================================================================
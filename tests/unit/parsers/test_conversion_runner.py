@@ -0,0 +1,147 @@
+"""Tests for the parallel, incremental conversion runner."""
+from __future__ import annotations
+
+import os
+from functools import partial
+from pathlib import Path
+
+import pytest
+
+from gmail_assistant.parsers.conversion_runner import (
+    STATE_FILENAME,
+    ConversionRunner,
+    ConversionSummary,
+)
+
+
+def _upper_case(out_root: Path, source: Path) -> Path:
+    """Toy conversion: write the upper-cased source to out_root."""
+    if source.read_text() == 'fail':
+        raise ValueError('cannot convert')
+    output = out_root / f"{source.stem}.out"
+    output.write_text(source.read_text().upper())
+    return output
+
+
+@pytest.fixture
+def sources(tmp_path):
+    """Create a directory of source files."""
+    source_dir = tmp_path / 'src'
+    source_dir.mkdir()
+    paths = []
+    for i in range(5):
+        path = source_dir / f"file{i}.txt"
+        path.write_text(f"content {i}")
+        paths.append(path)
+    return source_dir, paths
+
+
+@pytest.fixture
+def out_root(tmp_path):
+    """Create the output root."""
+    root = tmp_path / 'out'
+    root.mkdir()
+    return root
+
+
+def _runner(out_root: Path, **kwargs) -> ConversionRunner:
+    kwargs.setdefault('workers', 1)
+    return ConversionRunner(partial(_upper_case, out_root), out_root, **kwargs)
+
+
+class TestConversionRunner:
+    """Tests for ConversionRunner."""
+
+    def test_converts_all_sources(self, sources, out_root):
+        """Test a first run converts every source and saves state."""
+        source_dir, paths = sources
+
+        summary = _runner(out_root).run(paths, base_dir=source_dir)
+
+        assert (summary.total, summary.converted, summary.skipped) == (5, 5, 0)
+        assert (out_root / 'file0.out').read_text() == 'CONTENT 0'
+        assert (out_root / STATE_FILENAME).exists()
+
+    def test_rerun_skips_unchanged(self, sources, out_root):
+        """Test a second run only converts modified sources."""
+        source_dir, paths = sources
+        _runner(out_root).run(paths, base_dir=source_dir)
+
+        paths[2].write_text('changed content')
+        summary = _runner(out_root).run(paths, base_dir=source_dir)
+
+        assert (summary.converted, summary.skipped) == (1, 4)
+        assert (out_root / 'file2.out').read_text() == 'CHANGED CONTENT'
+
+    def test_touched_but_identical_is_skipped(self, sources, out_root):
+        """Test a new mtime with identical content is detected by hash."""
+        source_dir, paths = sources
+        _runner(out_root).run(paths, base_dir=source_dir)
+
+        stat = paths[0].stat()
+        os.utime(paths[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        summary = _runner(out_root).run(paths, base_dir=source_dir)
+
+        assert summary.skipped == 5
+
+    def test_missing_output_is_reconverted(self, sources, out_root):
+        """Test deleting an output forces its source to be converted again."""
+        source_dir, paths = sources
+        _runner(out_root).run(paths, base_dir=source_dir)
+
+        (out_root / 'file1.out').unlink()
+        summary = _runner(out_root).run(paths, base_dir=source_dir)
+
+        assert summary.converted == 1
+        assert (out_root / 'file1.out').exists()
+
+    def test_force_converts_everything(self, sources, out_root):
+        """Test force ignores recorded state."""
+        source_dir, paths = sources
+        _runner(out_root).run(paths, base_dir=source_dir)
+
+        summary = _runner(out_root, force=True).run(paths, base_dir=source_dir)
+
+        assert summary.converted == 5
+
+    def test_expected_output_without_state(self, sources, out_root):
+        """Test outputs newer than their source count as up to date on a first run."""
+        source_dir, paths = sources
+        for path in paths:
+            output = out_root / f"{path.stem}.out"
+            output.write_text('existing')
+
+        runner = _runner(out_root, expected_output=lambda p: out_root / f"{p.stem}.out")
+        summary = runner.run(paths, base_dir=source_dir)
+
+        assert summary.skipped == 5
+        assert (out_root / 'file0.out').read_text() == 'existing'
+
+    def test_failures_collected(self, sources, out_root):
+        """Test failures land in the summary and are retried next run."""
+        source_dir, paths = sources
+        paths[3].write_text('fail')
+
+        summary = _runner(out_root).run(paths, base_dir=source_dir)
+        assert summary.failed == 1
+        assert summary.failures[0].source == str(paths[3])
+        assert 'ValueError: cannot convert' in summary.failures[0].error
+        assert 'FAILED' in summary.format()
+
+        rerun = _runner(out_root).run(paths, base_dir=source_dir)
+        assert (rerun.skipped, rerun.failed) == (4, 1)
+
+    def test_parallel_with_progress(self, sources, out_root):
+        """Test chunks run in worker processes and report progress."""
+        source_dir, paths = sources
+        seen: list[int] = []
+
+        def record(summary: ConversionSummary) -> None:
+            seen.append(summary.done)
+
+        runner = _runner(out_root, workers=2, chunk_size=2, progress=record)
+        summary = runner.run(paths, base_dir=source_dir)
+
+        assert summary.converted == 5
+        assert seen == [2, 4, 5]
+        assert all((out_root / f"file{i}.out").exists() for i in range(5))
@@ -612,6 +612,43 @@ class TestDirectoryConversion:
         expected_output = output_dir / "2024" / "01" / "email.md"
         assert expected_output.exists()
 
+    def test_convert_directory_skips_unchanged(self, converter, tmp_path):
+        """Test a rerun only converts EML files that changed."""
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        for i in range(3):
+            (input_dir / f"email{i}.eml").write_bytes(_create_gmail_api_eml(
+                html_content=f'<html><body>Email {i}</body></html>'
+            ))
+        output_dir = tmp_path / "output"
+        converter.convert_directory(input_dir, output_dir, workers=1)
+
+        (input_dir / "email1.eml").write_bytes(_create_gmail_api_eml(
+            html_content='<html><body>Edited email</body></html>'
+        ))
+        stats = converter.convert_directory(input_dir, output_dir, workers=1)
+
+        assert stats['success'] == 1
+        assert stats['skipped'] == 2
+        assert 'Edited email' in (output_dir / "email1.md").read_text(encoding='utf-8')
+
+    def test_convert_directory_parallel(self, converter, tmp_path):
+        """Test conversion in worker processes collects failures."""
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        for i in range(40):
+            (input_dir / f"email{i:02d}.eml").write_bytes(_create_gmail_api_eml(
+                html_content=f'<html><body>Email {i}</body></html>'
+            ))
+        (input_dir / "empty.eml").write_bytes(b"")
+
+        stats = converter.convert_directory(input_dir, tmp_path / "output", workers=2)
+
+        assert stats['total'] == 41
+        assert stats['success'] == 40
+        assert stats['failed'] == 1
+        assert stats['failures'][0].source.endswith("empty.eml")
+
 
 # ==============================================================================
 # TestEncodingHandling
@@ -550,3 +550,148 @@ class TestClassifyAllEmails:
         result = classifier.classify_all_emails()
 
         assert result is True
+
+    def _make_db(self, tmp_path, count):
+        """Create an emails table with classification columns and count rows."""
+        db_path = tmp_path / "test.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE emails (
+                id INTEGER PRIMARY KEY,
+                sender TEXT,
+                subject TEXT,
+                plain_text_content TEXT,
+                labels TEXT,
+                parsed_date TEXT
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO emails (sender, subject, plain_text_content, labels) VALUES (?, ?, ?, ?)",
+            [
+                (f"news{i % 3}@example.com", f"Weekly digest {i}", "unsubscribe", "INBOX")
+                for i in range(count)
+            ]
+        )
+        conn.commit()
+        conn.close()
+        return db_path
+
+    def test_classify_all_covers_every_row(self, tmp_path):
+        """Keyset pagination must not skip rows as earlier chunks get classified."""
+        from gmail_assistant.core.processing.classifier import EmailClassifier
+
+        db_path = self._make_db(tmp_path, 25)
+        classifier = EmailClassifier(str(db_path))
+        classifier.create_classification_schema()
+
+        assert classifier.classify_all_emails(batch_size=4) is True
+
+        conn = sqlite3.connect(db_path)
+        remaining = conn.execute(
+            "SELECT COUNT(*) FROM emails WHERE primary_category IS NULL"
+        ).fetchone()[0]
+        frequency = conn.execute(
+            "SELECT sender_frequency FROM emails WHERE sender = 'news0@example.com'"
+        ).fetchone()[0]
+        conn.close()
+
+        assert remaining == 0
+        assert frequency == 9
+        stats = classifier.last_run_stats
+        assert stats.processed == 25
+        assert stats.chunks == 7
+
+    def test_classify_all_computes_sender_stats_once(self, tmp_path):
+        """Sender statistics should be gathered once per run, not per chunk."""
+        from gmail_assistant.core.processing.classifier import EmailClassifier
+
+        db_path = self._make_db(tmp_path, 10)
+        classifier = EmailClassifier(str(db_path))
+        classifier.create_classification_schema()
+
+        with mock.patch.object(
+            classifier, 'analyze_sender_patterns',
+            wraps=classifier.analyze_sender_patterns
+        ) as analyze:
+            classifier.classify_all_emails(batch_size=3)
+
+        assert analyze.call_count == 1
+
+    def test_classify_all_skips_past_failed_rows(self, tmp_path):
+        """A row that fails to classify is counted and does not stall the run."""
+        from gmail_assistant.core.processing.classifier import EmailClassifier
+
+        db_path = self._make_db(tmp_path, 5)
+        classifier = EmailClassifier(str(db_path))
+        classifier.create_classification_schema()
+
+        original = classifier.classify_by_subject
+
+        def flaky(subject):
+            if subject.endswith(' 2'):
+                raise ValueError("bad subject")
+            return original(subject)
+
+        with mock.patch.object(classifier, 'classify_by_subject', side_effect=flaky):
+            result = classifier.classify_all_emails(batch_size=2)
+
+        assert result is False
+        assert classifier.last_run_stats.processed == 4
+        assert classifier.last_run_stats.errors == 1
+
+
+class TestClassifyGmailIds:
+    """Tests for classify_gmail_ids method."""
+
+    def test_classifies_only_given_ids(self, tmp_path):
+        """Test only the requested unclassified emails are classified."""
+        from gmail_assistant.core.processing.classifier import EmailClassifier
+
+        db_path = tmp_path / "test.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE emails (
+                id INTEGER PRIMARY KEY,
+                gmail_id TEXT,
+                sender TEXT,
+                subject TEXT,
+                plain_text_content TEXT,
+                labels TEXT,
+                parsed_date TEXT
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO emails (gmail_id, sender, subject, plain_text_content, labels) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(f"g{i}", "news@example.com", f"Digest {i}", "unsubscribe", "INBOX")
+             for i in range(3)]
+        )
+        conn.commit()
+
+        classifier = EmailClassifier(str(db_path))
+        classifier.create_classification_schema()
+        classified, errors = classifier.classify_gmail_ids(conn, ['g0', 'g2', 'missing'],
+                                                           sender_stats={}, chunk_size=2)
+
+        categorized = conn.execute(
+            "SELECT gmail_id FROM emails WHERE primary_category IS NOT NULL ORDER BY gmail_id"
+        ).fetchall()
+        conn.close()
+
+        assert (classified, errors) == (2, 0)
+        assert [row[0] for row in categorized] == ['g0', 'g2']
+
+
+class TestClassificationRunStats:
+    """Tests for ClassificationRunStats."""
+
+    def test_rows_per_second(self):
+        from gmail_assistant.core.processing.classifier import ClassificationRunStats
+
+        stats = ClassificationRunStats(processed=500, elapsed_seconds=2.0)
+        assert stats.rows_per_second == 250.0
+
+    def test_rows_per_second_zero_elapsed(self):
+        from gmail_assistant.core.processing.classifier import ClassificationRunStats
+
+        assert ClassificationRunStats(processed=5).rows_per_second == 0.0
@@ -360,6 +360,112 @@ class TestImportAllMonthlyFiles:
         importer.close_database()
 
 
+def write_month(json_folder: Path, year_month: str, count: int, prefix: str = "") -> Path:
+    """Write a monthly JSON file with count emails."""
+    json_folder.mkdir(exist_ok=True)
+    json_file = json_folder / f"{year_month}_emails.json"
+    json_file.write_text(json.dumps({
+        "year_month": year_month,
+        "emails": [
+            {
+                "filename": f"{prefix}{i}.md",
+                "file_path": f"/archive/{year_month}/{prefix}{i}.md",
+                "gmail_id": f"{year_month}-{prefix}{i}",
+                "year_month": year_month,
+                "sender": "sender@example.com",
+                "subject": f"Invoice {i}",
+                "message_content": f"Quarterly report {i}",
+                "extraction_timestamp": "2024-01-15"
+            }
+            for i in range(count)
+        ]
+    }))
+    return json_file
+
+
+class TestBulkImport:
+    """Tests for executemany import and bulk-load mode."""
+
+    @pytest.fixture
+    def importer(self, tmp_path):
+        """Create connected importer with schema."""
+        from gmail_assistant.core.processing.database import EmailDatabaseImporter
+
+        importer = EmailDatabaseImporter(str(tmp_path / "test.db"), str(tmp_path / "json"))
+        importer.connect_database()
+        importer.create_database_schema()
+        yield importer
+        importer.close_database()
+
+    def schema_objects(self, importer):
+        return {row[0] for row in importer.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger') "
+            "AND name NOT LIKE 'sqlite_%'"
+        )}
+
+    def test_import_skips_existing_file_paths(self, importer, tmp_path):
+        """Test emails already imported from another batch are skipped."""
+        write_month(tmp_path / "json", "2024-01", 3)
+        importer.import_monthly_json(tmp_path / "json" / "2024-01_emails.json")
+
+        other = write_month(tmp_path / "other", "2024-01", 5)
+        importer.conn.execute("DELETE FROM import_batches")
+        imported, skipped = importer.import_monthly_json(other)
+
+        assert (imported, skipped) == (2, 3)
+        assert importer.conn.execute("SELECT COUNT(*) FROM emails").fetchone()[0] == 5
+
+    def test_import_isolates_bad_rows(self, importer, tmp_path):
+        """Test a row violating constraints does not drop the rest of the file."""
+        json_file = write_month(tmp_path / "json", "2024-01", 2)
+        data = json.loads(json_file.read_text())
+        data["emails"][0]["extraction_timestamp"] = None
+        json_file.write_text(json.dumps(data))
+
+        imported, skipped = importer.import_monthly_json(json_file)
+
+        assert (imported, skipped) == (1, 1)
+
+    def test_bulk_import_rebuilds_indexes_and_fts(self, importer, tmp_path):
+        """Test bulk import restores indexes, triggers and search."""
+        before = self.schema_objects(importer)
+        write_month(tmp_path / "json", "2024-01", 10)
+        write_month(tmp_path / "json", "2024-02", 10)
+
+        stats = importer.import_all_monthly_files(bulk=True)
+
+        assert stats['total_imported'] == 20
+        assert self.schema_objects(importer) == before
+        assert len(importer.search_emails("quarterly", limit=100)) == 20
+
+    def test_bulk_load_defers_indexes(self, importer):
+        """Test indexes and FTS triggers are dropped during the load."""
+        with importer.bulk_load():
+            objects = self.schema_objects(importer)
+            assert not objects & set(importer.SECONDARY_INDEXES)
+            assert not objects & set(importer.FTS_TRIGGERS)
+            cache_size = importer.conn.execute("PRAGMA cache_size").fetchone()[0]
+            assert cache_size == -importer.BULK_CACHE_SIZE_KIB
+
+        assert importer.conn.execute("PRAGMA cache_size").fetchone()[0] == \
+            importer.DEFAULT_CACHE_SIZE
+
+    def test_bulk_load_keep_indexes(self, importer):
+        """Test defer_indexes=False leaves indexes in place."""
+        before = self.schema_objects(importer)
+        with importer.bulk_load(defer_indexes=False):
+            assert self.schema_objects(importer) == before
+
+    def test_bulk_load_rebuilds_on_error(self, importer):
+        """Test indexes are rebuilt even when the import fails."""
+        before = self.schema_objects(importer)
+
+        with pytest.raises(RuntimeError), importer.bulk_load():
+            raise RuntimeError("import failed")
+
+        assert self.schema_objects(importer) == before
+
+
 class TestUpdateStatistics:
     """Tests for update_statistics method."""
 
@@ -0,0 +1,157 @@
+"""
+Tests for database_extensions.py module.
+Tests EmailDatabaseExtensions batched upsert.
+"""
+
+import pytest
+
+from gmail_assistant.core.processing.database import EmailDatabaseImporter
+from gmail_assistant.core.processing.database_extensions import EmailDatabaseExtensions
+
+
+@pytest.fixture
+def extensions(tmp_path):
+    """Create extensions over a database with the importer schema."""
+    db_path = tmp_path / "emails.db"
+    importer = EmailDatabaseImporter(str(db_path))
+    importer.connect_database()
+    importer.create_database_schema()
+    importer.close_database()
+
+    extensions = EmailDatabaseExtensions(str(db_path))
+    extensions.ensure_schema()
+    yield extensions
+    extensions.close()
+
+
+def make_email(gmail_id, **fields):
+    """Create an email dict satisfying the importer schema's NOT NULL columns."""
+    email = {
+        'gmail_id': gmail_id,
+        'filename': f'{gmail_id}.md',
+        'file_path': f'/archive/{gmail_id}.md',
+        'year_month': '2024-01',
+        'extraction_timestamp': '2024-01-15T12:00:00',
+    }
+    email.update(fields)
+    return email
+
+
+def fetch(extensions, gmail_id):
+    return extensions.connect().execute(
+        "SELECT * FROM emails WHERE gmail_id = ?", (gmail_id,)
+    ).fetchone()
+
+
+class TestUpsertEmailsBatch:
+    """Tests for EmailDatabaseExtensions.upsert_emails_batch."""
+
+    def test_inserts_new_emails(self, extensions):
+        result = extensions.upsert_emails_batch([
+            make_email('a', subject='First'),
+            make_email('b', subject='Second'),
+        ])
+
+        assert result.to_dict() == {'inserted': 2, 'updated': 0, 'skipped': 0, 'failed': 0}
+        assert fetch(extensions, 'a')['subject'] == 'First'
+
+    def test_updates_existing_emails(self, extensions):
+        extensions.upsert_emails_batch([make_email('a', subject='Old', sender='x@example.com')])
+
+        result = extensions.upsert_emails_batch([
+            {'gmail_id': 'a', 'subject': 'New', 'sender': None},
+        ])
+
+        assert result.updated == 1
+        row = fetch(extensions, 'a')
+        assert row['subject'] == 'New'
+        assert row['sender'] == 'x@example.com'  # None keeps the stored value
+
+    def test_skips_missing_ids_and_empty_updates(self, extensions):
+        extensions.upsert_emails_batch([make_email('a')])
+
+        result = extensions.upsert_emails_batch([
+            {'subject': 'No id'},
+            {'gmail_id': 'a', 'thread_id': 't1'},  # no updatable fields
+        ])
+
+        assert result.to_dict() == {'inserted': 0, 'updated': 0, 'skipped': 2, 'failed': 0}
+
+    def test_id_key_fallback(self, extensions):
+        email = make_email('a')
+        email['id'] = email.pop('gmail_id')
+
+        result = extensions.upsert_emails_batch([email])
+
+        assert result.inserted == 1
+
+    def test_repeated_id_inserted_then_updated(self, extensions):
+        result = extensions.upsert_emails_batch([
+            make_email('a', subject='One'),
+            make_email('a', subject='Two'),
+            make_email('a', subject='Three'),
+        ])
+
+        assert (result.inserted, result.updated) == (1, 2)
+        assert fetch(extensions, 'a')['subject'] == 'Three'
+
+    def test_constraint_violation_only_skips_bad_row(self, extensions):
+        bad = make_email('bad')
+        del bad['file_path']  # NOT NULL in the importer schema
+
+        result = extensions.upsert_emails_batch([make_email('a'), bad, make_email('b')])
+
+        assert result.to_dict() == {'inserted': 2, 'updated': 0, 'skipped': 1, 'failed': 0}
+        assert fetch(extensions, 'bad') is None
+
+    def test_retry_after_failed_insert_in_same_batch(self, extensions):
+        bad = make_email('a')
+        del bad['file_path']
+
+        result = extensions.upsert_emails_batch([bad, make_email('a', subject='Retry')])
+
+        assert (result.inserted, result.updated, result.skipped) == (1, 0, 1)
+        assert fetch(extensions, 'a')['subject'] == 'Retry'
+
+    def test_single_commit_per_batch(self, extensions):
+        statements = []
+        conn = extensions.connect()
+        conn.set_trace_callback(statements.append)
+
+        extensions.upsert_emails_batch([make_email(str(i)) for i in range(50)])
+
+        conn.set_trace_callback(None)
+        assert sum(1 for s in statements if s.strip().upper() == 'COMMIT') == 1
+        assert conn.execute("SELECT COUNT(*) FROM emails").fetchone()[0] == 50
+
+    def test_matches_row_by_row_upsert(self, extensions, tmp_path):
+        batch = [
+            make_email('a', subject='A1'),
+            make_email('b', subject='B1', labels='INBOX'),
+            make_email('a', subject='A2', sender=None),
+            {'gmail_id': 'b', 'labels': 'ARCHIVE'},
+            {'gmail_id': 'c'},
+        ]
+        extensions.upsert_emails_batch([make_email('b', subject='B0')])
+        result = extensions.upsert_emails_batch(batch)
+
+        db_path = tmp_path / "rowwise.db"
+        importer = EmailDatabaseImporter(str(db_path))
+        importer.connect_database()
+        importer.create_database_schema()
+        importer.close_database()
+        rowwise = EmailDatabaseExtensions(str(db_path))
+        rowwise.ensure_schema()
+        rowwise.upsert_email('b', make_email('b', subject='B0'))
+        actions = [rowwise.upsert_email(e['gmail_id'], e)[1] for e in batch]
+
+        assert result.inserted == actions.count('inserted')
+        assert result.updated == actions.count('updated')
+        assert result.skipped == actions.count('skipped')
+        for gmail_id in 'abc':
+            expected = fetch(rowwise, gmail_id)
+            actual = fetch(extensions, gmail_id)
+            columns = ('subject', 'sender', 'labels', 'file_path')
+            assert (expected and [expected[c] for c in columns]) == \
+                (actual and [actual[c] for c in columns])
+        rowwise.close()
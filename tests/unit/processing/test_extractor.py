@@ -406,3 +406,167 @@ class TestExtractorDateFormats:
         assert result.year == 2024
         assert result.month == 1
         assert result.day == 15
+
+
+def write_email(folder: Path, name: str, date: str, subject: str) -> Path:
+    """Write a minimal regenerated email markdown file."""
+    folder.mkdir(parents=True, exist_ok=True)
+    md_file = folder / name
+    md_file.write_text(f"""# Email
+
+| Field | Value |
+| --- | --- |
+| Date | {date} |
+| From | sender@example.com |
+| Subject | {subject} |
+| Gmail ID | {subject.lower()} |
+
+## Message Content
+
+Body of {subject}.
+""")
+    return md_file
+
+
+class TestStreamingExtraction:
+    """Tests for lazy, batched extraction into sinks."""
+
+    @pytest.fixture
+    def archive(self, tmp_path):
+        """Create a small archive spanning two months."""
+        input_folder = tmp_path / "input"
+        write_email(input_folder / "2024" / "01", "a.md", "Mon, 15 Jan 2024 10:00:00 +0000", "A")
+        write_email(input_folder / "2024" / "01", "b.md", "Tue, 16 Jan 2024 10:00:00 +0000", "B")
+        write_email(input_folder / "2024" / "02", "c.md", "Thu, 01 Feb 2024 10:00:00 +0000", "C")
+        (input_folder / "notes.txt").write_text("not an email")
+        return input_folder
+
+    @pytest.fixture
+    def extractor(self, archive, tmp_path):
+        """Create extractor over the archive."""
+        from gmail_assistant.core.processing.extractor import EmailDataExtractor
+        return EmailDataExtractor(str(archive), str(tmp_path / "output"))
+
+    def test_iter_md_files_is_lazy(self, extractor):
+        """Test iter_md_files returns a generator of markdown files only."""
+        files = extractor.iter_md_files()
+
+        assert not isinstance(files, list)
+        assert sorted(f.name for f in files) == ['a.md', 'b.md', 'c.md']
+
+    def test_iter_emails_preserves_order(self, extractor, tmp_path):
+        """Test iter_emails yields results in input order, including failures."""
+        files = [*sorted(extractor.iter_md_files()), tmp_path / "missing.md"]
+
+        results = list(extractor.iter_emails(files, chunk_size=2))
+
+        assert [path for path, _ in results] == files
+        assert [email['subject'] for _, email in results[:3]] == ['A', 'B', 'C']
+        assert results[3][1] is None
+
+    def test_iter_emails_process_pool(self, extractor):
+        """Test extraction in worker processes matches in-process extraction."""
+        files = sorted(extractor.iter_md_files())
+
+        pooled = [email['gmail_id'] for _, email in extractor.iter_emails(files, workers=2,
+                                                                          chunk_size=1)]
+
+        assert pooled == ['a', 'b', 'c']
+
+    def test_streams_in_batches(self, extractor):
+        """Test the sink receives bounded batches."""
+        sink = mock.MagicMock()
+
+        stats = extractor.process_emails_streaming(sink, workers=1, batch_size=2)
+
+        assert [len(call.args[0]) for call in sink.write_batch.call_args_list] == [2, 1]
+        assert stats['successful_extractions'] == 3
+        assert stats['months_created'] == 2
+        sink.close.assert_not_called()
+
+    def test_ndjson_sink(self, extractor, tmp_path):
+        """Test NDJSON sink appends one line per email to monthly files."""
+        from gmail_assistant.core.processing.extractor import NDJSONEmailSink
+
+        output_folder = tmp_path / "ndjson"
+        with NDJSONEmailSink(output_folder) as sink:
+            extractor.process_emails_streaming(sink, workers=1, batch_size=1)
+
+        january = (output_folder / "2024-01_emails.ndjson").read_text().splitlines()
+        assert sorted(json.loads(line)['subject'] for line in january) == ['A', 'B']
+        assert len((output_folder / "2024-02_emails.ndjson").read_text().splitlines()) == 1
+        assert sink.emails_written == 3
+
+    def test_sqlite_sink(self, extractor, tmp_path):
+        """Test SQLite sink inserts emails and records monthly batches."""
+        import sqlite3
+
+        from gmail_assistant.core.processing.extractor import SQLiteEmailSink
+
+        db_path = tmp_path / "emails.db"
+        with SQLiteEmailSink(db_path, source="archive") as sink:
+            extractor.process_emails_streaming(sink, workers=1, batch_size=2)
+
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT COUNT(*) FROM emails").fetchone()[0] == 3
+        batches = conn.execute(
+            "SELECT year_month, email_count, source_file FROM import_batches ORDER BY year_month"
+        ).fetchall()
+        assert batches == [('2024-01', 2, 'archive'), ('2024-02', 1, 'archive')]
+        assert conn.execute(
+            "SELECT COUNT(*) FROM emails_fts WHERE emails_fts MATCH 'Body'"
+        ).fetchone()[0] == 3
+        conn.close()
+        assert sink.emails_written == 3
+
+    def test_sqlite_sink_rerun_skips_existing(self, extractor, tmp_path):
+        """Test re-running into the same database ignores already imported files."""
+        from gmail_assistant.core.processing.extractor import SQLiteEmailSink
+
+        db_path = tmp_path / "emails.db"
+        with SQLiteEmailSink(db_path) as sink:
+            extractor.process_emails_streaming(sink, workers=1)
+        with SQLiteEmailSink(db_path) as sink:
+            extractor.process_emails_streaming(sink, workers=1)
+
+        assert sink.emails_written == 0
+        assert sink.emails_skipped == 3
+
+    def test_sqlite_sink_rerun_keeps_batch_counts(self, extractor, archive, tmp_path):
+        """Test re-runs record emails present, not emails seen, and widen date ranges."""
+        import sqlite3
+
+        from gmail_assistant.core.processing.extractor import SQLiteEmailSink
+
+        db_path = tmp_path / "emails.db"
+        with SQLiteEmailSink(db_path) as sink:
+            extractor.process_emails_streaming(sink, workers=1)
+        write_email(archive / "2024" / "01", "d.md", "Wed, 31 Jan 2024 10:00:00 +0000", "D")
+        with SQLiteEmailSink(db_path) as sink:
+            extractor.process_emails_streaming(sink, workers=1)
+
+        conn = sqlite3.connect(db_path)
+        batches = conn.execute(
+            "SELECT year_month, email_count, date_range_first, date_range_last "
+            "FROM import_batches ORDER BY year_month"
+        ).fetchall()
+        conn.close()
+        assert [(month, count) for month, count, _, _ in batches] == [
+            ('2024-01', 3), ('2024-02', 1)
+        ]
+        assert '15 Jan 2024' in batches[0][2]
+        assert '31 Jan 2024' in batches[0][3]
+
+    def test_sqlite_sink_bulk(self, extractor, tmp_path):
+        """Test bulk sink rebuilds full-text search on close."""
+        from gmail_assistant.core.processing.database import EmailDatabaseImporter
+        from gmail_assistant.core.processing.extractor import SQLiteEmailSink
+
+        db_path = tmp_path / "emails.db"
+        with SQLiteEmailSink(db_path, bulk=True) as sink:
+            extractor.process_emails_streaming(sink, workers=1)
+
+        importer = EmailDatabaseImporter(str(db_path))
+        importer.connect_database()
+        assert len(importer.search_emails("Body")) == 3
+        importer.close_database()
@@ -0,0 +1,117 @@
+"""
+Tests for plaintext.py module.
+Tests markdown stripping and the keyset-paged plain text backfill.
+"""
+
+import sqlite3
+
+import pytest
+
+from gmail_assistant.core.processing.plaintext import (
+    EmailPlaintextProcessor,
+    markdown_to_plaintext,
+)
+
+
+class TestMarkdownToPlaintext:
+    """Tests for markdown_to_plaintext."""
+
+    def test_empty_content(self):
+        """Test empty content returns empty string."""
+        assert markdown_to_plaintext("") == ""
+        assert markdown_to_plaintext(None) == ""
+
+    def test_strips_formatting(self):
+        """Test headers, emphasis, code and entities are stripped."""
+        text = "# Title\n\n**bold** and *italic* with `code` &amp; more"
+        assert markdown_to_plaintext(text) == "Title\n\nbold and italic with code & more"
+
+    def test_links_and_lists(self):
+        """Test links are kept readable and list markers normalised."""
+        text = "- [Docs](https://example.com)\n1. first"
+        assert markdown_to_plaintext(text) == "• Docs (https://example.com)\n first"
+
+    def test_collapses_blank_lines_and_trailing_space(self):
+        """Test blank line runs collapse and trailing whitespace is removed."""
+        text = "one   \n\n\n\ntwo\t\nthree"
+        assert markdown_to_plaintext(text) == "one\n\ntwo\nthree"
+
+    def test_method_delegates(self, tmp_path, monkeypatch):
+        """Test the processor method uses the module function."""
+        monkeypatch.chdir(tmp_path)
+        processor = EmailPlaintextProcessor(str(tmp_path / "emails.db"))
+        assert processor.markdown_to_plaintext("**x**") == "x"
+
+
+class TestPlaintextBackfill:
+    """Tests for batch and full-corpus processing."""
+
+    @pytest.fixture
+    def db_path(self, tmp_path, monkeypatch):
+        """Create a database with emails needing plain text."""
+        monkeypatch.chdir(tmp_path)
+        path = tmp_path / "emails.db"
+        conn = sqlite3.connect(path)
+        conn.execute("""
+            CREATE TABLE emails (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                subject TEXT,
+                message_content TEXT,
+                plain_text_content TEXT
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO emails (subject, message_content, plain_text_content) VALUES (?, ?, ?)",
+            [(f"Subject {i}", f"**Email {i}**", "done" if i % 5 == 0 else None)
+             for i in range(1, 26)]
+        )
+        conn.commit()
+        conn.close()
+        return path
+
+    def _plain_texts(self, db_path):
+        conn = sqlite3.connect(db_path)
+        rows = dict(conn.execute("SELECT id, plain_text_content FROM emails").fetchall())
+        conn.close()
+        return rows
+
+    def test_process_all_emails_covers_every_row(self, db_path):
+        """Test keyset paging fills every pending row without skipping."""
+        processor = EmailPlaintextProcessor(str(db_path), batch_size=3)
+
+        assert processor.process_all_emails(workers=1) is True
+
+        texts = self._plain_texts(db_path)
+        assert processor.get_processing_stats() == (25, 0)
+        assert texts[1] == "Email 1"
+        assert texts[24] == "Email 24"
+        assert texts[5] == "done"
+
+    def test_process_all_emails_parallel(self, db_path):
+        """Test conversion in a process pool matches inline results."""
+        processor = EmailPlaintextProcessor(str(db_path), batch_size=4)
+
+        assert processor.process_all_emails(workers=2) is True
+
+        texts = self._plain_texts(db_path)
+        assert processor.get_processing_stats() == (25, 0)
+        assert all(texts[i] == f"Email {i}" for i in range(1, 26) if i % 5)
+
+    def test_dry_run_writes_nothing(self, db_path):
+        """Test dry run leaves the column untouched."""
+        processor = EmailPlaintextProcessor(str(db_path), batch_size=3)
+
+        assert processor.process_all_emails(dry_run=True, workers=1) is True
+        assert processor.get_processing_stats() == (25, 20)
+
+    def test_process_emails_batch_returns_last_id(self, db_path):
+        """Test a single batch advances by keyset."""
+        processor = EmailPlaintextProcessor(str(db_path))
+
+        processed, errors, last_id = processor.process_emails_batch(0, 5)
+        assert (processed, errors, last_id) == (5, 0, 6)
+
+        processed, errors, last_id = processor.process_emails_batch(last_id, 100)
+        assert (processed, errors, last_id) == (15, 0, 24)
+
+        assert processor.process_emails_batch(last_id, 100) == (0, 0, None)
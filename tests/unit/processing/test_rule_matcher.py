@@ -0,0 +1,113 @@
+"""
+Tests for rule_matcher.py module.
+Tests RuleMatcher single-pass matching and CategoryRules priority selection.
+"""
+
+from unittest import mock
+
+import pytest
+
+from gmail_assistant.core.processing import rule_matcher
+from gmail_assistant.core.processing.rule_matcher import CategoryRules, RuleHit, RuleMatcher
+
+
+@pytest.fixture(params=[True, False], ids=['automaton', 'fallback'])
+def literal_backend(request):
+    """Run literal-mode tests with and without pyahocorasick."""
+    if request.param and not rule_matcher.AHOCORASICK_AVAILABLE:
+        pytest.skip("pyahocorasick not installed")
+    with mock.patch.object(rule_matcher, 'AHOCORASICK_AVAILABLE', request.param):
+        yield request.param
+
+
+class TestRegexMatcher:
+    """Tests for RuleMatcher in regex mode."""
+
+    def test_first_respects_family_then_pattern_order(self):
+        matcher = RuleMatcher({
+            'Newsletter': [r'newsletter@', r'news@'],
+            'Support': [r'support@', r'help@'],
+        })
+        assert matcher.first('help@x.com news@x.com') == RuleHit('Newsletter', 'news@')
+        assert matcher.first('help@x.com support@x.com') == RuleHit('Support', 'support@')
+
+    def test_first_no_match(self):
+        matcher = RuleMatcher({'Support': [r'support@']})
+        assert matcher.first('someone@example.com') is None
+        assert matcher.first('') is None
+
+    def test_anchored_patterns(self):
+        matcher = RuleMatcher({'Support': [r'^re:'], 'Personal': [r'lunch']})
+        assert matcher.first('lunch re: plans') == RuleHit('Personal', 'lunch')
+        assert matcher.first('re: lunch') == RuleHit('Support', '^re:')
+
+    def test_scan_counts_matches(self):
+        matcher = RuleMatcher({'Digits': [r'\d+'], 'Alpha': [r'[a-z]+']})
+        assert matcher.scan('a1 b22 c') == {'Digits': {r'\d+': 2}, 'Alpha': {'[a-z]+': 3}}
+
+    def test_empty_rules(self):
+        matcher = RuleMatcher({})
+        assert len(matcher) == 0
+        assert matcher.first('anything') is None
+        assert matcher.scan('anything') == {}
+
+
+class TestLiteralMatcher:
+    """Tests for RuleMatcher in literal mode."""
+
+    def test_scan_counts_like_str_count(self, literal_backend):
+        matcher = RuleMatcher({'Finance': ['bank', 'credit'], 'Tech': ['ai']}, literal=True)
+        text = 'bank said credit bank ai'
+        assert matcher.scan(text) == {
+            'Finance': {'bank': 2, 'credit': 1},
+            'Tech': {'ai': 2},
+        }
+
+    def test_overlapping_keywords_all_counted(self, literal_backend):
+        matcher = RuleMatcher({
+            'Education': ['learning'],
+            'Tech': ['machine learning'],
+        }, literal=True)
+        hits = matcher.scan('machine learning')
+        assert hits == {'Education': {'learning': 1}, 'Tech': {'machine learning': 1}}
+
+    def test_self_overlapping_keyword_counted_like_str_count(self, literal_backend):
+        matcher = RuleMatcher({'Alert': ['aa', 'abab']}, literal=True)
+        text = 'aaaa ababab'
+        assert matcher.scan(text) == {
+            'Alert': {'aa': text.count('aa'), 'abab': text.count('abab')},
+        }
+
+    def test_shared_keyword_credited_to_each_family(self, literal_backend):
+        matcher = RuleMatcher({'Shopping': ['order'], 'Transactional': ['order']}, literal=True)
+        assert set(matcher.scan('your order')) == {'Shopping', 'Transactional'}
+
+    def test_first_uses_rule_order_not_text_order(self, literal_backend):
+        matcher = RuleMatcher({'High': ['urgent'], 'Medium': ['reminder']}, literal=True)
+        assert matcher.first('reminder: urgent') == RuleHit('High', 'urgent')
+
+    def test_special_characters_are_literal(self, literal_backend):
+        matcher = RuleMatcher({'Marketing': ['% off', 'a.b']}, literal=True)
+        assert matcher.scan('20% off axb') == {'Marketing': {'% off': 1}}
+
+
+class TestCategoryRules:
+    """Tests for CategoryRules."""
+
+    @pytest.fixture
+    def rules(self):
+        return CategoryRules({
+            'Newsletters': {'priority': 2, 'keywords': ['digest'], 'sender_patterns': ['news@']},
+            'Financial': {'priority': 1, 'keywords': ['invoice'], 'sender_patterns': ['Billing@']},
+        }, lowercase_patterns=True)
+
+    def test_priority_decides_between_keyword_and_sender(self, rules):
+        assert rules.categorize('weekly digest', 'billing@shop.com') == 'Financial'
+        assert rules.categorize('weekly digest', 'friend@example.com') == 'Newsletters'
+
+    def test_default_category(self, rules):
+        assert rules.categorize('hello', 'friend@example.com') == 'Other'
+
+    def test_count_matches(self, rules):
+        assert rules.count_matches('invoice', 'billing@shop.com', 'Financial') == (2, 2)
+        assert rules.count_matches('invoice', 'x@y.com', 'Unknown') == (0, 0)
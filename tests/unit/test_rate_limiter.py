@@ -10,7 +10,9 @@ import pytest
 from gmail_assistant.utils.rate_limiter import (
     RateLimitError,
     GmailRateLimiter,
+    QuotaTokenBucket,
     QuotaTracker,
+    get_gmail_rate_limiter,
     retry_on_rate_limit,
 )
 
@@ -419,6 +421,102 @@ class TestGetStats:
         assert stats["quota_units_used"] == 15
 
 
+@pytest.mark.unit
+class TestQuotaTokenBucket:
+    """Test QuotaTokenBucket quota-unit throttling."""
+
+    def test_burst_within_capacity_does_not_wait(self):
+        bucket = QuotaTokenBucket(rate=250.0)
+        waits = [bucket.reserve(5) for _ in range(50)]
+        assert all(w == 0.0 for w in waits)
+
+    def test_cost_is_weighted(self):
+        """A 50-unit call drains ten times what a 5-unit call does."""
+        bucket = QuotaTokenBucket(rate=100.0, capacity=50)
+        assert bucket.reserve(50) == 0.0
+        assert bucket.reserve(5) == pytest.approx(0.05, abs=0.01)
+
+    def test_debt_orders_waiters_fifo(self):
+        bucket = QuotaTokenBucket(rate=100.0, capacity=0)
+        first = bucket.reserve(10)
+        second = bucket.reserve(10)
+        assert second == pytest.approx(first + 0.1, abs=0.01)
+
+    def test_lock_not_held_while_sleeping(self):
+        """Concurrent acquirers overlap their waits rather than queueing on a lock."""
+        bucket = QuotaTokenBucket(rate=100.0, capacity=0)
+        threads = [threading.Thread(target=bucket.acquire, args=(5,)) for _ in range(4)]
+
+        start = time.monotonic()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.monotonic() - start
+
+        # 20 units at 100/s is 0.2s total; serialised sleeps would take 0.5s
+        assert elapsed < 0.35
+
+    def test_on_rate_limited_halves_rate(self):
+        bucket = QuotaTokenBucket(rate=200.0)
+        bucket.on_rate_limited()
+        assert bucket.rate == 100.0
+        assert bucket.get_stats()['throttle_events'] == 1
+
+    def test_on_rate_limited_respects_min_rate(self):
+        bucket = QuotaTokenBucket(rate=200.0, min_rate=150.0)
+        bucket.on_rate_limited()
+        assert bucket.rate == 150.0
+
+    def test_retry_after_pushes_back_next_reservation(self):
+        bucket = QuotaTokenBucket(rate=100.0)
+        bucket.on_rate_limited(retry_after=1.0)
+        assert bucket.reserve(0) >= 0.9
+
+    def test_record_success_recovers_rate(self):
+        bucket = QuotaTokenBucket(rate=100.0, recovery_factor=0.25)
+        bucket.on_rate_limited()
+        bucket.record_success()
+        bucket.record_success()
+        assert bucket.rate == 100.0
+
+    def test_invalid_rate_rejected(self):
+        with pytest.raises(ValueError):
+            QuotaTokenBucket(rate=0)
+
+    def test_acquire_async(self):
+        import asyncio
+
+        bucket = QuotaTokenBucket(rate=100.0, capacity=0)
+        waited = asyncio.run(bucket.acquire_async(5))
+        assert waited == pytest.approx(0.05, abs=0.01)
+
+
+@pytest.mark.unit
+class TestRateLimitFeedback:
+    """Test GmailRateLimiter adapting to 429 responses."""
+
+    def test_429_reduces_shared_rate(self, rate_limiter: GmailRateLimiter):
+        from googleapiclient.errors import HttpError
+
+        resp = mock.MagicMock(status=429)
+        resp.get.return_value = None
+        func = mock.MagicMock(side_effect=[HttpError(resp, b"rate"), "ok"])
+        initial = rate_limiter.bucket.rate
+
+        with mock.patch("time.sleep"):
+            assert rate_limiter.rate_limited_call(func) == "ok"
+
+        assert rate_limiter.bucket.rate < initial
+        assert rate_limiter.get_stats()["throttle_events"] == 1
+
+    def test_shared_limiter_is_singleton(self):
+        limiter = get_gmail_rate_limiter()
+        assert get_gmail_rate_limiter() is limiter
+        assert limiter.bucket.max_rate == 250.0
+        assert limiter.bucket.capacity == 250.0
+
+
 @pytest.mark.unit
 class TestQuotaTrackerInit:
     """Test QuotaTracker initialization."""
@@ -0,0 +1,190 @@
+"""
+Tests for cache_manager.py module.
+Tests IntelligentCache and its SQLite-backed disk tier.
+"""
+
+import json
+import sqlite3
+import time
+
+import pytest
+
+from gmail_assistant.utils.cache_manager import (
+    STORE_FILENAME,
+    IntelligentCache,
+    _decode_value,
+    _encode_value,
+)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a persistent cache in a temporary directory."""
+    cache = IntelligentCache(memory_limit_mb=10_000, disk_cache_dir=tmp_path)
+    yield cache
+    cache.close()
+
+
+def _store_rows(path):
+    conn = sqlite3.connect(path / STORE_FILENAME)
+    rows = conn.execute(
+        "SELECT key, access_count, ttl, size_bytes FROM cache_entries ORDER BY key"
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+class TestValueEncoding:
+    """Tests for compact value encoding."""
+
+    def test_round_trip_small(self):
+        """Test small values are stored as compact JSON."""
+        payload, size = _encode_value({"a": [1, 2]})
+        assert payload == b'j{"a":[1,2]}'
+        assert size == len('{"a":[1,2]}')
+        assert _decode_value(payload) == {"a": [1, 2]}
+
+    def test_round_trip_compressed(self):
+        """Test large values are compressed."""
+        value = {"body": "x" * 10_000}
+        payload, size = _encode_value(value)
+        assert payload[:1] == b'z'
+        assert len(payload) < size
+        assert _decode_value(payload) == value
+
+    def test_unknown_tag_rejected(self):
+        """Test payloads with an unknown tag are rejected."""
+        with pytest.raises(ValueError):
+            _decode_value(b'?{}')
+
+
+class TestIntelligentCacheStore:
+    """Tests for the disk tier."""
+
+    def test_persisted_entry_survives_restart(self, tmp_path, cache):
+        """Test persisted values are readable by a new instance."""
+        cache.put("big", {"data": "v" * 2000})
+        cache.close()
+
+        reopened = IntelligentCache(disk_cache_dir=tmp_path)
+        try:
+            assert reopened.get("big") == {"data": "v" * 2000}
+        finally:
+            reopened.close()
+
+    def test_small_short_lived_entry_not_persisted(self, tmp_path, cache, monkeypatch):
+        """Test small, short-lived values stay in memory only."""
+        monkeypatch.setattr(cache.memory_tracker, "check_memory",
+                            lambda: {"status": "normal", "current_mb": 0})
+        cache.put("small", "x", ttl=60)
+
+        assert cache.get("small") == "x"
+        assert _store_rows(tmp_path) == []
+
+    def test_overwrite_drops_stale_persisted_copy(self, tmp_path, cache, monkeypatch):
+        """Test replacing a persisted value with a memory-only one removes the row."""
+        monkeypatch.setattr(cache.memory_tracker, "check_memory",
+                            lambda: {"status": "normal", "current_mb": 0})
+        cache.put("key", "x" * 2000)
+        cache.put("key", "y", ttl=60)
+
+        assert _store_rows(tmp_path) == []
+
+    def test_expired_entry_removed_on_read(self, tmp_path, cache):
+        """Test an expired persisted entry is deleted when read."""
+        cache.put("key", "x" * 2000, ttl=7200)
+        cache.memory_cache.clear()
+        cache.metadata.clear()
+        conn = sqlite3.connect(tmp_path / STORE_FILENAME)
+        conn.execute("UPDATE cache_entries SET created_at = ?, expires_at = ?",
+                     (time.time() - 10_000, time.time() - 2800))
+        conn.commit()
+        conn.close()
+
+        assert cache.get("key") is None
+        assert _store_rows(tmp_path) == []
+
+    def test_cleanup_expired_on_startup(self, tmp_path, cache):
+        """Test expired rows are purged when a cache is opened."""
+        cache.put("key", "x" * 2000, ttl=7200)
+        cache.close()
+        conn = sqlite3.connect(tmp_path / STORE_FILENAME)
+        conn.execute("UPDATE cache_entries SET expires_at = ?", (time.time() - 1,))
+        conn.commit()
+        conn.close()
+
+        reopened = IntelligentCache(disk_cache_dir=tmp_path)
+        reopened.close()
+        assert _store_rows(tmp_path) == []
+
+    def test_access_counts_flushed(self, tmp_path, cache):
+        """Test buffered access updates reach the store."""
+        cache.put("key", "x" * 2000)
+        for _ in range(3):
+            cache.get("key")
+        cache.close()
+
+        assert _store_rows(tmp_path)[0][1] == 3
+
+    def test_batch_operations_commit_once(self, tmp_path, cache):
+        """Test writes inside a batch are invisible until it exits."""
+        with cache.batch_operations():
+            for i in range(5):
+                cache.put(f"key{i}", "x" * 2000)
+            assert _store_rows(tmp_path) == []
+
+        assert len(_store_rows(tmp_path)) == 5
+
+    def test_invalidate_and_clear(self, tmp_path, cache):
+        """Test invalidation removes entries from every tier."""
+        cache.put("a", "x" * 2000)
+        cache.put("b", "y" * 2000)
+
+        assert cache.invalidate("a") is True
+        assert cache.get("a") is None
+        assert cache.invalidate("a") is False
+
+        cache.clear()
+        assert cache.get("b") is None
+        assert _store_rows(tmp_path) == []
+
+    def test_lru_cleanup_evicts_oldest(self, tmp_path, cache):
+        """Test LRU cleanup removes the least recently used rows first."""
+        cache.put("old", "o" * 2000)
+        cache.put("new", "n" * 2000)
+        conn = sqlite3.connect(tmp_path / STORE_FILENAME)
+        conn.execute("UPDATE cache_entries SET last_accessed = 0 WHERE key = 'old'")
+        conn.commit()
+        conn.close()
+
+        freed = cache._cleanup_lru_disk_entries(target_mb=3000 / (1024 * 1024))
+
+        assert freed > 0
+        assert [row[0] for row in _store_rows(tmp_path)] == ["new"]
+
+    def test_stats(self, cache):
+        """Test stats report disk entries."""
+        cache.put("a", "x" * 2000)
+        stats = cache.get_stats()
+
+        assert stats['disk_cache']['entries'] == 1
+        assert stats['total_entries'] == 1
+
+    def test_legacy_files_removed(self, tmp_path):
+        """Test per-entry JSON files from earlier versions are cleaned up."""
+        (tmp_path / "metadata.json").write_text(json.dumps({}))
+        (tmp_path / "old.cache").write_text("{}")
+
+        cache = IntelligentCache(disk_cache_dir=tmp_path)
+        cache.close()
+
+        assert not (tmp_path / "metadata.json").exists()
+        assert not (tmp_path / "old.cache").exists()
+
+    def test_persistence_disabled(self, tmp_path):
+        """Test no store is created when persistence is disabled."""
+        cache = IntelligentCache(disk_cache_dir=tmp_path, enable_persistence=False)
+        cache.put("key", "x" * 2000)
+
+        assert cache.get("key") == "x" * 2000
+        assert not (tmp_path / STORE_FILENAME).exists()
@@ -0,0 +1,46 @@
+"""
+Tests for process_pool.py module.
+Tests bounded_process_map ordering and in-flight bounds.
+"""
+
+import operator
+
+from gmail_assistant.utils.process_pool import bounded_process_map
+
+
+class TestBoundedProcessMap:
+    """Tests for bounded_process_map."""
+
+    def test_inline_with_one_worker(self):
+        """Test a single worker applies func in this process, in order."""
+        seen = []
+
+        def record(item):
+            seen.append(item)
+            return item * 2
+
+        assert list(bounded_process_map(record, range(4), workers=1)) == [
+            (0, 0), (1, 2), (2, 4), (3, 6)
+        ]
+        assert seen == [0, 1, 2, 3]
+
+    def test_process_pool_keeps_input_order(self):
+        """Test pooled results pair with their items in input order."""
+        results = list(bounded_process_map(operator.neg, range(20), workers=2))
+
+        assert results == [(i, -i) for i in range(20)]
+
+    def test_items_consumed_lazily(self):
+        """Test only max_in_flight items are taken before the first result."""
+        taken = []
+
+        def items():
+            for i in range(10):
+                taken.append(i)
+                yield i
+
+        results = bounded_process_map(operator.neg, items(), workers=2, max_in_flight=3)
+
+        assert next(results) == (0, 0)
+        assert taken == [0, 1, 2]
+        assert [item for item, _ in results] == list(range(1, 10))